@@ -0,0 +1,945 @@
+#!/usr/bin/env python3
+"""
+Performance Benchmark for Device Discovery
+
+Runs each discovery protocol and DiscoveryEngine.discover_all against a
+simulated fleet served from loopback aliases (127.77.0.0/16 by default):
+
+- an mDNS responder answering service queries with PTR/SRV/TXT/A records
+- SSDP responders replying from each device's own address, with an HTTP
+  server per device for UPnP descriptions
+- TCP listeners emulating IoT services and their banners
+- an SNMP v1/v2c agent emulator for the system group and ifTable
+
+The simulator runs in a child process so its CPU and memory use do not skew
+the measurements. Results (devices/s, p50/p99 latency, peak RSS) are compared
+against a stored baseline.
+
+Linux routes all of 127.0.0.0/8 to the loopback interface, so no setup is
+needed there. On macOS each alias has to be added first, e.g.
+``sudo ifconfig lo0 alias 127.77.0.1``.
+
+Usage:
+    python benchmark_discovery_performance.py --fleet-size 200
+    python benchmark_discovery_performance.py --save-baseline
+"""
+
+import argparse
+import asyncio
+import bisect
+import gc
+import json
+import multiprocessing
+import platform
+import resource
+import socket
+import struct
+import sys
+import time
+from dataclasses import asdict, dataclass, field
+from ipaddress import IPv4Address
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+# Add the project root to Python path
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+from edge_device_fleet_manager.core.config import Config, DiscoveryConfig, LoggingConfig
+from edge_device_fleet_manager.core.logging import setup_logging
+from edge_device_fleet_manager.discovery.core import DiscoveryEngine
+from edge_device_fleet_manager.discovery.protocols.mdns import MDNSDiscovery
+from edge_device_fleet_manager.discovery.protocols.network_scan import NetworkScanDiscovery
+from edge_device_fleet_manager.discovery.protocols.snmp import SNMP_AVAILABLE, SNMPDiscovery
+from edge_device_fleet_manager.discovery.protocols.ssdp import SSDPDiscovery
+
+DEFAULT_BASELINE = project_root / "benchmark_discovery_baseline.json"
+
+
+# ---------------------------------------------------------------------------
+# Simulated fleet
+# ---------------------------------------------------------------------------
+
+@dataclass
+class DeviceProfile:
+    """Behaviour of one kind of simulated device."""
+    kind: str
+    manufacturer: str
+    model: str
+    # TCP port -> ("http", server header) | ("banner", greeting) | ("silent", "")
+    tcp_services: Dict[int, Tuple[str, str]]
+    mdns_service: str
+    upnp_device_type: str
+    sys_object_id: str
+
+
+PROFILES = [
+    DeviceProfile(
+        kind="camera", manufacturer="Hikvision", model="DS-2CD2143",
+        tcp_services={8000: ("http", "Hikvision-Webs")},
+        mdns_service="_http._tcp.local",
+        upnp_device_type="urn:schemas-upnp-org:device:Basic:1",
+        sys_object_id="1.3.6.1.4.1.39165.1.1",
+    ),
+    DeviceProfile(
+        kind="gateway", manufacturer="Cisco", model="IR1101",
+        tcp_services={1883: ("silent", ""), 8883: ("silent", "")},
+        mdns_service="_mqtt._tcp.local",
+        upnp_device_type="urn:schemas-upnp-org:device:InternetGatewayDevice:1",
+        sys_object_id="1.3.6.1.4.1.9.1.2638",
+    ),
+    DeviceProfile(
+        kind="printer", manufacturer="HP", model="LaserJet M404",
+        tcp_services={9100: ("silent", ""), 8080: ("http", "HP HTTP Server")},
+        mdns_service="_ipp._tcp.local",
+        upnp_device_type="urn:schemas-upnp-org:device:Printer:1",
+        sys_object_id="1.3.6.1.4.1.11.2.3.9.1",
+    ),
+    DeviceProfile(
+        kind="media", manufacturer="Plex", model="Media Server",
+        tcp_services={32400: ("http", "Plex Media Server")},
+        mdns_service="_airplay._tcp.local",
+        upnp_device_type="urn:schemas-upnp-org:device:MediaServer:1",
+        sys_object_id="1.3.6.1.4.1.8072.3.2.10",
+    ),
+    DeviceProfile(
+        kind="sensor", manufacturer="Espressif", model="ESP32",
+        tcp_services={8883: ("silent", ""), 2222: ("banner", "SSH-2.0-dropbear_2020.81")},
+        mdns_service="_coap._udp.local",
+        upnp_device_type="urn:schemas-upnp-org:device:Basic:1",
+        sys_object_id="1.3.6.1.4.1.8072.3.2.10",
+    ),
+]
+
+
+@dataclass
+class FleetSpec:
+    """Size and addressing of the simulated fleet."""
+    fleet_size: int = 100
+    base_address: str = "127.77.0.0"
+    snmp_port: int = 1161
+    description_port: int = 49152
+    community: str = "public"
+    silent_close_delay: float = 0.2
+
+    def device_address(self, index: int) -> str:
+        """Loopback alias of a device; .0 and .255 are skipped in each /24."""
+        return str(IPv4Address(self.base_address) + (index // 254) * 256 + index % 254 + 1)
+
+    def profile(self, index: int) -> DeviceProfile:
+        return PROFILES[index % len(PROFILES)]
+
+    @property
+    def networks(self) -> List[str]:
+        subnets = (self.fleet_size + 253) // 254
+        base = IPv4Address(self.base_address)
+        return [f"{base + i * 256}/24" for i in range(subnets)]
+
+    @property
+    def tcp_ports(self) -> List[int]:
+        return sorted({port for profile in PROFILES for port in profile.tcp_services})
+
+
+# --- DNS / mDNS -------------------------------------------------------------
+
+def _dns_name(name: str) -> bytes:
+    encoded = b"".join(
+        bytes([len(label)]) + label.encode("ascii") for label in name.strip(".").split(".")
+    )
+    return encoded + b"\x00"
+
+
+def _dns_record(name: str, rr_type: int, rdata: bytes, ttl: int = 120) -> bytes:
+    return _dns_name(name) + struct.pack("!HHIH", rr_type, 0x8001, ttl, len(rdata)) + rdata
+
+
+def _read_question_name(data: bytes) -> Optional[str]:
+    """Name of the first question in a DNS query (queries are uncompressed)."""
+    if len(data) < 13 or struct.unpack("!H", data[4:6])[0] == 0:
+        return None
+    labels, offset = [], 12
+    while offset < len(data) and data[offset]:
+        length = data[offset]
+        labels.append(data[offset + 1:offset + 1 + length].decode("ascii", "ignore"))
+        offset += 1 + length
+    return ".".join(labels).lower()
+
+
+class _MDNSResponder(asyncio.DatagramProtocol):
+    """Answers service queries for every device offering that service."""
+
+    def __init__(self, spec: FleetSpec):
+        self.responses: Dict[str, List[bytes]] = {}
+        for index in range(spec.fleet_size):
+            profile = spec.profile(index)
+            address = spec.device_address(index)
+            host = f"{profile.kind}-{index:05d}.local"
+            instance = f"{profile.kind}-{index:05d}.{profile.mdns_service}"
+            first_port = next(iter(profile.tcp_services))
+            txt = b"".join(
+                bytes([len(item)]) + item for item in (
+                    f"manufacturer={profile.manufacturer}".encode(),
+                    f"model={profile.model}".encode(),
+                    b"version=1.4.2",
+                )
+            )
+            packet = struct.pack("!HHHHHH", 0, 0x8400, 0, 1, 0, 3) + b"".join((
+                _dns_record(profile.mdns_service, 12, _dns_name(instance)),
+                _dns_record(instance, 33, struct.pack("!HHH", 0, 0, first_port) + _dns_name(host)),
+                _dns_record(instance, 16, txt),
+                _dns_record(host, 1, socket.inet_aton(address)),
+            ))
+            self.responses.setdefault(profile.mdns_service, []).append(packet)
+
+    def connection_made(self, transport):
+        self.transport = transport
+
+    def datagram_received(self, data, addr):
+        name = _read_question_name(data)
+        for packet in self.responses.get(name, ()):
+            self.transport.sendto(packet, addr)
+
+
+# --- SSDP / UPnP ------------------------------------------------------------
+
+class _SSDPFrontend(asyncio.DatagramProtocol):
+    """Receives M-SEARCH requests and fans replies out through device sockets."""
+
+    def __init__(self, spec: FleetSpec):
+        self.spec = spec
+        self.device_transports: List[Tuple[int, asyncio.DatagramTransport]] = []
+
+    def connection_made(self, transport):
+        self.transport = transport
+
+    def datagram_received(self, data, addr):
+        headers = {}
+        for line in data.decode("utf-8", "ignore").split("\r\n")[1:]:
+            if ":" in line:
+                key, value = line.split(":", 1)
+                headers[key.strip().upper()] = value.strip()
+        search_target = headers.get("ST", "")
+
+        for index, transport in self.device_transports:
+            profile = self.spec.profile(index)
+            if search_target not in ("ssdp:all", "upnp:rootdevice", profile.upnp_device_type):
+                continue
+            address = self.spec.device_address(index)
+            reply = (
+                "HTTP/1.1 200 OK\r\n"
+                "CACHE-CONTROL: max-age=1800\r\n"
+                f"LOCATION: http://{address}:{self.spec.description_port}/description.xml\r\n"
+                "SERVER: Linux/5.10 UPnP/1.0 EdgeSim/1.0\r\n"
+                f"ST: {search_target}\r\n"
+                f"USN: uuid:edgesim-{index:08d}::{search_target}\r\n"
+                "\r\n"
+            )
+            transport.sendto(reply.encode("utf-8"), addr)
+
+
+def _device_description(spec: FleetSpec, index: int) -> bytes:
+    profile = spec.profile(index)
+    xml = (
+        '<?xml version="1.0"?>'
+        '<root xmlns="urn:schemas-upnp-org:device-1-0">'
+        "<specVersion><major>1</major><minor>0</minor></specVersion>"
+        "<device>"
+        f"<deviceType>{profile.upnp_device_type}</deviceType>"
+        f"<friendlyName>{profile.kind}-{index:05d}</friendlyName>"
+        f"<manufacturer>{profile.manufacturer}</manufacturer>"
+        f"<modelName>{profile.model}</modelName>"
+        "<modelNumber>1.4.2</modelNumber>"
+        f"<serialNumber>SN{index:08d}</serialNumber>"
+        f"<UDN>uuid:edgesim-{index:08d}</UDN>"
+        "<serviceList><service>"
+        "<serviceType>urn:schemas-upnp-org:service:ConnectionManager:1</serviceType>"
+        "<serviceId>urn:upnp-org:serviceId:ConnectionManager</serviceId>"
+        "<controlURL>/cm/control</controlURL>"
+        "</service></serviceList>"
+        "</device></root>"
+    )
+    return xml.encode("utf-8")
+
+
+def _http_response(body: bytes, server: str, content_type: str = "text/html") -> bytes:
+    return (
+        "HTTP/1.0 200 OK\r\n"
+        f"Server: {server}\r\n"
+        f"Content-Type: {content_type}\r\n"
+        f"Content-Length: {len(body)}\r\n"
+        "Connection: close\r\n"
+        "\r\n"
+    ).encode("utf-8") + body
+
+
+# --- TCP services -----------------------------------------------------------
+
+def _tcp_handler(kind: str, payload: str, spec: FleetSpec):
+    """Connection handler emulating one TCP service."""
+
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            if kind == "http":
+                await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), timeout=5)
+                writer.write(_http_response(b"<html></html>", payload))
+            elif kind == "banner":
+                writer.write(payload.encode("utf-8") + b"\r\n")
+            else:
+                # Services such as MQTT wait for the client; idle clients get dropped
+                await asyncio.sleep(spec.silent_close_delay)
+            await writer.drain()
+        except (asyncio.TimeoutError, asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    return handle
+
+
+def _description_handler(body: bytes):
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), timeout=5)
+            writer.write(_http_response(body, "EdgeSim/1.0 UPnP/1.0", "text/xml"))
+            await writer.drain()
+        except (asyncio.TimeoutError, asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    return handle
+
+
+# --- SNMP -------------------------------------------------------------------
+
+def _ber_length(length: int) -> bytes:
+    if length < 0x80:
+        return bytes([length])
+    encoded = length.to_bytes((length.bit_length() + 7) // 8, "big")
+    return bytes([0x80 | len(encoded)]) + encoded
+
+
+def _ber(tag: int, payload: bytes) -> bytes:
+    return bytes([tag]) + _ber_length(len(payload)) + payload
+
+
+def _ber_int(value: int, tag: int = 0x02) -> bytes:
+    length = max(1, (value.bit_length() + 8) // 8)
+    return _ber(tag, value.to_bytes(length, "big", signed=True))
+
+
+def _ber_unsigned(value: int, tag: int) -> bytes:
+    length = max(1, (value.bit_length() + 7) // 8)
+    encoded = value.to_bytes(length, "big")
+    if encoded[0] & 0x80:
+        encoded = b"\x00" + encoded
+    return _ber(tag, encoded)
+
+
+def _ber_oid(oid: Tuple[int, ...]) -> bytes:
+    body = bytearray([40 * oid[0] + oid[1]])
+    for arc in oid[2:]:
+        chunk = [arc & 0x7F]
+        arc >>= 7
+        while arc:
+            chunk.append(0x80 | (arc & 0x7F))
+            arc >>= 7
+        body.extend(reversed(chunk))
+    return _ber(0x06, bytes(body))
+
+
+def _ber_read(data: bytes, offset: int) -> Tuple[int, bytes, int]:
+    """Read one TLV; returns (tag, value, next offset)."""
+    tag = data[offset]
+    length = data[offset + 1]
+    offset += 2
+    if length & 0x80:
+        count = length & 0x7F
+        length = int.from_bytes(data[offset:offset + count], "big")
+        offset += count
+    return tag, data[offset:offset + length], offset + length
+
+
+def _decode_oid(value: bytes) -> Tuple[int, ...]:
+    arcs = [value[0] // 40, value[0] % 40]
+    arc = 0
+    for byte in value[1:]:
+        arc = (arc << 7) | (byte & 0x7F)
+        if not byte & 0x80:
+            arcs.append(arc)
+            arc = 0
+    return tuple(arcs)
+
+
+def _oid(text: str) -> Tuple[int, ...]:
+    return tuple(int(arc) for arc in text.split("."))
+
+
+class _SNMPAgent(asyncio.DatagramProtocol):
+    """SNMP v1/v2c agent answering GET, GETNEXT and GETBULK from a static MIB."""
+
+    GET, GETNEXT, GETBULK = 0xA0, 0xA1, 0xA5
+
+    def __init__(self, spec: FleetSpec, index: int):
+        self.community = spec.community.encode("utf-8")
+        profile = spec.profile(index)
+        mib = {
+            _oid("1.3.6.1.2.1.1.1.0"): _ber(0x04, f"{profile.manufacturer} {profile.model} firmware 1.4.2".encode()),
+            _oid("1.3.6.1.2.1.1.2.0"): _ber_oid(_oid(profile.sys_object_id)),
+            _oid("1.3.6.1.2.1.1.3.0"): _ber_unsigned(8640000 + index, 0x43),
+            _oid("1.3.6.1.2.1.1.4.0"): _ber(0x04, b"ops@example.com"),
+            _oid("1.3.6.1.2.1.1.5.0"): _ber(0x04, f"{profile.kind}-{index:05d}".encode()),
+            _oid("1.3.6.1.2.1.1.6.0"): _ber(0x04, f"rack-{index // 40}".encode()),
+            _oid("1.3.6.1.2.1.1.7.0"): _ber_int(72),
+        }
+        for if_index in (1, 2):
+            mac = bytes([0x02, 0x77, (index >> 16) & 0xFF, (index >> 8) & 0xFF, index & 0xFF, if_index])
+            columns = {
+                1: _ber_int(if_index),
+                2: _ber(0x04, f"eth{if_index - 1}".encode()),
+                3: _ber_int(6),
+                4: _ber_int(1500),
+                5: _ber_unsigned(1000000000, 0x42),
+                6: _ber(0x04, mac),
+                7: _ber_int(1),
+                8: _ber_int(1),
+            }
+            for column, value in columns.items():
+                mib[_oid(f"1.3.6.1.2.1.2.2.1.{column}.{if_index}")] = value
+        self.mib = mib
+        self.oids = sorted(mib)
+
+    def connection_made(self, transport):
+        self.transport = transport
+
+    def _next(self, oid: Tuple[int, ...]) -> Optional[Tuple[int, ...]]:
+        position = bisect.bisect_right(self.oids, oid)
+        return self.oids[position] if position < len(self.oids) else None
+
+    def datagram_received(self, data, addr):
+        try:
+            _, message, _ = _ber_read(data, 0)
+            _, version, offset = _ber_read(message, 0)
+            _, community, offset = _ber_read(message, offset)
+            pdu_type, pdu, _ = _ber_read(message, offset)
+        except (IndexError, ValueError):
+            return
+        if community != self.community or pdu_type not in (self.GET, self.GETNEXT, self.GETBULK):
+            return
+
+        request_id_end = _ber_read(pdu, 0)[2]
+        request_id = pdu[:request_id_end]
+        _, field_a, offset = _ber_read(pdu, request_id_end)
+        _, field_b, offset = _ber_read(pdu, offset)
+        _, varbind_list, _ = _ber_read(pdu, offset)
+
+        requested = []
+        offset = 0
+        while offset < len(varbind_list):
+            _, varbind, offset = _ber_read(varbind_list, offset)
+            _, oid_value, _ = _ber_read(varbind, 0)
+            requested.append(_decode_oid(oid_value))
+
+        v1 = version == b"\x00"
+        error_status, error_index, varbinds = 0, 0, []
+
+        if pdu_type == self.GETBULK:
+            non_repeaters = int.from_bytes(field_a, "big")
+            max_repetitions = min(int.from_bytes(field_b, "big"), 64)
+            for oid in requested[:non_repeaters]:
+                varbinds.append(self._varbind_next(oid))
+            for oid in requested[non_repeaters:]:
+                for _ in range(max_repetitions):
+                    next_oid = self._next(oid)
+                    varbinds.append(self._varbind_next(oid))
+                    if next_oid is None:
+                        break
+                    oid = next_oid
+        else:
+            for position, oid in enumerate(requested, 1):
+                target = oid if pdu_type == self.GET else self._next(oid)
+                value = self.mib.get(target) if target else None
+                if value is None:
+                    if v1:
+                        error_status, error_index = 2, position  # noSuchName
+                        varbinds.append(_ber(0x30, _ber_oid(oid) + b"\x05\x00"))
+                        continue
+                    value = _ber(0x80 if pdu_type == self.GET else 0x82, b"")
+                    target = oid
+                varbinds.append(_ber(0x30, _ber_oid(target) + value))
+
+        response_pdu = _ber(
+            0xA2,
+            request_id + _ber_int(error_status) + _ber_int(error_index) + _ber(0x30, b"".join(varbinds))
+        )
+        response = _ber(0x30, _ber(0x02, version) + _ber(0x04, community) + response_pdu)
+        self.transport.sendto(response, addr)
+
+    def _varbind_next(self, oid: Tuple[int, ...]) -> bytes:
+        next_oid = self._next(oid)
+        if next_oid is None:
+            return _ber(0x30, _ber_oid(oid) + _ber(0x82, b""))  # endOfMibView
+        return _ber(0x30, _ber_oid(next_oid) + self.mib[next_oid])
+
+
+class FleetSimulator:
+    """Serves the whole simulated fleet from one event loop."""
+
+    def __init__(self, spec: FleetSpec):
+        self.spec = spec
+        self.servers: List[asyncio.AbstractServer] = []
+        self.transports: List[asyncio.BaseTransport] = []
+
+    async def start(self) -> Dict[str, Any]:
+        loop = asyncio.get_running_loop()
+        spec = self.spec
+
+        mdns_transport, _ = await loop.create_datagram_endpoint(
+            lambda: _MDNSResponder(spec), local_addr=("127.0.0.1", 0)
+        )
+        ssdp_transport, ssdp = await loop.create_datagram_endpoint(
+            lambda: _SSDPFrontend(spec), local_addr=("127.0.0.1", 0)
+        )
+        self.transports += [mdns_transport, ssdp_transport]
+
+        for index in range(spec.fleet_size):
+            address = spec.device_address(index)
+            profile = spec.profile(index)
+
+            for port, (kind, payload) in profile.tcp_services.items():
+                self.servers.append(await asyncio.start_server(
+                    _tcp_handler(kind, payload, spec), address, port, reuse_address=True
+                ))
+            self.servers.append(await asyncio.start_server(
+                _description_handler(_device_description(spec, index)),
+                address, spec.description_port, reuse_address=True
+            ))
+
+            device_transport, _ = await loop.create_datagram_endpoint(
+                asyncio.DatagramProtocol, local_addr=(address, 0)
+            )
+            ssdp.device_transports.append((index, device_transport))
+            snmp_transport, _ = await loop.create_datagram_endpoint(
+                lambda: _SNMPAgent(spec, index), local_addr=(address, spec.snmp_port)
+            )
+            self.transports += [device_transport, snmp_transport]
+
+        return {
+            "mdns": mdns_transport.get_extra_info("sockname")[:2],
+            "ssdp": ssdp_transport.get_extra_info("sockname")[:2],
+        }
+
+    async def stop(self) -> None:
+        for server in self.servers:
+            server.close()
+        for transport in self.transports:
+            transport.close()
+
+
+def _run_simulator(spec: FleetSpec, ready: "multiprocessing.Queue", stop: "multiprocessing.Event"):
+    """Child process entry point."""
+
+    async def serve():
+        simulator = FleetSimulator(spec)
+        try:
+            endpoints = await simulator.start()
+        except OSError as e:
+            ready.put({"error": str(e)})
+            return
+        ready.put(endpoints)
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, stop.wait)
+        await simulator.stop()
+
+    asyncio.run(serve())
+
+
+class SimulatedNetwork:
+    """Runs a FleetSimulator in a child process."""
+
+    def __init__(self, spec: FleetSpec):
+        self.spec = spec
+        self.endpoints: Dict[str, Tuple[str, int]] = {}
+        context = multiprocessing.get_context("spawn")
+        self._ready = context.Queue()
+        self._stop = context.Event()
+        self._process = context.Process(
+            target=_run_simulator, args=(spec, self._ready, self._stop), daemon=True
+        )
+
+    def start(self, timeout: float = 120.0) -> None:
+        self._process.start()
+        endpoints = self._ready.get(timeout=timeout)
+        if "error" in endpoints:
+            self.stop()
+            raise RuntimeError(f"Simulator failed to start: {endpoints['error']}")
+        self.endpoints = {name: tuple(value) for name, value in endpoints.items()}
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._process.join(timeout=10)
+        if self._process.is_alive():
+            self._process.terminate()
+
+
+# ---------------------------------------------------------------------------
+# Measurement
+# ---------------------------------------------------------------------------
+
+def reset_peak_rss() -> bool:
+    """Reset the kernel's peak RSS counter for this process (Linux only)."""
+    gc.collect()
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+        return True
+    except OSError:
+        return False
+
+
+def peak_rss_mb() -> float:
+    """Peak RSS since the last reset, or for the process lifetime if resets are unsupported."""
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is bytes on macOS and kilobytes elsewhere
+    return peak / (1024 * 1024) if platform.system() == "Darwin" else peak / 1024
+
+
+@dataclass
+class BenchmarkResult:
+    """Measurements for one protocol."""
+    name: str
+    available: bool = True
+    error: Optional[str] = None
+    iterations: int = 0
+    devices_found: int = 0
+    expected_devices: int = 0
+    duration_seconds: float = 0.0
+    devices_per_second: float = 0.0
+    p50_ms: float = 0.0
+    p99_ms: float = 0.0
+    latency_basis: str = "sweep"
+    peak_rss_mb: float = 0.0
+    latency_samples: List[float] = field(default_factory=list, repr=False)
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = asdict(self)
+        data.pop("latency_samples")
+        return data
+
+
+def _instrument(protocol: Any, method_name: str, samples: List[float]) -> None:
+    """Record the latency of each call to a per-device protocol coroutine."""
+    original = getattr(protocol, method_name)
+
+    async def timed(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return await original(*args, **kwargs)
+        finally:
+            samples.append(time.perf_counter() - start)
+
+    setattr(protocol, method_name, timed)
+
+
+class DiscoveryBenchmark:
+    """Runs discovery protocols against a simulated network."""
+
+    # Per-device unit of work timed for latency; other protocols use sweep time
+    LATENCY_HOOKS = {
+        "network_scan": "_scan_single_host",
+        "ssdp": "_create_device_from_response",
+        "snmp": "_discover_device",
+    }
+
+    # Why is_available() can fail for a protocol, reported when it is skipped
+    UNAVAILABLE_REASONS = {
+        "snmp": "pysnmp is not installed" if not SNMP_AVAILABLE else "SNMP not available on this host",
+    }
+
+    def __init__(self, spec: FleetSpec, config: Optional[Config] = None,
+                 iterations: int = 3, multicast_timeout: float = 1.0):
+        self.spec = spec
+        self.config = config or Config()
+        self.iterations = iterations
+        self.multicast_timeout = multicast_timeout
+        self.network = SimulatedNetwork(spec)
+        self.results: List[BenchmarkResult] = []
+
+    def _build_protocols(self) -> Dict[str, Any]:
+        """Create protocol instances pointed at the simulated network."""
+        spec, endpoints = self.spec, self.network.endpoints
+
+        mdns = MDNSDiscovery(self.config)
+        mdns.timeout = self.multicast_timeout
+        mdns.interfaces = ["lo"]
+        mdns.sweep.group, mdns.sweep.port = endpoints["mdns"]
+
+        ssdp = SSDPDiscovery(self.config)
+        ssdp.timeout = self.multicast_timeout
+        ssdp.interfaces = ["lo"]
+        ssdp.sweep.group, ssdp.sweep.port = endpoints["ssdp"]
+
+        network_scan = NetworkScanDiscovery(self.config)
+        network_scan.networks = spec.networks
+        network_scan.ports = spec.tcp_ports
+        network_scan.ping_first = False
+        network_scan.use_neighbor_table = False
+
+        snmp = SNMPDiscovery({
+            "ip_ranges": spec.networks,
+            "port": spec.snmp_port,
+            "community": spec.community,
+            "timeout": 1,
+            "retries": 0,
+        })
+
+        return {"mdns": mdns, "ssdp": ssdp, "network_scan": network_scan, "snmp": snmp}
+
+    async def benchmark_protocol(self, name: str) -> BenchmarkResult:
+        """Benchmark one protocol's discover()."""
+        result = BenchmarkResult(name=name, expected_devices=self.spec.fleet_size)
+        protocol = self._build_protocols()[name]
+        hook = self.LATENCY_HOOKS.get(name)
+        if hook:
+            _instrument(protocol, hook, result.latency_samples)
+            result.latency_basis = "device"
+
+        if not await protocol.is_available():
+            result.available = False
+            result.error = self.UNAVAILABLE_REASONS.get(name, "protocol not available on this host")
+            return result
+
+        reset_peak_rss()
+        for _ in range(self.iterations):
+            start = time.perf_counter()
+            discovery = await protocol.discover()
+            elapsed = time.perf_counter() - start
+
+            if not discovery.success:
+                result.available = False
+                result.error = discovery.error
+                return result
+
+            result.iterations += 1
+            result.duration_seconds += elapsed
+            result.devices_found = len({d.ip_address for d in discovery.devices})
+            if not hook:
+                result.latency_samples.append(elapsed)
+
+        result.peak_rss_mb = peak_rss_mb()
+        return result
+
+    async def benchmark_discover_all(self) -> BenchmarkResult:
+        """Benchmark DiscoveryEngine.discover_all with every protocol registered."""
+        result = BenchmarkResult(name="discover_all", expected_devices=self.spec.fleet_size)
+        engine = DiscoveryEngine(self.config)
+        for protocol in self._build_protocols().values():
+            engine.register_protocol(protocol)
+
+        reset_peak_rss()
+        for _ in range(self.iterations):
+            start = time.perf_counter()
+            discovery = await engine.discover_all()
+            elapsed = time.perf_counter() - start
+
+            result.iterations += 1
+            result.duration_seconds += elapsed
+            result.devices_found = len({d.ip_address for d in discovery.devices})
+            result.latency_samples.append(elapsed)
+
+        result.peak_rss_mb = peak_rss_mb()
+        return result
+
+    @staticmethod
+    def _summarize(result: BenchmarkResult) -> BenchmarkResult:
+        if result.iterations and result.duration_seconds:
+            result.devices_per_second = (
+                result.devices_found * result.iterations / result.duration_seconds
+            )
+        if result.latency_samples:
+            p50, p99 = np.percentile(result.latency_samples, [50, 99])
+            result.p50_ms, result.p99_ms = float(p50 * 1000), float(p99 * 1000)
+        return result
+
+    async def run(self, protocols: List[str]) -> List[BenchmarkResult]:
+        """Run the benchmark for the named protocols (and discover_all)."""
+        print(f"🔧 Starting simulated fleet of {self.spec.fleet_size:,} devices "
+              f"on {', '.join(self.spec.networks)}...")
+        self.network.start()
+        print("✅ Simulated network ready")
+
+        try:
+            for name in protocols:
+                print(f"\n📡 Benchmarking {name}...")
+                if name == "discover_all":
+                    result = await self.benchmark_discover_all()
+                else:
+                    result = await self.benchmark_protocol(name)
+                self.results.append(self._summarize(result))
+                self._print_result(result)
+        finally:
+            self.network.stop()
+
+        return self.results
+
+    @staticmethod
+    def _print_result(result: BenchmarkResult) -> None:
+        if not result.available:
+            print(f"  ⚠️  Skipped: {result.error}")
+            return
+        print(f"  Devices:     {result.devices_found}/{result.expected_devices}")
+        print(f"  Throughput:  {result.devices_per_second:,.1f} devices/s")
+        print(f"  Latency:     p50 {result.p50_ms:.1f} ms, p99 {result.p99_ms:.1f} ms "
+              f"(per {result.latency_basis})")
+        print(f"  Peak RSS:    {result.peak_rss_mb:.1f} MB")
+
+
+# ---------------------------------------------------------------------------
+# Baseline comparison
+# ---------------------------------------------------------------------------
+
+def load_baseline(path: Path, fleet_size: int) -> Dict[str, Dict[str, Any]]:
+    """Baseline results for a fleet size; empty if none were stored."""
+    if not path.exists():
+        return {}
+    with open(path) as f:
+        return json.load(f).get(str(fleet_size), {}).get("results", {})
+
+
+def save_baseline(path: Path, fleet_size: int, results: List[BenchmarkResult]) -> None:
+    """Store results as the baseline for a fleet size."""
+    data = {}
+    if path.exists():
+        with open(path) as f:
+            data = json.load(f)
+    data[str(fleet_size)] = {
+        "recorded_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": {r.name: r.to_dict() for r in results if r.available},
+        # Protocols without a baseline, and why
+        "skipped": {r.name: r.error for r in results if not r.available},
+    }
+    with open(path, "w") as f:
+        json.dump(data, f, indent=2, sort_keys=True)
+        f.write("\n")
+    print(f"💾 Baseline saved to {path}")
+
+
+def compare_with_baseline(
+    results: List[BenchmarkResult],
+    baseline: Dict[str, Dict[str, Any]],
+    tolerance: float
+) -> List[str]:
+    """
+    Compare results with a baseline.
+
+    Returns:
+        Descriptions of metrics that regressed by more than the tolerance
+    """
+    regressions = []
+    checks = [
+        # metric, higher is better
+        ("devices_per_second", True),
+        ("p99_ms", False),
+        ("peak_rss_mb", False),
+    ]
+
+    print("\n📈 Comparison with baseline")
+    for result in results:
+        previous = baseline.get(result.name)
+        if not result.available or not previous:
+            continue
+        if result.devices_found < previous.get("devices_found", 0):
+            regressions.append(
+                f"{result.name}: found {result.devices_found} devices, "
+                f"baseline {previous['devices_found']}"
+            )
+        for metric, higher_is_better in checks:
+            old, new = previous.get(metric, 0.0), getattr(result, metric)
+            if not old:
+                continue
+            change = (new - old) / old
+            regressed = change < -tolerance if higher_is_better else change > tolerance
+            marker = "❌" if regressed else "✅"
+            print(f"  {marker} {result.name:<13} {metric:<19} {old:>10.1f} -> {new:>10.1f} ({change:+.1%})")
+            if regressed:
+                regressions.append(f"{result.name}: {metric} {old:.1f} -> {new:.1f} ({change:+.1%})")
+
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Discovery benchmark against a simulated network")
+    parser.add_argument("--fleet-size", type=int, default=100, help="Number of simulated devices")
+    parser.add_argument("--base-address", default="127.77.0.0", help="First loopback alias subnet")
+    parser.add_argument("--iterations", type=int, default=3, help="Discovery runs per protocol")
+    parser.add_argument("--multicast-timeout", type=float, default=1.0,
+                        help="mDNS/SSDP collection window in seconds")
+    parser.add_argument("--snmp-port", type=int, default=1161, help="Port of the SNMP agent emulator")
+    parser.add_argument("--rate-limit-per-host", type=int, default=100)
+    parser.add_argument("--rate-limit-global", type=int, default=5000)
+    parser.add_argument("--protocols", nargs="+",
+                        default=["mdns", "ssdp", "network_scan", "snmp", "discover_all"])
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true", help="Store results as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=0.2,
+                        help="Allowed relative regression before failing")
+    parser.add_argument("--output", type=Path, help="Write results as JSON")
+    parser.add_argument("--log-level", default="ERROR")
+    args = parser.parse_args()
+
+    config = Config(
+        logging=LoggingConfig(level=args.log_level, format="console"),
+        discovery=DiscoveryConfig(
+            rate_limit_per_host=args.rate_limit_per_host,
+            rate_limit_global=args.rate_limit_global,
+        ),
+    )
+    setup_logging(config)
+
+    spec = FleetSpec(fleet_size=args.fleet_size, base_address=args.base_address,
+                     snmp_port=args.snmp_port)
+    benchmark = DiscoveryBenchmark(spec, config, iterations=args.iterations,
+                                   multicast_timeout=args.multicast_timeout)
+
+    print("🚀 Starting Discovery Benchmark Suite")
+    print("=" * 60)
+    results = asyncio.run(benchmark.run(args.protocols))
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump([r.to_dict() for r in results], f, indent=2)
+        print(f"\n📄 Results written to {args.output}")
+
+    if args.save_baseline:
+        save_baseline(args.baseline, args.fleet_size, results)
+        return 0
+
+    baseline = load_baseline(args.baseline, args.fleet_size)
+    if not baseline:
+        print(f"\nℹ️  No baseline for fleet size {args.fleet_size} in {args.baseline}")
+        return 0
+
+    regressions = compare_with_baseline(results, baseline, args.tolerance)
+    if regressions:
+        print("\n❌ Regressions detected:")
+        for regression in regressions:
+            print(f"  - {regression}")
+        return 1
+
+    print("\n🎉 No regressions against baseline")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
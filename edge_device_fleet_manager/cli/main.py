@@ -4,6 +4,8 @@ Main CLI entry point for Edge Device Fleet Manager.
 
 import asyncio
 import sys
+import uuid
+from datetime import timedelta
 from typing import Optional
 
 import click
@@ -14,9 +16,12 @@ from ..core.config import get_config, get_config_sync
 from ..core.context import app_context, async_context_manager, context_manager
 from ..core.logging import setup_logging, get_logger
 from ..core.plugins import initialize_plugin_system, shutdown_plugin_system
-from ..discovery import DiscoveryEngine, DeviceRegistry
+from ..discovery import DiscoveryEngine, DeviceRegistry, start_metrics_server
 from ..discovery.protocols import MDNSDiscovery, SSDPDiscovery, NetworkScanDiscovery
 from ..discovery.cache import DiscoveryCache
+from ..discovery.plugins import PluginManager
+from ..persistence.connection import DatabaseConfig, DatabaseManager
+from ..persistence.repositories import LatestTelemetryRepository, TelemetryRollupRepository
 from ..core.exceptions import EdgeFleetError
 
 # Install rich traceback handler
@@ -256,6 +261,11 @@ def discover(ctx: click.Context, protocols: tuple, networks: tuple,
         registry = DeviceRegistry()
         discovery_cache = DiscoveryCache(config.redis, config.discovery.cache_ttl)
         engine = DiscoveryEngine(config, registry)
+        # Active discovery plugins contribute device classification rules
+        plugin_manager = PluginManager([config.plugins.plugins_dir], enable_hot_reload=False)
+
+        if config.discovery.metrics_port:
+            start_metrics_server(config.discovery.metrics_port, config.discovery.metrics_address)
 
         # Register protocols
         if not protocols or 'mdns' in protocols:
@@ -263,7 +273,7 @@ def discover(ctx: click.Context, protocols: tuple, networks: tuple,
         if not protocols or 'ssdp' in protocols:
             engine.register_protocol(SSDPDiscovery(config))
         if not protocols or 'network_scan' in protocols:
-            engine.register_protocol(NetworkScanDiscovery(config))
+            engine.register_protocol(NetworkScanDiscovery(config, plugin_manager=plugin_manager))
 
         # Run discovery
         console.print("🔍 Starting device discovery...")
@@ -328,6 +338,90 @@ def devices(ctx: click.Context, output_format: str, filter_type: str,
         sys.exit(1)
 
 
+@cli.command('backfill-latest-telemetry')
+@click.option('--batch-size', default=500, type=int, show_default=True,
+              help='Devices processed per batch')
+@click.option('--pause', default=0.0, type=float, show_default=True,
+              help='Seconds to pause between batches')
+@click.option('--resume-from', type=click.UUID,
+              help='Device ID reported by an interrupted run')
+@click.pass_context
+def backfill_latest_telemetry(ctx: click.Context, batch_size: int, pause: float,
+                              resume_from: Optional[uuid.UUID]) -> None:
+    """Build the device latest-telemetry table from stored telemetry."""
+
+    def report(progress) -> None:
+        console.print(f"  {progress.devices} devices, {progress.rows} rows "
+                      f"(last device {progress.last_device_id})")
+
+    async def run():
+        # Connection settings come from DATABASE_URL and the DB_* variables
+        manager = DatabaseManager(DatabaseConfig.from_env())
+        await manager.initialize()
+        try:
+            async with manager.get_session() as session:
+                return await LatestTelemetryRepository(session).backfill(
+                    batch_size=batch_size, pause_seconds=pause,
+                    resume_from=resume_from, progress_callback=report
+                )
+        finally:
+            await manager.shutdown()
+
+    try:
+        console.print("📥 Backfilling latest telemetry values...")
+        progress = asyncio.run(run())
+        console.print(f"[green]Backfilled {progress.rows} latest values for "
+                      f"{progress.devices} devices in {progress.elapsed:.1f}s[/green]")
+
+    except Exception as e:
+        console.print(f"[red]Latest telemetry backfill failed: {e}[/red]")
+        logger.error("Latest telemetry backfill failed", error=str(e), exc_info=e)
+        sys.exit(1)
+
+
+@cli.command('refresh-telemetry-rollups')
+@click.option('--lag', default=30.0, type=float, show_default=True,
+              help='Seconds of recently received telemetry left for the next refresh')
+@click.option('--interval', default=0.0, type=float, show_default=True,
+              help='Seconds between refreshes; 0 refreshes once and exits')
+@click.pass_context
+def refresh_telemetry_rollups(ctx: click.Context, lag: float, interval: float) -> None:
+    """Fold newly received telemetry into the minute, hour and day rollups."""
+
+    def report(written) -> None:
+        rows = ", ".join(f"{resolution.value}={count}" for resolution, count in written.items())
+        console.print(f"  Rollup rows written: {rows or 'none, already up to date'}")
+
+    async def run() -> None:
+        # Connection settings come from DATABASE_URL and the DB_* variables
+        manager = DatabaseManager(DatabaseConfig.from_env())
+        await manager.initialize()
+        try:
+            while True:
+                async with manager.get_transaction() as session:
+                    report(await TelemetryRollupRepository(session).refresh(
+                        lag=timedelta(seconds=lag)
+                    ))
+                if interval <= 0:
+                    return
+                await asyncio.sleep(interval)
+        finally:
+            await manager.shutdown()
+
+    try:
+        console.print("📊 Refreshing telemetry rollups...")
+        asyncio.run(run())
+        console.print("[green]Telemetry rollups are up to date[/green]")
+
+    except KeyboardInterrupt:
+        console.print("[yellow]Telemetry rollup refresh stopped[/yellow]")
+
+    except Exception as e:
+        console.print(f"[red]Telemetry rollup refresh failed: {e}[/red]")
+        logger.error("Telemetry rollup refresh failed", error=str(e), exc_info=e)
+        sys.exit(1)
+
+
 @cli.command(hidden=True)
 @click.pass_context
 def debug_repl(ctx: click.Context) -> None:
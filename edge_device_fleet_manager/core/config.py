@@ -92,6 +92,10 @@ class DiscoveryConfig(BaseModel):
     rate_limit_per_host: int = 10
     rate_limit_global: int = 100
     cache_ttl: int = 300
+    snapshot_path: Optional[str] = None
+    snapshot_interval: int = 60
+    metrics_port: Optional[int] = None
+    metrics_address: str = "0.0.0.0"
 
 
 class Config(BaseSettings):
@@ -21,12 +21,16 @@ from .protocols import (
     NetworkScanDiscovery,
 )
 from .cache import DiscoveryCache
+from .classification import DeviceClassifier, PortSignature
+from .metrics import start_metrics_server
 from .rate_limiter import RateLimiter
+from .snapshot import RegistrySnapshotStore, RegistrySnapshotter
 from .exceptions import (
     DiscoveryError,
     DiscoveryTimeoutError,
     RateLimitExceededError,
     DeviceNotFoundError,
+    SnapshotError,
 )
 
 __all__ = [
@@ -46,11 +50,17 @@ __all__ = [
     
     # Supporting classes
     "DiscoveryCache",
+    "DeviceClassifier",
+    "PortSignature",
     "RateLimiter",
+    "RegistrySnapshotStore",
+    "RegistrySnapshotter",
+    "start_metrics_server",
     
     # Exceptions
     "DiscoveryError",
     "DiscoveryTimeoutError",
     "RateLimitExceededError",
     "DeviceNotFoundError",
+    "SnapshotError",
 ]
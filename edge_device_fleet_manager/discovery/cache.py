@@ -16,8 +16,9 @@ try:
 except ImportError:
     REDIS_AVAILABLE = False
 
-from .core import Device, DeviceStatus, DeviceType
+from .core import Device
 from .exceptions import CacheError
+from .metrics import get_cache_metrics
 from ..core.logging import get_logger
 
 logger = get_logger(__name__)
@@ -175,6 +176,8 @@ class DiscoveryCache:
             self.cache = MemoryCache(default_ttl)
             self.backend = "memory"
             self.logger.info("Using memory cache backend")
+        
+        self.metrics = get_cache_metrics(self.backend)
     
     def _device_key(self, device_id: str) -> str:
         """Generate cache key for device."""
@@ -211,6 +214,7 @@ class DiscoveryCache:
         try:
             device_key = self._device_key(device_id)
             device_data = await self.cache.get(device_key)
+            self.metrics.record(device_data is not None)
             
             if device_data:
                 data = json.loads(device_data)
@@ -226,6 +230,7 @@ class DiscoveryCache:
         try:
             ip_key = self._ip_key(ip_address)
             device_id = await self.cache.get(ip_key)
+            self.metrics.record(device_id is not None)
             
             if device_id:
                 return await self.get_device(device_id)
@@ -274,6 +279,7 @@ class DiscoveryCache:
         try:
             discovery_key = self._discovery_key(protocol)
             result_data = await self.cache.get(discovery_key)
+            self.metrics.record(result_data is not None)
             
             if result_data:
                 return json.loads(result_data)
@@ -307,26 +313,4 @@ class DiscoveryCache:
     
     def _dict_to_device(self, data: Dict[str, Any]) -> Device:
         """Convert dictionary to Device object."""
-        # Parse datetime fields
-        discovery_time = datetime.fromisoformat(data['discovery_time'].replace('Z', '+00:00'))
-        last_seen = datetime.fromisoformat(data['last_seen'].replace('Z', '+00:00'))
-        
-        return Device(
-            device_id=data['device_id'],
-            name=data.get('name'),
-            device_type=DeviceType(data['device_type']),
-            ip_address=data['ip_address'],
-            mac_address=data.get('mac_address'),
-            hostname=data.get('hostname'),
-            ports=data.get('ports', []),
-            discovery_protocol=data['discovery_protocol'],
-            discovery_time=discovery_time,
-            last_seen=last_seen,
-            status=DeviceStatus(data['status']),
-            manufacturer=data.get('manufacturer'),
-            model=data.get('model'),
-            firmware_version=data.get('firmware_version'),
-            services=data.get('services', []),
-            capabilities=data.get('capabilities', {}),
-            metadata=data.get('metadata', {})
-        )
+        return Device.from_dict(data)
@@ -0,0 +1,324 @@
+"""
+Port-signature device classification.
+
+Device types are inferred from the open ports and service names found by a
+scan. Signatures are compiled once into two dense matrices over a shared
+feature vocabulary (ports from ``PortScanner.COMMON_PORTS``/``IOT_PORTS`` and
+every signature, plus lowercase service hints). Hosts are encoded as bitmap
+rows over the same vocabulary, so a whole sweep is matched with a few matrix
+products instead of a chain of per-host set checks.
+
+Signatures are evaluated in order: a host takes the type of the first
+signature it satisfies, which mirrors an if/elif rule chain. Confidence is the
+winning signature's base confidence scaled by the share of matching
+signatures that agree with that type. A matching signature of another type
+only counts against the winner if it relies on evidence the winner does not
+already explain, so a router is not penalised for also looking like a
+managed switch.
+"""
+
+import re
+from dataclasses import dataclass
+from itertools import chain
+from typing import Dict, FrozenSet, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from ..core.logging import get_logger
+from .core import Device, DeviceType
+
+HostFeatures = Tuple[Sequence[int], Sequence[str]]
+
+
+@dataclass(frozen=True)
+class PortSignature:
+    """
+    A device type rule over open ports and service hints.
+
+    A host satisfies the signature when every port in ``all_ports`` is open,
+    at least one port in ``any_ports`` is open (if any are given) and every
+    hint in ``hints`` is a substring of the host's lowercased service names.
+    """
+    device_type: DeviceType
+    all_ports: FrozenSet[int] = frozenset()
+    any_ports: FrozenSet[int] = frozenset()
+    hints: FrozenSet[str] = frozenset()
+    confidence: float = 0.7
+    name: str = ""
+
+    def __post_init__(self):
+        object.__setattr__(self, "all_ports", frozenset(self.all_ports))
+        object.__setattr__(self, "any_ports", frozenset(self.any_ports))
+        object.__setattr__(self, "hints", frozenset(h.lower() for h in self.hints))
+
+        if not (self.all_ports or self.any_ports or self.hints):
+            raise ValueError("Signature must have at least one port or hint condition")
+        if not 0.0 < self.confidence <= 1.0:
+            raise ValueError("Signature confidence must be in (0, 1]")
+        if not self.name:
+            object.__setattr__(self, "name", self.device_type.value)
+
+
+# Built-in rules, in precedence order
+DEFAULT_SIGNATURES: List[PortSignature] = [
+    PortSignature(DeviceType.ROUTER, all_ports={80, 443}, any_ports={22, 23},
+                  confidence=0.85, name="router"),
+    PortSignature(DeviceType.PRINTER, any_ports={631, 9100, 515},
+                  confidence=0.9, name="printer_ports"),
+    PortSignature(DeviceType.PRINTER, hints={"printer"},
+                  confidence=0.8, name="printer_service"),
+    PortSignature(DeviceType.MEDIA_SERVER, any_ports={8080, 8200, 32400},
+                  confidence=0.6, name="media_ports"),
+    PortSignature(DeviceType.MEDIA_SERVER, hints={"media"},
+                  confidence=0.7, name="media_service"),
+    PortSignature(DeviceType.IOT_GATEWAY, all_ports={1883},
+                  confidence=0.8, name="mqtt_port"),
+    PortSignature(DeviceType.IOT_GATEWAY, hints={"mqtt"},
+                  confidence=0.8, name="mqtt_service"),
+    PortSignature(DeviceType.CAMERA, any_ports={554, 8000, 8080}, hints={"http"},
+                  confidence=0.75, name="camera"),
+    PortSignature(DeviceType.SWITCH, all_ports={161},
+                  confidence=0.6, name="snmp"),
+    PortSignature(DeviceType.SWITCH, all_ports={22, 80},
+                  confidence=0.5, name="managed_switch"),
+    PortSignature(DeviceType.IOT_SENSOR, any_ports={5683, 8883, 5353},
+                  confidence=0.6, name="iot_ports"),
+]
+
+
+class DeviceClassifier:
+    """Classifies hosts by matching port/hint bitmaps against compiled signatures."""
+
+    def __init__(
+        self,
+        signatures: Optional[Iterable[PortSignature]] = None,
+        base_ports: Optional[Iterable[int]] = None,
+        batch_size: int = 65536
+    ):
+        """
+        Initialize classifier.
+
+        Args:
+            signatures: Built-in signatures; DEFAULT_SIGNATURES when omitted
+            base_ports: Extra ports to include in the bitmap vocabulary
+            batch_size: Hosts encoded per matrix block, bounding memory use
+        """
+        self.signatures = list(DEFAULT_SIGNATURES if signatures is None else signatures)
+        self.registered_signatures: List[PortSignature] = []
+        self.base_ports = frozenset(base_ports or ())
+        self.batch_size = batch_size
+        self.logger = get_logger(__name__)
+        self._compiled = False
+
+    def register_signatures(self, signatures: Iterable[PortSignature]) -> None:
+        """
+        Register additional signatures, e.g. rules supplied by plugins.
+
+        Registered signatures take precedence over the built-in ones.
+        """
+        self.registered_signatures.extend(signatures)
+        self._compiled = False
+
+    def clear_registered_signatures(self) -> None:
+        """Remove all registered signatures."""
+        self.registered_signatures.clear()
+        self._compiled = False
+
+    @property
+    def active_signatures(self) -> List[PortSignature]:
+        """Signatures in evaluation order."""
+        return self.registered_signatures + self.signatures
+
+    def compile(self) -> None:
+        """Build the feature vocabulary and signature matrices."""
+        signatures = self.active_signatures
+
+        ports = set(self.base_ports)
+        hints = set()
+        for signature in signatures:
+            ports |= signature.all_ports | signature.any_ports
+            hints |= signature.hints
+
+        self._port_vocab = np.array(sorted(ports), dtype=np.int64)
+        self._hint_vocab = sorted(hints)
+        hint_columns = {
+            hint: len(self._port_vocab) + i for i, hint in enumerate(self._hint_vocab)
+        }
+        port_columns = {int(port): i for i, port in enumerate(self._port_vocab)}
+        n_features = len(self._port_vocab) + len(self._hint_vocab)
+
+        self._types: List[DeviceType] = []
+        type_index: Dict[DeviceType, int] = {}
+        all_matrix = np.zeros((len(signatures), n_features), dtype=np.float32)
+        any_matrix = np.zeros((len(signatures), n_features), dtype=np.float32)
+        signature_types = np.zeros(len(signatures), dtype=np.int64)
+
+        for row, signature in enumerate(signatures):
+            for port in signature.all_ports:
+                all_matrix[row, port_columns[port]] = 1.0
+            for hint in signature.hints:
+                all_matrix[row, hint_columns[hint]] = 1.0
+            for port in signature.any_ports:
+                any_matrix[row, port_columns[port]] = 1.0
+            if signature.device_type not in type_index:
+                type_index[signature.device_type] = len(self._types)
+                self._types.append(signature.device_type)
+            signature_types[row] = type_index[signature.device_type]
+
+        self._all_matrix_t = all_matrix.T.copy()
+        self._any_matrix_t = any_matrix.T.copy()
+        self._feature_matrix = ((all_matrix + any_matrix) > 0).astype(np.float32)
+        self._feature_matrix_t = self._feature_matrix.T.copy()
+        self._all_counts = all_matrix.sum(axis=1)
+        self._any_required = any_matrix.sum(axis=1) > 0
+        self._signature_types = signature_types
+        self._type_onehot = np.zeros((len(signatures), len(self._types)), dtype=np.float32)
+        self._type_onehot[np.arange(len(signatures)), signature_types] = 1.0
+        self._confidences = np.array([s.confidence for s in signatures], dtype=np.float32)
+        self._type_lookup = np.array(
+            [s.device_type for s in signatures] + [DeviceType.UNKNOWN], dtype=object
+        )
+        self._n_features = n_features
+        self._compiled = True
+
+        self.logger.debug(
+            "Compiled classification signatures",
+            signatures=len(signatures),
+            ports=len(self._port_vocab),
+            hints=len(self._hint_vocab)
+        )
+
+    def encode(self, hosts: Sequence[HostFeatures]) -> np.ndarray:
+        """
+        Encode hosts as feature bitmap rows.
+
+        Args:
+            hosts: (open ports, service names) per host
+
+        Returns:
+            Array of shape (len(hosts), n_features); ports outside the
+            vocabulary are ignored
+        """
+        if not self._compiled:
+            self.compile()
+
+        n_hosts = len(hosts)
+        bitmap = np.zeros((n_hosts, self._n_features), dtype=np.float32)
+        if n_hosts == 0:
+            return bitmap
+
+        if len(self._port_vocab):
+            port_lists = [h[0] for h in hosts]
+            counts = np.fromiter(map(len, port_lists), dtype=np.int64, count=n_hosts)
+            total = int(counts.sum())
+            if total:
+                flat_ports = np.fromiter(
+                    chain.from_iterable(port_lists), dtype=np.int64, count=total
+                )
+                rows = np.repeat(np.arange(n_hosts), counts)
+                columns = np.searchsorted(self._port_vocab, flat_ports)
+                columns[columns == len(self._port_vocab)] = 0
+                known = self._port_vocab[columns] == flat_ports
+                bitmap[rows[known], columns[known]] = 1.0
+
+        if self._hint_vocab:
+            # Search each hint once over all hosts' service text, then map
+            # match offsets back to host rows
+            texts = [" ".join(h[1]) for h in hosts]
+            text = "\n".join(texts).lower()
+            ends = np.cumsum(np.fromiter(map(len, texts), dtype=np.int64, count=n_hosts) + 1)
+            offset = len(self._port_vocab)
+            for i, hint in enumerate(self._hint_vocab):
+                positions = np.fromiter(
+                    (m.start() for m in re.finditer(re.escape(hint), text)), dtype=np.int64
+                )
+                if len(positions):
+                    bitmap[np.searchsorted(ends, positions, side="right"), offset + i] = 1.0
+
+        return bitmap
+
+    def match(self, bitmap: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Match encoded hosts against the compiled signatures.
+
+        Args:
+            bitmap: Output of encode()
+
+        Returns:
+            (signature index per host, or -1 if none matched; confidence per host)
+        """
+        if not self._compiled:
+            self.compile()
+
+        n_hosts = bitmap.shape[0]
+        if n_hosts == 0 or not len(self._confidences):
+            return np.full(n_hosts, -1, dtype=np.int64), np.zeros(n_hosts, dtype=np.float32)
+
+        all_ok = (bitmap @ self._all_matrix_t) >= self._all_counts
+        any_ok = ~self._any_required | ((bitmap @ self._any_matrix_t) > 0)
+        matched = all_ok & any_ok
+
+        rows = np.arange(n_hosts)
+        winner = matched.argmax(axis=1)
+        has_match = matched[rows, winner]
+
+        # Matches of another type count only if they use evidence the winner does not
+        winner_types = self._signature_types[winner]
+        residual = bitmap * (1.0 - self._feature_matrix[winner])
+        independent = (residual @ self._feature_matrix_t) > 0
+        same_type = self._signature_types == winner_types[:, None]
+        counted = matched & (independent | same_type)
+
+        weights = counted * self._confidences
+        type_weights = weights @ self._type_onehot
+        agreeing = type_weights[rows, winner_types]
+        total = weights.sum(axis=1)
+        ratio = np.divide(agreeing, total, out=np.zeros_like(total), where=total > 0)
+
+        confidence = np.where(has_match, self._confidences[winner] * ratio, 0.0)
+        return np.where(has_match, winner, -1), confidence.astype(np.float32)
+
+    def classify(self, hosts: Sequence[HostFeatures]) -> Tuple[List[DeviceType], List[float]]:
+        """
+        Classify hosts in vectorised batches.
+
+        Results are returned as parallel lists rather than per-host tuples,
+        which keeps allocation (and garbage collector work) flat for large
+        sweeps.
+
+        Args:
+            hosts: (open ports, service names) per host
+
+        Returns:
+            (device types, confidences); UNKNOWN with 0.0 where nothing matched
+        """
+        if not self._compiled:
+            self.compile()
+
+        device_types: List[DeviceType] = []
+        confidences: List[float] = []
+        for start in range(0, len(hosts), self.batch_size):
+            batch = hosts[start:start + self.batch_size]
+            winners, batch_confidences = self.match(self.encode(batch))
+            # Index -1 selects the trailing UNKNOWN entry
+            device_types.extend(self._type_lookup[winners].tolist())
+            confidences.extend(batch_confidences.tolist())
+        return device_types, confidences
+
+    def classify_one(self, ports: Sequence[int], services: Sequence[str]) -> Tuple[DeviceType, float]:
+        """Classify a single host."""
+        device_types, confidences = self.classify([(ports, services)])
+        return device_types[0], confidences[0]
+
+    def classify_devices(self, devices: Sequence[Device]) -> None:
+        """
+        Set device_type and classification confidence on devices in place.
+
+        The confidence is stored as ``metadata['classification_confidence']``.
+        """
+        device_types, confidences = self.classify(
+            [(device.ports, device.services) for device in devices]
+        )
+        for device, device_type, confidence in zip(devices, device_types, confidences):
+            device.device_type = device_type
+            device.metadata['classification_confidence'] = round(confidence, 3)
@@ -11,10 +11,14 @@ from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from enum import Enum
-from typing import Dict, List, Optional, Set, Any, AsyncIterator, Callable
+from typing import TYPE_CHECKING, Dict, List, Optional, Set, Any, AsyncIterator, Callable, Iterable, Tuple
 from uuid import uuid4
 
 from ..core.logging import get_logger
+from .metrics import REGISTRY_DEVICES, ProtocolMetrics
+
+if TYPE_CHECKING:
+    from .snapshot import RegistrySnapshotter
 
 logger = get_logger(__name__)
 
@@ -73,10 +77,14 @@ class Device:
     # Additional metadata
     metadata: Dict[str, Any] = field(default_factory=dict)
     
+    # False for entries restored from a snapshot until a sweep sees them again
+    verified: bool = True
+    
     def update_last_seen(self) -> None:
         """Update the last seen timestamp."""
         self.last_seen = datetime.now(timezone.utc)
         self.status = DeviceStatus.ONLINE
+        self.verified = True
     
     def is_stale(self, ttl_seconds: int = 300) -> bool:
         """Check if device information is stale."""
@@ -103,7 +111,36 @@ class Device:
             "services": self.services,
             "capabilities": self.capabilities,
             "metadata": self.metadata,
+            "verified": self.verified,
         }
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'Device':
+        """Create a device from its dictionary representation."""
+        # Parse datetime fields
+        discovery_time = datetime.fromisoformat(data['discovery_time'].replace('Z', '+00:00'))
+        last_seen = datetime.fromisoformat(data['last_seen'].replace('Z', '+00:00'))
+        
+        return cls(
+            device_id=data['device_id'],
+            name=data.get('name'),
+            device_type=DeviceType(data['device_type']),
+            ip_address=data['ip_address'],
+            mac_address=data.get('mac_address'),
+            hostname=data.get('hostname'),
+            ports=data.get('ports', []),
+            discovery_protocol=data['discovery_protocol'],
+            discovery_time=discovery_time,
+            last_seen=last_seen,
+            status=DeviceStatus(data['status']),
+            manufacturer=data.get('manufacturer'),
+            model=data.get('model'),
+            firmware_version=data.get('firmware_version'),
+            services=data.get('services', []),
+            capabilities=data.get('capabilities', {}),
+            metadata=data.get('metadata', {}),
+            verified=data.get('verified', True)
+        )
 
 
 @dataclass
@@ -132,6 +169,7 @@ class DiscoveryProtocol(ABC):
     def __init__(self, name: str):
         self.name = name
         self.logger = get_logger(f"{__name__}.{name}")
+        self.metrics = ProtocolMetrics(name)
     
     @abstractmethod
     async def discover(self, **kwargs) -> DiscoveryResult:
@@ -156,6 +194,10 @@ class DeviceRegistry:
         self._ip_to_device: Dict[str, str] = {}  # IP -> device_id mapping
         self._lock = asyncio.Lock()
         self.logger = get_logger(__name__)
+        
+        # Change tracking for incremental snapshots
+        self._dirty_ids: Set[str] = set()
+        self._removed_ids: Set[str] = set()
     
     async def add_device(self, device: Device) -> bool:
         """Add or update a device in the registry."""
@@ -182,6 +224,7 @@ class DeviceRegistry:
                 # Update capabilities and metadata
                 existing_device.capabilities.update(device.capabilities)
                 existing_device.metadata.update(device.metadata)
+                self._dirty_ids.add(existing_id)
                 
                 self.logger.debug("Updated existing device", device_id=existing_id, ip=device.ip_address)
                 return False  # Not a new device
@@ -189,6 +232,9 @@ class DeviceRegistry:
                 # Add new device
                 self._devices[device.device_id] = device
                 self._ip_to_device[device.ip_address] = device.device_id
+                self._dirty_ids.add(device.device_id)
+                self._removed_ids.discard(device.device_id)
+                REGISTRY_DEVICES.set(len(self._devices))
                 
                 self.logger.info("Added new device", device_id=device.device_id, ip=device.ip_address)
                 return True  # New device added
@@ -219,6 +265,8 @@ class DeviceRegistry:
                 del self._devices[device_id]
                 if device.ip_address in self._ip_to_device:
                     del self._ip_to_device[device.ip_address]
+                self._mark_removed(device_id)
+                REGISTRY_DEVICES.set(len(self._devices))
                 self.logger.info("Removed device", device_id=device_id)
                 return True
             return False
@@ -236,8 +284,10 @@ class DeviceRegistry:
                 del self._devices[device_id]
                 if device.ip_address in self._ip_to_device:
                     del self._ip_to_device[device.ip_address]
+                self._mark_removed(device_id)
             
             if stale_devices:
+                REGISTRY_DEVICES.set(len(self._devices))
                 self.logger.info("Cleaned up stale devices", count=len(stale_devices))
             
             return len(stale_devices)
@@ -246,10 +296,66 @@ class DeviceRegistry:
         """Get the total number of devices."""
         async with self._lock:
             return len(self._devices)
+    
+    async def get_unverified_devices(self) -> List[Device]:
+        """Get devices restored from a snapshot that no sweep has confirmed yet."""
+        async with self._lock:
+            return [device for device in self._devices.values() if not device.verified]
+    
+    async def restore_devices(self, devices: Iterable[Device]) -> int:
+        """
+        Seed the registry with previously persisted devices.
+        
+        Restored devices are marked unverified with unknown status; the next
+        sweep that sees a device confirms it through add_device(). Devices
+        already present in the registry take precedence.
+        """
+        restored = 0
+        async with self._lock:
+            for device in devices:
+                if device.device_id in self._devices or device.ip_address in self._ip_to_device:
+                    continue
+                device.verified = False
+                device.status = DeviceStatus.UNKNOWN
+                self._devices[device.device_id] = device
+                self._ip_to_device[device.ip_address] = device.device_id
+                restored += 1
+            REGISTRY_DEVICES.set(len(self._devices))
+        
+        self.logger.info("Restored devices from snapshot", count=restored)
+        return restored
+    
+    async def drain_changes(self) -> Tuple[List[Device], Set[str]]:
+        """
+        Return devices changed and IDs removed since the previous drain.
+        
+        Returns:
+            Tuple of (changed devices, removed device IDs)
+        """
+        async with self._lock:
+            changed = [
+                self._devices[device_id] for device_id in self._dirty_ids
+                if device_id in self._devices
+            ]
+            removed = self._removed_ids
+            self._dirty_ids = set()
+            self._removed_ids = set()
+            return changed, removed
+    
+    def _mark_removed(self, device_id: str) -> None:
+        """Record a removal for change tracking; caller holds the lock."""
+        self._dirty_ids.discard(device_id)
+        self._removed_ids.add(device_id)
 
 
 class DiscoveryEngine:
-    """Main discovery engine that coordinates multiple protocols."""
+    """
+    Main discovery engine that coordinates multiple protocols.
+    
+    With ``discovery.snapshot_path`` configured, ``start`` restores the
+    registry from the last snapshot before the first sweep and snapshots it
+    periodically; ``stop`` writes a final snapshot.
+    """
     
     def __init__(self, config, registry: Optional[DeviceRegistry] = None):
         self.config = config
@@ -258,6 +364,35 @@ class DiscoveryEngine:
         self.logger = get_logger(__name__)
         self._running = False
         self._discovery_tasks: Set[asyncio.Task] = set()
+        self.metrics = ProtocolMetrics("all")
+        self.snapshotter: Optional['RegistrySnapshotter'] = None
+    
+    async def start(self) -> None:
+        """Start the engine, warm-starting the registry from its snapshot if configured."""
+        if self._running:
+            return
+        
+        # snapshot imports this module
+        from .snapshot import RegistrySnapshotter
+        
+        self.snapshotter = RegistrySnapshotter.from_config(self.registry, self.config)
+        if self.snapshotter is not None:
+            await self.snapshotter.restore()
+            await self.snapshotter.start()
+        
+        self._running = True
+        self.logger.info("Discovery engine started", snapshots=self.snapshotter is not None)
+    
+    async def stop(self) -> None:
+        """Stop the engine, flushing the registry snapshot."""
+        if not self._running:
+            return
+        
+        self._running = False
+        if self.snapshotter is not None:
+            await self.snapshotter.stop(final_snapshot=True)
+        
+        self.logger.info("Discovery engine stopped")
     
     def register_protocol(self, protocol: DiscoveryProtocol) -> None:
         """Register a discovery protocol."""
@@ -285,6 +420,7 @@ class DiscoveryEngine:
         for protocol_name, task in tasks:
             try:
                 protocol_result = await task
+                self.protocols[protocol_name].metrics.observe_result(protocol_result)
                 result.devices.extend(protocol_result.devices)
                 
                 # Add devices to registry
@@ -299,6 +435,7 @@ class DiscoveryEngine:
                 )
                 
             except Exception as e:
+                self.protocols[protocol_name].metrics.failed.inc()
                 self.logger.error(
                     "Protocol discovery failed",
                     protocol=protocol_name,
@@ -309,6 +446,7 @@ class DiscoveryEngine:
         result.duration = time.time() - start_time
         result.metadata["total_protocols"] = len(protocols)
         result.metadata["successful_protocols"] = len([t for _, t in tasks if not t.exception()])
+        self.metrics.observe_result(result)
         
         self.logger.info(
             "Discovery completed",
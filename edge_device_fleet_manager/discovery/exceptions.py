@@ -45,3 +45,8 @@ class InvalidDeviceError(DiscoveryError):
 class CacheError(DiscoveryError):
     """Raised when cache operations fail."""
     pass
+
+
+class SnapshotError(DiscoveryError):
+    """Raised when registry snapshot persistence fails."""
+    pass
@@ -0,0 +1,176 @@
+"""
+Prometheus metrics for the discovery system.
+
+Collectors are registered once, on the default registry, when this module is
+imported. Components bind the label children they use when they are
+constructed, so instrumented hot paths (probe sends, response parsing, rate
+limiter waits, cache lookups) pay for a single increment or observation
+rather than a label lookup.
+"""
+
+from typing import Dict
+
+from prometheus_client import Counter, Gauge, Histogram, start_http_server
+
+from ..core.logging import get_logger
+
+logger = get_logger(__name__)
+
+DURATION_BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+WAIT_BUCKETS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0)
+
+DISCOVERY_DURATION = Histogram(
+    "edge_discovery_duration_seconds",
+    "Duration of discovery runs",
+    ["protocol"],
+    buckets=DURATION_BUCKETS,
+)
+DISCOVERY_RUNS = Counter(
+    "edge_discovery_runs_total",
+    "Discovery runs by outcome",
+    ["protocol", "outcome"],
+)
+DEVICES_DISCOVERED = Counter(
+    "edge_discovery_devices_discovered_total",
+    "Devices reported by discovery runs",
+    ["protocol"],
+)
+PROBES_SENT = Counter(
+    "edge_discovery_probes_sent_total",
+    "Probes sent (multicast queries, TCP connects, SNMP requests)",
+    ["protocol"],
+)
+RESPONSES_PARSED = Counter(
+    "edge_discovery_responses_parsed_total",
+    "Responses received, by parse result",
+    ["protocol", "result"],
+)
+RATE_LIMITER_WAIT = Histogram(
+    "edge_discovery_rate_limiter_wait_seconds",
+    "Time spent waiting for rate limiter permission",
+    buckets=WAIT_BUCKETS,
+)
+RATE_LIMITER_REJECTIONS = Counter(
+    "edge_discovery_rate_limiter_rejections_total",
+    "Requests rejected by the rate limiter",
+    ["scope"],
+)
+CACHE_REQUESTS = Counter(
+    "edge_discovery_cache_requests_total",
+    "Discovery cache lookups",
+    ["backend", "result"],
+)
+CACHE_HIT_RATIO = Gauge(
+    "edge_discovery_cache_hit_ratio",
+    "Discovery cache hit ratio since process start",
+    ["backend"],
+)
+REGISTRY_DEVICES = Gauge(
+    "edge_discovery_registry_devices",
+    "Devices held in the device registry",
+)
+SCHEDULER_JOBS = Counter(
+    "edge_discovery_scheduler_jobs_total",
+    "Scheduler jobs by lifecycle event",
+    ["event"],
+)
+SCHEDULER_JOB_DURATION = Histogram(
+    "edge_discovery_scheduler_job_duration_seconds",
+    "Duration of completed scheduler jobs",
+    buckets=DURATION_BUCKETS,
+)
+SCHEDULER_RUNNING_JOBS = Gauge(
+    "edge_discovery_scheduler_running_jobs",
+    "Scheduler jobs currently running",
+)
+SCHEDULER_QUEUE_SIZE = Gauge(
+    "edge_discovery_scheduler_queue_size",
+    "Scheduler jobs waiting in the queue",
+)
+
+# Children for unlabelled call sites that have no owning instance
+RATE_LIMITER_GLOBAL_REJECTIONS = RATE_LIMITER_REJECTIONS.labels(scope="global")
+RATE_LIMITER_HOST_REJECTIONS = RATE_LIMITER_REJECTIONS.labels(scope="host")
+
+
+class ProtocolMetrics:
+    """Pre-bound metric children for one discovery protocol."""
+
+    __slots__ = ("protocol", "duration", "succeeded", "failed", "devices",
+                 "probes", "parsed", "rejected")
+
+    def __init__(self, protocol: str):
+        self.protocol = protocol
+        self.duration = DISCOVERY_DURATION.labels(protocol=protocol)
+        self.succeeded = DISCOVERY_RUNS.labels(protocol=protocol, outcome="success")
+        self.failed = DISCOVERY_RUNS.labels(protocol=protocol, outcome="failure")
+        self.devices = DEVICES_DISCOVERED.labels(protocol=protocol)
+        self.probes = PROBES_SENT.labels(protocol=protocol)
+        self.parsed = RESPONSES_PARSED.labels(protocol=protocol, result="parsed")
+        self.rejected = RESPONSES_PARSED.labels(protocol=protocol, result="rejected")
+
+    def observe_result(self, result) -> None:
+        """Record the duration, outcome and device count of a DiscoveryResult."""
+        self.duration.observe(result.duration)
+        (self.succeeded if result.success else self.failed).inc()
+        self.devices.inc(len(result.devices))
+
+    def response(self, parsed: bool) -> None:
+        """Count a received response."""
+        (self.parsed if parsed else self.rejected).inc()
+
+
+class CacheMetrics:
+    """Pre-bound metric children for one cache backend."""
+
+    __slots__ = ("backend", "hits", "misses", "ratio", "_hits", "_lookups")
+
+    def __init__(self, backend: str):
+        self.backend = backend
+        self.hits = CACHE_REQUESTS.labels(backend=backend, result="hit")
+        self.misses = CACHE_REQUESTS.labels(backend=backend, result="miss")
+        self.ratio = CACHE_HIT_RATIO.labels(backend=backend)
+        self._hits = 0
+        self._lookups = 0
+
+    def record(self, hit: bool) -> None:
+        """Count a lookup and refresh the hit ratio."""
+        self._lookups += 1
+        if hit:
+            self._hits += 1
+            self.hits.inc()
+        else:
+            self.misses.inc()
+        self.ratio.set(self._hits / self._lookups)
+
+
+_cache_metrics: Dict[str, CacheMetrics] = {}
+_servers: Dict[int, str] = {}
+
+
+def get_cache_metrics(backend: str) -> CacheMetrics:
+    """Shared CacheMetrics for a backend, so the hit ratio spans all cache instances."""
+    metrics = _cache_metrics.get(backend)
+    if metrics is None:
+        metrics = _cache_metrics[backend] = CacheMetrics(backend)
+    return metrics
+
+
+def start_metrics_server(port: int = 9090, addr: str = "0.0.0.0") -> bool:
+    """
+    Serve the default registry at http://<addr>:<port>/metrics.
+
+    The server runs on a daemon thread. Calling this again for a port that is
+    already being served is a no-op.
+
+    Returns:
+        True if a server was started by this call
+    """
+    if port in _servers:
+        return False
+
+    start_http_server(port, addr=addr)
+    _servers[port] = addr
+    logger.info("Metrics endpoint started", address=addr, port=port, path="/metrics")
+    return True
+
@@ -14,6 +14,7 @@ from typing import Dict, List, Optional, Any, Set, Callable, Union
 from uuid import uuid4
 
 from ...core.logging import get_logger
+from ..classification import PortSignature
 from ..core import DiscoveryResult, Device
 
 
@@ -198,6 +199,15 @@ class DiscoveryPlugin(ABC):
             }
         }
     
+    def get_classification_rules(self) -> List[PortSignature]:
+        """
+        Get port signatures this plugin contributes to device classification.
+        
+        Returns:
+            List[PortSignature]: Signatures, empty by default
+        """
+        return []
+    
     def register_hook(self, event: str, callback: Callable) -> None:
         """
         Register a hook for plugin events.
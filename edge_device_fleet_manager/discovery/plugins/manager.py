@@ -11,6 +11,7 @@ This module provides comprehensive plugin management including:
 """
 
 import asyncio
+import hashlib
 import importlib
 import importlib.util
 import os
@@ -28,6 +29,7 @@ except ImportError:
 import inspect
 
 from ...core.logging import get_logger
+from ..classification import PortSignature
 from .base import DiscoveryPlugin, PluginConfig, PluginStatus, PluginMetadata, PluginError
 
 
@@ -59,8 +61,18 @@ class PluginRegistry:
             
             self.logger.info("Registered plugin class", plugin=name, version=metadata.version)
     
-    async def create_plugin_instance(self, name: str, config: PluginConfig) -> DiscoveryPlugin:
-        """Create a plugin instance from registered class."""
+    async def create_plugin_instance(
+        self,
+        name: str,
+        config: PluginConfig,
+        register: bool = True
+    ) -> DiscoveryPlugin:
+        """
+        Create a plugin instance from registered class.
+        
+        With ``register=False`` the instance is built but not published, so
+        it can be prepared off to the side and installed with swap_plugin().
+        """
         async with self._lock:
             if name not in self._plugin_classes:
                 raise PluginError(name, "Plugin class not registered")
@@ -69,9 +81,17 @@ class PluginRegistry:
             plugin = plugin_class(config)
             plugin.metadata = self._metadata[name]
             
-            self._plugins[name] = plugin
+            if register:
+                self._plugins[name] = plugin
             return plugin
     
+    async def swap_plugin(self, name: str, plugin: DiscoveryPlugin) -> Optional[DiscoveryPlugin]:
+        """Atomically replace the instance registered under a name, returning the previous one."""
+        async with self._lock:
+            previous = self._plugins.get(name)
+            self._plugins[name] = plugin
+            return previous
+    
     async def get_plugin(self, name: str) -> Optional[DiscoveryPlugin]:
         """Get plugin instance by name."""
         async with self._lock:
@@ -143,9 +163,32 @@ class PluginLoader:
         self.plugin_directories = [Path(d) for d in plugin_directories]
         self.logger = get_logger(__name__)
         self._loaded_modules: Dict[str, Any] = {}
+        self._file_hashes: Dict[str, str] = {}
+        self._file_classes: Dict[str, List[Type[DiscoveryPlugin]]] = {}
+    
+    @staticmethod
+    def compute_file_hash(file_path: Path) -> Optional[str]:
+        """Compute the SHA-256 digest of a plugin source file."""
+        try:
+            with open(file_path, "rb") as f:
+                return hashlib.sha256(f.read()).hexdigest()
+        except OSError:
+            return None
+    
+    def has_changed(self, file_path: Path) -> bool:
+        """Check whether a plugin file's source differs from the last import."""
+        current_hash = self.compute_file_hash(file_path)
+        if current_hash is None:
+            return False
+        return self._file_hashes.get(str(file_path)) != current_hash
     
     async def discover_plugins(self) -> List[Type[DiscoveryPlugin]]:
-        """Discover plugin classes in plugin directories."""
+        """
+        Discover plugin classes in plugin directories.
+        
+        Files whose source is unchanged since they were last imported are
+        not re-executed; their previously discovered classes are reused.
+        """
         plugin_classes = []
         
         for plugin_dir in self.plugin_directories:
@@ -163,6 +206,10 @@ class PluginLoader:
                     continue
                 
                 try:
+                    if not self.has_changed(py_file) and str(py_file) in self._file_classes:
+                        plugin_classes.extend(self._file_classes[str(py_file)])
+                        continue
+                    
                     classes = await self._load_plugin_file(py_file)
                     plugin_classes.extend(classes)
                 except Exception as e:
@@ -178,6 +225,7 @@ class PluginLoader:
     async def _load_plugin_file(self, file_path: Path) -> List[Type[DiscoveryPlugin]]:
         """Load plugin classes from a Python file."""
         module_name = f"plugin_{file_path.stem}_{id(file_path)}"
+        source_hash = self.compute_file_hash(file_path)
         
         # Load module
         spec = importlib.util.spec_from_file_location(module_name, file_path)
@@ -185,8 +233,6 @@ class PluginLoader:
             raise PluginError(module_name, f"Cannot load module from {file_path}")
         
         module = importlib.util.module_from_spec(spec)
-        self._loaded_modules[str(file_path)] = module
-        
         spec.loader.exec_module(module)
         
         # Find plugin classes
@@ -197,26 +243,59 @@ class PluginLoader:
                 hasattr(obj, '__plugin_metadata__')):
                 plugin_classes.append(obj)
         
+        # Only record the module once it executed cleanly so a broken edit
+        # leaves the previous version in place
+        self._loaded_modules[str(file_path)] = module
+        self._file_classes[str(file_path)] = plugin_classes
+        if source_hash is not None:
+            self._file_hashes[str(file_path)] = source_hash
+        
         return plugin_classes
     
-    async def reload_plugin_file(self, file_path: Path) -> List[Type[DiscoveryPlugin]]:
-        """Reload a plugin file."""
-        module_path = str(file_path)
+    async def reload_plugin_file(self, file_path: Path) -> Optional[List[Type[DiscoveryPlugin]]]:
+        """
+        Reload a plugin file if its source changed.
         
-        if module_path in self._loaded_modules:
-            # Reload existing module
-            module = self._loaded_modules[module_path]
-            importlib.reload(module)
+        Returns:
+            The freshly imported plugin classes, or None when the file content
+            is identical to the version already loaded.
+        """
+        if str(file_path) in self._loaded_modules and not self.has_changed(file_path):
+            self.logger.debug("Plugin file unchanged, skipping reload", file=str(file_path))
+            return None
         
         return await self._load_plugin_file(file_path)
+    
+    def forget_plugin_file(self, file_path: Path) -> None:
+        """Drop cached module state for a plugin file."""
+        key = str(file_path)
+        self._loaded_modules.pop(key, None)
+        self._file_hashes.pop(key, None)
+        self._file_classes.pop(key, None)
 
 
 class PluginWatcher(FileSystemEventHandler if WATCHDOG_AVAILABLE else object):
-    """File system watcher for plugin hot-reloading."""
+    """
+    File system watcher for plugin hot-reloading.
     
-    def __init__(self, plugin_manager: 'PluginManager'):
+    Watchdog delivers events on its observer thread, so events are handed to
+    the event loop and debounced per path: a burst of events for one file
+    (editor save, package rollout) results in a single reload once the file
+    has been quiet for ``debounce_delay`` seconds.
+    """
+    
+    def __init__(
+        self,
+        plugin_manager: 'PluginManager',
+        debounce_delay: float = 0.5,
+        loop: Optional[asyncio.AbstractEventLoop] = None
+    ):
         self.plugin_manager = plugin_manager
+        self.debounce_delay = debounce_delay
+        self.loop = loop
         self.logger = get_logger(__name__)
+        self._pending: Dict[str, asyncio.TimerHandle] = {}
+        self._pending_kinds: Dict[str, str] = {}
     
     def on_modified(self, event):
         """Handle file modification events."""
@@ -224,8 +303,7 @@ class PluginWatcher(FileSystemEventHandler if WATCHDOG_AVAILABLE else object):
             return
         
         if event.src_path.endswith('.py'):
-            self.logger.info("Plugin file modified", file=event.src_path)
-            asyncio.create_task(self.plugin_manager.reload_plugin_file(Path(event.src_path)))
+            self._schedule(event.src_path, "modified")
     
     def on_created(self, event):
         """Handle file creation events."""
@@ -233,8 +311,59 @@ class PluginWatcher(FileSystemEventHandler if WATCHDOG_AVAILABLE else object):
             return
         
         if event.src_path.endswith('.py'):
-            self.logger.info("New plugin file created", file=event.src_path)
-            asyncio.create_task(self.plugin_manager.discover_new_plugins())
+            self._schedule(event.src_path, "created")
+    
+    def _schedule(self, path: str, kind: str) -> None:
+        """Hand an event over to the event loop thread."""
+        loop = self.loop
+        if loop is None:
+            try:
+                loop = asyncio.get_running_loop()
+            except RuntimeError:
+                self.logger.warning("No event loop for plugin reload", file=path)
+                return
+        
+        if loop.is_closed():
+            return
+        loop.call_soon_threadsafe(self._debounce, path, kind)
+    
+    def _debounce(self, path: str, kind: str) -> None:
+        """(Re)arm the per-path timer; runs on the event loop thread."""
+        handle = self._pending.pop(path, None)
+        if handle is not None:
+            handle.cancel()
+        
+        # A creation followed by modifications is still a new file
+        if self._pending_kinds.get(path) == "created":
+            kind = "created"
+        self._pending_kinds[path] = kind
+        
+        loop = asyncio.get_running_loop()
+        self._pending[path] = loop.call_later(self.debounce_delay, self._fire, path)
+    
+    def _fire(self, path: str) -> None:
+        """Dispatch the settled event for a path."""
+        self._pending.pop(path, None)
+        kind = self._pending_kinds.pop(path, "modified")
+        
+        if kind == "created":
+            self.logger.info("New plugin file created", file=path)
+            asyncio.ensure_future(self.plugin_manager.discover_new_plugins())
+        else:
+            self.logger.info("Plugin file modified", file=path)
+            asyncio.ensure_future(self.plugin_manager.reload_plugin_file(Path(path)))
+    
+    def cancel_pending(self) -> None:
+        """Cancel all pending debounced reloads."""
+        for handle in self._pending.values():
+            handle.cancel()
+        self._pending.clear()
+        self._pending_kinds.clear()
+    
+    @property
+    def pending_count(self) -> int:
+        """Number of paths waiting for their debounce window to close."""
+        return len(self._pending)
 
 
 class PluginManager:
@@ -249,11 +378,17 @@ class PluginManager:
     - Plugin lifecycle management
     """
     
-    def __init__(self, plugin_directories: List[str], enable_hot_reload: bool = True):
+    def __init__(
+        self,
+        plugin_directories: List[str],
+        enable_hot_reload: bool = True,
+        reload_debounce: float = 0.5
+    ):
         self.registry = PluginRegistry()
         self.loader = PluginLoader(plugin_directories)
         self.plugin_directories = plugin_directories
         self.enable_hot_reload = enable_hot_reload
+        self.reload_debounce = reload_debounce
         self.logger = get_logger(__name__)
         
         # File system watcher for hot-reload
@@ -360,9 +495,20 @@ class PluginManager:
         return None
     
     async def reload_plugin_file(self, file_path: Path) -> None:
-        """Reload plugins from a specific file."""
+        """
+        Reload plugins from a specific file.
+        
+        Nothing is re-imported when the file content is unchanged. For each
+        live plugin defined in the file a replacement instance is loaded off
+        to the side and swapped into the registry in one step, so discovery
+        is never paused and lookups see either the old or the new instance.
+        The old instance is unloaded only after the swap. If the new
+        instance fails to load, the old one stays in service.
+        """
         try:
             plugin_classes = await self.loader.reload_plugin_file(file_path)
+            if plugin_classes is None:
+                return
             
             for plugin_class in plugin_classes:
                 metadata = getattr(plugin_class, '__plugin_metadata__', None)
@@ -370,10 +516,10 @@ class PluginManager:
                     # Re-register plugin class
                     await self.registry.register_plugin_class(plugin_class, metadata)
                     
-                    # Reload plugin instance if it exists
-                    plugin = await self.registry.get_plugin(metadata.name)
-                    if plugin:
-                        await plugin.reload()
+                    # Swap in a fresh instance if one is live
+                    old_plugin = await self.registry.get_plugin(metadata.name)
+                    if old_plugin:
+                        await self._swap_plugin_instance(metadata.name, old_plugin)
             
             self.logger.info("Plugin file reloaded", file=str(file_path))
             
@@ -385,6 +531,38 @@ class PluginManager:
                 exc_info=e
             )
     
+    async def _swap_plugin_instance(self, name: str, old_plugin: DiscoveryPlugin) -> Optional[DiscoveryPlugin]:
+        """Load a replacement instance and atomically install it in place of old_plugin."""
+        was_active = old_plugin.status == PluginStatus.ACTIVE
+        
+        try:
+            new_plugin = await self.registry.create_plugin_instance(
+                name, old_plugin.config, register=False
+            )
+            await new_plugin.load()
+            if was_active:
+                await new_plugin.activate()
+        except Exception as e:
+            self.logger.error(
+                "Replacement plugin failed to load, keeping previous instance",
+                plugin=name,
+                error=str(e),
+                exc_info=e
+            )
+            return None
+        
+        await self.registry.swap_plugin(name, new_plugin)
+        
+        try:
+            if old_plugin.status == PluginStatus.ACTIVE:
+                await old_plugin.deactivate()
+            await old_plugin.unload()
+        except Exception as e:
+            self.logger.error("Failed to unload replaced plugin", plugin=name, error=str(e))
+        
+        await self.trigger_hook("plugin_reloaded", new_plugin)
+        return new_plugin
+    
     async def get_plugin(self, name: str) -> Optional[DiscoveryPlugin]:
         """Get a plugin by name."""
         return await self.registry.get_plugin(name)
@@ -401,6 +579,16 @@ class PluginManager:
             if plugin.status == PluginStatus.ACTIVE
         }
     
+    async def get_classification_rules(self) -> List[PortSignature]:
+        """Collect port signatures contributed by active plugins."""
+        rules = []
+        for name, plugin in (await self.get_active_plugins()).items():
+            try:
+                rules.extend(plugin.get_classification_rules())
+            except Exception as e:
+                self.logger.warning("Failed to get classification rules", plugin=name, error=str(e))
+        return rules
+    
     def set_plugin_config(self, name: str, config: PluginConfig) -> None:
         """Set plugin configuration."""
         self._configs[name] = config
@@ -437,7 +625,11 @@ class PluginManager:
         if self._observer:
             return
         
-        self._watcher = PluginWatcher(self)
+        self._watcher = PluginWatcher(
+            self,
+            debounce_delay=self.reload_debounce,
+            loop=asyncio.get_running_loop()
+        )
         self._observer = Observer()
         
         for plugin_dir in self.plugin_directories:
@@ -455,6 +647,10 @@ class PluginManager:
             self._observer.join()
             self._observer = None
         
+        if self._watcher:
+            self._watcher.cancel_pending()
+            self._watcher = None
+        
         # Unload all plugins
         plugins = await self.registry.get_all_plugins()
         for name in plugins:
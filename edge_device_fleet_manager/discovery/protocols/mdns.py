@@ -15,6 +15,7 @@ from ipaddress import IPv4Address, AddressValueError
 from ..core import Device, DeviceType, DeviceStatus, DiscoveryProtocol, DiscoveryResult
 from ..exceptions import DiscoveryError, DiscoveryTimeoutError
 from ...core.logging import get_logger
+from .multicast import MulticastResponse, MulticastSweep, enumerate_interfaces
 
 logger = get_logger(__name__)
 
@@ -23,8 +24,13 @@ class MDNSQuery:
     """mDNS query packet builder."""
     
     @staticmethod
-    def build_query(service_type: str, query_type: int = 12) -> bytes:
-        """Build an mDNS query packet."""
+    def build_query(service_type: str, query_type: int = 12, unicast_response: bool = False) -> bytes:
+        """
+        Build an mDNS query packet.
+        
+        With unicast_response the QU bit is set, asking responders to reply
+        directly to the querying socket rather than to the multicast group.
+        """
         # Transaction ID (2 bytes)
         transaction_id = 0x0000
         
@@ -44,7 +50,8 @@ class MDNSQuery:
         
         # Build question
         question = MDNSQuery._encode_domain_name(service_type)
-        question += struct.pack('!HH', query_type, 0x0001)  # Type PTR, Class IN
+        query_class = 0x8001 if unicast_response else 0x0001  # Class IN, optional QU bit
+        question += struct.pack('!HH', query_type, query_class)
         
         return header + question
     
@@ -371,9 +378,19 @@ class MDNSDiscovery(DiscoveryProtocol):
         super().__init__("mdns")
         self.config = config
         self.timeout = config.discovery.mdns_timeout if config else 5.0
+        self.interfaces: Optional[List[str]] = None  # None means all interfaces
+        self.sweep = MulticastSweep(self.MDNS_ADDRESS, self.MDNS_PORT, metrics=self.metrics)
     
-    async def discover(self, service_types: Optional[List[str]] = None, **kwargs) -> DiscoveryResult:
-        """Perform mDNS discovery."""
+    async def discover(self, service_types: Optional[List[str]] = None,
+                      interfaces: Optional[List[str]] = None, **kwargs) -> DiscoveryResult:
+        """
+        Perform mDNS discovery.
+        
+        Queries are sent on every IPv4 interface (or the named ones)
+        concurrently from an ephemeral port, which makes responders answer
+        with unicast to the socket of the interface the query went out on.
+        Discovered devices are tagged with that interface.
+        """
         start_time = time.time()
         result = DiscoveryResult(protocol=self.name)
         
@@ -385,37 +402,24 @@ class MDNSDiscovery(DiscoveryProtocol):
             
             # Use provided service types or defaults
             types_to_query = service_types or self.SERVICE_TYPES
+            queries = [
+                MDNSQuery.build_query(service_type, unicast_response=True)
+                for service_type in types_to_query
+            ]
             
-            # Create UDP socket for multicast
-            sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-            sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
-            sock.settimeout(self.timeout)
+            selected = enumerate_interfaces(interfaces or self.interfaces)
+            responses = await self.sweep.query(queries, self.timeout, selected)
             
-            # Enable multicast
-            mreq = struct.pack('4sl', socket.inet_aton(self.MDNS_ADDRESS), socket.INADDR_ANY)
-            sock.setsockopt(socket.IPPROTO_IP, socket.IP_ADD_MEMBERSHIP, mreq)
+            devices = await self._collect_responses(responses)
+            result.devices = devices
+            result.metadata["interfaces"] = [interface.name for interface in selected]
             
-            try:
-                # Bind to multicast address
-                sock.bind(('', self.MDNS_PORT))
-                
-                # Send queries for each service type
-                for service_type in types_to_query:
-                    query = MDNSQuery.build_query(service_type)
-                    sock.sendto(query, (self.MDNS_ADDRESS, self.MDNS_PORT))
-                
-                # Collect responses
-                devices = await self._collect_responses(sock)
-                result.devices = devices
-                
-                self.logger.info(
-                    "mDNS discovery completed",
-                    devices_found=len(devices),
-                    service_types=len(types_to_query)
-                )
-                
-            finally:
-                sock.close()
+            self.logger.info(
+                "mDNS discovery completed",
+                devices_found=len(devices),
+                service_types=len(types_to_query),
+                interfaces=len(selected)
+            )
                 
         except Exception as e:
             result.success = False
@@ -425,50 +429,41 @@ class MDNSDiscovery(DiscoveryProtocol):
         result.duration = time.time() - start_time
         return result
     
-    async def _collect_responses(self, sock: socket.socket) -> List[Device]:
-        """Collect mDNS responses."""
+    async def _collect_responses(self, responses: List[MulticastResponse]) -> List[Device]:
+        """Parse mDNS responses and merge them into devices tagged with their interface."""
         devices: Dict[str, Device] = {}
-        end_time = time.time() + self.timeout
         
-        while time.time() < end_time:
+        for response in responses:
             try:
-                remaining_time = end_time - time.time()
-                if remaining_time <= 0:
-                    break
-                
-                sock.settimeout(min(remaining_time, 1.0))
-                data, addr = sock.recvfrom(4096)
-                
-                # Parse response
-                response = MDNSResponse(data, addr[0])
-                response_devices = response.parse()
-                
-                # Merge devices (avoid duplicates by IP)
-                for device in response_devices:
-                    if device.ip_address not in devices:
-                        devices[device.ip_address] = device
-                    else:
-                        # Merge information
-                        existing = devices[device.ip_address]
-                        existing.services = list(set(existing.services + device.services))
-                        existing.ports = list(set(existing.ports + device.ports))
-                        existing.capabilities.update(device.capabilities)
-                        
-                        # Update other fields if not set
-                        if not existing.name and device.name:
-                            existing.name = device.name
-                        if not existing.hostname and device.hostname:
-                            existing.hostname = device.hostname
-                        if not existing.manufacturer and device.manufacturer:
-                            existing.manufacturer = device.manufacturer
-                        if not existing.model and device.model:
-                            existing.model = device.model
-                
-            except socket.timeout:
-                continue
+                response_devices = MDNSResponse(response.data, response.source_ip).parse()
             except Exception as e:
-                self.logger.debug("Error receiving mDNS response", error=str(e))
+                self.metrics.rejected.inc()
+                self.logger.debug("Error parsing mDNS response", error=str(e))
                 continue
+            self.metrics.response(bool(response_devices))
+            
+            # Merge devices (avoid duplicates by IP)
+            for device in response_devices:
+                if device.ip_address not in devices:
+                    device.metadata['interface'] = response.interface.name
+                    device.metadata['interface_address'] = response.interface.address
+                    devices[device.ip_address] = device
+                else:
+                    # Merge information
+                    existing = devices[device.ip_address]
+                    existing.services = list(set(existing.services + device.services))
+                    existing.ports = list(set(existing.ports + device.ports))
+                    existing.capabilities.update(device.capabilities)
+                    
+                    # Update other fields if not set
+                    if not existing.name and device.name:
+                        existing.name = device.name
+                    if not existing.hostname and device.hostname:
+                        existing.hostname = device.hostname
+                    if not existing.manufacturer and device.manufacturer:
+                        existing.manufacturer = device.manufacturer
+                    if not existing.model and device.model:
+                        existing.model = device.model
         
         return list(devices.values())
     
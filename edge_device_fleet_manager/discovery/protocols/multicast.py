@@ -0,0 +1,243 @@
+"""
+Per-interface multicast query support.
+
+This module enumerates the host's IPv4 interfaces and runs a multicast
+query on all of them concurrently, one asyncio datagram endpoint per
+interface. Each endpoint is bound to its interface address and sends with
+IP_MULTICAST_IF set, so responders' unicast replies (SSDP, legacy-unicast
+mDNS) come back on the socket for the interface they were seen on. A
+multi-homed gateway therefore finishes a sweep of every VLAN in a single
+timeout window.
+"""
+
+import asyncio
+import platform
+import socket
+import struct
+from dataclasses import dataclass
+from typing import List, Optional, Sequence, Tuple
+
+from ...core.logging import get_logger
+from ..metrics import ProtocolMetrics
+
+logger = get_logger(__name__)
+
+SIOCGIFADDR = 0x8915  # Linux ioctl: get interface IPv4 address
+
+
+@dataclass(frozen=True)
+class NetworkInterface:
+    """An IPv4-capable network interface."""
+    name: str
+    address: str
+    index: int = 0
+
+
+@dataclass
+class MulticastResponse:
+    """A datagram received in reply to a multicast query."""
+    data: bytes
+    source_ip: str
+    interface: NetworkInterface
+
+
+DEFAULT_INTERFACE = NetworkInterface(name="default", address="0.0.0.0")
+
+
+def enumerate_interfaces(
+    names: Optional[Sequence[str]] = None,
+    include_loopback: bool = False
+) -> List[NetworkInterface]:
+    """
+    Enumerate IPv4 interfaces.
+
+    Args:
+        names: Restrict to these interface names; named loopback
+            interfaces are always included
+        include_loopback: Include 127.0.0.0/8 interfaces
+
+    Returns:
+        Interfaces with an IPv4 address; empty if they cannot be enumerated.
+        Requested names without an IPv4 interface are logged as a warning.
+    """
+    if platform.system().lower() == "linux":
+        interfaces = _enumerate_linux_interfaces()
+    else:
+        interfaces = _enumerate_host_addresses()
+
+    selected = [
+        interface for interface in interfaces
+        if (names is None or interface.name in names)
+        and (include_loopback or names is not None or not interface.address.startswith("127."))
+    ]
+
+    if names is not None:
+        missing = sorted(set(names) - {interface.name for interface in selected})
+        if missing:
+            # With nothing selected, sweeps fall back to the default interface
+            logger.warning(
+                "Requested interfaces not found" if selected
+                else "No requested interface found, using the default interface",
+                missing=missing,
+                available=[interface.name for interface in interfaces]
+            )
+    return selected
+
+
+def _enumerate_linux_interfaces() -> List[NetworkInterface]:
+    """Enumerate interfaces with the SIOCGIFADDR ioctl."""
+    import fcntl
+
+    interfaces = []
+    try:
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    except OSError as e:
+        logger.debug("Cannot open socket for interface enumeration", error=str(e))
+        return []
+
+    try:
+        for index, name in socket.if_nameindex():
+            try:
+                request = struct.pack("256s", name.encode("utf-8")[:15])
+                response = fcntl.ioctl(sock.fileno(), SIOCGIFADDR, request)
+                address = socket.inet_ntoa(response[20:24])
+            except (OSError, TypeError, ValueError):
+                # No IPv4 address configured on this interface
+                continue
+            interfaces.append(NetworkInterface(name=name, address=address, index=index))
+    except OSError as e:
+        logger.debug("Interface enumeration failed", error=str(e))
+    finally:
+        sock.close()
+
+    return interfaces
+
+
+def _enumerate_host_addresses() -> List[NetworkInterface]:
+    """Portable fallback: addresses of the local hostname, named by address."""
+    try:
+        addresses = socket.gethostbyname_ex(socket.gethostname())[2]
+    except OSError as e:
+        logger.debug("Failed to resolve local addresses", error=str(e))
+        return []
+    return [NetworkInterface(name=address, address=address) for address in addresses]
+
+
+class _MulticastCollector(asyncio.DatagramProtocol):
+    """Datagram protocol that collects responses for one interface."""
+
+    def __init__(self, interface: NetworkInterface):
+        self.interface = interface
+        self.responses: List[MulticastResponse] = []
+
+    def datagram_received(self, data: bytes, addr: Tuple[str, int]) -> None:
+        self.responses.append(MulticastResponse(data, addr[0], self.interface))
+
+    def error_received(self, exc: Exception) -> None:
+        logger.debug("Multicast endpoint error", interface=self.interface.name, error=str(exc))
+
+
+class MulticastSweep:
+    """Sends a multicast query on every interface concurrently and collects replies."""
+
+    def __init__(self, group: str, port: int, ttl: int = 2,
+                 metrics: Optional[ProtocolMetrics] = None):
+        self.group = group
+        self.port = port
+        self.ttl = ttl
+        self.metrics = metrics
+        self.logger = get_logger(__name__)
+
+    def _create_socket(self, interface: NetworkInterface) -> socket.socket:
+        """Create a UDP socket bound to an interface for multicast sends."""
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM, socket.IPPROTO_UDP)
+        try:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            sock.setsockopt(
+                socket.IPPROTO_IP, socket.IP_MULTICAST_IF, socket.inet_aton(interface.address)
+            )
+            sock.setsockopt(socket.IPPROTO_IP, socket.IP_MULTICAST_TTL, self.ttl)
+            sock.bind((interface.address, 0))
+            sock.setblocking(False)
+        except Exception:
+            sock.close()
+            raise
+        return sock
+
+    async def _open_endpoint(
+        self, interface: NetworkInterface
+    ) -> Optional[Tuple[asyncio.DatagramTransport, _MulticastCollector]]:
+        """Open a datagram endpoint for an interface; None if it cannot be bound."""
+        loop = asyncio.get_running_loop()
+        try:
+            sock = self._create_socket(interface)
+            return await loop.create_datagram_endpoint(
+                lambda: _MulticastCollector(interface), sock=sock
+            )
+        except Exception as e:
+            self.logger.warning(
+                "Cannot open multicast endpoint",
+                interface=interface.name,
+                address=interface.address,
+                error=str(e)
+            )
+            return None
+
+    async def query(
+        self,
+        payloads: Sequence[bytes],
+        timeout: float,
+        interfaces: Optional[Sequence[NetworkInterface]] = None
+    ) -> List[MulticastResponse]:
+        """
+        Send payloads on all interfaces and collect replies for one timeout window.
+
+        Args:
+            payloads: Query datagrams to send on each interface
+            timeout: Seconds to wait for replies
+            interfaces: Interfaces to use; enumerated when omitted
+
+        Returns:
+            Responses tagged with the interface they arrived on
+        """
+        if interfaces is None:
+            interfaces = enumerate_interfaces()
+        if not interfaces:
+            interfaces = [DEFAULT_INTERFACE]
+
+        opened = await asyncio.gather(*(self._open_endpoint(i) for i in interfaces))
+        endpoints = [endpoint for endpoint in opened if endpoint is not None]
+        if not endpoints:
+            return []
+
+        probes = self.metrics.probes if self.metrics else None
+        try:
+            for transport, collector in endpoints:
+                for payload in payloads:
+                    try:
+                        transport.sendto(payload, (self.group, self.port))
+                        if probes:
+                            probes.inc()
+                    except OSError as e:
+                        self.logger.debug(
+                            "Multicast send failed",
+                            interface=collector.interface.name,
+                            error=str(e)
+                        )
+
+            await asyncio.sleep(timeout)
+        finally:
+            for transport, _ in endpoints:
+                transport.close()
+
+        responses = []
+        for _, collector in endpoints:
+            responses.extend(collector.responses)
+
+        self.logger.debug(
+            "Multicast query completed",
+            group=self.group,
+            interfaces=len(endpoints),
+            responses=len(responses)
+        )
+        return responses
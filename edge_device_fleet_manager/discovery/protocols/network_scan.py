@@ -6,19 +6,28 @@ port detection, and service identification with parallel execution.
 """
 
 import asyncio
+import json
+import shutil
 import socket
 import time
 import subprocess
 import platform
-from typing import Dict, List, Optional, Set, Tuple
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, List, Optional, Set, Tuple
 from ipaddress import IPv4Network, IPv4Address, AddressValueError
 from concurrent.futures import ThreadPoolExecutor
 
 from ..core import Device, DeviceType, DeviceStatus, DiscoveryProtocol, DiscoveryResult
+from ..classification import DeviceClassifier, PortSignature
 from ..exceptions import DiscoveryError, NetworkError
+from ..metrics import ProtocolMetrics
 from ..rate_limiter import RateLimiter, RateLimitConfig
 from ...core.logging import get_logger
 
+if TYPE_CHECKING:
+    from ..plugins.manager import PluginManager
+
 logger = get_logger(__name__)
 
 
@@ -60,8 +69,10 @@ class PortScanner:
         9999,  # Various
     ]
     
-    def __init__(self, rate_limiter: Optional[RateLimiter] = None):
+    def __init__(self, rate_limiter: Optional[RateLimiter] = None,
+                 metrics: Optional[ProtocolMetrics] = None):
         self.rate_limiter = rate_limiter
+        self.metrics = metrics
         self.logger = get_logger(__name__)
     
     async def scan_port(self, ip: str, port: int, timeout: float = 1.0) -> bool:
@@ -71,6 +82,8 @@ class PortScanner:
                 await self.rate_limiter.acquire(ip, timeout=5.0)
             
             start_time = time.time()
+            if self.metrics:
+                self.metrics.probes.inc()
             
             # Create connection
             future = asyncio.open_connection(ip, port)
@@ -274,12 +287,127 @@ class NetworkDiscovery:
         return networks
 
 
+@dataclass
+class NeighborEntry:
+    """An entry from the kernel neighbour (ARP) table."""
+    ip_address: str
+    mac_address: Optional[str] = None
+    interface: Optional[str] = None
+    state: str = "UNKNOWN"
+    
+    # NUD states in which the kernel has recently confirmed reachability
+    LIVE_STATES = frozenset({"REACHABLE", "PERMANENT", "NOARP"})
+    
+    @property
+    def is_live(self) -> bool:
+        """Whether the host can be treated as alive without probing it."""
+        return self.state in self.LIVE_STATES and self.mac_address is not None
+
+
+class NeighborTable:
+    """
+    Reader for the Linux neighbour table.
+    
+    Uses ``ip -json neigh`` (netlink via iproute2) when available because it
+    reports NUD states, so stale entries can be told apart from reachable
+    ones. Falls back to ``/proc/net/arp``, which only marks entries as
+    complete; complete entries are treated as reachable there.
+    """
+    
+    PROC_ARP_PATH = "/proc/net/arp"
+    ATF_COM = 0x2  # Completed entry flag in /proc/net/arp
+    NULL_MAC = "00:00:00:00:00:00"
+    
+    @classmethod
+    async def read(cls) -> Dict[str, NeighborEntry]:
+        """Read neighbour entries keyed by IP address; empty if unsupported."""
+        if platform.system().lower() != "linux":
+            return {}
+        
+        loop = asyncio.get_event_loop()
+        try:
+            return await loop.run_in_executor(None, cls._read_sync)
+        except Exception as e:
+            logger.debug("Failed to read neighbour table", error=str(e))
+            return {}
+    
+    @classmethod
+    def _read_sync(cls) -> Dict[str, NeighborEntry]:
+        """Read the neighbour table, preferring netlink state information."""
+        if shutil.which("ip"):
+            try:
+                result = subprocess.run(
+                    ["ip", "-json", "-4", "neigh", "show"],
+                    capture_output=True, timeout=2
+                )
+                if result.returncode == 0 and result.stdout.strip():
+                    return cls.parse_ip_neigh_json(result.stdout.decode("utf-8", errors="ignore"))
+            except (subprocess.SubprocessError, OSError, ValueError) as e:
+                logger.debug("ip neigh unavailable, using /proc/net/arp", error=str(e))
+        
+        proc_arp = Path(cls.PROC_ARP_PATH)
+        if proc_arp.exists():
+            return cls.parse_proc_arp(proc_arp.read_text())
+        return {}
+    
+    @classmethod
+    def parse_ip_neigh_json(cls, output: str) -> Dict[str, NeighborEntry]:
+        """Parse the output of ``ip -json neigh show``."""
+        entries = {}
+        for item in json.loads(output):
+            ip = item.get("dst")
+            if not ip:
+                continue
+            
+            states = item.get("state") or ["UNKNOWN"]
+            mac = cls._normalize_mac(item.get("lladdr"))
+            entries[ip] = NeighborEntry(
+                ip_address=ip,
+                mac_address=mac,
+                interface=item.get("dev"),
+                state=states[0].upper()
+            )
+        return entries
+    
+    @classmethod
+    def parse_proc_arp(cls, content: str) -> Dict[str, NeighborEntry]:
+        """Parse the contents of ``/proc/net/arp``."""
+        entries = {}
+        for line in content.splitlines()[1:]:
+            fields = line.split()
+            if len(fields) < 6:
+                continue
+            
+            ip, _, flags, mac, _, device = fields[:6]
+            try:
+                complete = int(flags, 16) & cls.ATF_COM
+            except ValueError:
+                continue
+            
+            entries[ip] = NeighborEntry(
+                ip_address=ip,
+                mac_address=cls._normalize_mac(mac),
+                interface=device,
+                state="REACHABLE" if complete else "INCOMPLETE"
+            )
+        return entries
+    
+    @classmethod
+    def _normalize_mac(cls, mac: Optional[str]) -> Optional[str]:
+        """Lower-case a MAC address, mapping empty or null addresses to None."""
+        if not mac:
+            return None
+        mac = mac.lower()
+        return None if mac == cls.NULL_MAC else mac
+
+
 class NetworkScanDiscovery(DiscoveryProtocol):
     """Network scanning discovery protocol implementation."""
     
-    def __init__(self, config=None):
+    def __init__(self, config=None, plugin_manager: Optional['PluginManager'] = None):
         super().__init__("network_scan")
         self.config = config
+        self.plugin_manager = plugin_manager
         if config:
             self.rate_limiter = RateLimiter(RateLimitConfig(
                 per_host_limit=config.discovery.rate_limit_per_host,
@@ -290,29 +418,70 @@ class NetworkScanDiscovery(DiscoveryProtocol):
                 per_host_limit=10,
                 global_limit=100
             ))
-        self.port_scanner = PortScanner(self.rate_limiter)
+        self.port_scanner = PortScanner(self.rate_limiter, self.metrics)
         self.max_concurrent_hosts = 50
         self.max_concurrent_ports = 10
+        self.use_neighbor_table = True
+        self.networks: Optional[List[str]] = None  # None means auto-detect
+        self.ports: Optional[List[int]] = None  # None means common and IoT ports
+        self.ping_first = True
+        self.classifier = DeviceClassifier(
+            base_ports=PortScanner.COMMON_PORTS + PortScanner.IOT_PORTS
+        )
+        self._plugin_rules: List[PortSignature] = []
+    
+    async def load_classification_rules(self) -> int:
+        """
+        Register classification rules contributed by active plugins.
+        
+        Rules are re-read on every call, so plugins loaded, reloaded or
+        deactivated since the last sweep take effect on the next one; the
+        classifier is only recompiled when the rules changed.
+        
+        Returns:
+            Number of plugin rules registered
+        """
+        if self.plugin_manager is None:
+            return 0
+        
+        rules = await self.plugin_manager.get_classification_rules()
+        if rules != self._plugin_rules:
+            self.classifier.clear_registered_signatures()
+            self.classifier.register_signatures(rules)
+            self._plugin_rules = rules
+            self.logger.info("Plugin classification rules loaded", rules=len(rules))
+        return len(rules)
     
     async def discover(self, networks: Optional[List[str]] = None, 
                       ports: Optional[List[int]] = None,
-                      ping_first: bool = True,
+                      ping_first: Optional[bool] = None,
+                      use_neighbor_table: Optional[bool] = None,
                       **kwargs) -> DiscoveryResult:
-        """Perform network scanning discovery."""
+        """
+        Perform network scanning discovery.
+        
+        Hosts the kernel neighbour table reports as reachable are not pinged,
+        and MAC addresses from the table are attached to discovered devices.
+        """
         start_time = time.time()
         result = DiscoveryResult(protocol=self.name)
         
         try:
-            if not await self.is_available():
+            if ping_first is None:
+                ping_first = self.ping_first
+            
+            if not await self.is_available(ping_first):
                 result.success = False
                 result.error = "Network scanning not available"
                 return result
             
             # Use provided networks or auto-detect
-            scan_networks = networks or NetworkDiscovery.get_local_networks()
+            scan_networks = networks or self.networks or NetworkDiscovery.get_local_networks()
             
             # Use provided ports or defaults
-            scan_ports = ports or (PortScanner.COMMON_PORTS + PortScanner.IOT_PORTS)
+            scan_ports = ports or self.ports or (PortScanner.COMMON_PORTS + PortScanner.IOT_PORTS)
+            
+            await self.load_classification_rules()
             
             # Generate list of IPs to scan
             ips_to_scan = []
@@ -334,15 +503,26 @@ class NetworkScanDiscovery(DiscoveryProtocol):
                 result.error = "No valid networks to scan"
                 return result
             
+            # Seed liveness and MACs from the neighbour table
+            if use_neighbor_table is None:
+                use_neighbor_table = self.use_neighbor_table
+            neighbors = await NeighborTable.read() if use_neighbor_table else {}
+            prefiltered = sum(
+                1 for ip in ips_to_scan if ip in neighbors and neighbors[ip].is_live
+            )
+            result.metadata["neighbor_table_entries"] = len(neighbors)
+            result.metadata["pings_skipped"] = prefiltered if ping_first else 0
+            
             self.logger.info(
                 "Starting network scan",
                 networks=len(scan_networks),
                 ips=len(ips_to_scan),
-                ports=len(scan_ports)
+                ports=len(scan_ports),
+                live_neighbors=prefiltered
             )
             
             # Scan hosts
-            devices = await self._scan_hosts(ips_to_scan, scan_ports, ping_first)
+            devices = await self._scan_hosts(ips_to_scan, scan_ports, ping_first, neighbors)
             result.devices = devices
             
             self.logger.info(
@@ -359,27 +539,31 @@ class NetworkScanDiscovery(DiscoveryProtocol):
         result.duration = time.time() - start_time
         return result
     
-    async def _scan_hosts(self, ips: List[str], ports: List[int], ping_first: bool) -> List[Device]:
+    async def _scan_hosts(self, ips: List[str], ports: List[int], ping_first: bool,
+                          neighbors: Optional[Dict[str, NeighborEntry]] = None) -> List[Device]:
         """Scan multiple hosts concurrently."""
         semaphore = asyncio.Semaphore(self.max_concurrent_hosts)
+        neighbors = neighbors or {}
         
         async def scan_host_with_semaphore(ip: str) -> Optional[Device]:
             async with semaphore:
-                return await self._scan_single_host(ip, ports, ping_first)
+                return await self._scan_single_host(ip, ports, ping_first, neighbors.get(ip))
         
         # Scan all hosts concurrently
         tasks = [scan_host_with_semaphore(ip) for ip in ips]
         results = await asyncio.gather(*tasks, return_exceptions=True)
         
-        # Filter successful scans
+        # Filter successful scans and classify them in one pass
         devices = [device for device in results if isinstance(device, Device)]
+        self.classifier.classify_devices(devices)
         return devices
     
-    async def _scan_single_host(self, ip: str, ports: List[int], ping_first: bool) -> Optional[Device]:
+    async def _scan_single_host(self, ip: str, ports: List[int], ping_first: bool,
+                                neighbor: Optional[NeighborEntry] = None) -> Optional[Device]:
         """Scan a single host."""
         try:
-            # Ping first if requested
-            if ping_first:
+            # Ping first if requested, unless the kernel already knows the host is up
+            if ping_first and not (neighbor and neighbor.is_live):
                 if not await NetworkDiscovery.ping_host(ip, timeout=1):
                     return None
             
@@ -400,19 +584,22 @@ class NetworkScanDiscovery(DiscoveryProtocol):
                 status=DeviceStatus.ONLINE
             )
             
+            if neighbor:
+                device.mac_address = neighbor.mac_address
+                if neighbor.interface:
+                    device.metadata['interface'] = neighbor.interface
+            
             # Identify services
             services = []
             for port in open_ports[:5]:  # Limit service identification
                 service_info = await ServiceIdentifier.identify_service(ip, port, timeout=2.0)
+                self.metrics.response(bool(service_info))
                 if service_info:
                     services.append(service_info['name'])
                     device.capabilities[f'port_{port}'] = service_info
             
             device.services = services
             
-            # Determine device type from ports and services
-            device.device_type = self._determine_device_type(open_ports, services)
-            
             # Try to get hostname
             try:
                 hostname = socket.gethostbyaddr(ip)[0]
@@ -426,49 +613,24 @@ class NetworkScanDiscovery(DiscoveryProtocol):
             self.logger.debug("Host scan failed", ip=ip, error=str(e))
             return None
     
-    def _determine_device_type(self, ports: List[int], services: List[str]) -> DeviceType:
-        """Determine device type from open ports and services."""
-        ports_set = set(ports)
-        services_str = ' '.join(services).lower()
-        
-        # Router/Gateway indicators
-        if 80 in ports_set and 443 in ports_set and (22 in ports_set or 23 in ports_set):
-            return DeviceType.ROUTER
-        
-        # Printer indicators
-        if any(port in ports_set for port in [631, 9100, 515]) or 'printer' in services_str:
-            return DeviceType.PRINTER
-        
-        # Media server indicators
-        if any(port in ports_set for port in [8080, 8200, 32400]) or 'media' in services_str:
-            return DeviceType.MEDIA_SERVER
-        
-        # IoT indicators
-        if 1883 in ports_set or 'mqtt' in services_str:
-            return DeviceType.IOT_GATEWAY
+    async def is_available(self, ping_first: Optional[bool] = None) -> bool:
+        """
+        Check if network scanning is available.
         
-        # Camera indicators
-        if any(port in ports_set for port in [554, 8000, 8080]) and 'http' in services_str:
-            return DeviceType.CAMERA
-        
-        # Switch/Network device indicators
-        if 161 in ports_set or (22 in ports_set and 80 in ports_set):
-            return DeviceType.SWITCH
-        
-        # Generic IoT if has common IoT ports
-        if any(port in ports_set for port in [5683, 8883, 5353]):
-            return DeviceType.IOT_SENSOR
-        
-        return DeviceType.UNKNOWN
-    
-    async def is_available(self) -> bool:
-        """Check if network scanning is available."""
+        Ping is only required when hosts are pinged before their ports are
+        scanned (default: the instance's ping_first).
+        """
         try:
             # Test basic socket operations
             test_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
             test_socket.settimeout(1)
             test_socket.close()
             
+            if ping_first is None:
+                ping_first = self.ping_first
+            if not ping_first:
+                return True
+            
             # Test ping capability
             return await NetworkDiscovery.ping_host('127.0.0.1', timeout=1)
             
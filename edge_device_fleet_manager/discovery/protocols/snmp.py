@@ -320,11 +320,14 @@ class SNMPDiscovery(DiscoveryProtocol):
                     ContextData(),
                     ObjectType(ObjectIdentity(oid))
                 )
+                self.metrics.probes.inc()
                 
                 errorIndication, errorStatus, errorIndex, varBinds = await iterator
                 
                 if errorIndication or errorStatus:
+                    self.metrics.rejected.inc()
                     continue
+                self.metrics.parsed.inc()
                 
                 for varBind in varBinds:
                     value = varBind[1]
@@ -361,8 +364,12 @@ class SNMPDiscovery(DiscoveryProtocol):
                 )
                 
                 async for errorIndication, errorStatus, errorIndex, varBinds in iterator:
+                    # The walk issues one GETNEXT per row
+                    self.metrics.probes.inc()
                     if errorIndication or errorStatus:
+                        self.metrics.rejected.inc()
                         break
+                    self.metrics.parsed.inc()
                     
                     for varBind in varBinds:
                         oid_str = str(varBind[0])
@@ -18,6 +18,7 @@ import httpx
 from ..core import Device, DeviceType, DeviceStatus, DiscoveryProtocol, DiscoveryResult
 from ..exceptions import DiscoveryError, DiscoveryTimeoutError
 from ...core.logging import get_logger
+from .multicast import MulticastSweep, NetworkInterface, enumerate_interfaces
 
 logger = get_logger(__name__)
 
@@ -162,9 +163,19 @@ class SSDPDiscovery(DiscoveryProtocol):
         super().__init__("ssdp")
         self.config = config
         self.timeout = config.discovery.ssdp_timeout if config else 5.0
+        self.interfaces: Optional[List[str]] = None  # None means all interfaces
+        self.sweep = MulticastSweep(self.SSDP_ADDRESS, self.SSDP_PORT, metrics=self.metrics)
     
-    async def discover(self, search_targets: Optional[List[str]] = None, **kwargs) -> DiscoveryResult:
-        """Perform SSDP discovery."""
+    async def discover(self, search_targets: Optional[List[str]] = None,
+                      interfaces: Optional[List[str]] = None, **kwargs) -> DiscoveryResult:
+        """
+        Perform SSDP discovery.
+        
+        All search targets are sent on every IPv4 interface (or the named
+        ones) at once, so the sweep takes a single timeout window regardless
+        of how many targets and interfaces there are. Devices are tagged
+        with the interface their response arrived on.
+        """
         start_time = time.time()
         result = DiscoveryResult(protocol=self.name)
         
@@ -177,32 +188,31 @@ class SSDPDiscovery(DiscoveryProtocol):
             # Use provided search targets or defaults
             targets_to_search = search_targets or self.SEARCH_TARGETS
             
-            # Collect responses from all search targets
-            all_responses = []
-            
-            for target in targets_to_search:
-                responses = await self._discover_target(target)
-                all_responses.extend(responses)
-            
-            # Remove duplicates and fetch device descriptions
-            unique_locations = set()
-            devices = []
+            selected = enumerate_interfaces(interfaces or self.interfaces)
+            all_responses = await self._discover_targets(targets_to_search, selected)
             
+            # Remove duplicates and fetch device descriptions concurrently
+            unique_responses = {}
             for response in all_responses:
                 location = response.get('LOCATION')
-                if location and location not in unique_locations:
-                    unique_locations.add(location)
-                    device = await self._create_device_from_response(response)
-                    if device:
-                        devices.append(device)
+                if location and location not in unique_responses:
+                    unique_responses[location] = response
+            
+            created = await asyncio.gather(*(
+                self._create_device_from_response(response)
+                for response in unique_responses.values()
+            ))
+            devices = [device for device in created if device]
             
             result.devices = devices
+            result.metadata["interfaces"] = [interface.name for interface in selected]
             
             self.logger.info(
                 "SSDP discovery completed",
                 devices_found=len(devices),
                 search_targets=len(targets_to_search),
-                total_responses=len(all_responses)
+                total_responses=len(all_responses),
+                interfaces=len(selected)
             )
             
         except Exception as e:
@@ -213,53 +223,33 @@ class SSDPDiscovery(DiscoveryProtocol):
         result.duration = time.time() - start_time
         return result
     
-    async def _discover_target(self, search_target: str) -> List[Dict[str, str]]:
-        """Discover devices for a specific search target."""
-        responses = []
+    async def _discover_targets(
+        self,
+        search_targets: List[str],
+        interfaces: Optional[List[NetworkInterface]] = None
+    ) -> List[Dict[str, str]]:
+        """Send M-SEARCH requests for all targets on all interfaces and parse the replies."""
+        messages = [
+            SSDPMessage.build_msearch(target, self.timeout).encode('utf-8')
+            for target in search_targets
+        ]
         
-        try:
-            # Create UDP socket
-            sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-            sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
-            sock.settimeout(self.timeout)
-            
-            try:
-                # Send M-SEARCH request
-                message = SSDPMessage.build_msearch(search_target, self.timeout)
-                sock.sendto(message.encode('utf-8'), (self.SSDP_ADDRESS, self.SSDP_PORT))
-                
-                # Collect responses
-                end_time = time.time() + self.timeout
-                
-                while time.time() < end_time:
-                    try:
-                        remaining_time = end_time - time.time()
-                        if remaining_time <= 0:
-                            break
-                        
-                        sock.settimeout(min(remaining_time, 1.0))
-                        data, addr = sock.recvfrom(4096)
-                        
-                        # Parse response
-                        response = SSDPMessage.parse_response(data.decode('utf-8', errors='ignore'))
-                        if response:
-                            response['_source_ip'] = addr[0]
-                            responses.append(response)
-                        
-                    except socket.timeout:
-                        continue
-                    except Exception as e:
-                        logger.debug("Error receiving SSDP response", error=str(e))
-                        continue
-                
-            finally:
-                sock.close()
-                
-        except Exception as e:
-            logger.debug("SSDP target discovery failed", target=search_target, error=str(e))
+        responses = []
+        for reply in await self.sweep.query(messages, self.timeout, interfaces):
+            response = SSDPMessage.parse_response(reply.data.decode('utf-8', errors='ignore'))
+            self.metrics.response(bool(response))
+            if response:
+                response['_source_ip'] = reply.source_ip
+                response['_interface'] = reply.interface.name
+                response['_interface_address'] = reply.interface.address
+                responses.append(response)
         
         return responses
     
+    async def _discover_target(self, search_target: str) -> List[Dict[str, str]]:
+        """Discover devices for a specific search target."""
+        return await self._discover_targets([search_target])
+    
     async def _create_device_from_response(self, response: Dict[str, str]) -> Optional[Device]:
         """Create Device object from SSDP response."""
         try:
@@ -295,7 +285,12 @@ class SSDPDiscovery(DiscoveryProtocol):
                     'cache_control': response.get('CACHE-CONTROL', ''),
                 }
             )
-            
+
+            # Tag with the interface the response arrived on
+            if response.get('_interface'):
+                device.metadata['interface'] = response['_interface']
+                device.metadata['interface_address'] = response.get('_interface_address', '')
+
             # Fetch detailed device description
             device_info = await UPnPDeviceParser.fetch_device_description(location, timeout=3)
             if device_info:
@@ -12,6 +12,9 @@ from dataclasses import dataclass
 from typing import Dict, Optional
 
 from .exceptions import RateLimitExceededError
+from .metrics import (
+    RATE_LIMITER_GLOBAL_REJECTIONS, RATE_LIMITER_HOST_REJECTIONS, RATE_LIMITER_WAIT
+)
 from ..core.logging import get_logger
 
 logger = get_logger(__name__)
@@ -94,13 +97,17 @@ class AdaptiveRateLimiter:
     
     async def acquire(self, host: str, timeout: Optional[float] = None) -> bool:
         """Acquire permission to make a request to a host."""
+        start_time = time.perf_counter()
+        
         # Check global rate limit
         if not await self.global_bucket.wait_for_tokens(1, timeout):
+            RATE_LIMITER_GLOBAL_REJECTIONS.inc()
             raise RateLimitExceededError("Global rate limit exceeded")
         
         # Check per-host rate limit
         host_bucket = self._get_host_bucket(host)
         if not await host_bucket.wait_for_tokens(1, timeout):
+            RATE_LIMITER_HOST_REJECTIONS.inc()
             raise RateLimitExceededError(f"Rate limit exceeded for host {host}")
         
         # Apply adaptive backoff if needed
@@ -108,6 +115,7 @@ class AdaptiveRateLimiter:
         if backoff_delay > 0:
             await asyncio.sleep(backoff_delay)
         
+        RATE_LIMITER_WAIT.observe(time.perf_counter() - start_time)
         return True
     
     def record_success(self, host: str, response_time: float) -> None:
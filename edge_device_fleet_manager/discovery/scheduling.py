@@ -24,6 +24,9 @@ from uuid import uuid4
 from ..core.logging import get_logger
 from .core import DiscoveryEngine, DiscoveryResult
 from .events import DiscoveryEventBus, DiscoveryStartedEvent, DiscoveryCompletedEvent, DiscoveryErrorEvent
+from .metrics import (
+    SCHEDULER_JOB_DURATION, SCHEDULER_JOBS, SCHEDULER_QUEUE_SIZE, SCHEDULER_RUNNING_JOBS
+)
 
 
 class JobStatus(Enum):
@@ -203,6 +206,10 @@ class DiscoveryScheduler:
             "total_discovery_time": 0.0,
             "start_time": datetime.now(timezone.utc)
         }
+        self._job_events = {
+            event: SCHEDULER_JOBS.labels(event=event)
+            for event in ("scheduled", "completed", "failed", "cancelled", "retried")
+        }
     
     async def start(self) -> None:
         """Start the discovery scheduler."""
@@ -212,6 +219,9 @@ class DiscoveryScheduler:
         self._running = True
         self.logger.info("Starting discovery scheduler")
         
+        # Restores the registry snapshot before the first sweep
+        await self.discovery_engine.start()
+        
         # Start scheduler task
         self._scheduler_task = asyncio.create_task(self._scheduler_loop())
         
@@ -256,6 +266,9 @@ class DiscoveryScheduler:
                 if job:
                     job.status = JobStatus.CANCELLED
                     self._stats["jobs_cancelled"] += 1
+                    self._job_events["cancelled"].inc()
+        
+        await self.discovery_engine.stop()
         
         self.logger.info("Discovery scheduler stopped")
     
@@ -267,8 +280,10 @@ class DiscoveryScheduler:
             # Add to priority queue (lower priority value = higher priority)
             priority = (job.priority.value, job.scheduled_time.timestamp())
             await self._job_queue.put((priority, job.job_id))
+            SCHEDULER_QUEUE_SIZE.set(self._job_queue.qsize())
             
             self._stats["jobs_scheduled"] += 1
+            self._job_events["scheduled"].inc()
         
         self.logger.info(
             "Discovery job scheduled",
@@ -287,6 +302,7 @@ class DiscoveryScheduler:
             if job and job.status in [JobStatus.PENDING, JobStatus.SCHEDULED]:
                 job.status = JobStatus.CANCELLED
                 self._stats["jobs_cancelled"] += 1
+                self._job_events["cancelled"].inc()
                 
                 self.logger.info("Discovery job cancelled", job_id=job_id)
                 return True
@@ -377,6 +393,7 @@ class DiscoveryScheduler:
                     )
                 except asyncio.TimeoutError:
                     continue
+                SCHEDULER_QUEUE_SIZE.set(self._job_queue.qsize())
                 
                 # Process the job
                 await self._process_job(job_id, worker_name)
@@ -427,6 +444,7 @@ class DiscoveryScheduler:
             job.status = JobStatus.RUNNING
             job.started_at = datetime.now(timezone.utc)
             self._running_jobs.add(job_id)
+            SCHEDULER_RUNNING_JOBS.set(len(self._running_jobs))
         
         self.logger.info(
             "Starting discovery job",
@@ -459,9 +477,12 @@ class DiscoveryScheduler:
                 job.status = JobStatus.COMPLETED
                 job.completed_at = datetime.now(timezone.utc)
                 self._running_jobs.discard(job_id)
+                SCHEDULER_RUNNING_JOBS.set(len(self._running_jobs))
                 
                 self._stats["jobs_completed"] += 1
                 self._stats["total_discovery_time"] += duration
+                self._job_events["completed"].inc()
+                SCHEDULER_JOB_DURATION.observe(duration)
             
             # Publish discovery completed event
             if self.event_bus:
@@ -497,8 +518,10 @@ class DiscoveryScheduler:
             job.status = JobStatus.FAILED
             job.completed_at = datetime.now(timezone.utc)
             self._running_jobs.discard(job_id)
+            SCHEDULER_RUNNING_JOBS.set(len(self._running_jobs))
             
             self._stats["jobs_failed"] += 1
+            self._job_events["failed"].inc()
         
         # Publish discovery error event
         if self.event_bus:
@@ -516,6 +539,8 @@ class DiscoveryScheduler:
             job.schedule_retry()
             priority = (job.priority.value, job.scheduled_time.timestamp())
             await self._job_queue.put((priority, job_id))
+            SCHEDULER_QUEUE_SIZE.set(self._job_queue.qsize())
+            self._job_events["retried"].inc()
             
             self.logger.info(
                 "Discovery job scheduled for retry",
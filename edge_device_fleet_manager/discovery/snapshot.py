@@ -0,0 +1,448 @@
+"""
+Warm-start snapshots for the device registry.
+
+This module persists the DeviceRegistry to a local SQLite file so that a
+restarted discovery daemon can serve the last known fleet immediately
+instead of waiting for a full re-sweep. Snapshots are written in a single
+transaction (WAL journal), so a crash mid-write leaves the previous
+snapshot intact. Between full snapshots only devices that changed since
+the last write are upserted; a full snapshot rewrites the table and acts
+as compaction.
+
+Devices restored from a snapshot are marked unverified until the next
+sweep sees them again.
+"""
+
+import asyncio
+import json
+import sqlite3
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+from ..core.logging import get_logger
+from .core import Device, DeviceRegistry, DeviceStatus, DeviceType
+from .exceptions import SnapshotError
+
+logger = get_logger(__name__)
+
+SNAPSHOT_SCHEMA_VERSION = 1
+
+# Scalars are stored as native columns and timestamps as epoch seconds so
+# a restore avoids per-row JSON and ISO-8601 parsing; collections are JSON
+# and left NULL when empty, which is the common case.
+_DEVICE_COLUMNS = (
+    "device_id", "name", "device_type", "ip_address", "mac_address",
+    "hostname", "ports", "discovery_protocol", "discovery_time", "last_seen",
+    "status", "manufacturer", "model", "firmware_version", "services",
+    "capabilities", "metadata",
+)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS snapshot_meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS devices (
+    device_id TEXT PRIMARY KEY,
+    name TEXT,
+    device_type TEXT NOT NULL,
+    ip_address TEXT NOT NULL,
+    mac_address TEXT,
+    hostname TEXT,
+    ports TEXT,
+    discovery_protocol TEXT NOT NULL,
+    discovery_time REAL NOT NULL,
+    last_seen REAL NOT NULL,
+    status TEXT NOT NULL,
+    manufacturer TEXT,
+    model TEXT,
+    firmware_version TEXT,
+    services TEXT,
+    capabilities TEXT,
+    metadata TEXT
+);
+CREATE INDEX IF NOT EXISTS ix_devices_ip_address ON devices (ip_address);
+"""
+
+_INSERT_DEVICE = "INSERT OR REPLACE INTO devices ({}) VALUES ({})".format(
+    ", ".join(_DEVICE_COLUMNS), ", ".join("?" * len(_DEVICE_COLUMNS))
+)
+_SELECT_DEVICES = "SELECT {} FROM devices".format(", ".join(_DEVICE_COLUMNS))
+
+
+def _dump_collection(value: Any) -> Optional[str]:
+    """Encode a list or dict column, using NULL for empty values."""
+    if not value:
+        return None
+    return json.dumps(value, separators=(",", ":"), default=str)
+
+
+class RegistrySnapshotStore:
+    """SQLite-backed storage for registry snapshots."""
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        self.logger = get_logger(__name__)
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open a connection and make sure the schema exists."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(str(self.path), isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.executescript(_SCHEMA)
+        return conn
+
+    @staticmethod
+    def serialize(device: Device) -> Tuple:
+        """Convert a device into a snapshot row."""
+        return (
+            device.device_id,
+            device.name,
+            device.device_type.value,
+            device.ip_address,
+            device.mac_address,
+            device.hostname,
+            _dump_collection(device.ports),
+            device.discovery_protocol,
+            device.discovery_time.timestamp(),
+            device.last_seen.timestamp(),
+            device.status.value,
+            device.manufacturer,
+            device.model,
+            device.firmware_version,
+            _dump_collection(device.services),
+            _dump_collection(device.capabilities),
+            _dump_collection(device.metadata),
+        )
+
+    @staticmethod
+    def deserialize_rows(rows: Iterable[Tuple]) -> List[Device]:
+        """Convert snapshot rows back into devices."""
+        rows = list(rows)
+
+        # Decode each collection column with a single json.loads call over
+        # the whole column; per-call overhead dominates for small values.
+        def load_column(index: int, empty: str) -> List[Any]:
+            cells = [row[index] or empty for row in rows]
+            return json.loads("[" + ",".join(cells) + "]")
+
+        ports = load_column(6, "[]")
+        services = load_column(14, "[]")
+        capabilities = load_column(15, "{}")
+        metadata = load_column(16, "{}")
+
+        from_timestamp = datetime.fromtimestamp
+        utc = timezone.utc
+        device_types = DeviceType._value2member_map_
+        statuses = DeviceStatus._value2member_map_
+
+        devices = []
+        for i, (device_id, name, device_type, ip_address, mac_address, hostname,
+                _, discovery_protocol, discovery_time, last_seen, status,
+                manufacturer, model, firmware_version, *_) in enumerate(rows):
+            devices.append(Device(
+                device_id=device_id,
+                name=name,
+                device_type=device_types.get(device_type, DeviceType.UNKNOWN),
+                ip_address=ip_address,
+                mac_address=mac_address,
+                hostname=hostname,
+                ports=ports[i],
+                discovery_protocol=discovery_protocol,
+                discovery_time=from_timestamp(discovery_time, utc),
+                last_seen=from_timestamp(last_seen, utc),
+                status=statuses.get(status, DeviceStatus.UNKNOWN),
+                manufacturer=manufacturer,
+                model=model,
+                firmware_version=firmware_version,
+                services=services[i],
+                capabilities=capabilities[i],
+                metadata=metadata[i],
+            ))
+        return devices
+
+    def write(
+        self,
+        rows: Iterable[Tuple],
+        removed_ids: Iterable[str] = (),
+        full: bool = False
+    ) -> int:
+        """
+        Write snapshot rows in a single transaction.
+
+        Args:
+            rows: Serialized device rows (see serialize())
+            removed_ids: Device IDs to delete
+            full: Replace the whole snapshot instead of applying a delta
+
+        Returns:
+            Number of rows written
+        """
+        rows = list(rows)
+        try:
+            conn = self._connect()
+        except sqlite3.Error as e:
+            raise SnapshotError(f"Cannot open snapshot file {self.path}: {e}") from e
+
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            if full:
+                conn.execute("DELETE FROM devices")
+            else:
+                conn.executemany(
+                    "DELETE FROM devices WHERE device_id = ?",
+                    ((device_id,) for device_id in removed_ids)
+                )
+            conn.executemany(_INSERT_DEVICE, rows)
+            conn.executemany(
+                "INSERT OR REPLACE INTO snapshot_meta (key, value) VALUES (?, ?)",
+                [
+                    ("schema_version", str(SNAPSHOT_SCHEMA_VERSION)),
+                    ("saved_at", str(time.time())),
+                ]
+            )
+            conn.execute("COMMIT")
+
+            if full:
+                # Fold the WAL back into the main file after a compaction
+                conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+            return len(rows)
+        except sqlite3.Error as e:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            raise SnapshotError(f"Failed to write snapshot {self.path}: {e}") from e
+        finally:
+            conn.close()
+
+    def read(self) -> List[Device]:
+        """Read all devices from the snapshot; an absent file yields no devices."""
+        if not self.path.exists():
+            return []
+
+        try:
+            conn = self._connect()
+        except sqlite3.Error as e:
+            raise SnapshotError(f"Cannot open snapshot file {self.path}: {e}") from e
+
+        try:
+            version = conn.execute(
+                "SELECT value FROM snapshot_meta WHERE key = 'schema_version'"
+            ).fetchone()
+            if version and int(version[0]) != SNAPSHOT_SCHEMA_VERSION:
+                self.logger.warning(
+                    "Ignoring snapshot with unsupported schema version",
+                    path=str(self.path),
+                    version=version[0]
+                )
+                return []
+
+            return self.deserialize_rows(conn.execute(_SELECT_DEVICES))
+        except (sqlite3.Error, ValueError) as e:
+            raise SnapshotError(f"Failed to read snapshot {self.path}: {e}") from e
+        finally:
+            conn.close()
+
+    def get_metadata(self) -> Dict[str, str]:
+        """Get snapshot metadata such as schema version and save time."""
+        if not self.path.exists():
+            return {}
+
+        conn = self._connect()
+        try:
+            return dict(conn.execute("SELECT key, value FROM snapshot_meta"))
+        finally:
+            conn.close()
+
+
+class RegistrySnapshotter:
+    """
+    Periodically persists a DeviceRegistry and restores it at startup.
+
+    Example:
+        snapshotter = RegistrySnapshotter(registry, "/var/lib/edge-fleet/registry.db")
+        await snapshotter.restore()
+        await snapshotter.start()
+        ...
+        await snapshotter.stop()  # writes a final snapshot
+    """
+
+    def __init__(
+        self,
+        registry: DeviceRegistry,
+        path: Union[str, Path],
+        interval: float = 60.0,
+        compact_every: int = 10,
+        serialize_batch_size: int = 1000
+    ):
+        self.registry = registry
+        self.store = RegistrySnapshotStore(path)
+        self.interval = interval
+        self.compact_every = compact_every
+        self.serialize_batch_size = serialize_batch_size
+        self.logger = get_logger(__name__)
+
+        self._task: Optional[asyncio.Task] = None
+        self._write_lock = asyncio.Lock()
+        self._snapshots_since_compaction = 0
+        self._needs_full = True
+
+        # Statistics
+        self.snapshot_count = 0
+        self.last_snapshot_duration = 0.0
+        self.last_snapshot_rows = 0
+        self.last_restore_duration = 0.0
+
+    @classmethod
+    def from_config(cls, registry: DeviceRegistry, config) -> Optional['RegistrySnapshotter']:
+        """Create a snapshotter from application config, or None when disabled."""
+        discovery_config = config.discovery
+        if not discovery_config.snapshot_path:
+            return None
+        return cls(
+            registry,
+            discovery_config.snapshot_path,
+            interval=discovery_config.snapshot_interval
+        )
+
+    async def restore(self) -> int:
+        """
+        Load the snapshot into the registry.
+
+        Returns:
+            Number of devices restored
+        """
+        start_time = time.time()
+        loop = asyncio.get_running_loop()
+
+        try:
+            devices = await loop.run_in_executor(None, self.store.read)
+        except SnapshotError as e:
+            self.logger.error("Failed to restore registry snapshot", error=str(e))
+            return 0
+
+        restored = await self.registry.restore_devices(devices)
+
+        # The file already matches the registry, so deltas are enough from here
+        if restored == len(devices):
+            self._needs_full = False
+
+        self.last_restore_duration = time.time() - start_time
+        self.logger.info(
+            "Registry snapshot restored",
+            devices=restored,
+            duration=self.last_restore_duration
+        )
+        return restored
+
+    async def snapshot(self, full: bool = False) -> int:
+        """
+        Persist registry changes since the previous snapshot.
+
+        Args:
+            full: Rewrite the whole snapshot (compaction)
+
+        Returns:
+            Number of device rows written
+        """
+        async with self._write_lock:
+            start_time = time.time()
+            full = (
+                full or self._needs_full
+                or self._snapshots_since_compaction >= self.compact_every
+            )
+
+            changed, removed = await self.registry.drain_changes()
+            if full:
+                devices = await self.registry.get_all_devices()
+            else:
+                devices = changed
+
+            if not full and not devices and not removed:
+                return 0
+
+            rows = await self._serialize(devices)
+            loop = asyncio.get_running_loop()
+
+            try:
+                written = await loop.run_in_executor(
+                    None, self.store.write, rows, removed, full
+                )
+            except SnapshotError as e:
+                # Nothing was committed; force a full rewrite next time
+                self._needs_full = True
+                self.logger.error("Registry snapshot failed", error=str(e))
+                return 0
+
+            if full:
+                self._needs_full = False
+                self._snapshots_since_compaction = 0
+            else:
+                self._snapshots_since_compaction += 1
+
+            self.snapshot_count += 1
+            self.last_snapshot_rows = written
+            self.last_snapshot_duration = time.time() - start_time
+
+            self.logger.debug(
+                "Registry snapshot written",
+                rows=written,
+                removed=len(removed),
+                full=full,
+                duration=self.last_snapshot_duration
+            )
+            return written
+
+    async def _serialize(self, devices: List[Device]) -> List[Tuple]:
+        """Serialize devices on the event loop, yielding between batches."""
+        rows = []
+        serialize = self.store.serialize
+        for i in range(0, len(devices), self.serialize_batch_size):
+            rows.extend(serialize(device) for device in devices[i:i + self.serialize_batch_size])
+            await asyncio.sleep(0)
+        return rows
+
+    async def start(self) -> None:
+        """Start periodic snapshots."""
+        if self._task is not None:
+            return
+        self._task = asyncio.create_task(self._run())
+        self.logger.info("Registry snapshotter started", path=str(self.store.path), interval=self.interval)
+
+    async def stop(self, final_snapshot: bool = True) -> None:
+        """Stop periodic snapshots, optionally writing a final snapshot."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+        if final_snapshot:
+            await self.snapshot()
+
+        self.logger.info("Registry snapshotter stopped")
+
+    async def _run(self) -> None:
+        """Periodic snapshot loop."""
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.snapshot()
+            except Exception as e:
+                self.logger.error("Periodic registry snapshot failed", error=str(e), exc_info=e)
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Get snapshotter statistics."""
+        return {
+            "path": str(self.store.path),
+            "running": self._task is not None,
+            "snapshot_count": self.snapshot_count,
+            "last_snapshot_rows": self.last_snapshot_rows,
+            "last_snapshot_duration": self.last_snapshot_duration,
+            "last_restore_duration": self.last_restore_duration,
+        }
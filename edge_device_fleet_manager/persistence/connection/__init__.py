@@ -12,16 +12,38 @@ Key Features:
 - Connection lifecycle management
 - Performance monitoring
 - Multi-database support
+- Read replica routing with read-your-writes stickiness
+- Event-driven pool metrics with bounded histograms and leak detection
+- Demand-adaptive pool sizing and warm-up
 """
 
 from .manager import DatabaseManager
 from .pool import ConnectionPool
-from .health import HealthChecker
+from .pool_metrics import (
+    LatencyHistogram, HeldConnection, PoolMetrics, MonitoredQueuePool, MonitoredNullPool
+)
+from .adaptive_pool import AdaptiveQueuePool, AdaptivePoolPolicy, ResizeDecision
+from .health import HealthChecker, ReplicaHealthChecker
+from .routing import Replica, ReplicaRouter
 from .config import DatabaseConfig
+from .statement_cache import StatementCacheStats, track_statement_cache
 
 __all__ = [
     "DatabaseManager",
     "ConnectionPool", 
+    "LatencyHistogram",
+    "HeldConnection",
+    "PoolMetrics",
+    "MonitoredQueuePool",
+    "MonitoredNullPool",
+    "AdaptiveQueuePool",
+    "AdaptivePoolPolicy",
+    "ResizeDecision",
     "HealthChecker",
-    "DatabaseConfig"
+    "ReplicaHealthChecker",
+    "Replica",
+    "ReplicaRouter",
+    "DatabaseConfig",
+    "StatementCacheStats",
+    "track_statement_cache"
 ]
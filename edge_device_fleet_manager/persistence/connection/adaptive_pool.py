@@ -0,0 +1,377 @@
+"""
+Adaptive Pool Sizing
+
+A queue pool whose connection limit moves with demand, and the policy
+that moves it. The pool opens at most ``limit`` connections, between a
+floor and the hard cap of ``pool_size + max_overflow``; connections stay
+pooled while they are within the limit instead of being closed on return
+like overflow connections.
+
+The policy raises the limit when checkout waits exceed a target, lowers it
+to the recent peak demand once waits have stayed under target for a
+cool-down, and pre-opens connections up to that recent demand. Every
+resize is logged and kept in a bounded history.
+"""
+
+import asyncio
+import math
+import time
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Deque, Dict, Optional
+
+from sqlalchemy import event, exc, util
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from sqlalchemy.util import greenlet_spawn
+from sqlalchemy.util import queue as sqla_queue
+
+from ...core.logging import get_logger
+from .pool_metrics import LatencyHistogram, _TimedCheckout, checkout_wait
+
+logger = get_logger(__name__)
+
+
+class _LimitedQueuePool(AsyncAdaptedQueuePool):
+    """Async queue pool opening at most ``limit`` connections, adjustable up to a hard cap."""
+
+    def __init__(self, creator, pool_size: int = 5, max_overflow: int = 10, **kw: Any):
+        # The queue holds up to the hard cap; the limit decides how many are opened
+        super().__init__(creator, pool_size=pool_size + max(max_overflow, 0), max_overflow=0, **kw)
+        self._limit = max(pool_size, 1)
+
+    @property
+    def limit(self) -> int:
+        """Connections the pool may currently open."""
+        return self._limit
+
+    @property
+    def max_size(self) -> int:
+        """Hard cap on the limit."""
+        return self._pool.maxsize
+
+    def opened(self) -> int:
+        """Connections currently open, checked out or idle."""
+        return self._pool.maxsize + self._overflow
+
+    def resize(self, limit: int) -> int:
+        """
+        Set the connection limit, closing idle connections above it.
+
+        Connections checked out above a lowered limit are closed when returned.
+
+        Args:
+            limit: New limit, clamped between 1 and the hard cap
+
+        Returns:
+            Number of idle connections closed
+        """
+        self._limit = min(max(limit, 1), self._pool.maxsize)
+        closed = 0
+        while self.opened() > self._limit:
+            try:
+                record = self._pool.get(False)
+            except sqla_queue.Empty:
+                break
+            try:
+                record.close()
+            finally:
+                self._dec_overflow()
+            closed += 1
+        return closed
+
+    def _do_get(self):
+        at_limit = self.opened() >= self._limit
+        try:
+            return self._pool.get(at_limit, self._timeout)
+        except sqla_queue.Empty:
+            pass
+
+        if at_limit:
+            raise exc.TimeoutError(
+                f"Pool limit of {self._limit} connections (hard cap {self._pool.maxsize}) "
+                f"reached, connection timed out, timeout {self._timeout:.2f}",
+                code="3o7r",
+            )
+
+        with self._overflow_lock:
+            creating = self.opened() < self._limit
+            if creating:
+                self._overflow += 1
+        if not creating:
+            # Another checkout took the last slot; wait for a connection instead
+            return self._do_get()
+
+        try:
+            return self._create_connection()
+        except:
+            with util.safe_reraise():
+                self._dec_overflow()
+            raise
+
+    def _do_return_conn(self, record) -> None:
+        with self._overflow_lock:
+            excess = self.opened() > self._limit
+            if excess:
+                self._overflow -= 1
+        if excess:
+            record.close()
+        else:
+            super()._do_return_conn(record)
+
+    def recreate(self) -> '_LimitedQueuePool':
+        pool = super().recreate()
+        pool._limit = self._limit
+        return pool
+
+
+class AdaptiveQueuePool(_TimedCheckout, _LimitedQueuePool):
+    """
+    Async queue pool with an adjustable connection limit and timed checkouts.
+
+    ``pool_size`` is the initial limit and ``pool_size + max_overflow`` the
+    hard cap.
+    """
+
+
+@dataclass
+class ResizeDecision:
+    """A change of the pool's connection limit."""
+    decided_at: datetime
+    old_limit: int
+    new_limit: int
+    reason: str
+    closed: int = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert decision to dictionary."""
+        return {
+            'decided_at': self.decided_at.isoformat(),
+            'old_limit': self.old_limit,
+            'new_limit': self.new_limit,
+            'reason': self.reason,
+            'closed': self.closed,
+        }
+
+
+class AdaptivePoolPolicy:
+    """
+    Resizes an engine's AdaptiveQueuePool from observed checkout waits and demand.
+
+    Each ``evaluate`` closes a window: if the window's p99 checkout wait is
+    over ``target_wait`` the limit grows by ``growth`` of itself, up to the
+    hard cap. Once no window has been over target for ``cool_down`` seconds,
+    the limit shrinks to the peak number of connections in use during that
+    time, but not below ``min_size``. ``start`` warms the pool up and runs
+    ``evaluate`` every ``interval`` seconds.
+    """
+
+    def __init__(self, engine: AsyncEngine, min_size: int = 1, target_wait: float = 0.05,
+                 interval: float = 10.0, cool_down: float = 300.0, growth: float = 0.5):
+        """
+        Initialize the policy.
+
+        Args:
+            engine: Engine whose pool is an AdaptiveQueuePool
+            min_size: Lowest limit shrinking may reach
+            target_wait: p99 checkout wait in seconds above which the pool grows
+            interval: Seconds between evaluations when started
+            cool_down: Seconds without excess waits before the pool shrinks
+            growth: Fraction of the limit added when growing (at least one connection)
+        """
+        self.engine = engine
+        self.min_size = max(min_size, 1)
+        self.target_wait = target_wait
+        self.interval = interval
+        self.cool_down = cool_down
+        self.growth = growth
+        self.window = LatencyHistogram()
+        self.decisions: Deque[ResizeDecision] = deque(maxlen=50)
+        # Peak connections in use per evaluated window, over the cool-down
+        self._demand: Deque[int] = deque(maxlen=max(math.ceil(cool_down / interval), 1))
+        self._in_use = 0
+        self._peak = 0
+        self._calm_since = time.monotonic()
+        self._is_running = False
+        self._task: Optional[asyncio.Task] = None
+
+        target = engine.sync_engine
+        event.listen(target, "checkout", self._on_checkout)
+        event.listen(target, "checkin", self._on_checkin)
+        event.listen(target, "detach", self._on_checkin)
+
+    @property
+    def pool(self) -> Optional[AdaptiveQueuePool]:
+        """The engine's pool, if it can be resized."""
+        pool = self.engine.sync_engine.pool
+        return pool if isinstance(pool, AdaptiveQueuePool) else None
+
+    def recent_demand(self) -> int:
+        """Peak connections in use over the cool-down, including the current window."""
+        return max(max(self._demand, default=0), self._peak)
+
+    def warm_up_target(self) -> int:
+        """Connections to keep open ahead of demand."""
+        target = max(self.min_size, self.recent_demand())
+        pool = self.pool
+        return min(target, pool.limit) if pool else target
+
+    async def start(self) -> None:
+        """Warm the pool up and start periodic evaluation."""
+        if self._is_running:
+            logger.warning("Adaptive pool policy already running")
+            return
+
+        await self.warm_up()
+        self._is_running = True
+        self._task = asyncio.create_task(self._policy_loop())
+        logger.info("Adaptive pool policy started")
+
+    async def stop(self) -> None:
+        """Stop periodic evaluation."""
+        if not self._is_running:
+            return
+
+        self._is_running = False
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+        logger.info("Adaptive pool policy stopped")
+
+    async def _policy_loop(self) -> None:
+        """Main policy loop."""
+        while self._is_running:
+            try:
+                await asyncio.sleep(self.interval)
+                if await self.evaluate() is None:
+                    await self.warm_up()
+
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                logger.error(f"Error in adaptive pool policy loop: {e}")
+
+    async def evaluate(self) -> Optional[ResizeDecision]:
+        """
+        Close the current window and resize the pool if it calls for it.
+
+        Returns:
+            The resize made, if any
+        """
+        now = time.monotonic()
+        waits = self.window.count
+        p99 = self.window.percentile(99)
+        self._demand.append(self._peak)
+        self.window.reset()
+        self._peak = self._in_use
+
+        pool = self.pool
+        if pool is None:
+            return None
+
+        if waits and p99 > self.target_wait:
+            self._calm_since = now
+            if pool.limit >= pool.max_size:
+                logger.warning(
+                    f"Connection pool at hard cap of {pool.max_size}; "
+                    f"p99 checkout wait {p99 * 1000:.1f}ms over target {self.target_wait * 1000:.1f}ms"
+                )
+                return None
+            new_limit = min(pool.max_size, pool.limit + max(1, math.ceil(pool.limit * self.growth)))
+            return await self._resize(pool, new_limit, (
+                f"p99 checkout wait {p99 * 1000:.1f}ms over target {self.target_wait * 1000:.1f}ms"
+            ))
+
+        if now - self._calm_since >= self.cool_down:
+            demand = self.recent_demand()
+            new_limit = max(self.min_size, demand)
+            if new_limit < pool.limit:
+                self._calm_since = now
+                return await self._resize(pool, new_limit, (
+                    f"no checkout wait over target for {self.cool_down:g}s, recent demand {demand}"
+                ))
+        return None
+
+    async def warm_up(self, target: Optional[int] = None) -> int:
+        """
+        Open connections ahead of demand, so bursts do not pay for connecting.
+
+        Args:
+            target: Connections to have open (default: warm_up_target())
+
+        Returns:
+            Number of connections opened
+        """
+        target = self.warm_up_target() if target is None else target
+        pool = self.pool
+        if pool:
+            target = min(target, pool.limit)
+            if pool.opened() >= target:
+                return 0
+            before = pool.opened()
+            # Idle connections are checked out first, so hold enough to open the rest
+            holds = target - pool.checkedout()
+        else:
+            holds = target
+
+        results = await asyncio.gather(
+            *(self._connect() for _ in range(holds)), return_exceptions=True
+        )
+        connected = 0
+        for result in results:
+            if isinstance(result, BaseException):
+                logger.warning(f"Failed to open warm-up connection: {result}")
+            else:
+                await result.close()
+                connected += 1
+
+        opened = pool.opened() - before if pool else connected
+        logger.info(f"Connection pool warmed up to {target} connections ({opened} opened)")
+        return opened
+
+    async def _connect(self):
+        connection = self.engine.connect()
+        await connection.start()
+        return connection
+
+    async def _resize(self, pool: AdaptiveQueuePool, new_limit: int, reason: str) -> ResizeDecision:
+        old_limit = pool.limit
+        # Closing idle connections may need to await the driver
+        closed = await greenlet_spawn(pool.resize, new_limit)
+        decision = ResizeDecision(datetime.now(timezone.utc), old_limit, pool.limit, reason, closed)
+        self.decisions.append(decision)
+        logger.info(
+            f"Connection pool limit {old_limit} -> {pool.limit} ({reason}); "
+            f"closed {closed} idle connections"
+        )
+        return decision
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert policy state to dictionary."""
+        pool = self.pool
+        return {
+            'limit': pool.limit if pool else None,
+            'max_size': pool.max_size if pool else None,
+            'opened': pool.opened() if pool else None,
+            'min_size': self.min_size,
+            'in_use': self._in_use,
+            'recent_demand': self.recent_demand(),
+            'target_wait': self.target_wait,
+            'window_p99_wait': self.window.percentile(99),
+            'decisions': [decision.to_dict() for decision in list(self.decisions)[-10:]],
+        }
+
+    def _on_checkout(self, dbapi_connection, connection_record, connection_proxy) -> None:
+        self._in_use += 1
+        self._peak = max(self._peak, self._in_use)
+        wait = checkout_wait(connection_record)
+        if wait is not None:
+            self.window.record(wait)
+
+    def _on_checkin(self, dbapi_connection, connection_record) -> None:
+        self._in_use = max(self._in_use - 1, 0)
@@ -28,6 +28,15 @@ class DatabaseConfig:
     pool_timeout: int = 30
     pool_recycle: int = 3600
     pool_pre_ping: bool = True
+    # Seconds a connection may stay checked out before it is reported as leaked
+    leak_detection_threshold: float = 300.0
+    
+    # Adaptive pool sizing: pool_size is the initial limit, pool_size + max_overflow the hard cap
+    adaptive_pool_sizing: bool = False
+    pool_min_size: int = 1
+    pool_target_wait: float = 0.05
+    pool_resize_interval: float = 10.0
+    pool_shrink_cool_down: float = 300.0
     
     # Session settings
     autoflush: bool = True
@@ -48,9 +57,15 @@ class DatabaseConfig:
     enable_failover: bool = False
     failover_urls: List[str] = None
     
+    # Read replicas
+    replica_urls: List[str] = None
+    read_your_writes_seconds: float = 5.0
+    max_replica_lag_seconds: Optional[float] = 30.0
+    
     # Performance settings
     statement_timeout: Optional[int] = None
     query_cache_size: int = 500
+    prepared_statement_cache_size: int = 100
     
     # Security settings
     ssl_mode: Optional[str] = None
@@ -62,6 +77,8 @@ class DatabaseConfig:
         """Post-initialization validation and setup."""
         if self.failover_urls is None:
             self.failover_urls = []
+        if self.replica_urls is None:
+            self.replica_urls = []
         
         # Validate configuration
         self.validate()
@@ -99,6 +116,25 @@ class DatabaseConfig:
         if self.pool_recycle <= 0:
             errors.append("Pool recycle must be positive")
         
+        if self.leak_detection_threshold <= 0:
+            errors.append("Leak detection threshold must be positive")
+        
+        # Validate adaptive pool settings
+        if self.pool_min_size <= 0:
+            errors.append("Pool minimum size must be positive")
+        
+        if self.pool_min_size > self.pool_size + self.max_overflow:
+            errors.append("Pool minimum size cannot exceed pool size plus max overflow")
+        
+        if self.pool_target_wait <= 0:
+            errors.append("Pool target wait must be positive")
+        
+        if self.pool_resize_interval <= 0:
+            errors.append("Pool resize interval must be positive")
+        
+        if self.pool_shrink_cool_down < 0:
+            errors.append("Pool shrink cool-down cannot be negative")
+        
         # Validate health check settings
         if self.health_check_interval <= 0:
             errors.append("Health check interval must be positive")
@@ -113,6 +149,13 @@ class DatabaseConfig:
         if self.retry_delay <= 0:
             errors.append("Retry delay must be positive")
         
+        # Validate cache settings
+        if self.query_cache_size < 0:
+            errors.append("Query cache size cannot be negative")
+        
+        if self.prepared_statement_cache_size < 0:
+            errors.append("Prepared statement cache size cannot be negative")
+        
         # Validate failover URLs
         for url in self.failover_urls:
             try:
@@ -122,6 +165,21 @@ class DatabaseConfig:
             except Exception as e:
                 errors.append(f"Invalid failover URL {url}: {e}")
         
+        # Validate replica settings
+        for url in self.replica_urls:
+            try:
+                parsed = urlparse(url)
+                if not parsed.scheme:
+                    errors.append(f"Replica URL must include a scheme: {url}")
+            except Exception as e:
+                errors.append(f"Invalid replica URL {url}: {e}")
+        
+        if self.read_your_writes_seconds < 0:
+            errors.append("Read-your-writes window cannot be negative")
+        
+        if self.max_replica_lag_seconds is not None and self.max_replica_lag_seconds < 0:
+            errors.append("Max replica lag cannot be negative")
+        
         return errors
     
     @classmethod
@@ -141,6 +199,12 @@ class DatabaseConfig:
             pool_timeout=int(os.getenv('DB_POOL_TIMEOUT', cls.pool_timeout)),
             pool_recycle=int(os.getenv('DB_POOL_RECYCLE', cls.pool_recycle)),
             pool_pre_ping=os.getenv('DB_POOL_PRE_PING', 'true').lower() == 'true',
+            leak_detection_threshold=float(os.getenv('DB_LEAK_DETECTION_THRESHOLD', cls.leak_detection_threshold)),
+            adaptive_pool_sizing=os.getenv('DB_ADAPTIVE_POOL_SIZING', 'false').lower() == 'true',
+            pool_min_size=int(os.getenv('DB_POOL_MIN_SIZE', cls.pool_min_size)),
+            pool_target_wait=float(os.getenv('DB_POOL_TARGET_WAIT', cls.pool_target_wait)),
+            pool_resize_interval=float(os.getenv('DB_POOL_RESIZE_INTERVAL', cls.pool_resize_interval)),
+            pool_shrink_cool_down=float(os.getenv('DB_POOL_SHRINK_COOL_DOWN', cls.pool_shrink_cool_down)),
             
             # Session settings
             autoflush=os.getenv('DB_AUTOFLUSH', 'true').lower() == 'true',
@@ -161,9 +225,15 @@ class DatabaseConfig:
             enable_failover=os.getenv('DB_ENABLE_FAILOVER', 'false').lower() == 'true',
             failover_urls=os.getenv('DB_FAILOVER_URLS', '').split(',') if os.getenv('DB_FAILOVER_URLS') else [],
             
+            # Read replicas
+            replica_urls=os.getenv('DB_REPLICA_URLS', '').split(',') if os.getenv('DB_REPLICA_URLS') else [],
+            read_your_writes_seconds=float(os.getenv('DB_READ_YOUR_WRITES_SECONDS', cls.read_your_writes_seconds)),
+            max_replica_lag_seconds=float(os.getenv('DB_MAX_REPLICA_LAG_SECONDS')) if os.getenv('DB_MAX_REPLICA_LAG_SECONDS') else cls.max_replica_lag_seconds,
+            
             # Performance settings
             statement_timeout=int(os.getenv('DB_STATEMENT_TIMEOUT')) if os.getenv('DB_STATEMENT_TIMEOUT') else None,
             query_cache_size=int(os.getenv('DB_QUERY_CACHE_SIZE', cls.query_cache_size)),
+            prepared_statement_cache_size=int(os.getenv('DB_PREPARED_STATEMENT_CACHE_SIZE', cls.prepared_statement_cache_size)),
             
             # Security settings
             ssl_mode=os.getenv('DB_SSL_MODE'),
@@ -267,6 +337,12 @@ class DatabaseConfig:
             'pool_timeout': self.pool_timeout,
             'pool_recycle': self.pool_recycle,
             'pool_pre_ping': self.pool_pre_ping,
+            'leak_detection_threshold': self.leak_detection_threshold,
+            'adaptive_pool_sizing': self.adaptive_pool_sizing,
+            'pool_min_size': self.pool_min_size,
+            'pool_target_wait': self.pool_target_wait,
+            'pool_resize_interval': self.pool_resize_interval,
+            'pool_shrink_cool_down': self.pool_shrink_cool_down,
             'autoflush': self.autoflush,
             'autocommit': self.autocommit,
             'echo_sql': self.echo_sql,
@@ -278,8 +354,12 @@ class DatabaseConfig:
             'retry_delay': self.retry_delay,
             'enable_failover': self.enable_failover,
             'failover_urls': self.failover_urls,
+            'replica_count': len(self.replica_urls),
+            'read_your_writes_seconds': self.read_your_writes_seconds,
+            'max_replica_lag_seconds': self.max_replica_lag_seconds,
             'statement_timeout': self.statement_timeout,
             'query_cache_size': self.query_cache_size,
+            'prepared_statement_cache_size': self.prepared_statement_cache_size,
             'ssl_mode': self.ssl_mode,
         }
     
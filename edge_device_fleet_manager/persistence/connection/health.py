@@ -354,3 +354,39 @@ class HealthChecker:
             f"Avg Response: {self.metrics.average_response_time_ms:.1f}ms | "
             f"Consecutive Failures: {self.metrics.consecutive_failures}"
         )
+
+
+class ReplicaHealthChecker(HealthChecker):
+    """
+    Health checker for a read replica.
+    
+    Besides liveness, it measures replication lag on PostgreSQL standbys so
+    the router can skip replicas that are too far behind. A single failed
+    check takes the replica out of rotation; the next successful one puts it
+    back.
+    """
+    
+    LAG_QUERY = text(
+        "SELECT CASE WHEN pg_is_in_recovery() "
+        "THEN COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) "
+        "ELSE 0 END"
+    )
+    
+    def __init__(self, engine: AsyncEngine, check_interval: int = 60,
+                 timeout: int = 10, failure_threshold: int = 1):
+        super().__init__(engine, check_interval, timeout, failure_threshold)
+        self.lag_seconds: Optional[float] = None
+    
+    async def _execute_health_query(self) -> None:
+        """Execute health check query, recording replication lag where measurable."""
+        async with self.engine.connect() as connection:
+            if connection.dialect.name == 'postgresql':
+                self.lag_seconds = float((await connection.execute(self.LAG_QUERY)).scalar())
+            else:
+                await connection.execute(text("SELECT 1"))
+    
+    def mark_unhealthy(self) -> None:
+        """Take the replica out of rotation until the next successful check."""
+        if self._is_healthy:
+            logger.warning("Replica marked unhealthy after a connection failure")
+        self._is_healthy = False
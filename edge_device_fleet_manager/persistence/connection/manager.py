@@ -13,13 +13,16 @@ from datetime import datetime, timezone
 from sqlalchemy.ext.asyncio import (
     create_async_engine, AsyncEngine, AsyncSession, async_sessionmaker
 )
-from sqlalchemy.pool import QueuePool, NullPool
 from sqlalchemy.exc import SQLAlchemyError, DisconnectionError
 from sqlalchemy import text, event
 
 from ...core.logging import get_logger
 from .config import DatabaseConfig
-from .health import HealthChecker
+from .health import HealthChecker, ReplicaHealthChecker
+from .pool_metrics import MonitoredNullPool, MonitoredQueuePool, PoolMetrics
+from .adaptive_pool import AdaptivePoolPolicy, AdaptiveQueuePool
+from .routing import Replica, ReplicaRouter
+from .statement_cache import StatementCacheStats, track_statement_cache
 
 logger = get_logger(__name__)
 
@@ -30,6 +33,10 @@ class DatabaseManager:
     
     Provides high-level database management including connection pooling,
     health checks, transaction management, and failover capabilities.
+    
+    When replica URLs are configured, sessions requested with
+    ``read_only=True`` are routed to a healthy replica by a ReplicaRouter;
+    all other sessions use the primary.
     """
     
     def __init__(self, config: DatabaseConfig):
@@ -43,6 +50,10 @@ class DatabaseManager:
         self.engine: Optional[AsyncEngine] = None
         self.session_factory: Optional[async_sessionmaker] = None
         self.health_checker: Optional[HealthChecker] = None
+        self.router: Optional[ReplicaRouter] = None
+        self.statement_cache: Optional[StatementCacheStats] = None
+        self.pool_metrics: Optional[PoolMetrics] = None
+        self.pool_policy: Optional[AdaptivePoolPolicy] = None
         self._is_initialized = False
         self._connection_count = 0
         self._transaction_count = 0
@@ -58,38 +69,14 @@ class DatabaseManager:
                 return
             
             # Create async engine with connection pooling
-            engine_kwargs = {
-                'echo': self.config.echo_sql,
-                'echo_pool': self.config.echo_pool,
-                'pool_size': self.config.pool_size,
-                'max_overflow': self.config.max_overflow,
-                'pool_timeout': self.config.pool_timeout,
-                'pool_recycle': self.config.pool_recycle,
-                'pool_pre_ping': self.config.pool_pre_ping,
-            }
-            
-            # Use NullPool for SQLite, QueuePool for others
-            if self.config.database_url.startswith('sqlite'):
-                engine_kwargs['poolclass'] = NullPool
-                # Remove pool-specific settings for SQLite
-                for key in ['pool_size', 'max_overflow', 'pool_timeout', 'pool_recycle']:
-                    engine_kwargs.pop(key, None)
-            else:
-                engine_kwargs['poolclass'] = QueuePool
-            
-            self.engine = create_async_engine(
-                self.config.database_url,
-                **engine_kwargs
-            )
+            self.engine = self._create_engine(self.config.database_url)
+            self.statement_cache = track_statement_cache(self.engine)
+            self.pool_metrics = PoolMetrics(
+                leak_threshold=self.config.leak_detection_threshold
+            ).attach(self.engine)
             
             # Create session factory
-            self.session_factory = async_sessionmaker(
-                bind=self.engine,
-                class_=AsyncSession,
-                expire_on_commit=False,
-                autoflush=self.config.autoflush,
-                autocommit=False
-            )
+            self.session_factory = self._create_session_factory(self.engine)
             
             # Initialize health checker
             self.health_checker = HealthChecker(
@@ -105,6 +92,19 @@ class DatabaseManager:
             if self.config.enable_health_checks:
                 await self.health_checker.start()
             
+            if isinstance(self.engine.sync_engine.pool, AdaptiveQueuePool):
+                self.pool_policy = AdaptivePoolPolicy(
+                    self.engine,
+                    min_size=self.config.pool_min_size,
+                    target_wait=self.config.pool_target_wait,
+                    interval=self.config.pool_resize_interval,
+                    cool_down=self.config.pool_shrink_cool_down
+                )
+                await self.pool_policy.start()
+            
+            if self.config.replica_urls:
+                await self._initialize_replicas()
+            
             self._is_initialized = True
             logger.info("Database manager initialized successfully")
             
@@ -122,16 +122,103 @@ class DatabaseManager:
             if self.health_checker:
                 await self.health_checker.stop()
             
+            if self.pool_policy:
+                await self.pool_policy.stop()
+                self.pool_policy = None
+            
             # Close engine
             if self.engine:
                 await self.engine.dispose()
             
+            if self.router:
+                for replica in self.router.replicas:
+                    await replica.health_checker.stop()
+                    await replica.engine.dispose()
+                self.router = None
+            
             self._is_initialized = False
             logger.info("Database manager shutdown completed")
             
         except Exception as e:
             logger.error(f"Error during database manager shutdown: {e}")
     
+    def _create_engine(self, url: str) -> AsyncEngine:
+        """Create an async engine with the configured pooling."""
+        engine_kwargs = {
+            'echo': self.config.echo_sql,
+            'echo_pool': self.config.echo_pool,
+            'pool_size': self.config.pool_size,
+            'max_overflow': self.config.max_overflow,
+            'pool_timeout': self.config.pool_timeout,
+            'pool_recycle': self.config.pool_recycle,
+            'pool_pre_ping': self.config.pool_pre_ping,
+            # Size of SQLAlchemy's compiled SQL cache
+            'query_cache_size': self.config.query_cache_size,
+        }
+        
+        # Use NullPool for SQLite, a queue pool for others; both time checkouts for PoolMetrics
+        if url.startswith('sqlite'):
+            engine_kwargs['poolclass'] = MonitoredNullPool
+            # Remove pool-specific settings for SQLite
+            for key in ['pool_size', 'max_overflow', 'pool_timeout', 'pool_recycle']:
+                engine_kwargs.pop(key, None)
+        elif self.config.adaptive_pool_sizing:
+            engine_kwargs['poolclass'] = AdaptiveQueuePool
+        else:
+            engine_kwargs['poolclass'] = MonitoredQueuePool
+        
+        # asyncpg prepares every statement; keep them per connection for reuse
+        if url.startswith(('postgresql+asyncpg', 'postgres+asyncpg')):
+            engine_kwargs['connect_args'] = {
+                'prepared_statement_cache_size': self.config.prepared_statement_cache_size
+            }
+        
+        return create_async_engine(url, **engine_kwargs)
+    
+    def _create_session_factory(self, engine: AsyncEngine) -> async_sessionmaker:
+        """Create a session factory bound to an engine."""
+        return async_sessionmaker(
+            bind=engine,
+            class_=AsyncSession,
+            expire_on_commit=False,
+            autoflush=self.config.autoflush,
+            autocommit=False
+        )
+    
+    async def _initialize_replicas(self) -> None:
+        """Create replica engines, check them once and start their monitoring."""
+        replicas = []
+        for url in self.config.replica_urls:
+            engine = self._create_engine(url)
+            checker = ReplicaHealthChecker(
+                engine,
+                check_interval=self.config.health_check_interval,
+                timeout=self.config.health_check_timeout
+            )
+            replica = Replica(url, engine, self._create_session_factory(engine), checker)
+            self._setup_replica_listeners(replica)
+            
+            # Route around replicas that are down from the start
+            await checker.force_check()
+            if self.config.enable_health_checks:
+                await checker.start()
+            replicas.append(replica)
+        
+        self.router = ReplicaRouter(
+            replicas,
+            read_your_writes_seconds=self.config.read_your_writes_seconds,
+            max_lag_seconds=self.config.max_replica_lag_seconds
+        )
+        healthy = sum(replica.health_checker.is_healthy() for replica in replicas)
+        logger.info(f"Read replica routing enabled ({healthy}/{len(replicas)} replicas healthy)")
+    
+    def _setup_replica_listeners(self, replica: Replica) -> None:
+        """Take a replica out of rotation as soon as it drops a connection."""
+        @event.listens_for(replica.engine.sync_engine, "handle_error")
+        def on_error(exception_context):
+            if exception_context.is_disconnect:
+                replica.health_checker.mark_unhealthy()
+    
     def _setup_event_listeners(self) -> None:
         """Setup SQLAlchemy event listeners for monitoring."""
         if not self.engine:
@@ -156,10 +243,14 @@ class DatabaseManager:
             logger.error(f"Database error occurred: {exception_context.original_exception}")
     
     @asynccontextmanager
-    async def get_session(self) -> AsyncGenerator[AsyncSession, None]:
+    async def get_session(self, read_only: bool = False) -> AsyncGenerator[AsyncSession, None]:
         """
         Get database session with automatic cleanup.
         
+        Args:
+            read_only: Route the session to a read replica when one is
+                available and the current context has not written recently
+        
         Yields:
             AsyncSession instance
         """
@@ -169,7 +260,14 @@ class DatabaseManager:
         if not self.session_factory:
             raise RuntimeError("Session factory not available")
         
-        session = self.session_factory()
+        replica = self.router.choose_replica() if read_only and self.router else None
+        if replica:
+            session = replica.session_factory()
+        else:
+            session = self.session_factory()
+            if self.router:
+                # Commits on the primary keep this context's reads there for a while
+                event.listen(session.sync_session, "after_commit", self.router.record_write)
         try:
             yield session
         except Exception as e:
@@ -179,6 +277,15 @@ class DatabaseManager:
         finally:
             await session.close()
     
+    def get_read_session(self):
+        """
+        Get a read-only session, routed to a replica when possible.
+        
+        Returns:
+            Async context manager yielding an AsyncSession
+        """
+        return self.get_session(read_only=True)
+    
     @asynccontextmanager
     async def get_transaction(self) -> AsyncGenerator[AsyncSession, None]:
         """
@@ -273,6 +380,9 @@ class DatabaseManager:
                 health_info = await self.health_checker.get_status()
                 info['health_status'] = health_info
             
+            if self.router:
+                info['replication'] = self.router.get_status()
+            
             return info
             
         except Exception as e:
@@ -297,7 +407,9 @@ class DatabaseManager:
                     'pool_size': self.config.pool_size,
                     'max_overflow': self.config.max_overflow,
                     'pool_timeout': self.config.pool_timeout,
-                    'pool_recycle': self.config.pool_recycle
+                    'pool_recycle': self.config.pool_recycle,
+                    'query_cache_size': self.config.query_cache_size,
+                    'prepared_statement_cache_size': self.config.prepared_statement_cache_size
                 },
                 'health': {
                     'checks_enabled': self.config.enable_health_checks,
@@ -306,6 +418,23 @@ class DatabaseManager:
                 }
             }
             
+            if self.statement_cache:
+                stats['statement_cache'] = self.statement_cache.to_dict()
+            
+            if self.pool_metrics:
+                stats['pool_metrics'] = self.pool_metrics.to_dict()
+                stats['pool_metrics']['leaked'] = [
+                    {
+                        'connection_id': leaked.connection_id,
+                        'checked_out_at': leaked.checked_out_at.isoformat(),
+                        'held_seconds': leaked.held_seconds
+                    }
+                    for leaked in self.pool_metrics.check_leaks()
+                ]
+            
+            if self.pool_policy:
+                stats['pool_policy'] = self.pool_policy.to_dict()
+            
             # Add health check statistics
             if self.health_checker:
                 health_stats = await self.health_checker.get_statistics()
@@ -315,11 +444,11 @@ class DatabaseManager:
             if self.engine and hasattr(self.engine, 'pool'):
                 pool = self.engine.pool
                 stats['pool'] = {
-                    'checked_in': pool.checkedin(),
-                    'checked_out': pool.checkedout(),
-                    'overflow': pool.overflow(),
-                    'invalid': pool.invalid(),
-                    'size': pool.size()
+                    'checked_in': getattr(pool, 'checkedin', lambda: 'N/A')(),
+                    'checked_out': getattr(pool, 'checkedout', lambda: 'N/A')(),
+                    'overflow': getattr(pool, 'overflow', lambda: 'N/A')(),
+                    'invalid': getattr(pool, 'invalid', lambda: 'N/A')(),
+                    'size': getattr(pool, 'size', lambda: 'N/A')()
                 }
             
             return stats
@@ -15,6 +15,8 @@ from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
 from sqlalchemy.pool import QueuePool, StaticPool, NullPool
 
 from ...core.logging import get_logger
+from .pool_metrics import DEFAULT_LEAK_THRESHOLD, PoolMetrics
+from .adaptive_pool import AdaptivePoolPolicy
 
 logger = get_logger(__name__)
 
@@ -25,15 +27,22 @@ class ConnectionPool:
     
     Provides connection pooling with health monitoring, load balancing,
     and comprehensive connection lifecycle management.
+    
+    Wait and hold times come from pool events through PoolMetrics; waits
+    are only measured when the engine uses a monitored pool class.
     """
     
-    def __init__(self, engine: AsyncEngine, pool_config: Optional[Dict[str, Any]] = None):
+    def __init__(self, engine: AsyncEngine, pool_config: Optional[Dict[str, Any]] = None,
+                 metrics: Optional[PoolMetrics] = None,
+                 policy: Optional[AdaptivePoolPolicy] = None):
         """
         Initialize connection pool.
         
         Args:
             engine: Async SQLAlchemy engine
             pool_config: Pool configuration options
+            metrics: Metrics already attached to the engine (default: attach new ones)
+            policy: Adaptive sizing policy of the engine's pool, used for warm-up
         """
         self.engine = engine
         self.pool_config = pool_config or {}
@@ -46,10 +55,12 @@ class ConnectionPool:
             'connections_closed': 0,
             'connections_failed': 0,
             'peak_connections': 0,
-            'total_requests': 0,
-            'average_wait_time': 0.0
+            'total_requests': 0
         }
-        self._wait_times = []
+        self.metrics = metrics or PoolMetrics(
+            leak_threshold=self.pool_config.get('leak_threshold', DEFAULT_LEAK_THRESHOLD)
+        ).attach(engine)
+        self.policy = policy
         self.logger = get_logger(f"{__name__}.ConnectionPool")
     
     @asynccontextmanager
@@ -60,7 +71,6 @@ class ConnectionPool:
         Yields:
             Database connection
         """
-        start_time = time.time()
         connection = None
         
         try:
@@ -78,14 +88,6 @@ class ConnectionPool:
             if self._active_connections > self._pool_statistics['peak_connections']:
                 self._pool_statistics['peak_connections'] = self._active_connections
             
-            # Calculate wait time
-            wait_time = time.time() - start_time
-            self._wait_times.append(wait_time)
-            if len(self._wait_times) > 100:  # Keep last 100 measurements
-                self._wait_times.pop(0)
-            
-            self._pool_statistics['average_wait_time'] = sum(self._wait_times) / len(self._wait_times)
-            
             self.logger.debug(f"Connection acquired (active: {self._active_connections})")
             
             yield connection
@@ -151,7 +153,9 @@ class ConnectionPool:
             'connection_errors': self._connection_errors,
             'last_error_time': self._last_error_time.isoformat() if self._last_error_time else None,
             'pool_info': pool_info,
-            'statistics': self._pool_statistics.copy()
+            'statistics': self._pool_statistics.copy(),
+            'leaked_connections': len(self.metrics.check_leaks()),
+            'metrics': self.metrics.to_dict()
         }
     
     def get_pool_statistics(self) -> Dict[str, Any]:
@@ -163,6 +167,12 @@ class ConnectionPool:
         """
         stats = self._pool_statistics.copy()
         
+        # Checkout waits from the pool events
+        stats['average_wait_time'] = self.metrics.wait.mean
+        stats['p50_wait_time'] = self.metrics.wait.percentile(50)
+        stats['p99_wait_time'] = self.metrics.wait.percentile(99)
+        stats['max_wait_time'] = self.metrics.wait.max
+        
         # Calculate additional metrics
         if stats['total_requests'] > 0:
             stats['error_rate'] = (stats['connections_failed'] / stats['total_requests']) * 100
@@ -189,10 +199,9 @@ class ConnectionPool:
             'connections_closed': 0,
             'connections_failed': 0,
             'peak_connections': 0,
-            'total_requests': 0,
-            'average_wait_time': 0.0
+            'total_requests': 0
         }
-        self._wait_times = []
+        self.metrics.reset()
         self._connection_errors = 0
         self._last_error_time = None
         
@@ -216,16 +225,25 @@ class ConnectionPool:
             self.logger.error(f"Pool health check failed: {e}")
             return False
     
-    async def warm_up_pool(self, target_connections: int = 3) -> int:
+    async def warm_up_pool(self, target_connections: Optional[int] = None) -> int:
         """
         Warm up the connection pool by creating initial connections.
         
+        With an adaptive policy, the pool is filled up to its recent demand
+        (or ``target_connections``) and connections already open count.
+        
         Args:
-            target_connections: Number of connections to create
+            target_connections: Number of connections to create (default: recent
+                demand with a policy, 3 otherwise)
             
         Returns:
             Number of connections successfully created
         """
+        if self.policy:
+            return await self.policy.warm_up(target_connections)
+        
+        if target_connections is None:
+            target_connections = 3
         created_connections = 0
         
         self.logger.info(f"Warming up pool with {target_connections} connections")
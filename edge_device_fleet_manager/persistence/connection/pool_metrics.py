@@ -0,0 +1,306 @@
+"""
+Pool Metrics
+
+Connection pool instrumentation driven by SQLAlchemy pool events. Checkout
+waits and hold times go into fixed-size histograms, so a long-running
+process keeps constant memory however many connections it checks out, and
+connections held past a threshold are reported as suspected leaks.
+
+Pool events fire only once a connection has been obtained, so the time
+spent waiting for it is measured by the monitored pool classes below and
+handed to the checkout event on the connection record. Engines using other
+pool classes still get hold times, counters and leak detection.
+"""
+
+import math
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Union
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool
+
+from ...core.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Key of a checkout's wait in the connection record's info dictionary
+_WAIT_KEY = "pool_wait"
+
+# Seconds a connection may stay checked out before it is reported as leaked
+DEFAULT_LEAK_THRESHOLD = 300.0
+
+
+class LatencyHistogram:
+    """
+    Fixed-size histogram of durations with bounded relative error.
+
+    Durations are counted in microseconds. Values below ``2**precision_bits``
+    get a bucket each; above that, every power of two is split into
+    ``2**(precision_bits - 1)`` equal buckets, as in HDR histograms, so a
+    reported percentile is within about ``2**(1 - precision_bits)`` of the
+    true value (1.6% by default). Durations above ``max_seconds`` are
+    counted in the last bucket; the exact maximum is kept separately.
+    """
+
+    def __init__(self, max_seconds: float = 3600.0, precision_bits: int = 7):
+        """
+        Initialize the histogram.
+
+        Args:
+            max_seconds: Largest duration resolved by the buckets
+            precision_bits: Bits of precision kept per value
+        """
+        self._sub_bits = precision_bits
+        self._linear = 1 << precision_bits
+        self._half = self._linear >> 1
+        self._max_units = max(int(max_seconds * 1_000_000), self._linear)
+        self._counts = [0] * (self._index(self._max_units) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.min = 0.0
+        self.max = 0.0
+
+    def _index(self, units: int) -> int:
+        if units < self._linear:
+            return units
+        shift = units.bit_length() - self._sub_bits
+        return self._linear + (shift - 1) * self._half + (units >> shift) - self._half
+
+    def _highest_value(self, index: int) -> int:
+        """Largest value in microseconds counted in a bucket."""
+        if index < self._linear:
+            return index
+        shift = (index - self._linear) // self._half + 1
+        top = (index - self._linear) % self._half + self._half
+        return ((top + 1) << shift) - 1
+
+    def record(self, seconds: float) -> None:
+        """Count one duration."""
+        seconds = max(seconds, 0.0)
+        units = min(int(seconds * 1_000_000), self._max_units)
+        self._counts[self._index(units)] += 1
+        if not self.count or seconds < self.min:
+            self.min = seconds
+        self.max = max(self.max, seconds)
+        self.count += 1
+        self.total += seconds
+
+    @property
+    def mean(self) -> float:
+        """Mean duration in seconds."""
+        return self.total / self.count if self.count else 0.0
+
+    def percentile(self, percent: float) -> float:
+        """
+        Duration in seconds that ``percent`` of the recorded durations do not exceed.
+
+        Args:
+            percent: Percentile between 0 and 100
+
+        Returns:
+            Upper bound of the bucket holding the percentile, capped at the maximum
+        """
+        if not self.count:
+            return 0.0
+        rank = max(math.ceil(self.count * min(max(percent, 0.0), 100.0) / 100.0), 1)
+        seen = 0
+        for index, count in enumerate(self._counts):
+            seen += count
+            if seen >= rank:
+                if index == len(self._counts) - 1:
+                    # The last bucket also counts every duration beyond its range
+                    return self.max
+                return min(self._highest_value(index) / 1_000_000, self.max)
+        return self.max
+
+    def reset(self) -> None:
+        """Clear all counts."""
+        self._counts = [0] * len(self._counts)
+        self.count = 0
+        self.total = self.min = self.max = 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert the histogram summary to a dictionary, in seconds."""
+        return {
+            'count': self.count,
+            'mean': self.mean,
+            'p50': self.percentile(50),
+            'p90': self.percentile(90),
+            'p99': self.percentile(99),
+            'max': self.max,
+        }
+
+
+@dataclass
+class HeldConnection:
+    """A connection checked out for longer than the leak threshold."""
+    connection_id: int
+    checked_out_at: datetime
+    held_seconds: float
+
+
+def checkout_wait(connection_record) -> Optional[float]:
+    """
+    Seconds the latest checkout of a connection record waited for it.
+
+    Only monitored pools measure waits; the value stays on the record for
+    every checkout listener until the next checkout replaces it.
+    """
+    return connection_record.info.get(_WAIT_KEY)
+
+
+class _TimedCheckout:
+    """Pool mixin passing the time ``_do_get`` took to the checkout event."""
+
+    def _do_get(self):
+        start = time.perf_counter()
+        record = super()._do_get()
+        record.info[_WAIT_KEY] = time.perf_counter() - start
+        return record
+
+
+class MonitoredQueuePool(_TimedCheckout, AsyncAdaptedQueuePool):
+    """Async queue pool whose checkout waits are recorded by PoolMetrics."""
+
+
+class MonitoredNullPool(_TimedCheckout, NullPool):
+    """Non-pooling pool whose connection times are recorded by PoolMetrics as waits."""
+
+
+class PoolMetrics:
+    """
+    Connection pool metrics collected from pool events.
+
+    ``attach`` registers listeners for checkout, checkin, connect,
+    invalidate and detach on an engine; they survive ``engine.dispose()``.
+    Memory use is fixed: two histograms plus one entry per connection
+    currently checked out.
+    """
+
+    def __init__(self, leak_threshold: float = DEFAULT_LEAK_THRESHOLD):
+        """
+        Initialize pool metrics.
+
+        Args:
+            leak_threshold: Seconds after which a checked-out connection is reported as leaked
+        """
+        self.leak_threshold = leak_threshold
+        self.wait = LatencyHistogram()
+        self.hold = LatencyHistogram()
+        self.checkouts = 0
+        self.checkins = 0
+        self.connects = 0
+        self.invalidations = 0
+        self.leaks_detected = 0
+        # id(connection record) -> [checkout perf_counter, checkout time, reported as leaked]
+        self._held: Dict[int, List[Any]] = {}
+        self._lock = threading.Lock()
+
+    def attach(self, engine: Union[AsyncEngine, Engine]) -> 'PoolMetrics':
+        """
+        Start collecting metrics for an engine's pool.
+
+        Args:
+            engine: Engine to monitor
+
+        Returns:
+            These metrics
+        """
+        target = engine.sync_engine if isinstance(engine, AsyncEngine) else engine
+        event.listen(target, "checkout", self._on_checkout)
+        event.listen(target, "checkin", self._on_checkin)
+        event.listen(target, "connect", self._on_connect)
+        event.listen(target, "invalidate", self._on_invalidate)
+        event.listen(target, "detach", self._on_detach)
+        return self
+
+    @property
+    def checked_out(self) -> int:
+        """Connections currently checked out."""
+        return len(self._held)
+
+    def check_leaks(self) -> List[HeldConnection]:
+        """
+        Connections held longer than the leak threshold, longest first.
+
+        Each is logged as a warning the first time it is found.
+
+        Returns:
+            Suspected leaked connections
+        """
+        now = time.perf_counter()
+        leaked = []
+        with self._lock:
+            for connection_id, held in self._held.items():
+                held_seconds = now - held[0]
+                if held_seconds < self.leak_threshold:
+                    continue
+                if not held[2]:
+                    held[2] = True
+                    self.leaks_detected += 1
+                    logger.warning(
+                        f"Connection {connection_id:#x} checked out at {held[1].isoformat()} "
+                        f"held for {held_seconds:.1f}s; possible leak"
+                    )
+                leaked.append(HeldConnection(connection_id, held[1], held_seconds))
+        return sorted(leaked, key=lambda connection: connection.held_seconds, reverse=True)
+
+    def reset(self) -> None:
+        """Reset histograms and counters; connections still checked out stay tracked."""
+        with self._lock:
+            self.wait.reset()
+            self.hold.reset()
+            self.checkouts = self.checkins = self.connects = 0
+            self.invalidations = self.leaks_detected = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert metrics to dictionary."""
+        with self._lock:
+            return {
+                'checkouts': self.checkouts,
+                'checkins': self.checkins,
+                'connects': self.connects,
+                'invalidations': self.invalidations,
+                'checked_out': len(self._held),
+                'leaks_detected': self.leaks_detected,
+                'wait': self.wait.to_dict(),
+                'hold': self.hold.to_dict(),
+            }
+
+    def _on_checkout(self, dbapi_connection, connection_record, connection_proxy) -> None:
+        wait = checkout_wait(connection_record)
+        with self._lock:
+            self.checkouts += 1
+            if wait is not None:
+                self.wait.record(wait)
+            self._held[id(connection_record)] = [
+                time.perf_counter(), datetime.now(timezone.utc), False
+            ]
+
+    def _on_checkin(self, dbapi_connection, connection_record) -> None:
+        with self._lock:
+            self.checkins += 1
+            held = self._held.pop(id(connection_record), None)
+            if held is not None:
+                self.hold.record(time.perf_counter() - held[0])
+        if held is not None and held[2]:
+            logger.info(f"Connection {id(connection_record):#x} reported as leaked was returned")
+
+    def _on_connect(self, dbapi_connection, connection_record) -> None:
+        with self._lock:
+            self.connects += 1
+
+    def _on_invalidate(self, dbapi_connection, connection_record, exception) -> None:
+        with self._lock:
+            self.invalidations += 1
+        logger.debug(f"Pooled connection invalidated: {exception}")
+
+    def _on_detach(self, dbapi_connection, connection_record) -> None:
+        # Detached connections leave the pool and are never checked in
+        with self._lock:
+            self._held.pop(id(connection_record), None)
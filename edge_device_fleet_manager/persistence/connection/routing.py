@@ -0,0 +1,137 @@
+"""
+Read Replica Routing
+
+Routes read-only sessions to healthy read replicas and everything else to
+the primary, keeping reads that follow a write on the primary until the
+replicas can be expected to have caught up.
+"""
+
+import itertools
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker
+
+from ...core.logging import get_logger
+from .health import ReplicaHealthChecker
+
+logger = get_logger(__name__)
+
+_router_ids = itertools.count()
+
+
+@dataclass
+class Replica:
+    """A read replica and its health checker."""
+    url: str
+    engine: AsyncEngine
+    session_factory: async_sessionmaker
+    health_checker: ReplicaHealthChecker
+    
+    @property
+    def lag_seconds(self) -> Optional[float]:
+        """Last measured replication lag, None where it cannot be measured."""
+        return self.health_checker.lag_seconds
+    
+    def is_available(self, max_lag_seconds: Optional[float] = None) -> bool:
+        """Whether the replica is healthy and not lagging beyond the limit."""
+        if not self.health_checker.is_healthy():
+            return False
+        lag = self.lag_seconds
+        return max_lag_seconds is None or lag is None or lag <= max_lag_seconds
+
+
+class ReplicaRouter:
+    """
+    Routing policy for read-only sessions.
+    
+    Reads are spread round-robin over available replicas. After a write is
+    recorded, reads from the same context (asyncio task, or the task that
+    spawned it) stay on the primary for the read-your-writes window: the
+    configured minimum or the largest measured replica lag, whichever is
+    longer. When no replica is available reads fail over to the primary.
+    """
+    
+    def __init__(self, replicas: List[Replica],
+                 read_your_writes_seconds: float = 5.0,
+                 max_lag_seconds: Optional[float] = None):
+        """
+        Initialize the router.
+        
+        Args:
+            replicas: Replicas to route reads to
+            read_your_writes_seconds: Minimum time reads stay on the primary after a write
+            max_lag_seconds: Replicas lagging further behind are skipped
+        """
+        self.replicas = replicas
+        self.read_your_writes_seconds = read_your_writes_seconds
+        self.max_lag_seconds = max_lag_seconds
+        self._last_write: ContextVar[Optional[float]] = ContextVar(
+            f"replica_router_last_write_{next(_router_ids)}", default=None
+        )
+        self._position = 0
+        self.stats = {'replica_reads': 0, 'sticky_reads': 0, 'failover_reads': 0}
+    
+    def record_write(self, *args: Any) -> None:
+        """
+        Record a write in the current context.
+        
+        Accepts and ignores event arguments so it can be registered directly
+        as a session ``after_commit`` listener.
+        """
+        self._last_write.set(time.monotonic())
+    
+    def sticky_window(self) -> float:
+        """Seconds reads stay on the primary after a write."""
+        lags = [replica.lag_seconds for replica in self.replicas if replica.lag_seconds is not None]
+        return max([self.read_your_writes_seconds, *lags])
+    
+    def is_sticky(self) -> bool:
+        """Whether the current context wrote recently enough to need the primary."""
+        last_write = self._last_write.get()
+        return last_write is not None and time.monotonic() - last_write < self.sticky_window()
+    
+    def choose_replica(self) -> Optional[Replica]:
+        """
+        Pick the replica for a read-only session.
+        
+        Returns:
+            The replica to read from, or None to read from the primary
+        """
+        if self.is_sticky():
+            self.stats['sticky_reads'] += 1
+            return None
+        
+        for offset in range(len(self.replicas)):
+            replica = self.replicas[(self._position + offset) % len(self.replicas)]
+            if replica.is_available(self.max_lag_seconds):
+                self._position = (self._position + offset + 1) % len(self.replicas)
+                self.stats['replica_reads'] += 1
+                return replica
+        
+        self.stats['failover_reads'] += 1
+        logger.debug("No replica available, reading from the primary")
+        return None
+    
+    def get_status(self) -> Dict[str, Any]:
+        """
+        Get routing status.
+        
+        Returns:
+            Dictionary with per-replica health and lag and routing counters
+        """
+        return {
+            'replicas': [
+                {
+                    'is_healthy': replica.health_checker.is_healthy(),
+                    'is_available': replica.is_available(self.max_lag_seconds),
+                    'lag_seconds': replica.lag_seconds,
+                }
+                for replica in self.replicas
+            ],
+            'read_your_writes_seconds': self.read_your_writes_seconds,
+            'max_lag_seconds': self.max_lag_seconds,
+            **self.stats,
+        }
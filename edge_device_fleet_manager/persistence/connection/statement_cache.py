@@ -0,0 +1,84 @@
+"""
+Statement Cache Monitoring
+
+Tracks how often SQLAlchemy serves compiled SQL from an engine's compiled
+cache, so hot queries that miss the cache (e.g. because they embed literal
+values or are rebuilt with a varying shape) show up in the statistics.
+"""
+
+from dataclasses import dataclass
+from typing import Any, Dict
+
+from sqlalchemy import event
+from sqlalchemy.engine.default import (
+    CACHE_HIT, CACHE_MISS, CACHING_DISABLED, NO_CACHE_KEY, NO_DIALECT_SUPPORT
+)
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+_OUTCOMES = {
+    CACHE_HIT: 'hits',
+    CACHE_MISS: 'misses',
+    CACHING_DISABLED: 'disabled',
+    NO_CACHE_KEY: 'uncacheable',
+    NO_DIALECT_SUPPORT: 'uncacheable',
+}
+
+
+@dataclass
+class StatementCacheStats:
+    """Compiled-statement cache outcomes for the statements an engine executed."""
+
+    hits: int = 0
+    misses: int = 0
+    disabled: int = 0
+    uncacheable: int = 0
+
+    @property
+    def lookups(self) -> int:
+        """Executions that consulted the compiled cache."""
+        return self.hits + self.misses
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of cache lookups served without compiling."""
+        return self.hits / self.lookups if self.lookups else 0.0
+
+    def record(self, outcome: Any) -> None:
+        """Count one execution's cache outcome."""
+        name = _OUTCOMES.get(outcome)
+        if name:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def reset(self) -> None:
+        """Reset all counters."""
+        self.hits = self.misses = self.disabled = self.uncacheable = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert statistics to dictionary."""
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'disabled': self.disabled,
+            'uncacheable': self.uncacheable,
+            'hit_rate': self.hit_rate,
+        }
+
+
+def track_statement_cache(engine: AsyncEngine) -> StatementCacheStats:
+    """
+    Start counting compiled-cache outcomes for every statement an engine executes.
+
+    Args:
+        engine: Engine to monitor
+
+    Returns:
+        Statistics updated as statements execute
+    """
+    stats = StatementCacheStats()
+
+    @event.listens_for(engine.sync_engine, "after_cursor_execute")
+    def on_execute(conn, cursor, statement, parameters, context, executemany):
+        if context is not None:
+            stats.record(context.cache_hit)
+
+    return stats
@@ -11,16 +11,19 @@ Key Features:
 - Schema validation and integrity checks
 - Multi-environment support
 - Backup and restore capabilities
+- Search index (pg_trgm / FTS5) operations
 """
 
 from .manager import MigrationManager
 from .migrator import DatabaseMigrator
 from .utils import MigrationUtils
 from .validators import SchemaValidator
+from . import search_indexes
 
 __all__ = [
     "MigrationManager",
     "DatabaseMigrator", 
     "MigrationUtils",
-    "SchemaValidator"
+    "SchemaValidator",
+    "search_indexes",
 ]
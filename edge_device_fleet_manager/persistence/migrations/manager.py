@@ -24,6 +24,7 @@ from sqlalchemy.exc import SQLAlchemyError
 
 from ...core.logging import get_logger
 from ..models.base import Base
+from . import search_indexes
 
 logger = get_logger(__name__)
 
@@ -144,6 +145,7 @@ from alembic import context
 # Import all models to ensure they're registered with SQLAlchemy
 from edge_device_fleet_manager.persistence.models.base import Base
 from edge_device_fleet_manager.persistence.models import *
+from edge_device_fleet_manager.persistence.migrations.search_indexes import include_object
 
 # Alembic Config object
 config = context.config
@@ -166,6 +168,7 @@ def run_migrations_offline() -> None:
         dialect_opts={"paramstyle": "named"},
         compare_type=True,
         compare_server_default=True,
+        include_object=include_object,
     )
 
     with context.begin_transaction():
@@ -186,6 +189,7 @@ def run_migrations_online() -> None:
             target_metadata=target_metadata,
             compare_type=True,
             compare_server_default=True,
+            include_object=include_object,
         )
 
         with context.begin_transaction():
@@ -239,6 +243,35 @@ else:
             logger.error(f"Failed to generate migration: {e}")
             raise
     
+    def generate_search_index_migration(self) -> str:
+        """
+        Write a migration creating the search indexes on top of the current head.
+        
+        The indexes are dialect-specific DDL that autogenerate cannot derive
+        from the models, so the revision calls ``search_indexes`` instead.
+        
+        Returns:
+            Revision ID of the new migration
+        """
+        try:
+            script_dir = ScriptDirectory.from_config(self.alembic_cfg)
+            down_revision = script_dir.get_current_head()
+            now = datetime.now(timezone.utc)
+            revision = now.strftime("%Y%m%d%H%M%S")
+            
+            path = Path(script_dir.versions) / f"{now:%Y%m%d_%H%M}_{revision}_add_search_indexes.py"
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(search_indexes.REVISION_TEMPLATE.format(
+                revision=revision, down_revision=down_revision, create_date=now.isoformat()
+            ))
+            
+            logger.info(f"Generated migration: {revision} - add search indexes")
+            return revision
+            
+        except Exception as e:
+            logger.error(f"Failed to generate search index migration: {e}")
+            raise
+    
     def apply_migrations(self, target_revision: Optional[str] = None) -> None:
         """
         Apply migrations to the database.
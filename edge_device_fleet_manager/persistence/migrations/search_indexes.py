@@ -0,0 +1,94 @@
+"""
+Search Index Migrations
+
+Alembic operations creating and dropping the search indexes of
+``repositories.search``: ``pg_trgm`` GIN indexes on PostgreSQL and FTS5
+tables with their sync triggers on SQLite. Revisions call ``upgrade`` and
+``downgrade`` with their ``op``; ``include_object`` keeps autogenerate from
+proposing to drop these objects, which the models do not declare.
+"""
+
+from typing import Optional, Sequence
+
+from ...core.logging import get_logger
+from ..repositories.search import (
+    SEARCH_FIELDS, create_statements, drop_statements, fts_table_name, trigram_index_name
+)
+
+logger = get_logger(__name__)
+
+# Shadow tables SQLite creates for each FTS5 table
+_FTS5_SHADOW_SUFFIXES = ("", "_data", "_idx", "_docsize", "_config", "_content")
+
+REVISION_TEMPLATE = '''"""
+Add search indexes
+
+Revision ID: {revision}
+Revises: {down_revision}
+Create Date: {create_date}
+
+"""
+from edge_device_fleet_manager.persistence.migrations import search_indexes
+
+
+# revision identifiers, used by Alembic.
+revision = '{revision}'
+down_revision = {down_revision!r}
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Create pg_trgm indexes (PostgreSQL) or FTS5 tables (SQLite) for search."""
+    from alembic import op
+    search_indexes.upgrade(op)
+
+
+def downgrade() -> None:
+    """Drop the search indexes."""
+    from alembic import op
+    search_indexes.downgrade(op)
+'''
+
+
+def upgrade(op, tables: Optional[Sequence[str]] = None) -> None:
+    """
+    Create the search indexes.
+
+    Args:
+        op: Alembic operations object
+        tables: Tables to index (default: all in SEARCH_FIELDS)
+    """
+    dialect = op.get_bind().dialect.name
+    for table_name in tables or SEARCH_FIELDS:
+        statements = create_statements(dialect, table_name)
+        if not statements:
+            logger.warning(f"No search index for {table_name} on {dialect}; searches will scan")
+        for statement in statements:
+            op.execute(statement)
+
+
+def downgrade(op, tables: Optional[Sequence[str]] = None) -> None:
+    """
+    Drop the search indexes.
+
+    Args:
+        op: Alembic operations object
+        tables: Tables to drop indexes of (default: all in SEARCH_FIELDS)
+    """
+    dialect = op.get_bind().dialect.name
+    for table_name in tables or SEARCH_FIELDS:
+        for statement in drop_statements(dialect, table_name):
+            op.execute(statement)
+
+
+def include_object(obj, name, type_, reflected, compare_to) -> bool:
+    """Alembic autogenerate filter skipping search index objects."""
+    if type_ == "table":
+        return not any(
+            name == fts_table_name(table_name) + suffix
+            for table_name in SEARCH_FIELDS for suffix in _FTS5_SHADOW_SUFFIXES
+        )
+    if type_ == "index":
+        return name not in {trigram_index_name(table_name) for table_name in SEARCH_FIELDS}
+    return True
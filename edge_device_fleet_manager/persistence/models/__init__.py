@@ -9,6 +9,11 @@ and optimized queries for high-performance operations.
 from .base import Base, BaseModel, TimestampMixin, SoftDeleteMixin
 from .device import Device, DeviceStatus, DeviceType
 from .telemetry import TelemetryEvent, TelemetryType, TelemetryData
+from .telemetry_rollup import (
+    RollupResolution, TelemetryRollupMinute, TelemetryRollupHour, TelemetryRollupDay,
+    TelemetryRollupState, ROLLUP_MODELS
+)
+from .telemetry_latest import DeviceLatestTelemetry
 from .analytics import Analytics, AnalyticsType, AnalyticsMetric
 from .user import User, UserRole, UserStatus
 from .device_group import DeviceGroup, DeviceGroupMembership
@@ -31,6 +36,13 @@ __all__ = [
     "TelemetryEvent",
     "TelemetryType",
     "TelemetryData",
+    "RollupResolution",
+    "TelemetryRollupMinute",
+    "TelemetryRollupHour",
+    "TelemetryRollupDay",
+    "TelemetryRollupState",
+    "ROLLUP_MODELS",
+    "DeviceLatestTelemetry",
     
     # Analytics models
     "Analytics",
@@ -14,7 +14,8 @@ from datetime import datetime, timezone
 from typing import Any, Dict, Optional, Type, TypeVar
 
 from sqlalchemy import Column, DateTime, String, Boolean, Text, event
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.dialects.postgresql import INET, JSONB, MACADDR, UUID
+from sqlalchemy.ext.compiler import compiles
 from sqlalchemy.ext.declarative import declarative_base, declared_attr
 from sqlalchemy.ext.hybrid import hybrid_property
 from sqlalchemy.orm import Session
@@ -31,6 +32,23 @@ ModelType = TypeVar("ModelType", bound="BaseModel")
 logger = get_logger(__name__)
 
 
+# SQLite has no native JSONB or network address types. Render them as their
+# nearest equivalents so the tables can be created there for local runs and tests.
+@compiles(JSONB, "sqlite")
+def _compile_jsonb_sqlite(type_, compiler, **kw):
+    return "JSON"
+
+
+@compiles(INET, "sqlite")
+def _compile_inet_sqlite(type_, compiler, **kw):
+    return "VARCHAR(45)"
+
+
+@compiles(MACADDR, "sqlite")
+def _compile_macaddr_sqlite(type_, compiler, **kw):
+    return "VARCHAR(17)"
+
+
 class TimestampMixin:
     """Mixin for automatic timestamp tracking."""
     
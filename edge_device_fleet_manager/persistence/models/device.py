@@ -11,13 +11,14 @@ from typing import Optional, List, Dict, Any
 
 from sqlalchemy import (
     Column, String, Integer, Float, Boolean, DateTime, Text, JSON,
-    Enum, Index, ForeignKey, CheckConstraint, UniqueConstraint
+    Enum, Index, ForeignKey, CheckConstraint, UniqueConstraint, event, inspect
 )
 from sqlalchemy.dialects.postgresql import INET, MACADDR, UUID
 from sqlalchemy.orm import relationship, validates
 from sqlalchemy.ext.hybrid import hybrid_property
 
 from .base import BaseModel, create_foreign_key_constraint
+from .geo import GEOHASH_PRECISION, encode_geohash, haversine_km
 
 
 class DeviceStatus(enum.Enum):
@@ -157,6 +158,12 @@ class Device(BaseModel):
         comment="Altitude in meters"
     )
     
+    geohash = Column(
+        String(GEOHASH_PRECISION),
+        nullable=True,
+        comment="Geohash of the coordinates, for grid-cell range scans"
+    )
+    
     # Operational information
     last_seen = Column(
         DateTime(timezone=True),
@@ -318,6 +325,7 @@ class Device(BaseModel):
         Index('idx_devices_parent_device_id', 'parent_device_id'),
         Index('idx_devices_manufacturer_model', 'manufacturer', 'model'),
         Index('idx_devices_coordinates', 'latitude', 'longitude'),
+        Index('idx_devices_geohash', 'geohash'),
         
         # Partial indexes for active devices
         Index(
@@ -405,22 +413,25 @@ class Device(BaseModel):
         if not (self.has_location and other_device.has_location):
             return None
         
-        from math import radians, sin, cos, sqrt, atan2
-        
-        # Haversine formula
-        R = 6371  # Earth's radius in kilometers
-        
-        lat1, lon1 = radians(self.latitude), radians(self.longitude)
-        lat2, lon2 = radians(other_device.latitude), radians(other_device.longitude)
-        
-        dlat = lat2 - lat1
-        dlon = lon2 - lon1
-        
-        a = sin(dlat/2)**2 + cos(lat1) * cos(lat2) * sin(dlon/2)**2
-        c = 2 * atan2(sqrt(a), sqrt(1-a))
-        
-        return R * c
+        return haversine_km(self.latitude, self.longitude,
+                            other_device.latitude, other_device.longitude)
+    
+    def compute_geohash(self) -> Optional[str]:
+        """Geohash of the device's coordinates, or None without a location."""
+        return encode_geohash(self.latitude, self.longitude) if self.has_location else None
     
     def __repr__(self) -> str:
         """String representation of the device."""
         return f"<Device(id={self.id}, name='{self.name}', status={self.status.value})>"
+
+
+@event.listens_for(Device, "before_insert")
+def _set_geohash_on_insert(mapper, connection, target: Device) -> None:
+    target.geohash = target.compute_geohash()
+
+
+@event.listens_for(Device, "before_update")
+def _set_geohash_on_update(mapper, connection, target: Device) -> None:
+    state = inspect(target)
+    if state.attrs.latitude.history.has_changes() or state.attrs.longitude.history.has_changes():
+        target.geohash = target.compute_geohash()
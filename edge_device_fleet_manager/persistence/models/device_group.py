@@ -6,15 +6,18 @@ hierarchical relationships and membership management.
 """
 
 import enum
+import uuid
 from datetime import datetime, timezone
 from typing import Optional, List
 
 from sqlalchemy import (
     Column, String, Integer, Boolean, DateTime, Text, JSON,
-    Enum, Index, ForeignKey, CheckConstraint, UniqueConstraint, Table
+    Enum, Index, ForeignKey, CheckConstraint, UniqueConstraint, Table,
+    event, func, inspect, literal, select
 )
 from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy.orm import relationship, validates
+from sqlalchemy.orm import object_session, relationship, validates
+from sqlalchemy.orm.attributes import set_committed_value
 from sqlalchemy.ext.hybrid import hybrid_property
 
 from .base import BaseModel, create_foreign_key_constraint
@@ -59,6 +62,16 @@ class DeviceGroup(BaseModel):
         comment="Reference to parent group for hierarchy"
     )
     
+    # Materialised path of group IDs from the root, e.g. "/<root>/<parent>/<id>/".
+    # Byte-wise collation on PostgreSQL keeps subtree prefix ranges indexable.
+    # Each level takes 33 characters, so 2200 fits the 65 levels the
+    # repository's MAX_HIERARCHY_DEPTH allows.
+    hierarchy_path = Column(
+        String(2200).with_variant(String(2200, collation="C"), "postgresql"),
+        nullable=True,
+        comment="Slash-separated IDs of the group's ancestors and itself"
+    )
+    
     # Group properties
     is_dynamic = Column(
         Boolean,
@@ -172,6 +185,7 @@ class DeviceGroup(BaseModel):
         Index('idx_device_groups_name', 'name'),
         Index('idx_device_groups_type', 'group_type'),
         Index('idx_device_groups_parent_id', 'parent_group_id'),
+        Index('idx_device_groups_hierarchy_path', 'hierarchy_path'),
         Index('idx_device_groups_owner_id', 'owner_user_id'),
         Index('idx_device_groups_is_dynamic', 'is_dynamic'),
         
@@ -243,16 +257,26 @@ class DeviceGroup(BaseModel):
                 self.active_device_count = max(0, self.active_device_count - 1)
     
     def update_device_counts(self) -> None:
-        """Update device counts from actual device relationships."""
-        from sqlalchemy import func
+        """
+        Update device counts from the group's devices.
+        
+        Queries through the dynamic ``devices`` relationship, so it needs a
+        synchronous session; DynamicGroupEngine.recount recomputes counts of
+        many groups, including memberships, in one statement.
+        """
         from .device import Device, DeviceStatus
         
-        # This would be called in a database session context
-        # Implementation would query actual device counts
-        pass
+        live = self.devices.filter(Device.is_deleted == False)
+        self.device_count = live.count()
+        self.active_device_count = live.filter(Device.status == DeviceStatus.ONLINE).count()
     
     def get_all_descendant_groups(self) -> List['DeviceGroup']:
-        """Get all descendant groups recursively."""
+        """
+        Get all descendant groups recursively.
+        
+        Loads one level of children at a time; DeviceGroupRepository.get_descendants
+        reads a whole subtree in one query.
+        """
         descendants = []
         for child in self.child_groups:
             descendants.append(child)
@@ -270,6 +294,9 @@ class DeviceGroup(BaseModel):
     
     def is_ancestor_of(self, other_group: 'DeviceGroup') -> bool:
         """Check if this group is an ancestor of another group."""
+        if self.id is not None and other_group.hierarchy_path:
+            return other_group.id != self.id and path_segment(self.id) in other_group.hierarchy_path
+        
         current = other_group.parent_group
         while current:
             if current.id == self.id:
@@ -278,15 +305,17 @@ class DeviceGroup(BaseModel):
         return False
     
     def evaluate_dynamic_criteria(self, device) -> bool:
-        """Evaluate if a device matches dynamic group criteria."""
+        """
+        Evaluate if a device matches dynamic group criteria.
+        
+        Checks a single loaded device; DynamicGroupEngine applies the same
+        criteria to all devices at once in SQL.
+        """
         if not self.is_dynamic or not self.dynamic_criteria:
             return False
         
-        # Implementation would evaluate criteria against device properties
-        # This is a placeholder for the actual logic
         criteria = self.dynamic_criteria
         
-        # Example criteria evaluation
         if 'device_type' in criteria:
             if device.device_type.value not in criteria['device_type']:
                 return False
@@ -295,9 +324,11 @@ class DeviceGroup(BaseModel):
             if device.status.value not in criteria['status']:
                 return False
         
-        if 'tags' in criteria and device.tags:
+        if 'tags' in criteria:
             required_tags = set(criteria['tags'])
-            device_tags = set(device.tags.keys() if isinstance(device.tags, dict) else device.tags)
+            device_tags = set(
+                device.tags.keys() if isinstance(device.tags, dict) else device.tags or ()
+            )
             if not required_tags.issubset(device_tags):
                 return False
         
@@ -308,6 +339,74 @@ class DeviceGroup(BaseModel):
         return f"<DeviceGroup(id={self.id}, name='{self.name}', devices={self.device_count})>"
 
 
+def path_segment(group_id: uuid.UUID) -> str:
+    """Segment of a group's ID in hierarchy paths, slashes included."""
+    return f"/{group_id.hex}/"
+
+
+def subtree_range(path: str):
+    """Bounds of the hierarchy paths below ``path``, as (exclusive low, exclusive high)."""
+    # '0' sorts right after '/', so the range covers exactly the paths extending ``path``
+    return path, path[:-1] + "0"
+
+
+def _parent_path(connection, target: DeviceGroup) -> Optional[str]:
+    if target.parent_group_id is None:
+        return "/"
+    parent = inspect(target).dict.get('parent_group')
+    if parent is not None and parent.id == target.parent_group_id and parent.hierarchy_path:
+        return parent.hierarchy_path
+    table = DeviceGroup.__table__
+    return connection.execute(
+        select(table.c.hierarchy_path).where(table.c.id == target.parent_group_id)
+    ).scalar()
+
+
+@event.listens_for(DeviceGroup, "before_insert")
+def _set_path_on_insert(mapper, connection, target: DeviceGroup) -> None:
+    if target.id is None:
+        target.id = uuid.uuid4()
+    parent_path = _parent_path(connection, target)
+    target.hierarchy_path = None if parent_path is None else parent_path + f"{target.id.hex}/"
+
+
+@event.listens_for(DeviceGroup, "before_update")
+def _move_path_on_update(mapper, connection, target: DeviceGroup) -> None:
+    if not inspect(target).attrs.parent_group_id.history.has_changes():
+        return
+    
+    old_path = target.hierarchy_path
+    parent_path = _parent_path(connection, target)
+    if parent_path and path_segment(target.id) in parent_path:
+        raise ValueError("A group cannot be moved below itself or its descendants")
+    
+    new_path = None if parent_path is None else parent_path + f"{target.id.hex}/"
+    target.hierarchy_path = new_path
+    if not old_path:
+        return
+    
+    # Re-root the subtree, in the database and in the session's loaded groups
+    table = DeviceGroup.__table__
+    low, high = subtree_range(old_path)
+    connection.execute(
+        table.update()
+        .where(table.c.hierarchy_path > low, table.c.hierarchy_path < high)
+        .values(hierarchy_path=(
+            None if new_path is None
+            else literal(new_path) + func.substr(table.c.hierarchy_path, len(old_path) + 1)
+        ))
+    )
+    
+    session = object_session(target)
+    for loaded in list(session.identity_map.values()) if session is not None else ():
+        # Only values already loaded; reading an expired attribute would query
+        path = inspect(loaded).dict.get('hierarchy_path') if isinstance(loaded, DeviceGroup) else None
+        if path and low < path < high:
+            set_committed_value(
+                loaded, 'hierarchy_path', None if new_path is None else new_path + path[len(old_path):]
+            )
+
+
 class DeviceGroupMembership(BaseModel):
     """
     Explicit device group membership model.
@@ -0,0 +1,149 @@
+"""
+Geographic Helpers
+
+Great-circle distance, bounding boxes and geohash grid cells used to index
+and query device coordinates. A geohash interleaves longitude and latitude
+bits into a base-32 string, so nearby points share prefixes and every cell
+of the grid is a contiguous range of an ordinary B-tree index.
+"""
+
+import math
+from typing import List, Tuple
+
+EARTH_RADIUS_KM = 6371.0
+
+# Characters stored in Device.geohash; about 4.8m x 4.8m at the equator
+GEOHASH_PRECISION = 9
+
+_BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+
+# Bounding box as (min_lat, max_lat, min_lon, max_lon)
+BoundingBox = Tuple[float, float, float, float]
+
+
+def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Great-circle distance between two coordinates in kilometers."""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    dphi = phi2 - phi1
+    dlambda = math.radians(lon2 - lon1)
+
+    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlambda / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.atan2(math.sqrt(a), math.sqrt(1 - a))
+
+
+def bounding_boxes(latitude: float, longitude: float, radius_km: float) -> List[BoundingBox]:
+    """
+    Boxes enclosing every point within ``radius_km`` of a coordinate.
+
+    A box crossing the antimeridian is split in two; one reaching a pole
+    spans every longitude.
+    """
+    dlat = math.degrees(radius_km / EARTH_RADIUS_KM)
+    min_lat, max_lat = latitude - dlat, latitude + dlat
+    if min_lat <= -90.0 or max_lat >= 90.0:
+        return [(max(min_lat, -90.0), min(max_lat, 90.0), -180.0, 180.0)]
+
+    # Widest longitude span of the circle, reached at its tangent latitude
+    ratio = math.sin(radius_km / EARTH_RADIUS_KM) / math.cos(math.radians(latitude))
+    if ratio >= 1.0:
+        return [(min_lat, max_lat, -180.0, 180.0)]
+    dlon = math.degrees(math.asin(ratio))
+
+    min_lon, max_lon = longitude - dlon, longitude + dlon
+    if min_lon < -180.0:
+        return [(min_lat, max_lat, min_lon + 360.0, 180.0), (min_lat, max_lat, -180.0, max_lon)]
+    if max_lon > 180.0:
+        return [(min_lat, max_lat, min_lon, 180.0), (min_lat, max_lat, -180.0, max_lon - 360.0)]
+    return [(min_lat, max_lat, min_lon, max_lon)]
+
+
+def encode_geohash(latitude: float, longitude: float, precision: int = GEOHASH_PRECISION) -> str:
+    """Geohash of a coordinate with ``precision`` characters."""
+    lat_range = [-90.0, 90.0]
+    lon_range = [-180.0, 180.0]
+    chars = []
+    bits = 0
+    value = 0
+    even = True
+
+    while len(chars) < precision:
+        bounds, coordinate = (lon_range, longitude) if even else (lat_range, latitude)
+        middle = (bounds[0] + bounds[1]) / 2
+        value <<= 1
+        if coordinate >= middle:
+            value |= 1
+            bounds[0] = middle
+        else:
+            bounds[1] = middle
+        even = not even
+
+        bits += 1
+        if bits == 5:
+            chars.append(_BASE32[value])
+            bits = value = 0
+
+    return "".join(chars)
+
+
+def geohash_cell_size(precision: int) -> Tuple[float, float]:
+    """Height and width in degrees of a geohash cell with ``precision`` characters."""
+    lon_bits = (5 * precision + 1) // 2
+    lat_bits = 5 * precision // 2
+    return 180.0 / (1 << lat_bits), 360.0 / (1 << lon_bits)
+
+
+def covering_cells(boxes: List[BoundingBox], max_cells: int = 32) -> List[str]:
+    """
+    Geohash cells that together contain the given boxes.
+
+    Uses the finest precision needing at most ``max_cells`` cells, so the
+    candidate rows outside the boxes stay few without producing more index
+    ranges than are worth probing.
+    """
+    for precision in range(GEOHASH_PRECISION, 0, -1):
+        height, width = geohash_cell_size(precision)
+        spans = [
+            (_cell_index(min_lat, -90.0, height), _cell_index(max_lat, -90.0, height),
+             _cell_index(min_lon, -180.0, width), _cell_index(max_lon, -180.0, width))
+            for min_lat, max_lat, min_lon, max_lon in boxes
+        ]
+        count = sum((lat_hi - lat_lo + 1) * (lon_hi - lon_lo + 1) for lat_lo, lat_hi, lon_lo, lon_hi in spans)
+        if count <= max_cells or precision == 1:
+            break
+
+    cells = set()
+    for lat_lo, lat_hi, lon_lo, lon_hi in spans:
+        for row in range(lat_lo, lat_hi + 1):
+            for column in range(lon_lo, lon_hi + 1):
+                # Encoding the cell's centre yields the cell's own hash
+                cells.add(encode_geohash(
+                    -90.0 + (row + 0.5) * height, -180.0 + (column + 0.5) * width, precision
+                ))
+    return sorted(cells)
+
+
+def cell_ranges(cells: List[str]) -> List[Tuple[str, str]]:
+    """
+    Inclusive index ranges of ``Device.geohash`` values inside the given cells.
+
+    Cells are prefixes, so each spans from itself to itself padded with the
+    last base-32 character; neighbouring cells of one parent merge into a
+    single range.
+    """
+    ranges: List[Tuple[str, str]] = []
+    previous = None
+    for cell in sorted(cells):
+        low = cell
+        high = cell + _BASE32[-1] * (GEOHASH_PRECISION - len(cell))
+        if (previous is not None and len(previous) == len(cell) and previous[:-1] == cell[:-1]
+                and _BASE32.index(cell[-1]) == _BASE32.index(previous[-1]) + 1):
+            ranges[-1] = (ranges[-1][0], high)
+        else:
+            ranges.append((low, high))
+        previous = cell
+    return ranges
+
+
+def _cell_index(value: float, origin: float, size: float) -> int:
+    limit = int(round((-2 * origin) / size)) - 1
+    return min(max(int((value - origin) // size), 0), limit)
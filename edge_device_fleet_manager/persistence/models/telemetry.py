@@ -11,10 +11,11 @@ from typing import Optional, Dict, Any, Union
 
 from sqlalchemy import (
     Column, String, Integer, Float, Boolean, DateTime, Text, JSON,
-    Enum, Index, ForeignKey, CheckConstraint, BigInteger
+    Enum, Index, ForeignKey, CheckConstraint, BigInteger, PrimaryKeyConstraint,
+    DDL, event
 )
 from sqlalchemy.dialects.postgresql import UUID, JSONB
-from sqlalchemy.orm import relationship, validates
+from sqlalchemy.orm import declared_attr, relationship, validates
 from sqlalchemy.ext.hybrid import hybrid_property
 
 from .base import BaseModel, create_foreign_key_constraint
@@ -76,6 +77,7 @@ class TelemetryEvent(BaseModel):
     # Timing information
     timestamp = Column(
         DateTime(timezone=True),
+        primary_key=True,
         nullable=False,
         default=lambda: datetime.now(timezone.utc),
         comment="Timestamp when the event occurred"
@@ -207,6 +209,9 @@ class TelemetryEvent(BaseModel):
     
     # Constraints and indexes
     __table_args__ = (
+        # PostgreSQL requires the partition key in the primary key
+        PrimaryKeyConstraint('id', 'timestamp', name='pk_telemetry_events'),
+        
         # Check constraints
         CheckConstraint(
             'quality_score >= 0.0 AND quality_score <= 1.0',
@@ -245,19 +250,23 @@ class TelemetryEvent(BaseModel):
             'timestamp',
             postgresql_where="processed = false"
         ),
-        Index(
-            'idx_telemetry_recent_events',
-            'device_id', 'timestamp',
-            postgresql_where="timestamp > (NOW() - INTERVAL '24 hours')"
-        ),
         
         # GIN indexes for JSON data
         Index('idx_telemetry_data_gin', 'data', postgresql_using='gin'),
         
         # BRIN indexes for time-series data (PostgreSQL)
         Index('idx_telemetry_timestamp_brin', 'timestamp', postgresql_using='brin'),
+        
+        # Range partitioned by event time on PostgreSQL; partitions are
+        # managed by TelemetryPartitionManager
+        {'postgresql_partition_by': 'RANGE (timestamp)'},
     )
     
+    @declared_attr
+    def __mapper_args__(cls):
+        # Rows are still identified by id alone
+        return {'primary_key': [cls.__table__.c.id]}
+    
     # Validation methods
     @validates('quality_score')
     def validate_quality_score(self, key, value):
@@ -365,6 +374,17 @@ class TelemetryEvent(BaseModel):
         )
 
 
+# Catch rows outside every range partition so inserts never fail
+event.listen(
+    TelemetryEvent.__table__,
+    'after_create',
+    DDL(
+        'CREATE TABLE IF NOT EXISTS telemetry_events_default '
+        'PARTITION OF telemetry_events DEFAULT'
+    ).execute_if(dialect='postgresql')
+)
+
+
 class TelemetryData:
     """
     Helper class for structured telemetry data.
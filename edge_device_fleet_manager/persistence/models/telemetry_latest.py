@@ -0,0 +1,86 @@
+"""
+Latest Telemetry Model
+
+One row per device and metric holding the newest reading ingested for it,
+so "current values" queries read a narrow keyed table instead of sorting
+the raw telemetry events.
+
+Rows are overwritten in place by an upsert, so the model derives from
+``Base`` rather than ``BaseModel``.
+"""
+
+from typing import Optional, Union
+
+from sqlalchemy import Boolean, Column, DateTime, Enum, Float, Index, String
+from sqlalchemy.dialects.postgresql import UUID
+
+from .base import Base
+from .telemetry import TelemetryType
+
+
+class DeviceLatestTelemetry(Base):
+    """Newest reading of each metric of each device."""
+
+    __tablename__ = "device_latest_telemetry"
+
+    device_id = Column(
+        UUID(as_uuid=True),
+        primary_key=True,
+        comment="Reference to the source device"
+    )
+
+    event_name = Column(
+        String(255),
+        primary_key=True,
+        comment="Metric name"
+    )
+
+    event_type = Column(
+        Enum(TelemetryType),
+        nullable=False,
+        comment="Type of the latest event"
+    )
+
+    event_id = Column(
+        UUID(as_uuid=True),
+        nullable=True,
+        comment="ID of the telemetry event the reading came from"
+    )
+
+    timestamp = Column(
+        DateTime(timezone=True),
+        nullable=False,
+        comment="When the reading was taken"
+    )
+
+    numeric_value = Column(Float, nullable=True, comment="Numeric value")
+    string_value = Column(String(1000), nullable=True, comment="String value")
+    boolean_value = Column(Boolean, nullable=True, comment="Boolean value")
+    units = Column(String(50), nullable=True, comment="Units of the value")
+    quality_score = Column(Float, nullable=True, comment="Quality score of the reading")
+
+    updated_at = Column(
+        DateTime(timezone=True),
+        nullable=False,
+        comment="When the row was last written"
+    )
+
+    __table_args__ = (
+        # Fleet-wide "current value of metric X" scans
+        Index('idx_device_latest_telemetry_name_device', 'event_name', 'device_id'),
+    )
+
+    @property
+    def value(self) -> Optional[Union[float, str, bool]]:
+        """The reading's value, whichever type it was reported as."""
+        if self.numeric_value is not None:
+            return self.numeric_value
+        if self.string_value is not None:
+            return self.string_value
+        return self.boolean_value
+
+    def __repr__(self) -> str:
+        return (
+            f"<DeviceLatestTelemetry(device_id={self.device_id}, "
+            f"event_name='{self.event_name}', timestamp={self.timestamp})>"
+        )
@@ -0,0 +1,171 @@
+"""
+Telemetry Rollup Models
+
+Pre-aggregated telemetry at fixed resolutions. Each rollup row holds the
+count, sum, min, max and sum of squares of the numeric values one device
+reported for one event in one bucket, which is enough to derive averages and
+standard deviations at any coarser interval without touching raw events.
+
+Rollup rows are narrow, keyed by a composite primary key and rewritten in
+place, so they derive from ``Base`` rather than ``BaseModel``.
+"""
+
+import enum
+import math
+from datetime import timedelta
+from typing import Dict, Optional, Type
+
+from sqlalchemy import BigInteger, Column, DateTime, Enum, Float, Index, String
+from sqlalchemy.dialects.postgresql import UUID
+
+from .base import Base
+from .telemetry import TelemetryType
+
+
+class RollupResolution(enum.Enum):
+    """Bucket size of a rollup table."""
+    MINUTE = "1m"
+    HOUR = "1h"
+    DAY = "1d"
+
+    @property
+    def seconds(self) -> int:
+        """Bucket size in seconds."""
+        return _RESOLUTION_SECONDS[self]
+
+    @property
+    def interval(self) -> timedelta:
+        """Bucket size as a timedelta."""
+        return timedelta(seconds=self.seconds)
+
+
+_RESOLUTION_SECONDS = {
+    RollupResolution.MINUTE: 60,
+    RollupResolution.HOUR: 3600,
+    RollupResolution.DAY: 86400,
+}
+
+
+class TelemetryRollupMixin:
+    """Columns shared by every rollup resolution."""
+
+    device_id = Column(
+        UUID(as_uuid=True),
+        primary_key=True,
+        comment="Reference to the source device"
+    )
+
+    event_type = Column(
+        Enum(TelemetryType),
+        primary_key=True,
+        comment="Type of the aggregated events"
+    )
+
+    event_name = Column(
+        String(255),
+        primary_key=True,
+        comment="Name of the aggregated events"
+    )
+
+    bucket_start = Column(
+        DateTime(timezone=True),
+        primary_key=True,
+        comment="Start of the bucket, aligned to the Unix epoch"
+    )
+
+    count = Column(BigInteger, nullable=False, default=0, comment="Number of numeric values")
+    sum = Column(Float, nullable=False, default=0.0, comment="Sum of values")
+    min = Column(Float, nullable=True, comment="Smallest value")
+    max = Column(Float, nullable=True, comment="Largest value")
+    sum_squares = Column(Float, nullable=False, default=0.0, comment="Sum of squared values")
+
+    resolution: RollupResolution
+
+    @property
+    def avg(self) -> Optional[float]:
+        """Mean of the bucket's values."""
+        return self.sum / self.count if self.count else None
+
+    @property
+    def stddev(self) -> Optional[float]:
+        """Population standard deviation of the bucket's values."""
+        return rollup_stddev(self.count, self.sum, self.sum_squares)
+
+    def __repr__(self) -> str:
+        return (
+            f"<{self.__class__.__name__}(device_id={self.device_id}, "
+            f"event_name='{self.event_name}', bucket_start={self.bucket_start}, count={self.count})>"
+        )
+
+
+class TelemetryRollupMinute(TelemetryRollupMixin, Base):
+    """Per-minute telemetry rollup."""
+
+    __tablename__ = "telemetry_rollup_1m"
+    resolution = RollupResolution.MINUTE
+
+    __table_args__ = (
+        Index('idx_telemetry_rollup_1m_name_bucket', 'event_name', 'bucket_start'),
+    )
+
+
+class TelemetryRollupHour(TelemetryRollupMixin, Base):
+    """Per-hour telemetry rollup."""
+
+    __tablename__ = "telemetry_rollup_1h"
+    resolution = RollupResolution.HOUR
+
+    __table_args__ = (
+        Index('idx_telemetry_rollup_1h_name_bucket', 'event_name', 'bucket_start'),
+    )
+
+
+class TelemetryRollupDay(TelemetryRollupMixin, Base):
+    """Per-day telemetry rollup."""
+
+    __tablename__ = "telemetry_rollup_1d"
+    resolution = RollupResolution.DAY
+
+    __table_args__ = (
+        Index('idx_telemetry_rollup_1d_name_bucket', 'event_name', 'bucket_start'),
+    )
+
+
+class TelemetryRollupState(Base):
+    """High-water mark of raw events already folded into the rollups."""
+
+    __tablename__ = "telemetry_rollup_state"
+
+    name = Column(String(100), primary_key=True, comment="Rollup source name")
+
+    high_water_mark = Column(
+        DateTime(timezone=True),
+        nullable=False,
+        comment="received_at of the newest raw event included in the rollups"
+    )
+
+    updated_at = Column(
+        DateTime(timezone=True),
+        nullable=False,
+        comment="When the rollups were last refreshed"
+    )
+
+    def __repr__(self) -> str:
+        return f"<TelemetryRollupState(name='{self.name}', high_water_mark={self.high_water_mark})>"
+
+
+# Finest first
+ROLLUP_MODELS: Dict[RollupResolution, Type[TelemetryRollupMixin]] = {
+    RollupResolution.MINUTE: TelemetryRollupMinute,
+    RollupResolution.HOUR: TelemetryRollupHour,
+    RollupResolution.DAY: TelemetryRollupDay,
+}
+
+
+def rollup_stddev(count: int, total: float, sum_squares: float) -> Optional[float]:
+    """Population standard deviation from count, sum and sum of squares."""
+    if not count:
+        return None
+    mean = total / count
+    # Rounding can push the variance of near-constant series slightly negative
+    return math.sqrt(max(sum_squares / count - mean * mean, 0.0))
@@ -9,18 +9,30 @@ Key Features:
 - Async/await support throughout
 - Transaction management
 - Query optimization
-- Caching integration
+- Caching integration (read-through device cache)
+- Spatial indexing (PostGIS, SQLite R-tree or geohash)
+- Search indexing (pg_trgm or SQLite FTS5)
 - Audit trail support
 - Bulk operations
 - Pagination and filtering
 """
 
 from .base import BaseRepository, RepositoryError
+from .pagination import Page
 from .device import DeviceRepository
+from .device_cache import DeviceCache, DeviceCacheStats
+from .device_spatial import DeviceSpatialIndex, SpatialBackend
+from .search import SearchIndexManager, SearchBackend, SEARCH_FIELDS
+from .summary_cache import SummaryCache, SummaryCacheStats
 from .telemetry import TelemetryRepository
+from .telemetry_rollup import TelemetryRollupRepository
+from .telemetry_latest import LatestTelemetryRepository, BackfillProgress
+from .telemetry_partitions import TelemetryPartitionManager, TelemetryPartition, PartitionPeriod
+from .retention import RetentionExecutor, RetentionProgress, retention_session
 from .analytics import AnalyticsRepository
 from .user import UserRepository
 from .device_group import DeviceGroupRepository
+from .dynamic_groups import DynamicGroupEngine, MembershipRefresh
 from .alert import AlertRepository
 from .audit_log import AuditLogRepository
 
@@ -28,13 +40,34 @@ __all__ = [
     # Base classes
     "BaseRepository",
     "RepositoryError",
+    "Page",
     
     # Specific repositories
     "DeviceRepository",
+    "DeviceCache",
+    "DeviceCacheStats",
+    "DeviceSpatialIndex",
+    "SpatialBackend",
+    "SearchIndexManager",
+    "SearchBackend",
+    "SEARCH_FIELDS",
+    "SummaryCache",
+    "SummaryCacheStats",
     "TelemetryRepository",
+    "TelemetryRollupRepository",
+    "LatestTelemetryRepository",
+    "BackfillProgress",
+    "TelemetryPartitionManager",
+    "TelemetryPartition",
+    "PartitionPeriod",
+    "RetentionExecutor",
+    "RetentionProgress",
+    "retention_session",
     "AnalyticsRepository",
     "UserRepository",
     "DeviceGroupRepository",
+    "DynamicGroupEngine",
+    "MembershipRefresh",
     "AlertRepository",
     "AuditLogRepository",
 ]
@@ -9,10 +9,11 @@ import uuid
 from typing import List, Optional, Dict, Any
 from datetime import datetime, timezone, timedelta
 
-from sqlalchemy import select, func, and_, or_, desc
+from sqlalchemy import select, func, or_, desc, case
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from .base import BaseRepository, RepositoryError
+from .summary_cache import SummaryCache
 from ..models.alert import Alert, AlertSeverity, AlertStatus
 
 
@@ -22,10 +23,12 @@ class AlertRepository(BaseRepository[Alert]):
     
     Provides specialized operations for alerts including
     severity-based queries, status management, and reporting.
+    With a SummaryCache, alert statistics are served from it for its TTL.
     """
     
-    def __init__(self, session: AsyncSession):
+    def __init__(self, session: AsyncSession, summary_cache: Optional[SummaryCache] = None):
         super().__init__(session, Alert)
+        self.summary_cache = summary_cache
     
     async def get_by_severity(self, severity: AlertSeverity,
                              skip: int = 0, limit: int = 100) -> List[Alert]:
@@ -116,51 +119,38 @@ class AlertRepository(BaseRepository[Alert]):
     
     async def get_alert_statistics(self) -> Dict[str, Any]:
         """Get comprehensive alert statistics."""
+        if self.summary_cache is not None:
+            return await self.summary_cache.get('alert_statistics', self._compute_alert_statistics)
+        return await self._compute_alert_statistics()
+    
+    async def _compute_alert_statistics(self) -> Dict[str, Any]:
         try:
-            # Total alerts
-            total_query = select(func.count(self.model.id)).where(self.model.is_deleted == False)
-            total_result = await self.session.execute(total_query)
-            total_alerts = total_result.scalar()
-            
-            # Alerts by severity
-            severity_query = (
-                select(self.model.severity, func.count(self.model.id))
-                .where(self.model.is_deleted == False)
-                .group_by(self.model.severity)
-            )
-            severity_result = await self.session.execute(severity_query)
-            severity_counts = dict(severity_result.all())
-            
-            # Alerts by status
-            status_query = (
-                select(self.model.status, func.count(self.model.id))
-                .where(self.model.is_deleted == False)
-                .group_by(self.model.status)
-            )
-            status_result = await self.session.execute(status_query)
-            status_counts = dict(status_result.all())
-            
-            # Open alerts count
-            open_statuses = [AlertStatus.OPEN, AlertStatus.ACKNOWLEDGED, AlertStatus.IN_PROGRESS]
-            open_query = select(func.count(self.model.id)).where(
-                and_(
-                    self.model.status.in_(open_statuses),
-                    self.model.is_deleted == False
-                )
-            )
-            open_result = await self.session.execute(open_query)
-            open_alerts = open_result.scalar()
-            
-            # Recent alerts (last 24 hours)
+            # One scan grouped by severity and status, counting recent alerts
+            # conditionally; totals and open counts are sums of the groups
             recent_cutoff = datetime.now(timezone.utc) - timedelta(hours=24)
-            recent_query = select(func.count(self.model.id)).where(
-                and_(
-                    self.model.first_occurred >= recent_cutoff,
-                    self.model.is_deleted == False
+            query = (
+                select(
+                    self.model.severity,
+                    self.model.status,
+                    func.count(self.model.id),
+                    func.count(case((self.model.first_occurred >= recent_cutoff, 1)))
                 )
+                .where(self.model.is_deleted == False)
+                .group_by(self.model.severity, self.model.status)
             )
-            recent_result = await self.session.execute(recent_query)
-            recent_alerts = recent_result.scalar()
+            result = await self.session.execute(query)
+            
+            open_statuses = {AlertStatus.OPEN, AlertStatus.ACKNOWLEDGED, AlertStatus.IN_PROGRESS}
+            total_alerts = open_alerts = recent_alerts = 0
+            severity_counts: Dict[AlertSeverity, int] = {}
+            status_counts: Dict[AlertStatus, int] = {}
+            for severity, status, count, recent in result.all():
+                total_alerts += count
+                recent_alerts += recent
+                if status in open_statuses:
+                    open_alerts += count
+                severity_counts[severity] = severity_counts.get(severity, 0) + count
+                status_counts[status] = status_counts.get(status, 0) + count
             
             return {
                 'total_alerts': total_alerts,
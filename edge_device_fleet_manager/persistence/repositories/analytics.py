@@ -6,13 +6,14 @@ reporting, and business intelligence capabilities.
 """
 
 import uuid
-from typing import List, Optional, Dict, Any
+from typing import Callable, List, Optional, Dict, Any
 from datetime import datetime, timezone, timedelta
 
 from sqlalchemy import select, func, and_, or_, desc
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from .base import BaseRepository, RepositoryError
+from .retention import RetentionExecutor, RetentionProgress, retention_session
 from ..models.analytics import Analytics, AnalyticsType, AnalyticsMetric
 
 
@@ -155,26 +156,25 @@ class AnalyticsRepository(BaseRepository[Analytics]):
             self.logger.error(f"Error getting summary statistics: {e}")
             raise RepositoryError(f"Failed to get summary statistics: {e}")
     
-    async def cleanup_old_analytics(self, retention_days: int = 90) -> int:
-        """Clean up old analytics data."""
+    async def cleanup_old_analytics(self, retention_days: int = 90,
+                                    batch_size: int = 1000,
+                                    pause_seconds: float = 0.1,
+                                    progress_callback: Optional[Callable[[RetentionProgress], None]] = None) -> int:
+        """
+        Clean up old analytics data based on retention policy.
+        
+        Rows are deleted in committed batches of ``batch_size`` with a pause
+        between them, in a session of their own; see RetentionExecutor.
+        """
         try:
             cutoff_date = datetime.now(timezone.utc) - timedelta(days=retention_days)
             
-            # Count records to be deleted
-            count_query = select(func.count(self.model.id)).where(
-                self.model.period_end < cutoff_date
-            )
-            count_result = await self.session.execute(count_query)
-            count = count_result.scalar()
-            
-            # Delete old records
-            from sqlalchemy import delete
-            delete_query = delete(self.model).where(self.model.period_end < cutoff_date)
-            await self.session.execute(delete_query)
-            await self.session.flush()
+            async with retention_session(self.session) as session:
+                executor = RetentionExecutor(session, batch_size, pause_seconds, progress_callback)
+                progress = await executor.purge(self.model, self.model.period_end < cutoff_date)
             
-            self.logger.info(f"Cleaned up {count} old analytics records")
-            return count
+            self.logger.info(f"Cleaned up {progress.deleted} old analytics records")
+            return progress.deleted
             
         except Exception as e:
             self.logger.error(f"Error cleaning up old analytics: {e}")
@@ -6,13 +6,14 @@ security monitoring, and audit trail capabilities.
 """
 
 import uuid
-from typing import List, Optional, Dict, Any
+from typing import Callable, List, Optional, Dict, Any
 from datetime import datetime, timezone, timedelta
 
 from sqlalchemy import select, func, and_, or_, desc
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from .base import BaseRepository, RepositoryError
+from .retention import RetentionExecutor, RetentionProgress, retention_session
 from ..models.audit_log import AuditLog, AuditAction, AuditResource
 
 
@@ -223,26 +224,25 @@ class AuditLogRepository(BaseRepository[AuditLog]):
             self.logger.error(f"Error getting audit statistics: {e}")
             raise RepositoryError(f"Failed to get audit statistics: {e}")
     
-    async def cleanup_old_logs(self, retention_days: int = 365) -> int:
-        """Clean up old audit logs based on retention policy."""
+    async def cleanup_old_logs(self, retention_days: int = 365,
+                               batch_size: int = 1000,
+                               pause_seconds: float = 0.1,
+                               progress_callback: Optional[Callable[[RetentionProgress], None]] = None) -> int:
+        """
+        Clean up old audit logs based on retention policy.
+        
+        Rows are deleted in committed batches of ``batch_size`` with a pause
+        between them, in a session of their own; see RetentionExecutor.
+        """
         try:
             cutoff_date = datetime.now(timezone.utc) - timedelta(days=retention_days)
             
-            # Count records to be deleted
-            count_query = select(func.count(self.model.id)).where(
-                self.model.timestamp < cutoff_date
-            )
-            count_result = await self.session.execute(count_query)
-            count = count_result.scalar()
-            
-            # Delete old records
-            from sqlalchemy import delete
-            delete_query = delete(self.model).where(self.model.timestamp < cutoff_date)
-            await self.session.execute(delete_query)
-            await self.session.flush()
+            async with retention_session(self.session) as session:
+                executor = RetentionExecutor(session, batch_size, pause_seconds, progress_callback)
+                progress = await executor.purge(self.model, self.model.timestamp < cutoff_date)
             
-            self.logger.info(f"Cleaned up {count} old audit log records")
-            return count
+            self.logger.info(f"Cleaned up {progress.deleted} old audit log records")
+            return progress.deleted
             
         except Exception as e:
             self.logger.error(f"Error cleaning up old audit logs: {e}")
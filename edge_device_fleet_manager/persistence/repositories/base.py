@@ -13,7 +13,10 @@ from typing import (
 )
 from datetime import datetime, timezone
 
-from sqlalchemy import select, update, delete, func, and_, or_, text
+from sqlalchemy import (
+    Column, MetaData, Table, bindparam, cast, column, select, insert, update, delete,
+    func, and_, or_, text, values
+)
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload, joinedload
 from sqlalchemy.exc import SQLAlchemyError, IntegrityError
@@ -21,6 +24,8 @@ from sqlalchemy.sql import Select
 
 from ...core.logging import get_logger
 from ..models.base import BaseModel
+from .pagination import Page, SortField, decode_cursor, encode_cursor, resolve_sort, seek_condition
+from .search import SEARCH_FIELDS, SearchIndexManager
 
 # Type variables for generic repository
 ModelType = TypeVar("ModelType", bound=BaseModel)
@@ -168,6 +173,75 @@ class BaseRepository(Generic[ModelType], ABC):
             self.logger.error(f"Error getting multiple {self.model.__name__}: {e}")
             raise RepositoryError(f"Failed to get {self.model.__name__} records: {e}")
     
+    async def get_page(self, cursor: Optional[str] = None, limit: int = 100,
+                       order_by: Optional[Sequence[SortField]] = None,
+                       include_deleted: bool = False,
+                       **filters) -> Page[ModelType]:
+        """
+        Get one page of records using keyset pagination.
+        
+        Unlike get_multi, the cost of a page does not grow with its depth.
+        
+        Args:
+            cursor: next_cursor of the previous page, or None for the first page
+            limit: Maximum number of records to return
+            order_by: Sort fields, e.g. ``["-created_at"]``; the primary key
+                is always appended as tie-breaker
+            include_deleted: Whether to include soft-deleted records
+            **filters: Additional filters
+            
+        Returns:
+            Page of model instances with the cursor of the next page
+        """
+        if order_by is None:
+            order_by = ['-created_at'] if hasattr(self.model, 'created_at') else []
+        
+        query = self._apply_filters(select(self.model), include_deleted, **filters)
+        return await self.paginate(query, order_by, cursor=cursor, limit=limit)
+    
+    async def paginate(self, query: Select, order_by: Sequence[SortField],
+                       cursor: Optional[str] = None, limit: int = 100) -> Page[ModelType]:
+        """
+        Page through a query of this repository's model by seeking past the cursor.
+        
+        For pages to be cheap, the sort fields (after any equality filters in
+        the query) should be the leading columns of an index.
+        
+        Args:
+            query: Select of the model, with filters but no ordering or limit
+            order_by: Sort fields; the primary key is appended as tie-breaker
+            cursor: next_cursor of the previous page, or None for the first page
+            limit: Maximum number of records to return
+            
+        Returns:
+            Page of model instances with the cursor of the next page
+        """
+        if limit <= 0:
+            raise RepositoryError("Page limit must be positive")
+        
+        try:
+            keys = resolve_sort(self.model, order_by)
+            if cursor:
+                query = query.where(seek_condition(keys, decode_cursor(self.model, keys, cursor)))
+        except ValueError as e:
+            raise RepositoryError(f"Invalid pagination request for {self.model.__name__}: {e}")
+        
+        try:
+            # One extra row tells whether another page follows
+            query = query.order_by(*(key.order_clause() for key in keys)).limit(limit + 1)
+            result = await self.session.execute(query)
+            items = list(result.scalars().all())
+            
+            next_cursor = None
+            if len(items) > limit:
+                items = items[:limit]
+                next_cursor = encode_cursor(self.model, keys, items[-1])
+            return Page(items=items, next_cursor=next_cursor)
+            
+        except Exception as e:
+            self.logger.error(f"Error paginating {self.model.__name__}: {e}")
+            raise RepositoryError(f"Failed to get {self.model.__name__} page: {e}")
+    
     async def update(self, id: Union[uuid.UUID, str],
                     obj_in: Union[UpdateSchemaType, Dict[str, Any]],
                     **kwargs) -> Optional[ModelType]:
@@ -341,6 +415,166 @@ class BaseRepository(Generic[ModelType], ABC):
             self.logger.error(f"Error bulk creating {self.model.__name__}: {e}")
             raise RepositoryError(f"Failed to bulk create {self.model.__name__}: {e}")
     
+    async def bulk_insert(self, objects: List[Union[CreateSchemaType, Dict[str, Any]]],
+                          chunk_size: Optional[int] = None,
+                          use_copy: bool = True) -> List[Any]:
+        """
+        Insert records in bulk through Core statements.
+        
+        Unlike bulk_create(), no ORM objects are built and nothing is
+        refreshed. Python-side column defaults, including the UUID primary
+        key, are filled in before sending, so IDs come back without a
+        SELECT; a primary key generated by the database is fetched with
+        RETURNING instead. Rows are sent as one executemany per chunk, with
+        chunks sized to the driver's bind-parameter limit. On PostgreSQL with
+        asyncpg the rows are streamed with COPY when use_copy is set.
+        
+        ORM validators, events and relationship cascades are bypassed.
+        
+        Args:
+            objects: List of input data keyed by attribute name
+            chunk_size: Rows per statement (default: derived from the parameter limit)
+            use_copy: Use COPY when the database supports it
+            
+        Returns:
+            Primary keys of the inserted records, in input order
+        """
+        if not objects:
+            return []
+        
+        try:
+            table = self.model.__table__
+            pk_column = list(table.primary_key.columns)[0]
+            rows = self._prepare_bulk_rows(objects)
+            conn = await self.session.connection()
+            dialect = conn.dialect
+            ids: List[Any] = [None] * len(rows)
+            
+            # executemany requires every row in a statement to bind the same columns
+            groups: Dict[Tuple[str, ...], List[int]] = {}
+            for index, row in enumerate(rows):
+                groups.setdefault(tuple(row), []).append(index)
+            
+            for columns, indexes in groups.items():
+                group_rows = [rows[i] for i in indexes]
+                size = chunk_size or max(1, dialect.insertmanyvalues_max_parameters // len(columns))
+                
+                if pk_column.key not in columns:
+                    stmt = insert(table).returning(pk_column, sort_by_parameter_order=True)
+                    returned: List[Any] = []
+                    for start in range(0, len(group_rows), size):
+                        result = await conn.execute(stmt, group_rows[start:start + size])
+                        returned.extend(result.scalars().all())
+                    for i, pk in zip(indexes, returned):
+                        ids[i] = pk
+                    continue
+                
+                if not (use_copy and self._supports_copy(dialect)
+                        and await self._copy_rows(conn, table, columns, group_rows)):
+                    stmt = insert(table)
+                    for start in range(0, len(group_rows), size):
+                        await conn.execute(stmt, group_rows[start:start + size])
+                
+                for i in indexes:
+                    ids[i] = rows[i][pk_column.key]
+            
+            self.logger.debug(f"Bulk inserted {len(rows)} {self.model.__name__} records")
+            return ids
+            
+        except RepositoryError:
+            await self.session.rollback()
+            raise
+        except Exception as e:
+            await self.session.rollback()
+            self.logger.error(f"Error bulk inserting {self.model.__name__}: {e}")
+            raise RepositoryError(f"Failed to bulk insert {self.model.__name__}: {e}")
+    
+    def _prepare_bulk_rows(self, objects: List[Union[CreateSchemaType, Dict[str, Any]]]) -> List[Dict[str, Any]]:
+        """
+        Convert input data to column-keyed rows with Python-side defaults applied.
+        
+        Args:
+            objects: List of input data keyed by attribute name
+            
+        Returns:
+            List of row dictionaries keyed by column name
+        """
+        table = self.model.__table__
+        attribute_columns = self._attribute_columns()
+        defaults = [
+            (column.key, column.default) for column in table.columns
+            if column.default is not None
+            and (column.default.is_scalar or column.default.is_callable)
+        ]
+        
+        rows = []
+        for obj_in in objects:
+            if hasattr(obj_in, 'dict'):
+                data = obj_in.dict()
+            else:
+                data = obj_in
+            
+            row = {}
+            for field, value in data.items():
+                column_key = attribute_columns.get(field)
+                if column_key is None:
+                    raise RepositoryError(
+                        f"Unknown field '{field}' for {self.model.__name__} bulk insert"
+                    )
+                row[column_key] = value
+            
+            for column_key, default in defaults:
+                if column_key not in row:
+                    row[column_key] = default.arg(None) if default.is_callable else default.arg
+            
+            rows.append(row)
+        
+        return rows
+    
+    @staticmethod
+    def _supports_copy(dialect) -> bool:
+        """Check whether rows can be streamed with COPY on this dialect."""
+        return dialect.name == "postgresql" and dialect.driver == "asyncpg"
+    
+    async def _copy_rows(self, conn, table, columns: Tuple[str, ...],
+                         rows: List[Dict[str, Any]]) -> bool:
+        """
+        Stream rows into a table with COPY.
+        
+        The copy runs inside a savepoint so that a type the driver cannot
+        encode in COPY's binary format leaves the transaction usable for the
+        executemany fallback.
+        
+        Returns:
+            True if the rows were copied, False if the caller should fall back
+        """
+        dialect = conn.dialect
+        processors = [
+            table.c[key].type.dialect_impl(dialect).bind_processor(dialect)
+            for key in columns
+        ]
+        records = (
+            tuple(
+                process(row[key]) if process else row[key]
+                for key, process in zip(columns, processors)
+            )
+            for row in rows
+        )
+        
+        try:
+            async with conn.begin_nested():
+                raw = await conn.get_raw_connection()
+                await raw.driver_connection.copy_records_to_table(
+                    table.name,
+                    records=records,
+                    columns=list(columns),
+                    schema_name=table.schema
+                )
+            return True
+        except Exception as e:
+            self.logger.warning(f"COPY into {table.name} failed, using executemany: {e}")
+            return False
+    
     async def bulk_update(self, updates: List[Dict[str, Any]]) -> int:
         """
         Update multiple records in bulk.
@@ -351,38 +585,165 @@ class BaseRepository(Generic[ModelType], ABC):
         Returns:
             Number of updated records
         """
+        counts = await self.bulk_update_grouped(updates)
+        return sum(counts.values())
+    
+    async def bulk_update_grouped(self, updates: List[Dict[str, Any]],
+                                  chunk_size: Optional[int] = None) -> Dict[Tuple[str, ...], int]:
+        """
+        Update records set-wise, grouped by the columns each update changes.
+        
+        Each group is applied with as few statements as the database allows:
+        UPDATE ... FROM (VALUES ...) on PostgreSQL, a join against a
+        temporary table on SQLite, and a single executemany elsewhere. Rows
+        without an 'id' are skipped. Instances already loaded in the session
+        are not refreshed.
+        
+        Args:
+            updates: List of update dictionaries with 'id' and update fields
+            chunk_size: Rows per statement (default: derived from the parameter limit)
+            
+        Returns:
+            Rows affected per group, keyed by the sorted column names of the group
+        """
+        if not updates:
+            return {}
+        
         try:
-            updated_count = 0
+            table = self.model.__table__
+            pk_key = list(table.primary_key.columns)[0].key
+            attribute_columns = self._attribute_columns()
+            now = datetime.now(timezone.utc)
             
+            # Rows keyed by ID within each group, so a repeated ID keeps its last update
+            groups: Dict[Tuple[str, ...], Dict[Any, Dict[str, Any]]] = {}
             for update_data in updates:
                 if 'id' not in update_data:
                     continue
                 
-                record_id = update_data.pop('id')
+                row = {}
+                for field, value in update_data.items():
+                    if field == 'id':
+                        continue
+                    column_key = attribute_columns.get(field)
+                    if column_key is None:
+                        raise RepositoryError(
+                            f"Unknown field '{field}' for {self.model.__name__} bulk update"
+                        )
+                    row[column_key] = value
                 
                 # Add updated_at timestamp if available
-                if hasattr(self.model, 'updated_at'):
-                    update_data['updated_at'] = datetime.now(timezone.utc)
-                
-                query = (
-                    update(self.model)
-                    .where(self.model.id == record_id)
-                    .values(**update_data)
-                )
+                if 'updated_at' in table.c:
+                    row.setdefault('updated_at', now)
+                if not row:
+                    continue
                 
-                result = await self.session.execute(query)
-                updated_count += result.rowcount
+                row[pk_key] = update_data['id']
+                columns = tuple(sorted(key for key in row if key != pk_key))
+                groups.setdefault(columns, {})[row[pk_key]] = row
             
-            await self.session.flush()
+            conn = await self.session.connection()
+            dialect = conn.dialect
+            counts: Dict[Tuple[str, ...], int] = {}
+            
+            for columns, rows_by_id in groups.items():
+                rows = list(rows_by_id.values())
+                size = chunk_size or max(1, dialect.insertmanyvalues_max_parameters // (len(columns) + 1))
+                
+                if dialect.name == "postgresql":
+                    count = await self._update_from_values(conn, table, pk_key, columns, rows, size)
+                elif dialect.name == "sqlite":
+                    count = await self._update_from_temp_table(conn, table, pk_key, columns, rows)
+                else:
+                    stmt = (
+                        update(table)
+                        .where(table.c[pk_key] == bindparam('_pk'))
+                        .values({key: bindparam(key) for key in columns})
+                    )
+                    params = [
+                        {'_pk': row[pk_key], **{key: row[key] for key in columns}}
+                        for row in rows
+                    ]
+                    result = await conn.execute(stmt, params)
+                    count = result.rowcount
+                
+                counts[columns] = count
+                self.logger.debug(
+                    f"Bulk updated {count} {self.model.__name__} records setting {', '.join(columns)}"
+                )
             
-            self.logger.debug(f"Bulk updated {updated_count} {self.model.__name__} records")
-            return updated_count
+            return counts
             
+        except RepositoryError:
+            await self.session.rollback()
+            raise
         except Exception as e:
             await self.session.rollback()
             self.logger.error(f"Error bulk updating {self.model.__name__}: {e}")
             raise RepositoryError(f"Failed to bulk update {self.model.__name__}: {e}")
     
+    async def _update_from_values(self, conn, table, pk_key: str, columns: Tuple[str, ...],
+                                  rows: List[Dict[str, Any]], chunk_size: int) -> int:
+        """Apply one update group with UPDATE ... FROM (VALUES ...) per chunk."""
+        keys = (pk_key,) + columns
+        updated = 0
+        
+        for start in range(0, len(rows), chunk_size):
+            source = values(
+                *(column(key, table.c[key].type) for key in keys),
+                name='bulk_values'
+            ).data([tuple(row[key] for key in keys) for row in rows[start:start + chunk_size]])
+            
+            stmt = (
+                update(table)
+                .where(table.c[pk_key] == source.c[pk_key])
+                # NULLs render untyped inside VALUES, so cast back to the column type
+                .values({key: cast(source.c[key], table.c[key].type) for key in columns})
+            )
+            result = await conn.execute(stmt)
+            updated += result.rowcount
+        
+        return updated
+    
+    async def _update_from_temp_table(self, conn, table, pk_key: str, columns: Tuple[str, ...],
+                                      rows: List[Dict[str, Any]]) -> int:
+        """Apply one update group by loading it into a temporary table and joining."""
+        keys = (pk_key,) + columns
+        staging = Table(
+            f"_bulk_update_{table.name}",
+            MetaData(),
+            *(Column(key, table.c[key].type, primary_key=(key == pk_key)) for key in keys),
+            prefixes=["TEMPORARY"]
+        )
+        
+        await conn.run_sync(staging.drop, checkfirst=True)
+        await conn.run_sync(staging.create)
+        try:
+            await conn.execute(insert(staging), [{key: row[key] for key in keys} for row in rows])
+            
+            matched = select(staging.c[pk_key])
+            stmt = (
+                update(table)
+                .where(table.c[pk_key].in_(matched))
+                .values({
+                    key: select(staging.c[key])
+                    .where(staging.c[pk_key] == table.c[pk_key])
+                    .scalar_subquery()
+                    for key in columns
+                })
+            )
+            result = await conn.execute(stmt)
+            return result.rowcount
+        finally:
+            await conn.run_sync(staging.drop)
+    
+    def _attribute_columns(self) -> Dict[str, str]:
+        """Map mapped attribute names to table column keys."""
+        return {
+            prop.key: prop.columns[0].key
+            for prop in self.model.__mapper__.column_attrs
+        }
+    
     def _apply_filters(self, query: Select, include_deleted: bool = False, **filters) -> Select:
         """
         Apply filters to a query.
@@ -462,6 +823,10 @@ class BaseRepository(Generic[ModelType], ABC):
         """
         Search records by text in specified fields.
         
+        When the fields are those of the table's search index and the index
+        exists, the search uses it and returns the best matches first;
+        otherwise every row is scanned with ILIKE.
+        
         Args:
             search_term: Text to search for
             search_fields: List of field names to search in
@@ -472,6 +837,16 @@ class BaseRepository(Generic[ModelType], ABC):
             List of matching model instances
         """
         try:
+            table_name = getattr(self.model, '__tablename__', None)
+            if table_name in SEARCH_FIELDS and set(search_fields) == set(SEARCH_FIELDS[table_name]):
+                indexes = SearchIndexManager(self.session)
+                query = indexes.query(await indexes.backend(table_name), self.model, search_term)
+                if query is not None:
+                    if hasattr(self.model, 'is_deleted'):
+                        query = query.where(self.model.is_deleted == False)
+                    result = await self.session.execute(query.offset(skip).limit(limit))
+                    return result.scalars().all()
+            
             query = select(self.model)
             
             # Build search conditions
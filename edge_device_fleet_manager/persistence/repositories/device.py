@@ -5,37 +5,130 @@ Specialized repository for device management with advanced querying,
 geospatial operations, and device-specific business logic.
 """
 
+import copy
 import uuid
-from typing import List, Optional, Dict, Any, Tuple
+from typing import Awaitable, Callable, List, Optional, Dict, Any, Tuple, Union
 from datetime import datetime, timezone, timedelta
 
-from sqlalchemy import select, func, and_, or_, text
+from sqlalchemy import select, update, func, and_, or_, text, bindparam, case, literal
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload, joinedload
+from sqlalchemy import inspect
+from sqlalchemy.orm import selectinload, joinedload, make_transient_to_detached
+from sqlalchemy.orm.util import identity_key
 
 from .base import BaseRepository, RepositoryError
+from .pagination import Page
+from .device_cache import DeviceCache
+from .dynamic_groups import DynamicGroupEngine
+from .device_spatial import DeviceSpatialIndex, SpatialBackend, device_geography, point_geography
+from .summary_cache import SummaryCache
 from ..models.device import Device, DeviceStatus, DeviceType
+from ..models.geo import encode_geohash, haversine_km
 from ..models.device_group import DeviceGroup
 
 
+# Hot-path statements are built once. Executing the same construct with new
+# parameter values skips rebuilding it and reuses its memoized cache key,
+# so each call goes straight to the compiled SQL cache.
+
+_DEVICE_BY_IP = select(Device).where(
+    Device.ip_address == bindparam('ip_address'), Device.is_deleted == False
+)
+
+_DEVICE_BY_MAC = select(Device).where(
+    Device.mac_address == bindparam('mac_address'), Device.is_deleted == False
+)
+
+_DEVICE_BY_SERIAL = select(Device).where(
+    Device.serial_number == bindparam('serial_number'), Device.is_deleted == False
+)
+
+# A heartbeat brings offline devices back online and leaves other states alone
+_UPDATE_HEARTBEAT = update(Device).where(
+    Device.id == bindparam('device_id'), Device.is_deleted == False
+).values(
+    last_heartbeat=bindparam('heartbeat_at', type_=Device.last_heartbeat.type),
+    status=case(
+        (Device.status == DeviceStatus.OFFLINE, literal(DeviceStatus.ONLINE, Device.status.type)),
+        else_=Device.status
+    )
+).execution_options(synchronize_session=False)
+
+
 class DeviceRepository(BaseRepository[Device]):
     """
     Device repository with specialized device management operations.
     
     Provides device-specific queries, geospatial operations,
     health monitoring, and fleet management capabilities.
+    
+    With a DeviceCache, lookups by ID, IP and MAC address read through the
+    cache, and the repository's update, delete and heartbeat paths
+    invalidate the devices they touch. With a SummaryCache, fleet statistics
+    are served from it for its TTL.
+    
+    Location searches use the spatial index DeviceSpatialIndex detects;
+    set ``spatial_backend`` to force one.
+    
+    With a DynamicGroupEngine, writes that change a device's type, status,
+    tags, group or deletion re-evaluate that device's dynamic group
+    membership and the affected group counts in the same transaction.
     """
     
-    def __init__(self, session: AsyncSession):
+    spatial_backend: Optional[SpatialBackend] = None
+    
+    def __init__(self, session: AsyncSession, cache: Optional[DeviceCache] = None,
+                 summary_cache: Optional[SummaryCache] = None,
+                 dynamic_groups: Optional[DynamicGroupEngine] = None):
         super().__init__(session, Device)
+        self.cache = cache
+        self.summary_cache = summary_cache
+        self.dynamic_groups = dynamic_groups
+        self.spatial = DeviceSpatialIndex(session)
+    
+    async def create(self, obj_in: Union[Any, Dict[str, Any]], **kwargs) -> Device:
+        """Create a device, adding it to the dynamic groups it matches."""
+        device = await super().create(obj_in, **kwargs)
+        await self._refresh_groups([device.id])
+        return device
+    
+    async def bulk_create(self, objects: List[Union[Any, Dict[str, Any]]]) -> List[Device]:
+        """Create devices, adding them to the dynamic groups they match."""
+        devices = await super().bulk_create(objects)
+        await self._refresh_groups([device.id for device in devices])
+        return devices
+    
+    async def bulk_insert(self, objects: List[Union[Any, Dict[str, Any]]],
+                          chunk_size: Optional[int] = None,
+                          use_copy: bool = True) -> List[Any]:
+        """Insert devices through Core, adding them to the dynamic groups they match."""
+        ids = await super().bulk_insert(objects, chunk_size, use_copy)
+        await self._refresh_groups(ids)
+        return ids
+    
+    async def get(self, id: Union[uuid.UUID, str],
+                 include_deleted: bool = False) -> Optional[Device]:
+        """Get a device by ID, through the cache when configured."""
+        if self.cache is None:
+            return await super().get(id, include_deleted)
+        
+        device_id = id if isinstance(id, uuid.UUID) else uuid.UUID(str(id))
+        return await self._read_through(
+            'id', device_id, include_deleted,
+            lambda: super(DeviceRepository, self).get(device_id, include_deleted)
+        )
     
     async def get_by_ip_address(self, ip_address: str) -> Optional[Device]:
         """Get device by IP address."""
+        if self.cache is not None:
+            return await self._read_through(
+                'ip_address', ip_address, False, lambda: self._load_by_ip_address(ip_address)
+            )
+        return await self._load_by_ip_address(ip_address)
+    
+    async def _load_by_ip_address(self, ip_address: str) -> Optional[Device]:
         try:
-            query = select(self.model).where(self.model.ip_address == ip_address)
-            query = query.where(self.model.is_deleted == False)
-            
-            result = await self.session.execute(query)
+            result = await self.session.execute(_DEVICE_BY_IP, {'ip_address': ip_address})
             return result.scalar_one_or_none()
             
         except Exception as e:
@@ -44,11 +137,15 @@ class DeviceRepository(BaseRepository[Device]):
     
     async def get_by_mac_address(self, mac_address: str) -> Optional[Device]:
         """Get device by MAC address."""
+        if self.cache is not None:
+            return await self._read_through(
+                'mac_address', mac_address, False, lambda: self._load_by_mac_address(mac_address)
+            )
+        return await self._load_by_mac_address(mac_address)
+    
+    async def _load_by_mac_address(self, mac_address: str) -> Optional[Device]:
         try:
-            query = select(self.model).where(self.model.mac_address == mac_address)
-            query = query.where(self.model.is_deleted == False)
-            
-            result = await self.session.execute(query)
+            result = await self.session.execute(_DEVICE_BY_MAC, {'mac_address': mac_address})
             return result.scalar_one_or_none()
             
         except Exception as e:
@@ -58,16 +155,69 @@ class DeviceRepository(BaseRepository[Device]):
     async def get_by_serial_number(self, serial_number: str) -> Optional[Device]:
         """Get device by serial number."""
         try:
-            query = select(self.model).where(self.model.serial_number == serial_number)
-            query = query.where(self.model.is_deleted == False)
-            
-            result = await self.session.execute(query)
+            result = await self.session.execute(_DEVICE_BY_SERIAL, {'serial_number': serial_number})
             return result.scalar_one_or_none()
             
         except Exception as e:
             self.logger.error(f"Error getting device by serial {serial_number}: {e}")
             raise RepositoryError(f"Failed to get device by serial: {e}")
     
+    async def update(self, id: Union[uuid.UUID, str],
+                     obj_in: Union[Any, Dict[str, Any]],
+                     **kwargs) -> Optional[Device]:
+        """Update a device, invalidating its cache entry."""
+        device = await super().update(id, obj_in, **kwargs)
+        if device is not None:
+            await self._invalidate([device.id])
+            fields = set(kwargs)
+            fields.update(obj_in.dict(exclude_unset=True) if hasattr(obj_in, 'dict') else obj_in)
+            await self._refresh_groups([device.id], fields)
+        return device
+    
+    async def delete(self, id: Union[uuid.UUID, str],
+                     soft_delete: bool = True) -> bool:
+        """Delete a device, invalidating its cache entry."""
+        deleted = await super().delete(id, soft_delete)
+        if deleted:
+            device_id = id if isinstance(id, uuid.UUID) else uuid.UUID(str(id))
+            await self._invalidate([device_id])
+            await self._refresh_groups([device_id])
+        return deleted
+    
+    async def bulk_update_grouped(self, updates: List[Dict[str, Any]],
+                                  chunk_size: Optional[int] = None) -> Dict[Tuple[str, ...], int]:
+        """Update devices set-wise, keeping geohashes current and invalidating cache entries."""
+        relocated = []
+        updates = [dict(update) for update in updates]
+        for update in updates:
+            if 'latitude' in update and 'longitude' in update:
+                update['geohash'] = (
+                    encode_geohash(update['latitude'], update['longitude'])
+                    if update['latitude'] is not None and update['longitude'] is not None else None
+                )
+            elif ('latitude' in update or 'longitude' in update) and update.get('id') is not None:
+                relocated.append(update['id'])
+        
+        counts = await super().bulk_update_grouped(updates, chunk_size)
+        if relocated:
+            # The other coordinate is only known to the database
+            await self.spatial.refresh_geohashes(relocated)
+        await self._invalidate([update['id'] for update in updates if update.get('id') is not None])
+        if self.dynamic_groups is not None:
+            await self._refresh_groups([
+                update['id'] for update in updates
+                if update.get('id') is not None and self.dynamic_groups.is_relevant(update)
+            ])
+        return counts
+    
+    def _prepare_bulk_rows(self, objects: List[Union[Any, Dict[str, Any]]]) -> List[Dict[str, Any]]:
+        """Column-keyed device rows, with the geohash of their coordinates."""
+        rows = super()._prepare_bulk_rows(objects)
+        for row in rows:
+            if row.get('latitude') is not None and row.get('longitude') is not None:
+                row['geohash'] = encode_geohash(row['latitude'], row['longitude'])
+        return rows
+    
     async def get_by_status(self, status: DeviceStatus, 
                            skip: int = 0, limit: int = 100) -> List[Device]:
         """Get devices by status."""
@@ -84,6 +234,24 @@ class DeviceRepository(BaseRepository[Device]):
             self.logger.error(f"Error getting devices by status {status}: {e}")
             raise RepositoryError(f"Failed to get devices by status: {e}")
     
+    async def get_by_status_page(self, status: DeviceStatus,
+                                 cursor: Optional[str] = None,
+                                 limit: int = 100) -> Page[Device]:
+        """
+        Get devices by status, most recently seen first, one keyset page at a time.
+        
+        Args:
+            status: Device status
+            cursor: next_cursor of the previous page, or None for the first page
+            limit: Maximum number of devices to return
+            
+        Returns:
+            Page of devices with the cursor of the next page
+        """
+        query = select(self.model).where(self.model.status == status)
+        query = query.where(self.model.is_deleted == False)
+        return await self.paginate(query, ['-last_seen'], cursor=cursor, limit=limit)
+    
     async def get_by_device_type(self, device_type: DeviceType,
                                 skip: int = 0, limit: int = 100) -> List[Device]:
         """Get devices by type."""
@@ -128,7 +296,10 @@ class DeviceRepository(BaseRepository[Device]):
                                      radius_km: float, skip: int = 0, 
                                      limit: int = 100) -> List[Device]:
         """
-        Get devices within a geographic radius.
+        Get devices within a geographic radius, nearest first.
+        
+        Candidates come from the spatial index and are refined with the
+        exact haversine distance.
         
         Args:
             latitude: Center latitude
@@ -141,30 +312,33 @@ class DeviceRepository(BaseRepository[Device]):
             List of devices within the radius
         """
         try:
-            # Using Haversine formula for distance calculation
-            # This is a simplified version - in production you'd use PostGIS
+            backend = self.spatial_backend or await self.spatial.backend()
             query = select(self.model).where(
                 and_(
                     self.model.latitude.isnot(None),
                     self.model.longitude.isnot(None),
-                    self.model.is_deleted == False
+                    self.model.is_deleted == False,
+                    self.spatial.candidate_condition(backend, latitude, longitude, radius_km)
                 )
             )
             
-            # Add distance calculation (simplified)
-            # In production, use proper geospatial functions
-            distance_formula = func.sqrt(
-                func.pow(69.1 * (self.model.latitude - latitude), 2) +
-                func.pow(69.1 * (longitude - self.model.longitude) * 
-                        func.cos(self.model.latitude / 57.3), 2)
-            )
-            
-            query = query.where(distance_formula <= radius_km)
-            query = query.order_by(distance_formula)
-            query = query.offset(skip).limit(limit)
+            if backend is SpatialBackend.POSTGIS:
+                # ST_DWithin is exact, so the database can order and page
+                query = query.order_by(
+                    func.ST_Distance(device_geography(), point_geography(latitude, longitude))
+                )
+                query = query.offset(skip).limit(limit)
+                result = await self.session.execute(query)
+                return result.scalars().all()
             
             result = await self.session.execute(query)
-            return result.scalars().all()
+            nearby = []
+            for device in result.scalars().all():
+                distance = haversine_km(latitude, longitude, device.latitude, device.longitude)
+                if distance <= radius_km:
+                    nearby.append((distance, device))
+            nearby.sort(key=lambda item: item[0])
+            return [device for _, device in nearby[skip:skip + limit]]
             
         except Exception as e:
             self.logger.error(f"Error getting devices by location: {e}")
@@ -276,43 +450,42 @@ class DeviceRepository(BaseRepository[Device]):
         Returns:
             Dictionary with device statistics
         """
+        if self.summary_cache is not None:
+            return await self.summary_cache.get('device_statistics', self._compute_device_statistics)
+        return await self._compute_device_statistics()
+    
+    async def _compute_device_statistics(self) -> Dict[str, Any]:
         try:
-            # Total devices
-            total_query = select(func.count(self.model.id)).where(self.model.is_deleted == False)
-            total_result = await self.session.execute(total_query)
-            total_devices = total_result.scalar()
-            
-            # Devices by status
-            status_query = (
-                select(self.model.status, func.count(self.model.id))
+            # One scan grouped by status and type; every total is a sum of groups
+            query = (
+                select(
+                    self.model.status,
+                    self.model.device_type,
+                    func.count(self.model.id),
+                    func.count(self.model.health_score),
+                    func.sum(self.model.health_score),
+                    func.min(self.model.health_score),
+                    func.max(self.model.health_score)
+                )
                 .where(self.model.is_deleted == False)
-                .group_by(self.model.status)
+                .group_by(self.model.status, self.model.device_type)
             )
-            status_result = await self.session.execute(status_query)
-            status_counts = dict(status_result.all())
+            result = await self.session.execute(query)
             
-            # Devices by type
-            type_query = (
-                select(self.model.device_type, func.count(self.model.id))
-                .where(self.model.is_deleted == False)
-                .group_by(self.model.device_type)
-            )
-            type_result = await self.session.execute(type_query)
-            type_counts = dict(type_result.all())
-            
-            # Health statistics
-            health_query = select(
-                func.avg(self.model.health_score),
-                func.min(self.model.health_score),
-                func.max(self.model.health_score)
-            ).where(
-                and_(
-                    self.model.health_score.isnot(None),
-                    self.model.is_deleted == False
-                )
-            )
-            health_result = await self.session.execute(health_query)
-            avg_health, min_health, max_health = health_result.first()
+            total_devices = 0
+            status_counts: Dict[DeviceStatus, int] = {}
+            type_counts: Dict[DeviceType, int] = {}
+            health_count, health_sum = 0, 0.0
+            min_health = max_health = None
+            for status, device_type, count, scored, score_sum, score_min, score_max in result.all():
+                total_devices += count
+                status_counts[status] = status_counts.get(status, 0) + count
+                type_counts[device_type] = type_counts.get(device_type, 0) + count
+                if scored:
+                    health_count += scored
+                    health_sum += score_sum
+                    min_health = score_min if min_health is None else min(min_health, score_min)
+                    max_health = score_max if max_health is None else max(max_health, score_max)
             
             return {
                 'total_devices': total_devices,
@@ -323,9 +496,9 @@ class DeviceRepository(BaseRepository[Device]):
                     device_type.value: count for device_type, count in type_counts.items()
                 },
                 'health_statistics': {
-                    'average_health': float(avg_health) if avg_health else None,
-                    'min_health': float(min_health) if min_health else None,
-                    'max_health': float(max_health) if max_health else None
+                    'average_health': health_sum / health_count if health_count else None,
+                    'min_health': float(min_health) if min_health is not None else None,
+                    'max_health': float(max_health) if max_health is not None else None
                 }
             }
             
@@ -353,6 +526,7 @@ class DeviceRepository(BaseRepository[Device]):
             if device:
                 device.update_last_seen()
                 await self.session.flush()
+                await self._invalidate([device_id])
                 return True
             
             return False
@@ -374,13 +548,26 @@ class DeviceRepository(BaseRepository[Device]):
             True if updated successfully
         """
         try:
-            device = await self.get(device_id)
-            if device:
-                device.update_heartbeat()
-                await self.session.flush()
-                return True
+            if timestamp is None:
+                timestamp = datetime.now(timezone.utc)
             
-            return False
+            was_offline = False
+            if self.dynamic_groups is not None:
+                # Membership only needs re-evaluating when the heartbeat brings the device online
+                status = await self.session.execute(
+                    select(self.model.status).where(self.model.id == device_id)
+                )
+                was_offline = status.scalar() == DeviceStatus.OFFLINE
+            
+            # One UPDATE instead of loading the device and flushing it;
+            # devices already loaded in this session are not refreshed
+            result = await self.session.execute(
+                _UPDATE_HEARTBEAT, {'device_id': device_id, 'heartbeat_at': timestamp}
+            )
+            await self._invalidate([device_id])
+            if was_offline:
+                await self._refresh_groups([device_id])
+            return result.rowcount > 0
             
         except Exception as e:
             self.logger.error(f"Error updating heartbeat for device {device_id}: {e}")
@@ -427,3 +614,80 @@ class DeviceRepository(BaseRepository[Device]):
         except Exception as e:
             self.logger.error(f"Error getting devices with telemetry: {e}")
             raise RepositoryError(f"Failed to get devices with telemetry: {e}")
+    
+    async def _read_through(self, field: str, value: Any, include_deleted: bool,
+                            load: Callable[[], Awaitable[Optional[Device]]]) -> Optional[Device]:
+        """
+        Serve a lookup from the cache, loading and caching the device on a miss.
+        
+        Args:
+            field: Looked-up column ('id', 'ip_address' or 'mac_address')
+            value: Looked-up value
+            include_deleted: Whether soft-deleted devices may be returned
+            load: Database lookup used on a miss
+            
+        Returns:
+            Device instance attached to this session, or None
+        """
+        snapshot = await self.cache.lookup(field, value)
+        if snapshot is not None and (include_deleted or not snapshot['is_deleted']):
+            if not self.cache.should_verify() or await self._verify(snapshot):
+                return self._attach(snapshot)
+        
+        started = self.cache.begin_load()
+        device = await load()
+        if device is not None and not self.cache.is_pending(self.session, device.id):
+            snapshot = self._snapshot(device)
+            if snapshot is not None:
+                await self.cache.store(snapshot, started)
+        return device
+    
+    async def _verify(self, snapshot: Dict[str, Any]) -> bool:
+        """Check a cached snapshot against the database, dropping it if stale."""
+        result = await self.session.execute(
+            select(self.model.updated_at).where(self.model.id == snapshot['id'])
+        )
+        current = result.first()
+        stale = current is None or current[0] != snapshot['updated_at']
+        self.cache.record_verification(stale)
+        if stale:
+            await self.cache.invalidate([snapshot['id']])
+        return not stale
+    
+    def _attach(self, snapshot: Dict[str, Any]) -> Device:
+        """Return the session's instance for a snapshot, attaching a new one if needed."""
+        existing = self.session.identity_map.get(identity_key(Device, snapshot['id']))
+        if existing is not None:
+            return existing
+        
+        device = Device.__mapper__.class_manager.new_instance()
+        for key, value in copy.deepcopy(snapshot).items():
+            setattr(device, key, value)
+        # Persistent without a SELECT, as if just loaded
+        make_transient_to_detached(device)
+        self.session.add(device)
+        return device
+    
+    def _snapshot(self, device: Device) -> Optional[Dict[str, Any]]:
+        """Column values of a loaded device, or None if some are not loaded."""
+        loaded = inspect(device).dict
+        keys = [prop.key for prop in Device.__mapper__.column_attrs]
+        if any(key not in loaded for key in keys):
+            return None
+        return copy.deepcopy({key: loaded[key] for key in keys})
+    
+    async def _refresh_groups(self, device_ids: List[uuid.UUID],
+                              fields: Optional[Any] = None) -> None:
+        """Re-evaluate dynamic group membership of written devices, if any relevant field changed."""
+        if self.dynamic_groups is None or not device_ids:
+            return
+        if fields is not None and not self.dynamic_groups.is_relevant(fields):
+            return
+        await self.dynamic_groups.refresh_devices(device_ids)
+    
+    async def _invalidate(self, device_ids: List[uuid.UUID]) -> None:
+        """Drop written devices from the cache now and again when the transaction ends."""
+        if self.cache is None or not device_ids:
+            return
+        await self.cache.invalidate(device_ids)
+        self.cache.invalidate_on_commit(self.session, device_ids)
@@ -0,0 +1,349 @@
+"""
+Device Cache
+
+Read-through second-level cache for device lookups by ID, IP address and
+MAC address. Entries are column snapshots of devices, held in a local LRU
+tier and optionally shared through Redis; DeviceRepository turns them back
+into session-attached instances and invalidates them on its write paths.
+"""
+
+import asyncio
+import itertools
+import json
+import random
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, Optional, Set, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ...core.logging import get_logger
+from ..models.device import Device
+from .pagination import decode_value, encode_value
+
+# Lookup fields served from the cache, besides the primary key
+SECONDARY_FIELDS = ('ip_address', 'mac_address')
+
+_cache_ids = itertools.count()
+
+
+@dataclass
+class DeviceCacheStats:
+    """Device cache counters."""
+
+    local_hits: int = 0
+    redis_hits: int = 0
+    misses: int = 0
+    fills: int = 0
+    rejected_fills: int = 0
+    invalidations: int = 0
+    evictions: int = 0
+    verifications: int = 0
+    stale_reads: int = 0
+
+    @property
+    def hits(self) -> int:
+        return self.local_hits + self.redis_hits
+
+    @property
+    def hit_ratio(self) -> float:
+        """Fraction of lookups answered from either tier."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    @property
+    def stale_read_ratio(self) -> float:
+        """Fraction of verified hits that no longer matched the database."""
+        return self.stale_reads / self.verifications if self.verifications else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert statistics to dictionary."""
+        return {
+            'local_hits': self.local_hits,
+            'redis_hits': self.redis_hits,
+            'misses': self.misses,
+            'hit_ratio': self.hit_ratio,
+            'fills': self.fills,
+            'rejected_fills': self.rejected_fills,
+            'invalidations': self.invalidations,
+            'evictions': self.evictions,
+            'verifications': self.verifications,
+            'stale_reads': self.stale_reads,
+            'stale_read_ratio': self.stale_read_ratio,
+        }
+
+
+class DeviceCache:
+    """
+    Two-tier cache of device snapshots.
+
+    The local tier is an LRU with a short TTL, which also bounds how long
+    another process's writes can go unseen here. The optional Redis tier is
+    shared between processes and invalidated by every writer.
+
+    Secondary keys (IP, MAC) map to a device ID and are checked against the
+    snapshot they resolve to, so they never need invalidating themselves.
+    Invalidation is applied when the repository writes and again when the
+    writing session commits, and a fill is rejected if its device was
+    invalidated while it was being loaded, so a slow reader cannot put back
+    data a concurrent writer has just replaced.
+
+    With ``verify_ratio`` above zero, that fraction of hits is checked
+    against the database's ``updated_at``; mismatches count as stale reads
+    and are reloaded.
+    """
+
+    def __init__(self, max_entries: int = 10000,
+                 ttl_seconds: float = 30.0,
+                 redis_client: Optional[Any] = None,
+                 redis_ttl_seconds: int = 300,
+                 key_prefix: str = "efm:device:",
+                 verify_ratio: float = 0.0):
+        """
+        Initialize the device cache.
+
+        Args:
+            max_entries: Devices held in the local tier
+            ttl_seconds: Lifetime of local entries
+            redis_client: ``redis.asyncio`` client for the shared tier
+            redis_ttl_seconds: Lifetime of Redis entries
+            key_prefix: Prefix of Redis keys
+            verify_ratio: Fraction of hits checked against the database
+        """
+        if max_entries <= 0:
+            raise ValueError("Cache size must be positive")
+        if ttl_seconds <= 0:
+            raise ValueError("Cache TTL must be positive")
+        if not 0.0 <= verify_ratio <= 1.0:
+            raise ValueError("Verify ratio must be between 0 and 1")
+
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.redis = redis_client
+        self.redis_ttl_seconds = redis_ttl_seconds
+        self.key_prefix = key_prefix
+        self.verify_ratio = verify_ratio
+        self.stats = DeviceCacheStats()
+        self.logger = get_logger(f"{__name__}.DeviceCache")
+
+        self._entries: "OrderedDict[Any, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._secondary: Dict[Tuple[str, Any], Any] = {}
+        self._clock = itertools.count(1)
+        self._invalidated_at: Dict[Any, int] = {}
+        self._pending_key = f"device_cache_pending_{next(_cache_ids)}"
+        self._tasks: Set[asyncio.Task] = set()
+        self._columns = {prop.key: prop.columns[0] for prop in Device.__mapper__.column_attrs}
+
+    # Reads
+
+    async def lookup(self, field: str, value: Any) -> Optional[Dict[str, Any]]:
+        """
+        Find the snapshot of the device whose ``field`` equals ``value``.
+
+        Args:
+            field: 'id' or one of SECONDARY_FIELDS
+            value: Value to look up
+
+        Returns:
+            Column snapshot, or None on a miss
+        """
+        device_id = value if field == 'id' else self._secondary.get((field, value))
+        snapshot = self._local_get(device_id) if device_id is not None else None
+        if snapshot is not None and snapshot.get(field) == value:
+            self.stats.local_hits += 1
+            return snapshot
+
+        snapshot = await self._redis_lookup(field, value)
+        if snapshot is not None:
+            self.stats.redis_hits += 1
+            self._local_put(snapshot)
+            return snapshot
+
+        self.stats.misses += 1
+        return None
+
+    def begin_load(self) -> int:
+        """Mark the start of a database load; pass the result to :meth:`store`."""
+        return next(self._clock)
+
+    async def store(self, snapshot: Dict[str, Any], started: int) -> bool:
+        """
+        Fill both tiers with a snapshot loaded from the database.
+
+        Args:
+            snapshot: Column snapshot of the device
+            started: Value of :meth:`begin_load` taken before the load
+
+        Returns:
+            False if the device was invalidated during the load
+        """
+        if self._invalidated_at.get(snapshot['id'], 0) > started:
+            self.stats.rejected_fills += 1
+            return False
+
+        self.stats.fills += 1
+        self._local_put(snapshot)
+        await self._redis_store(snapshot)
+        return True
+
+    def should_verify(self) -> bool:
+        """Whether to check this hit against the database."""
+        return self.verify_ratio > 0 and random.random() < self.verify_ratio
+
+    def record_verification(self, stale: bool) -> None:
+        """Count a verified hit."""
+        self.stats.verifications += 1
+        if stale:
+            self.stats.stale_reads += 1
+
+    # Invalidation
+
+    async def invalidate(self, device_ids: Iterable[Any]) -> None:
+        """Drop devices from both tiers."""
+        device_ids = [device_id for device_id in device_ids if device_id is not None]
+        if not device_ids:
+            return
+        self._invalidate_local(device_ids)
+        await self._redis_delete(device_ids)
+
+    def invalidate_on_commit(self, session: AsyncSession, device_ids: Iterable[Any]) -> None:
+        """
+        Invalidate devices again once ``session`` commits or rolls back.
+
+        Readers in other sessions can load and cache the old row between the
+        write and its commit; the second invalidation removes what they cached.
+        """
+        sync_session = session.sync_session
+        pending = sync_session.info.get(self._pending_key)
+        if pending is None:
+            pending = sync_session.info[self._pending_key] = set()
+            event.listen(sync_session, "after_commit", self._after_commit)
+            event.listen(sync_session, "after_soft_rollback", self._after_rollback)
+        pending.update(device_id for device_id in device_ids if device_id is not None)
+
+    def is_pending(self, session: AsyncSession, device_id: Any) -> bool:
+        """Whether ``session`` wrote the device in its uncommitted transaction."""
+        return device_id in session.sync_session.info.get(self._pending_key, ())
+
+    def clear(self) -> None:
+        """Empty the local tier."""
+        self._entries.clear()
+        self._secondary.clear()
+
+    def _after_commit(self, sync_session) -> None:
+        device_ids = sync_session.info.get(self._pending_key)
+        if not device_ids:
+            return
+        device_ids = list(device_ids)
+        sync_session.info[self._pending_key].clear()
+        self._invalidate_deferred(device_ids)
+
+    def _after_rollback(self, sync_session, previous_transaction) -> None:
+        # Anything filled from the rolled-back writes must go too
+        self._after_commit(sync_session)
+
+    def _invalidate_deferred(self, device_ids) -> None:
+        self._invalidate_local(device_ids)
+        if self.redis is not None:
+            # Commit listeners are synchronous; finish the Redis side in a task
+            task = asyncio.get_running_loop().create_task(self._redis_delete(device_ids))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    def _invalidate_local(self, device_ids: Iterable[Any]) -> None:
+        for device_id in device_ids:
+            self._invalidated_at[device_id] = next(self._clock)
+            self.stats.invalidations += 1
+            entry = self._entries.pop(device_id, None)
+            if entry:
+                self._drop_secondary(entry[1])
+
+    # Local tier
+
+    def _local_get(self, device_id: Any) -> Optional[Dict[str, Any]]:
+        entry = self._entries.get(device_id)
+        if entry is None:
+            return None
+        expires, snapshot = entry
+        if time.monotonic() >= expires:
+            del self._entries[device_id]
+            self._drop_secondary(snapshot)
+            return None
+        self._entries.move_to_end(device_id)
+        return snapshot
+
+    def _local_put(self, snapshot: Dict[str, Any]) -> None:
+        device_id = snapshot['id']
+        previous = self._entries.pop(device_id, None)
+        if previous:
+            self._drop_secondary(previous[1])
+
+        self._entries[device_id] = (time.monotonic() + self.ttl_seconds, snapshot)
+        for field in SECONDARY_FIELDS:
+            if snapshot.get(field) is not None:
+                self._secondary[(field, snapshot[field])] = device_id
+
+        while len(self._entries) > self.max_entries:
+            _, (_, evicted) = self._entries.popitem(last=False)
+            self._drop_secondary(evicted)
+            self.stats.evictions += 1
+
+    def _drop_secondary(self, snapshot: Dict[str, Any]) -> None:
+        for field in SECONDARY_FIELDS:
+            key = (field, snapshot.get(field))
+            if self._secondary.get(key) == snapshot['id']:
+                del self._secondary[key]
+
+    # Redis tier
+
+    def _redis_key(self, field: str, value: Any) -> str:
+        return f"{self.key_prefix}{field}:{value}"
+
+    async def _redis_lookup(self, field: str, value: Any) -> Optional[Dict[str, Any]]:
+        if self.redis is None:
+            return None
+        try:
+            device_id = value
+            if field != 'id':
+                raw_id = await self.redis.get(self._redis_key(field, value))
+                if raw_id is None:
+                    return None
+                device_id = raw_id.decode() if isinstance(raw_id, bytes) else raw_id
+
+            raw = await self.redis.get(self._redis_key('id', device_id))
+            if raw is None:
+                return None
+            snapshot = {
+                key: decode_value(item, self._columns[key])
+                for key, item in json.loads(raw).items() if key in self._columns
+            }
+            return snapshot if snapshot.get(field) == value else None
+
+        except Exception as e:
+            self.logger.error(f"Redis device cache lookup failed: {e}")
+            return None
+
+    async def _redis_store(self, snapshot: Dict[str, Any]) -> None:
+        if self.redis is None:
+            return
+        try:
+            device_id = snapshot['id']
+            payload = json.dumps({key: encode_value(value) for key, value in snapshot.items()})
+            await self.redis.setex(self._redis_key('id', device_id), self.redis_ttl_seconds, payload)
+            for field in SECONDARY_FIELDS:
+                if snapshot.get(field) is not None:
+                    await self.redis.setex(
+                        self._redis_key(field, snapshot[field]), self.redis_ttl_seconds, str(device_id)
+                    )
+        except Exception as e:
+            self.logger.error(f"Redis device cache store failed: {e}")
+
+    async def _redis_delete(self, device_ids: Iterable[Any]) -> None:
+        if self.redis is None:
+            return
+        try:
+            await self.redis.delete(*(self._redis_key('id', device_id) for device_id in device_ids))
+        except Exception as e:
+            self.logger.error(f"Redis device cache invalidation failed: {e}")
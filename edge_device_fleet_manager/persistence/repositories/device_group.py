@@ -6,14 +6,19 @@ operations, membership management, and group-based queries.
 """
 
 import uuid
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Union
 from datetime import datetime, timezone
 
-from sqlalchemy import select, func, and_, or_
+from sqlalchemy import select, func, and_, or_, bindparam, case, literal
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from .base import BaseRepository, RepositoryError
-from ..models.device_group import DeviceGroup, DeviceGroupMembership
+from .dynamic_groups import DynamicGroupEngine
+from ..models.device import Device, DeviceStatus
+from ..models.device_group import DeviceGroup, DeviceGroupMembership, path_segment, subtree_range
+
+# Guards the recursive queries against cycles in legacy data
+MAX_HIERARCHY_DEPTH = 64
 
 
 class DeviceGroupRepository(BaseRepository[DeviceGroup]):
@@ -22,10 +27,58 @@ class DeviceGroupRepository(BaseRepository[DeviceGroup]):
     
     Provides specialized operations for device groups including
     hierarchy management, membership operations, and group queries.
+    
+    Hierarchy reads (ancestors, descendants, subtrees) run as a single
+    recursive CTE each. Subtree membership checks read the group's
+    materialised ``hierarchy_path`` by primary key.
+    
+    With a DynamicGroupEngine, creating a dynamic group or changing its
+    criteria recomputes its membership in the same transaction; making it
+    static or deleting it removes that membership.
     """
     
-    def __init__(self, session: AsyncSession):
+    def __init__(self, session: AsyncSession,
+                 dynamic_groups: Optional[DynamicGroupEngine] = None):
         super().__init__(session, DeviceGroup)
+        self.dynamic_groups = dynamic_groups
+    
+    async def create(self, obj_in: Union[Any, Dict[str, Any]], **kwargs) -> DeviceGroup:
+        """Create a group, computing its membership if it is dynamic."""
+        group = await super().create(obj_in, **kwargs)
+        if self.dynamic_groups is not None and group.is_dynamic:
+            await self.dynamic_groups.refresh_groups([group.id])
+        return group
+    
+    async def update(self, id: Union[uuid.UUID, str],
+                     obj_in: Union[Any, Dict[str, Any]],
+                     **kwargs) -> Optional[DeviceGroup]:
+        """Update a group, recomputing its membership if its criteria changed."""
+        if self.dynamic_groups is None:
+            return await super().update(id, obj_in, **kwargs)
+        
+        existing = await self.get(id)
+        was_dynamic = existing is not None and existing.is_dynamic
+        group = await super().update(id, obj_in, **kwargs)
+        if group is None:
+            return group
+        
+        if group.is_dynamic:
+            fields = set(kwargs)
+            fields.update(obj_in.dict(exclude_unset=True) if hasattr(obj_in, 'dict') else obj_in)
+            if fields & {'is_dynamic', 'dynamic_criteria'}:
+                await self.dynamic_groups.refresh_groups([group.id])
+        elif was_dynamic:
+            await self.dynamic_groups.clear_groups([group.id])
+            await self.session.refresh(group)
+        return group
+    
+    async def delete(self, id: Union[uuid.UUID, str], soft_delete: bool = True) -> bool:
+        """Delete a group, removing its membership first if it is dynamic."""
+        if self.dynamic_groups is not None:
+            group = await self.get(id)
+            if group is not None and group.is_dynamic:
+                await self.dynamic_groups.clear_groups([group.id])
+        return await super().delete(id, soft_delete=soft_delete)
     
     async def get_root_groups(self, skip: int = 0, limit: int = 100) -> List[DeviceGroup]:
         """Get root groups (groups without parent)."""
@@ -106,24 +159,262 @@ class DeviceGroupRepository(BaseRepository[DeviceGroup]):
             raise RepositoryError(f"Failed to get dynamic groups: {e}")
     
     async def get_group_hierarchy(self, group_id: uuid.UUID) -> List[DeviceGroup]:
-        """Get complete hierarchy path for a group."""
+        """Get complete hierarchy path for a group, root first."""
         try:
-            hierarchy = []
-            current_group = await self.get(group_id)
-            
-            while current_group:
-                hierarchy.append(current_group)
-                if current_group.parent_group_id:
-                    current_group = await self.get(current_group.parent_group_id)
-                else:
-                    break
-            
-            return list(reversed(hierarchy))  # Root to leaf order
+            ancestors = self._ancestors_cte(group_id)
+            query = (
+                select(self.model)
+                .join(ancestors, self.model.id == ancestors.c.id)
+                .order_by(ancestors.c.depth.desc())
+            )
+            result = await self.session.execute(query)
+            return result.scalars().all()
             
         except Exception as e:
             self.logger.error(f"Error getting group hierarchy for {group_id}: {e}")
             raise RepositoryError(f"Failed to get group hierarchy: {e}")
     
+    async def get_ancestors(self, group_id: uuid.UUID) -> List[DeviceGroup]:
+        """Get the ancestors of a group, root first."""
+        hierarchy = await self.get_group_hierarchy(group_id)
+        return hierarchy[:-1]
+    
+    async def get_descendants(self, group_id: uuid.UUID,
+                              include_self: bool = False,
+                              max_depth: Optional[int] = None) -> List[DeviceGroup]:
+        """
+        Get the groups below a group.
+        
+        Args:
+            group_id: Root of the subtree
+            include_self: Whether to include the root group itself
+            max_depth: Deepest level to return, counting children as 1
+            
+        Returns:
+            Groups ordered by depth, then name
+        """
+        try:
+            descendants = self._descendants_cte(group_id, max_depth)
+            query = (
+                select(self.model)
+                .join(descendants, self.model.id == descendants.c.id)
+                .order_by(descendants.c.depth, self.model.name)
+            )
+            if not include_self:
+                query = query.where(descendants.c.depth > 0)
+            
+            result = await self.session.execute(query)
+            return result.scalars().all()
+            
+        except Exception as e:
+            self.logger.error(f"Error getting descendants of group {group_id}: {e}")
+            raise RepositoryError(f"Failed to get group descendants: {e}")
+    
+    async def get_subtree(self, group_id: uuid.UUID) -> List[Dict[str, Any]]:
+        """
+        Get a group's subtree with device counts, in one query.
+        
+        Args:
+            group_id: Root of the subtree
+            
+        Returns:
+            One entry per group, ordered by depth then name, with the group,
+            its depth below the root, its own device and online device
+            counts, and the same counts summed over its subtree
+        """
+        try:
+            descendants = self._descendants_cte(group_id)
+            devices = (
+                select(
+                    Device.device_group_id,
+                    func.count(Device.id).label('device_count'),
+                    func.count(case((Device.status == DeviceStatus.ONLINE, Device.id))).label('online_count')
+                )
+                .where(
+                    Device.device_group_id.in_(select(descendants.c.id)),
+                    Device.is_deleted == False
+                )
+                .group_by(Device.device_group_id)
+                .subquery()
+            )
+            query = (
+                select(self.model, descendants.c.depth, devices.c.device_count, devices.c.online_count)
+                .join(descendants, self.model.id == descendants.c.id)
+                .outerjoin(devices, devices.c.device_group_id == self.model.id)
+                .order_by(descendants.c.depth, self.model.name)
+            )
+            result = await self.session.execute(query)
+            
+            entries = [
+                {
+                    'group': group,
+                    'depth': depth,
+                    'device_count': device_count or 0,
+                    'online_device_count': online_count or 0,
+                    'subtree_device_count': device_count or 0,
+                    'subtree_online_device_count': online_count or 0,
+                }
+                for group, depth, device_count, online_count in result.all()
+            ]
+            
+            # Roll counts up the tree, deepest groups first
+            by_id = {entry['group'].id: entry for entry in entries}
+            for entry in reversed(entries):
+                parent = by_id.get(entry['group'].parent_group_id)
+                if parent is not None and entry['depth'] > 0:
+                    parent['subtree_device_count'] += entry['subtree_device_count']
+                    parent['subtree_online_device_count'] += entry['subtree_online_device_count']
+            return entries
+            
+        except Exception as e:
+            self.logger.error(f"Error getting subtree of group {group_id}: {e}")
+            raise RepositoryError(f"Failed to get group subtree: {e}")
+    
+    async def is_in_subtree(self, group_id: uuid.UUID, ancestor_id: uuid.UUID) -> bool:
+        """
+        Check whether a group is ``ancestor_id`` or lies below it.
+        
+        Answered from the group's hierarchy path with one primary key lookup;
+        groups without a path fall back to walking their ancestors.
+        """
+        try:
+            result = await self.session.execute(
+                select(self.model.hierarchy_path).where(self.model.id == group_id)
+            )
+            path = result.scalar()
+            if path:
+                return path_segment(ancestor_id) in path
+            
+            ancestors = self._ancestors_cte(group_id)
+            result = await self.session.execute(
+                select(ancestors.c.id).where(ancestors.c.id == ancestor_id)
+            )
+            return result.first() is not None
+            
+        except Exception as e:
+            self.logger.error(f"Error checking subtree of group {ancestor_id}: {e}")
+            raise RepositoryError(f"Failed to check group subtree: {e}")
+    
+    async def get_subtree_group_ids(self, group_id: uuid.UUID) -> List[uuid.UUID]:
+        """Get the IDs of a group and its descendants with an index range scan of hierarchy paths."""
+        try:
+            result = await self.session.execute(
+                select(self.model.hierarchy_path).where(self.model.id == group_id)
+            )
+            path = result.scalar()
+            if not path:
+                return [group.id for group in await self.get_descendants(group_id, include_self=True)]
+            
+            low, high = subtree_range(path)
+            result = await self.session.execute(
+                select(self.model.id).where(
+                    self.model.hierarchy_path >= low,
+                    self.model.hierarchy_path < high,
+                    self.model.is_deleted == False
+                )
+            )
+            return result.scalars().all()
+            
+        except Exception as e:
+            self.logger.error(f"Error getting subtree group IDs of {group_id}: {e}")
+            raise RepositoryError(f"Failed to get subtree group IDs: {e}")
+    
+    async def rebuild_hierarchy_paths(self) -> int:
+        """
+        Recompute every group's hierarchy path from the parent links.
+        
+        Needed once for groups created before paths existed, and after
+        writes that change ``parent_group_id`` without the ORM.
+        
+        Returns:
+            Number of groups whose path changed
+        """
+        try:
+            table = self.model.__table__
+            result = await self.session.execute(
+                select(table.c.id, table.c.parent_group_id, table.c.hierarchy_path)
+            )
+            rows = result.all()
+            parents = {group_id: parent_id for group_id, parent_id, _ in rows}
+            
+            paths: Dict[uuid.UUID, Optional[str]] = {}
+            
+            def path_of(group_id: uuid.UUID) -> Optional[str]:
+                # Iterative, so deep or cyclic data cannot overflow the stack
+                chain = []
+                current = group_id
+                while current is not None and current not in paths:
+                    if current in chain or len(chain) > MAX_HIERARCHY_DEPTH:
+                        for member in chain:
+                            paths[member] = None
+                        return None
+                    chain.append(current)
+                    current = parents.get(current)
+                
+                prefix = "/" if current is None else paths[current]
+                for member in reversed(chain):
+                    if prefix is not None and member in parents:
+                        prefix = prefix + f"{member.hex}/"
+                    else:
+                        prefix = None
+                    paths[member] = prefix
+                return paths[group_id]
+            
+            changes = [
+                {'group_id': group_id, 'new_path': path_of(group_id)}
+                for group_id, _, current_path in rows
+                if path_of(group_id) != current_path
+            ]
+            if changes:
+                await self.session.execute(
+                    table.update()
+                    .where(table.c.id == bindparam('group_id'))
+                    .values(hierarchy_path=bindparam('new_path')),
+                    changes
+                )
+            
+            self.logger.info(f"Rebuilt hierarchy paths: {len(changes)} of {len(rows)} groups changed")
+            return len(changes)
+            
+        except Exception as e:
+            self.logger.error(f"Error rebuilding hierarchy paths: {e}")
+            raise RepositoryError(f"Failed to rebuild hierarchy paths: {e}")
+    
+    def _ancestors_cte(self, group_id: uuid.UUID):
+        """Recursive CTE of a group and its live ancestors, with depth 0 at the group."""
+        groups = self.model
+        tree = (
+            select(groups.id, groups.parent_group_id, literal(0).label('depth'))
+            .where(groups.id == group_id, groups.is_deleted == False)
+            .cte('group_ancestors', recursive=True)
+        )
+        return tree.union_all(
+            select(groups.id, groups.parent_group_id, tree.c.depth + 1)
+            .where(
+                groups.id == tree.c.parent_group_id,
+                groups.is_deleted == False,
+                tree.c.depth < MAX_HIERARCHY_DEPTH
+            )
+        )
+    
+    def _descendants_cte(self, group_id: uuid.UUID, max_depth: Optional[int] = None):
+        """Recursive CTE of a group and its live descendants, with depth 0 at the group."""
+        groups = self.model
+        limit = MAX_HIERARCHY_DEPTH if max_depth is None else min(max_depth, MAX_HIERARCHY_DEPTH)
+        tree = (
+            select(groups.id, literal(0).label('depth'))
+            .where(groups.id == group_id, groups.is_deleted == False)
+            .cte('group_descendants', recursive=True)
+        )
+        return tree.union_all(
+            select(groups.id, tree.c.depth + 1)
+            .where(
+                groups.parent_group_id == tree.c.id,
+                groups.is_deleted == False,
+                tree.c.depth < limit
+            )
+        )
+    
     async def get_group_statistics(self) -> Dict[str, Any]:
         """Get device group statistics."""
         try:
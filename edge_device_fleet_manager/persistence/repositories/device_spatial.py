@@ -0,0 +1,281 @@
+"""
+Device Spatial Index
+
+Index structures behind radius searches over device coordinates. Each
+backend narrows the search to candidate rows with an index; callers refine
+the candidates with the exact great-circle distance.
+
+- PostGIS: a GiST index on the coordinates as ``geography``, queried with
+  ``ST_DWithin``, which is exact on its own.
+- R-tree: on SQLite builds with the R*Tree module, a ``devices_rtree``
+  virtual table kept in step with ``devices`` by triggers.
+- Geohash: everywhere else, range scans of the B-tree index on
+  ``Device.geohash`` over the grid cells covering the search circle.
+"""
+
+import enum
+import uuid
+from typing import List, Optional
+
+from sqlalchemy import (
+    and_, bindparam, cast, column, func, literal_column, or_, select, table, text
+)
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.types import UserDefinedType
+
+from ...core.logging import get_logger
+from ..models.device import Device
+from ..models.geo import bounding_boxes, cell_ranges, covering_cells, encode_geohash
+
+
+class SpatialBackend(enum.Enum):
+    """Index used to find devices near a point."""
+    POSTGIS = "postgis"
+    RTREE = "rtree"
+    GEOHASH = "geohash"
+
+
+class Geography(UserDefinedType):
+    """PostGIS ``geography`` type, for casts in spatial expressions."""
+
+    cache_ok = True
+
+    def get_col_spec(self, **kw) -> str:
+        return "geography"
+
+
+RTREE_TABLE = f"{Device.__tablename__}_rtree"
+POSTGIS_INDEX = f"idx_{Device.__tablename__}_geography"
+
+_rtree = table(RTREE_TABLE, column("id"), column("min_lat"), column("max_lat"),
+               column("min_lon"), column("max_lon"))
+
+# Key of the detected backend in the connection's info dictionary
+_BACKEND_KEY = "device_spatial_backend"
+
+
+def point_geography(latitude, longitude):
+    """Expression of a WGS 84 point as ``geography``, for columns or values."""
+    return cast(func.ST_SetSRID(func.ST_MakePoint(longitude, latitude), 4326), Geography())
+
+
+def device_geography():
+    """Geography of ``Device`` coordinates; the expression the GiST index is built on."""
+    return point_geography(Device.latitude, Device.longitude)
+
+
+class DeviceSpatialIndex:
+    """
+    Detects, creates and queries the spatial index of the devices table.
+
+    ``ensure`` creates the best index the database supports and is safe to
+    call at every startup. Until it has run, searches use the geohash index,
+    which needs no setup beyond the ``geohash`` column.
+
+    SQLite keys the R-tree by the rowid of ``devices``, which VACUUM may
+    renumber; call ``ensure(rebuild=True)`` after vacuuming.
+    """
+
+    def __init__(self, session: AsyncSession):
+        """
+        Initialize the spatial index.
+
+        Args:
+            session: Async SQLAlchemy session
+        """
+        self.session = session
+        self.logger = get_logger(f"{__name__}.DeviceSpatialIndex")
+
+    async def backend(self) -> SpatialBackend:
+        """Backend available on the session's database, cached per connection."""
+        conn = await self.session.connection()
+        backend = conn.info.get(_BACKEND_KEY)
+        if backend is None:
+            backend = await self._detect(conn)
+            conn.info[_BACKEND_KEY] = backend
+        return backend
+
+    async def ensure(self, rebuild: bool = False) -> SpatialBackend:
+        """
+        Create the spatial index if missing, and fill in missing geohashes.
+
+        Args:
+            rebuild: Drop and repopulate an existing SQLite R-tree
+
+        Returns:
+            Backend searches will use
+        """
+        conn = await self.session.connection()
+        dialect = conn.dialect.name
+
+        backend = SpatialBackend.GEOHASH
+        if dialect == "postgresql":
+            if await self._has_postgis():
+                await self.session.execute(text(
+                    f"CREATE INDEX IF NOT EXISTS {POSTGIS_INDEX} ON {Device.__tablename__} "
+                    f"USING GIST ((ST_SetSRID(ST_MakePoint(longitude, latitude), 4326)::geography))"
+                ))
+                backend = SpatialBackend.POSTGIS
+            else:
+                self.logger.info("PostGIS is not installed; using the geohash index")
+        elif dialect == "sqlite":
+            if await self._create_rtree(rebuild):
+                backend = SpatialBackend.RTREE
+
+        await self.refresh_geohashes()
+        conn.info[_BACKEND_KEY] = backend
+        self.logger.info(f"Device spatial index: {backend.value}")
+        return backend
+
+    def candidate_condition(self, backend: SpatialBackend, latitude: float,
+                            longitude: float, radius_km: float):
+        """
+        Condition selecting devices that may lie within a radius.
+
+        Every device within the radius matches; some further away may too.
+        PostGIS conditions are exact.
+
+        Args:
+            backend: Backend in use
+            latitude: Center latitude
+            longitude: Center longitude
+            radius_km: Radius in kilometers
+
+        Returns:
+            SQL boolean expression over ``Device``
+        """
+        if backend is SpatialBackend.POSTGIS:
+            return func.ST_DWithin(
+                device_geography(), point_geography(latitude, longitude), radius_km * 1000.0
+            )
+
+        boxes = bounding_boxes(latitude, longitude, radius_km)
+        if backend is SpatialBackend.RTREE:
+            overlapping = select(_rtree.c.id).where(or_(*(
+                and_(_rtree.c.max_lat >= min_lat, _rtree.c.min_lat <= max_lat,
+                     _rtree.c.max_lon >= min_lon, _rtree.c.min_lon <= max_lon)
+                for min_lat, max_lat, min_lon, max_lon in boxes
+            )))
+            return literal_column(f"{Device.__tablename__}.rowid").in_(overlapping)
+
+        return or_(*(
+            Device.geohash.between(low, high)
+            for low, high in cell_ranges(covering_cells(boxes))
+        ))
+
+    async def _detect(self, conn) -> SpatialBackend:
+        if conn.dialect.name == "postgresql":
+            result = await conn.execute(
+                text("SELECT 1 FROM pg_indexes WHERE tablename = :table AND indexname = :index"),
+                {"table": Device.__tablename__, "index": POSTGIS_INDEX}
+            )
+            if result.first() is not None:
+                return SpatialBackend.POSTGIS
+        elif conn.dialect.name == "sqlite":
+            result = await conn.execute(
+                text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"),
+                {"name": RTREE_TABLE}
+            )
+            if result.first() is not None:
+                return SpatialBackend.RTREE
+        return SpatialBackend.GEOHASH
+
+    async def _has_postgis(self) -> bool:
+        result = await self.session.execute(
+            text("SELECT 1 FROM pg_extension WHERE extname = 'postgis'")
+        )
+        return result.first() is not None
+
+    async def _create_rtree(self, rebuild: bool) -> bool:
+        """Create and populate the SQLite R-tree; False if R*Tree is not compiled in."""
+        devices = Device.__tablename__
+        if rebuild:
+            await self.session.execute(text(f"DROP TABLE IF EXISTS {RTREE_TABLE}"))
+        elif await self._detect(await self.session.connection()) is SpatialBackend.RTREE:
+            return True
+
+        try:
+            await self.session.execute(text(
+                f"CREATE VIRTUAL TABLE {RTREE_TABLE} USING rtree(id, min_lat, max_lat, min_lon, max_lon)"
+            ))
+        except Exception as e:
+            self.logger.info(f"SQLite R*Tree is unavailable ({e}); using the geohash index")
+            return False
+
+        point = "NEW.rowid, NEW.latitude, NEW.latitude, NEW.longitude, NEW.longitude"
+        located = "NEW.latitude IS NOT NULL AND NEW.longitude IS NOT NULL"
+        statements = [
+            f"INSERT INTO {RTREE_TABLE} SELECT rowid, latitude, latitude, longitude, longitude "
+            f"FROM {devices} WHERE latitude IS NOT NULL AND longitude IS NOT NULL",
+
+            f"CREATE TRIGGER IF NOT EXISTS {RTREE_TABLE}_insert AFTER INSERT ON {devices} "
+            f"WHEN {located} BEGIN INSERT INTO {RTREE_TABLE} VALUES ({point}); END",
+
+            f"CREATE TRIGGER IF NOT EXISTS {RTREE_TABLE}_update "
+            f"AFTER UPDATE OF latitude, longitude ON {devices} BEGIN "
+            f"DELETE FROM {RTREE_TABLE} WHERE id = OLD.rowid; "
+            f"INSERT INTO {RTREE_TABLE} SELECT {point} WHERE {located}; END",
+
+            f"CREATE TRIGGER IF NOT EXISTS {RTREE_TABLE}_delete AFTER DELETE ON {devices} "
+            f"BEGIN DELETE FROM {RTREE_TABLE} WHERE id = OLD.rowid; END",
+        ]
+        for statement in statements:
+            await self.session.execute(text(statement))
+        return True
+
+    async def refresh_geohashes(self, device_ids: Optional[List[uuid.UUID]] = None,
+                                batch_size: int = 1000) -> int:
+        """
+        Recompute stored geohashes from the coordinates.
+
+        Writes that bypass the ORM and change only one coordinate leave the
+        geohash stale; refresh those devices. Without IDs, fills in every
+        located device stored without a geohash, such as rows written before
+        the column existed.
+
+        Args:
+            device_ids: Devices to refresh
+            batch_size: Devices read per query
+
+        Returns:
+            Number of devices written
+        """
+        devices = Device.__table__
+        statement = devices.update().where(devices.c.id == bindparam("device_id")).values(
+            geohash=bindparam("new_geohash")
+        )
+        conn = await self.session.connection()
+
+        written = 0
+        last_id = None
+        pending = list(device_ids) if device_ids is not None else None
+        while True:
+            query = select(devices.c.id, devices.c.latitude, devices.c.longitude)
+            if pending is not None:
+                if not pending:
+                    return written
+                query = query.where(devices.c.id.in_(pending[:batch_size]))
+                pending = pending[batch_size:]
+            else:
+                query = query.where(
+                    devices.c.geohash.is_(None),
+                    devices.c.latitude.isnot(None),
+                    devices.c.longitude.isnot(None)
+                ).order_by(devices.c.id).limit(batch_size)
+                if last_id is not None:
+                    query = query.where(devices.c.id > last_id)
+
+            rows = (await conn.execute(query)).all()
+            if rows:
+                await conn.execute(statement, [
+                    {
+                        "device_id": device_id,
+                        "new_geohash": (encode_geohash(latitude, longitude)
+                                        if latitude is not None and longitude is not None else None),
+                    }
+                    for device_id, latitude, longitude in rows
+                ])
+                written += len(rows)
+                last_id = rows[-1][0]
+            elif pending is None:
+                return written
@@ -0,0 +1,353 @@
+"""
+Dynamic Group Membership
+
+Set-based maintenance of dynamic device group membership. Each group's
+``dynamic_criteria`` is compiled into a SQL condition over ``devices``, and
+membership rows are brought in line with it by one DELETE and one
+INSERT ... SELECT per group, so the database computes the difference
+instead of Python checking devices one at a time. Group device counts are
+recomputed in the same transaction as the membership changes.
+"""
+
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set
+
+from sqlalchemy import and_, cast, exists, false, func, literal, or_, select, true
+from sqlalchemy.dialects.postgresql import JSONB, insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ...core.logging import get_logger
+from .base import RepositoryError
+from ..models.device import Device, DeviceStatus, DeviceType
+from ..models.device_group import DeviceGroup, DeviceGroupMembership
+
+# Device attributes dynamic criteria can test, keyed by criteria name
+CRITERIA_ENUMS = {
+    'device_type': (Device.device_type, DeviceType),
+    'status': (Device.status, DeviceStatus),
+}
+
+# Device attributes whose change can alter membership or group counts
+RELEVANT_FIELDS = frozenset({'device_type', 'status', 'tags', 'is_deleted', 'device_group_id'})
+
+
+@dataclass
+class MembershipRefresh:
+    """Outcome of a membership refresh."""
+    groups: int = 0
+    added: int = 0
+    removed: int = 0
+    recounted: int = 0
+
+
+def compile_criteria(criteria: Optional[Dict[str, Any]], dialect_name: str):
+    """
+    Compile dynamic group criteria into a condition over ``Device``.
+
+    Matches the same devices as ``DeviceGroup.evaluate_dynamic_criteria``:
+    ``device_type`` and ``status`` list the accepted enum values, ``tags``
+    lists tags the device must all carry, as keys of a tag object or items
+    of a tag list. Other keys are ignored.
+
+    Args:
+        criteria: Dynamic criteria of a group
+        dialect_name: Database dialect the condition is for
+
+    Returns:
+        SQL boolean expression
+    """
+    if not criteria:
+        return false()
+
+    conditions = []
+    for key, (column, enum_type) in CRITERIA_ENUMS.items():
+        if key in criteria:
+            accepted = _as_list(criteria[key])
+            members = [member for member in enum_type if member.value in accepted]
+            conditions.append(column.in_(members) if members else false())
+
+    if 'tags' in criteria:
+        conditions.extend(_has_tag(tag, dialect_name) for tag in _as_list(criteria['tags']))
+
+    return and_(true(), *conditions)
+
+
+def _as_list(value: Any) -> List[Any]:
+    return list(value) if isinstance(value, (list, tuple, set)) else [value]
+
+
+def _has_tag(tag: str, dialect_name: str):
+    if dialect_name == "postgresql":
+        # ? tests both object keys and string items of an array
+        return cast(Device.tags, JSONB).has_key(tag)
+    if dialect_name == "sqlite":
+        entries = func.json_each(Device.tags).table_valued('key', 'value')
+        return exists(
+            select(literal(1)).select_from(entries).where(or_(
+                and_(func.json_type(Device.tags) == 'object', entries.c.key == tag),
+                and_(func.json_type(Device.tags) == 'array', entries.c.value == tag),
+            ))
+        )
+    raise RepositoryError(f"Dynamic group tag criteria are not supported on {dialect_name}")
+
+
+class DynamicGroupEngine:
+    """
+    Recomputes dynamic group membership with set-based statements.
+
+    ``refresh_all`` rebuilds every dynamic group, ``refresh_groups`` the
+    groups whose criteria changed, and ``refresh_devices`` only the given
+    devices, for use after writes to attributes in RELEVANT_FIELDS.
+    ``clear_groups`` drops the membership of groups that are no longer
+    dynamic.
+    Nothing is committed; the changes and the recomputed counts land in the
+    caller's transaction together.
+    """
+
+    SUPPORTED_DIALECTS = ("postgresql", "sqlite")
+
+    def __init__(self, session: AsyncSession):
+        """
+        Initialize the engine.
+
+        Args:
+            session: Async SQLAlchemy session
+        """
+        self.session = session
+        self.logger = get_logger(f"{__name__}.DynamicGroupEngine")
+
+    @staticmethod
+    def is_relevant(fields: Iterable[str]) -> bool:
+        """Whether writing these device attributes can change membership or counts."""
+        return not RELEVANT_FIELDS.isdisjoint(fields)
+
+    async def refresh_all(self) -> MembershipRefresh:
+        """Recompute the membership of every dynamic group."""
+        return await self._refresh(group_ids=None, device_ids=None)
+
+    async def refresh_groups(self, group_ids: Sequence[uuid.UUID]) -> MembershipRefresh:
+        """Recompute the membership of the given dynamic groups, e.g. after editing their criteria."""
+        if not group_ids:
+            return MembershipRefresh()
+        return await self._refresh(group_ids=list(group_ids), device_ids=None)
+
+    async def refresh_devices(self, device_ids: Sequence[uuid.UUID]) -> MembershipRefresh:
+        """
+        Re-evaluate the given devices against every dynamic group.
+
+        Also recounts the static groups the devices belong to, since a
+        status change alters their active device counts.
+
+        Args:
+            device_ids: Devices whose relevant attributes changed
+
+        Returns:
+            Membership changes made
+        """
+        if not device_ids:
+            return MembershipRefresh()
+        return await self._refresh(group_ids=None, device_ids=list(dict.fromkeys(device_ids)))
+
+    async def clear_groups(self, group_ids: Sequence[uuid.UUID]) -> MembershipRefresh:
+        """
+        Remove every membership of groups that stopped being dynamic or were deleted.
+
+        Their counts are recomputed, leaving only devices that have the group
+        as their own device group.
+
+        Args:
+            group_ids: Groups whose computed membership is discarded
+
+        Returns:
+            Membership changes made
+        """
+        if not group_ids:
+            return MembershipRefresh()
+        try:
+            members = DeviceGroupMembership.__table__
+            result = await self.session.execute(
+                members.delete().where(members.c.device_group_id.in_(list(group_ids)))
+            )
+            refresh = MembershipRefresh(groups=len(group_ids), removed=max(result.rowcount, 0))
+            refresh.recounted = await self.recount(group_ids)
+
+            self.logger.debug(
+                f"Dynamic memberships cleared: {refresh.groups} groups, -{refresh.removed} members"
+            )
+            return refresh
+
+        except RepositoryError:
+            raise
+        except Exception as e:
+            self.logger.error(f"Error clearing dynamic group memberships: {e}")
+            raise RepositoryError(f"Failed to clear dynamic group memberships: {e}")
+
+    async def recount(self, group_ids: Optional[Sequence[uuid.UUID]] = None) -> int:
+        """
+        Recompute device and active device counts of groups from the database.
+
+        A group counts the live devices that have it as their group or hold
+        a membership in it.
+
+        Args:
+            group_ids: Groups to recount (default: all)
+
+        Returns:
+            Number of groups updated
+        """
+        try:
+            groups = DeviceGroup.__table__
+            members = DeviceGroupMembership.__table__
+            devices = Device.__table__
+
+            def counted(*conditions):
+                return select(func.count(devices.c.id)).where(
+                    devices.c.is_deleted == False,
+                    or_(
+                        devices.c.device_group_id == groups.c.id,
+                        exists().where(
+                            members.c.device_id == devices.c.id,
+                            members.c.device_group_id == groups.c.id,
+                            members.c.is_deleted == False
+                        ).correlate_except(members)
+                    ),
+                    *conditions
+                ).scalar_subquery()
+
+            statement = groups.update().values(
+                device_count=counted(),
+                active_device_count=counted(devices.c.status == DeviceStatus.ONLINE)
+            )
+            if group_ids is not None:
+                if not group_ids:
+                    return 0
+                statement = statement.where(groups.c.id.in_(list(group_ids)))
+
+            result = await self.session.execute(statement)
+            return max(result.rowcount, 0)
+
+        except Exception as e:
+            self.logger.error(f"Error recounting device groups: {e}")
+            raise RepositoryError(f"Failed to recount device groups: {e}")
+
+    async def _refresh(self, group_ids: Optional[List[uuid.UUID]],
+                       device_ids: Optional[List[uuid.UUID]]) -> MembershipRefresh:
+        refresh = MembershipRefresh()
+        try:
+            conn = await self.session.connection()
+            dialect = conn.dialect.name
+            if dialect not in self.SUPPORTED_DIALECTS:
+                raise RepositoryError(f"Dynamic groups are not supported on {dialect}")
+
+            query = select(DeviceGroup.id, DeviceGroup.dynamic_criteria).where(
+                DeviceGroup.is_dynamic == True,
+                DeviceGroup.is_deleted == False
+            )
+            if group_ids is not None:
+                query = query.where(DeviceGroup.id.in_(group_ids))
+            groups = (await self.session.execute(query)).all()
+
+            touched: Set[uuid.UUID] = set()
+            if device_ids is not None:
+                touched |= await self._groups_of(device_ids)
+
+            for group_id, criteria in groups:
+                condition = compile_criteria(criteria, dialect)
+                removed = await self._remove_stale(group_id, condition, device_ids)
+                added = await self._add_matching(dialect, group_id, condition, device_ids)
+                refresh.groups += 1
+                refresh.removed += removed
+                refresh.added += added
+                if added or removed or device_ids is None:
+                    touched.add(group_id)
+
+            if device_ids is not None:
+                touched |= await self._groups_of(device_ids)
+            if touched:
+                refresh.recounted = await self.recount(sorted(touched, key=str))
+
+            self.logger.debug(
+                f"Dynamic groups refreshed: {refresh.groups} groups, +{refresh.added} "
+                f"-{refresh.removed} members, {refresh.recounted} recounted"
+            )
+            return refresh
+
+        except RepositoryError:
+            raise
+        except Exception as e:
+            self.logger.error(f"Error refreshing dynamic groups: {e}")
+            raise RepositoryError(f"Failed to refresh dynamic groups: {e}")
+
+    async def _remove_stale(self, group_id: uuid.UUID, condition,
+                            device_ids: Optional[List[uuid.UUID]]) -> int:
+        """Delete memberships of devices that no longer match, and soft-deleted ones."""
+        members = DeviceGroupMembership.__table__
+        still_matching = exists(
+            select(Device.id).where(
+                Device.id == members.c.device_id,
+                Device.is_deleted == False,
+                condition
+            )
+        )
+        statement = members.delete().where(
+            members.c.device_group_id == group_id,
+            or_(members.c.is_deleted == True, ~still_matching)
+        )
+        if device_ids is not None:
+            statement = statement.where(members.c.device_id.in_(device_ids))
+        result = await self.session.execute(statement)
+        return max(result.rowcount, 0)
+
+    async def _add_matching(self, dialect: str, group_id: uuid.UUID, condition,
+                            device_ids: Optional[List[uuid.UUID]]) -> int:
+        """INSERT ... SELECT memberships for matching devices not yet in the group."""
+        members = DeviceGroupMembership.__table__
+        now = literal(datetime.now(timezone.utc), members.c.joined_at.type)
+        if dialect == "postgresql":
+            new_id, insert = func.gen_random_uuid(), pg_insert
+        else:
+            new_id, insert = func.lower(func.hex(func.randomblob(16))), sqlite_insert
+
+        matching = select(
+            new_id,
+            Device.id,
+            literal(group_id, members.c.device_group_id.type),
+            false(),
+            literal(0),
+            now,
+            now,
+            now,
+            false(),
+        ).where(
+            Device.is_deleted == False,
+            condition,
+            ~exists().where(
+                members.c.device_id == Device.id,
+                members.c.device_group_id == group_id
+            )
+        )
+        if device_ids is not None:
+            matching = matching.where(Device.id.in_(device_ids))
+
+        statement = insert(members).from_select(
+            ['id', 'device_id', 'device_group_id', 'is_primary', 'priority',
+             'joined_at', 'created_at', 'updated_at', 'is_deleted'],
+            matching
+        ).on_conflict_do_nothing(index_elements=['device_id', 'device_group_id'])
+        result = await self.session.execute(statement)
+        return max(result.rowcount, 0)
+
+    async def _groups_of(self, device_ids: List[uuid.UUID]) -> Set[uuid.UUID]:
+        """Groups the devices belong to, directly or through memberships."""
+        members = DeviceGroupMembership.__table__
+        result = await self.session.execute(
+            select(Device.device_group_id).where(
+                Device.id.in_(device_ids), Device.device_group_id.isnot(None)
+            ).union(
+                select(members.c.device_group_id).where(members.c.device_id.in_(device_ids))
+            )
+        )
+        return set(result.scalars().all())
@@ -0,0 +1,220 @@
+"""
+Keyset Pagination
+
+Seek-based paging helpers. A page is fetched by filtering on the sort key of
+the last row already returned instead of skipping rows with OFFSET, so every
+page costs one index range scan no matter how deep it is.
+
+Cursors are opaque URL-safe strings encoding the last row's sort values and
+a fingerprint of the ordering they belong to.
+"""
+
+import base64
+import binascii
+import enum
+import hashlib
+import ipaddress
+import json
+import uuid
+from dataclasses import dataclass
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Generic, List, Optional, Sequence, Tuple, TypeVar, Union
+
+from sqlalchemy import JSON, and_, false, or_, tuple_
+from sqlalchemy.orm.attributes import InstrumentedAttribute
+
+T = TypeVar("T")
+
+# A sort field is "name", "-name" (descending) or (name, "asc" | "desc")
+SortField = Union[str, Tuple[str, str]]
+
+
+@dataclass
+class Page(Generic[T]):
+    """One page of results and the cursor of the page after it."""
+    items: List[T]
+    next_cursor: Optional[str] = None
+
+    @property
+    def has_more(self) -> bool:
+        """Whether another page follows this one."""
+        return self.next_cursor is not None
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+
+@dataclass(frozen=True)
+class SortKey:
+    """A resolved sort column."""
+    name: str
+    attribute: InstrumentedAttribute
+    descending: bool
+
+    @property
+    def nullable(self) -> bool:
+        return any(column.nullable for column in self.attribute.property.columns)
+
+    def order_clause(self):
+        """ORDER BY clause sorting NULLs as larger than any value on every dialect."""
+        if self.descending:
+            clause = self.attribute.desc()
+            return clause.nulls_first() if self.nullable else clause
+        clause = self.attribute.asc()
+        return clause.nulls_last() if self.nullable else clause
+
+
+def resolve_sort(model, order_by: Sequence[SortField]) -> List[SortKey]:
+    """
+    Resolve sort fields against a model, appending the primary key as tie-breaker.
+
+    Args:
+        model: Mapped model class
+        order_by: Sort fields, e.g. ``["-last_seen", "name"]``
+
+    Returns:
+        Sort keys whose values identify every row uniquely
+    """
+    keys = []
+    for field in order_by:
+        if isinstance(field, str):
+            name, descending = (field[1:], True) if field.startswith('-') else (field, False)
+        else:
+            name, direction = field
+            if direction.lower() not in ('asc', 'desc'):
+                raise ValueError(f"Invalid sort direction '{direction}' for {name}")
+            descending = direction.lower() == 'desc'
+
+        attribute = getattr(model, name, None)
+        if not isinstance(attribute, InstrumentedAttribute) or not hasattr(attribute.property, 'columns'):
+            raise ValueError(f"{model.__name__} has no sortable column '{name}'")
+        keys.append(SortKey(name, attribute, descending))
+
+    # Ties are broken by the primary key, in the direction of the last sort field
+    descending = keys[-1].descending if keys else False
+    mapper = model.__mapper__
+    for column in mapper.primary_key:
+        name = mapper.get_property_by_column(column).key
+        if all(key.name != name for key in keys):
+            keys.append(SortKey(name, getattr(model, name), descending))
+    return keys
+
+
+def seek_condition(keys: Sequence[SortKey], values: Sequence[Any]):
+    """
+    WHERE clause selecting the rows that sort after ``values``.
+
+    Uniform-direction sorts over non-null columns use a row-value comparison,
+    which the database matches against a composite index directly. Mixed
+    directions and nullable columns expand into an OR of prefix matches.
+    """
+    directions = {key.descending for key in keys}
+    if len(directions) == 1 and not any(key.nullable for key in keys):
+        row = tuple_(*(key.attribute for key in keys))
+        bound = tuple_(*values)
+        return row < bound if keys[0].descending else row > bound
+
+    branches = []
+    prefix = []
+    for key, value in zip(keys, values):
+        after = _after(key, value)
+        if after is not None:
+            branches.append(and_(*prefix, after))
+        prefix.append(key.attribute.is_(None) if value is None else key.attribute == value)
+    return or_(*branches) if branches else false()
+
+
+def _after(key: SortKey, value: Any):
+    """Rows sorting strictly after ``value`` on one column, with NULLs largest."""
+    column = key.attribute
+    if value is None:
+        # Nothing sorts after NULL ascending; every value does descending
+        return column.isnot(None) if key.descending else None
+    if key.descending:
+        return column < value
+    after = column > value
+    return or_(after, column.is_(None)) if key.nullable else after
+
+
+def fingerprint(model, keys: Sequence[SortKey]) -> str:
+    """Short digest tying a cursor to the table and ordering it was issued for."""
+    spec = model.__tablename__ + ':' + ','.join(
+        ('-' if key.descending else '') + key.name for key in keys
+    )
+    return hashlib.sha1(spec.encode()).hexdigest()[:8]
+
+
+def encode_cursor(model, keys: Sequence[SortKey], item: Any) -> str:
+    """Encode the sort values of ``item`` as an opaque cursor."""
+    payload = {
+        'o': fingerprint(model, keys),
+        'v': [encode_value(getattr(item, key.name)) for key in keys],
+    }
+    raw = json.dumps(payload, separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(raw).rstrip(b'=').decode('ascii')
+
+
+def decode_cursor(model, keys: Sequence[SortKey], cursor: str) -> List[Any]:
+    """
+    Decode a cursor issued by :func:`encode_cursor` for the same ordering.
+
+    Raises:
+        ValueError: If the cursor is malformed or belongs to another ordering
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        payload = json.loads(raw)
+        order, values = payload['o'], payload['v']
+    except (binascii.Error, ValueError, TypeError, KeyError) as e:
+        raise ValueError(f"Malformed pagination cursor: {e}")
+
+    if order != fingerprint(model, keys) or len(values) != len(keys):
+        raise ValueError("Pagination cursor does not match this query's ordering")
+
+    try:
+        return [
+            decode_value(value, key.attribute.property.columns[0])
+            for key, value in zip(keys, values)
+        ]
+    except (ValueError, TypeError, KeyError) as e:
+        raise ValueError(f"Malformed pagination cursor: {e}")
+
+
+def encode_value(value: Any) -> Any:
+    """Encode a column value as JSON, tagging types JSON cannot represent."""
+    if isinstance(value, enum.Enum):
+        return {'e': value.name}
+    if isinstance(value, datetime):
+        return {'dt': value.isoformat()}
+    if isinstance(value, date):
+        return {'d': value.isoformat()}
+    if isinstance(value, uuid.UUID):
+        return {'u': value.hex}
+    if isinstance(value, Decimal):
+        return {'n': str(value)}
+    if isinstance(value, (ipaddress.IPv4Address, ipaddress.IPv6Address,
+                          ipaddress.IPv4Interface, ipaddress.IPv6Interface)):
+        return str(value)
+    return value
+
+
+def decode_value(value: Any, column) -> Any:
+    """Decode a value produced by :func:`encode_value` for ``column``."""
+    # JSON columns hold plain dicts that must not be mistaken for tags
+    if not isinstance(value, dict) or len(value) != 1 or isinstance(column.type, JSON):
+        return value
+    if 'e' in value:
+        return column.type.enum_class[value['e']]
+    if 'dt' in value:
+        return datetime.fromisoformat(value['dt'])
+    if 'd' in value:
+        return date.fromisoformat(value['d'])
+    if 'u' in value:
+        return uuid.UUID(hex=value['u'])
+    if 'n' in value:
+        return Decimal(value['n'])
+    return value
@@ -0,0 +1,271 @@
+"""
+Search Indexes
+
+Indexed substring search over the text columns repositories search in.
+
+- PostgreSQL: a ``pg_trgm`` GIN index on the searched columns joined into
+  one document, which serves ``ILIKE '%term%'``; results are ranked by
+  ``word_similarity``.
+- SQLite: an external-content FTS5 table with the trigram tokenizer, kept
+  in step with its table by triggers; results are ranked by bm25.
+
+Both keep substring semantics, so they return what the unindexed
+``ILIKE`` scan returned. Tables without an index, and terms shorter than a
+trigram on SQLite, fall back to that scan.
+"""
+
+import enum
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import String, column, func, literal_column, or_, select, text
+from sqlalchemy import table as sql_table
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ...core.logging import get_logger
+
+# Searched columns of each indexed table, in document order
+SEARCH_FIELDS: Dict[str, Tuple[str, ...]] = {
+    'devices': ('name', 'hostname', 'location', 'manufacturer', 'model'),
+    'alerts': ('title', 'description', 'alert_type'),
+    'audit_logs': ('description', 'resource_name', 'username'),
+    'users': ('username', 'email', 'first_name', 'last_name'),
+    'device_groups': ('name', 'description', 'group_type'),
+}
+
+# Shortest term a trigram index can match
+MIN_TERM_LENGTH = 3
+
+# Key of the detected backends in the connection's info dictionary
+_BACKENDS_KEY = "search_backends"
+
+
+class SearchBackend(enum.Enum):
+    """Index serving searches of a table."""
+    TRIGRAM = "pg_trgm"
+    FTS5 = "fts5"
+    SCAN = "scan"
+
+
+def fts_table_name(table_name: str) -> str:
+    """Name of the FTS5 table indexing a table on SQLite."""
+    return f"{table_name}_search"
+
+
+def trigram_index_name(table_name: str) -> str:
+    """Name of the trigram index of a table on PostgreSQL."""
+    return f"idx_{table_name}_search_trgm"
+
+
+def search_document(columns):
+    """
+    Searched columns joined into one text expression.
+
+    The trigram index is built on this expression, so queries must use it
+    unchanged for PostgreSQL to match them to the index. The separators are
+    SQL literals rather than bound parameters, so a query renders the same
+    expression as the index DDL.
+    """
+    empty, space = literal_column("''", String), literal_column("' '", String)
+    columns = list(columns)
+    document = func.coalesce(columns[0], empty)
+    for col in columns[1:]:
+        document = document + space + func.coalesce(col, empty)
+    return document
+
+
+def like_pattern(term: str) -> str:
+    """``%term%`` with LIKE wildcards in the term escaped by backslashes."""
+    escaped = term.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+    return f"%{escaped}%"
+
+
+def create_statements(dialect_name: str, table_name: str) -> List[str]:
+    """
+    DDL creating the search index of a table, for migrations and ``ensure``.
+
+    Args:
+        dialect_name: 'postgresql' or 'sqlite'
+        table_name: One of SEARCH_FIELDS
+
+    Returns:
+        Statements to run in order; empty for other dialects
+    """
+    fields = SEARCH_FIELDS[table_name]
+    if dialect_name == "postgresql":
+        document = search_document(column(name, String) for name in fields).compile(
+            dialect=postgresql.dialect(), compile_kwargs={'literal_binds': True}
+        )
+        return [
+            "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+            f"CREATE INDEX IF NOT EXISTS {trigram_index_name(table_name)} ON {table_name} "
+            f"USING gin (({document}) gin_trgm_ops)",
+        ]
+
+    if dialect_name == "sqlite":
+        fts = fts_table_name(table_name)
+        names = ", ".join(fields)
+        new_values = ", ".join(f"new.{name}" for name in fields)
+        old_values = ", ".join(f"old.{name}" for name in fields)
+        remove = f"INSERT INTO {fts}({fts}, rowid, {names}) VALUES ('delete', old.rowid, {old_values});"
+        add = f"INSERT INTO {fts}(rowid, {names}) VALUES (new.rowid, {new_values});"
+        return [
+            f"CREATE VIRTUAL TABLE {fts} USING fts5({names}, content='{table_name}', tokenize='trigram')",
+            f"INSERT INTO {fts}({fts}) VALUES ('rebuild')",
+            f"CREATE TRIGGER {fts}_insert AFTER INSERT ON {table_name} BEGIN {add} END",
+            f"CREATE TRIGGER {fts}_delete AFTER DELETE ON {table_name} BEGIN {remove} END",
+            f"CREATE TRIGGER {fts}_update AFTER UPDATE OF {names} ON {table_name} "
+            f"BEGIN {remove} {add} END",
+        ]
+
+    return []
+
+
+def drop_statements(dialect_name: str, table_name: str) -> List[str]:
+    """DDL dropping the search index of a table; the pg_trgm extension is left in place."""
+    if dialect_name == "postgresql":
+        return [f"DROP INDEX IF EXISTS {trigram_index_name(table_name)}"]
+    if dialect_name == "sqlite":
+        fts = fts_table_name(table_name)
+        return [
+            *(f"DROP TRIGGER IF EXISTS {fts}_{event}" for event in ("insert", "delete", "update")),
+            f"DROP TABLE IF EXISTS {fts}",
+        ]
+    return []
+
+
+class SearchIndexManager:
+    """
+    Detects, creates and queries the search indexes of the tables in SEARCH_FIELDS.
+
+    ``ensure`` creates missing indexes and is safe to call at every startup;
+    deployments managed by migrations create them with
+    ``migrations.search_indexes`` instead. SQLite's FTS5 tables are keyed by
+    rowid, which VACUUM may renumber; call ``ensure(rebuild=True)`` after
+    vacuuming.
+    """
+
+    def __init__(self, session: AsyncSession):
+        """
+        Initialize the search index manager.
+
+        Args:
+            session: Async SQLAlchemy session
+        """
+        self.session = session
+        self.logger = get_logger(f"{__name__}.SearchIndexManager")
+
+    async def backend(self, table_name: str) -> SearchBackend:
+        """Backend serving searches of a table, cached per connection."""
+        if table_name not in SEARCH_FIELDS:
+            return SearchBackend.SCAN
+
+        conn = await self.session.connection()
+        backends = conn.info.setdefault(_BACKENDS_KEY, {})
+        if table_name not in backends:
+            backends[table_name] = await self._detect(conn, table_name)
+        return backends[table_name]
+
+    async def ensure(self, tables: Optional[Sequence[str]] = None,
+                     rebuild: bool = False) -> Dict[str, SearchBackend]:
+        """
+        Create missing search indexes.
+
+        Args:
+            tables: Tables to index (default: all in SEARCH_FIELDS)
+            rebuild: Drop and recreate existing indexes
+
+        Returns:
+            Backend serving each table
+        """
+        conn = await self.session.connection()
+        dialect = conn.dialect.name
+        backends = conn.info.setdefault(_BACKENDS_KEY, {})
+
+        result = {}
+        for table_name in tables or SEARCH_FIELDS:
+            if rebuild:
+                for statement in drop_statements(dialect, table_name):
+                    await self.session.execute(text(statement))
+                backend = SearchBackend.SCAN
+            else:
+                backend = await self._detect(conn, table_name)
+
+            if backend is SearchBackend.SCAN:
+                backend = await self._create(dialect, table_name)
+                self.logger.info(f"Search index for {table_name}: {backend.value}")
+            result[table_name] = backends[table_name] = backend
+        return result
+
+    def query(self, backend: SearchBackend, model, term: str):
+        """
+        Select ``model`` rows matching ``term`` through an index, best first.
+
+        Args:
+            backend: Backend serving the model's table
+            model: Mapped class of an indexed table
+            term: Substring to search for
+
+        Returns:
+            Select statement, or None if the backend cannot serve the term
+        """
+        table = model.__table__
+        columns = [table.c[name] for name in SEARCH_FIELDS[table.name]]
+
+        if backend is SearchBackend.TRIGRAM:
+            document = search_document(columns)
+            pattern = like_pattern(term)
+            return (
+                select(model)
+                .where(
+                    document.ilike(pattern, escape='\\'),
+                    # Recheck per column, so terms spanning two columns do not match
+                    or_(*(col.ilike(pattern, escape='\\') for col in columns))
+                )
+                .order_by(func.word_similarity(term, document).desc())
+            )
+
+        if backend is SearchBackend.FTS5 and len(term) >= MIN_TERM_LENGTH:
+            fts = sql_table(fts_table_name(table.name), column("rowid"), column("rank"))
+            phrase = '"' + term.replace('"', '""') + '"'
+            return (
+                select(model)
+                .join(fts, fts.c.rowid == literal_column(f"{table.name}.rowid"))
+                .where(literal_column(fts.name).op('MATCH')(phrase))
+                .order_by(fts.c.rank)
+            )
+
+        return None
+
+    async def _detect(self, conn, table_name: str) -> SearchBackend:
+        if conn.dialect.name == "postgresql":
+            result = await conn.execute(
+                text("SELECT 1 FROM pg_indexes WHERE tablename = :table AND indexname = :index"),
+                {"table": table_name, "index": trigram_index_name(table_name)}
+            )
+            if result.first() is not None:
+                return SearchBackend.TRIGRAM
+        elif conn.dialect.name == "sqlite":
+            result = await conn.execute(
+                text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"),
+                {"name": fts_table_name(table_name)}
+            )
+            if result.first() is not None:
+                return SearchBackend.FTS5
+        return SearchBackend.SCAN
+
+    async def _create(self, dialect: str, table_name: str) -> SearchBackend:
+        statements = create_statements(dialect, table_name)
+        if not statements:
+            return SearchBackend.SCAN
+
+        try:
+            # A savepoint, so a missing extension or module leaves the transaction usable
+            async with self.session.begin_nested():
+                for statement in statements:
+                    await self.session.execute(text(statement))
+        except Exception as e:
+            self.logger.info(f"Search index for {table_name} unavailable ({e}); searches will scan")
+            return SearchBackend.SCAN
+
+        return SearchBackend.TRIGRAM if dialect == "postgresql" else SearchBackend.FTS5
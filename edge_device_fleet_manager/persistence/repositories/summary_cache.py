@@ -0,0 +1,115 @@
+"""
+Summary Cache
+
+Short-lived, process-wide store for aggregate summaries such as the fleet,
+alert and telemetry statistics. Dashboards polling a summary read the stored
+copy until it expires, so polling cost stays constant however many clients
+poll, and concurrent refreshes of one summary run its query only once.
+"""
+
+import asyncio
+import copy
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+from ...core.logging import get_logger
+
+
+@dataclass
+class SummaryCacheStats:
+    """Summary cache counters."""
+
+    hits: int = 0
+    misses: int = 0
+    shared_refreshes: int = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        """Fraction of reads answered without running the summary query."""
+        reads = self.hits + self.misses + self.shared_refreshes
+        return (self.hits + self.shared_refreshes) / reads if reads else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert statistics to dictionary."""
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'shared_refreshes': self.shared_refreshes,
+            'hit_ratio': self.hit_ratio,
+        }
+
+
+class SummaryCache:
+    """
+    TTL cache of computed summaries with single-flight refresh.
+
+    Summaries may be up to ``ttl_seconds`` old; writes do not invalidate
+    them. Each read returns a copy, so callers can modify what they get.
+    """
+
+    def __init__(self, ttl_seconds: float = 5.0):
+        """
+        Initialize the summary cache.
+
+        Args:
+            ttl_seconds: How long a computed summary is served
+        """
+        if ttl_seconds <= 0:
+            raise ValueError("Summary TTL must be positive")
+
+        self.ttl_seconds = ttl_seconds
+        self.stats = SummaryCacheStats()
+        self.logger = get_logger(f"{__name__}.SummaryCache")
+
+        self._entries: Dict[Hashable, Tuple[float, Any]] = {}
+        self._refreshing: Dict[Hashable, asyncio.Future] = {}
+
+    async def get(self, key: Hashable, compute: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Return the summary stored under ``key``, computing it if missing or expired.
+
+        Args:
+            key: Summary identity, including any query arguments
+            compute: Coroutine function producing the summary
+
+        Returns:
+            Copy of the summary
+        """
+        entry = self._entries.get(key)
+        if entry is not None and time.monotonic() < entry[0]:
+            self.stats.hits += 1
+            return copy.deepcopy(entry[1])
+
+        pending = self._refreshing.get(key)
+        if pending is not None:
+            self.stats.shared_refreshes += 1
+            return copy.deepcopy(await asyncio.shield(pending))
+
+        self.stats.misses += 1
+        future = asyncio.get_running_loop().create_future()
+        self._refreshing[key] = future
+        try:
+            value = await compute()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Mark the error retrieved; waiters, if any, receive it as well
+            future.exception()
+            raise
+        else:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+            future.set_result(value)
+            self.logger.debug(f"Refreshed summary {key!r}")
+            return copy.deepcopy(value)
+        finally:
+            del self._refreshing[key]
+
+    def invalidate(self, key: Optional[Hashable] = None) -> None:
+        """Drop one summary, or all of them."""
+        if key is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(key, None)
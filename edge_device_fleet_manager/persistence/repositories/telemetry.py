@@ -6,26 +6,121 @@ operations, aggregation, and high-performance data access patterns.
 """
 
 import uuid
-from typing import List, Optional, Dict, Any, Tuple
+from typing import Callable, List, Optional, Dict, Any, Sequence, Tuple, Union
 from datetime import datetime, timezone, timedelta
 
-from sqlalchemy import select, func, and_, or_, desc
+from sqlalchemy import Integer, bindparam, cast, literal_column, select, func, and_, or_, desc
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from .base import BaseRepository, RepositoryError
+from .pagination import Page
+from .summary_cache import SummaryCache
+from .telemetry_latest import LatestTelemetryRepository
+from .telemetry_partitions import TelemetryPartitionManager
+from .retention import RetentionExecutor, RetentionProgress, retention_session
 from ..models.telemetry import TelemetryEvent, TelemetryType
 
 
+# Hot-path statements are built once and executed with new parameter values,
+# skipping construction and reusing the memoized compiled-cache key
+_LATEST_BY_DEVICE = (
+    select(TelemetryEvent)
+    .where(TelemetryEvent.device_id == bindparam('device_id'))
+    .order_by(desc(TelemetryEvent.timestamp))
+    .limit(1)
+)
+
+_LATEST_BY_DEVICE_AND_NAME = (
+    select(TelemetryEvent)
+    .where(TelemetryEvent.device_id == bindparam('device_id'),
+           TelemetryEvent.event_name == bindparam('event_name'))
+    .order_by(desc(TelemetryEvent.timestamp))
+    .limit(1)
+)
+
+
+def time_bucket(dialect, timestamp, bucket_seconds: int):
+    """
+    Expression flooring a timestamp column to an epoch-aligned bucket.
+    
+    PostgreSQL returns a timestamp; SQLite and other dialects return epoch
+    seconds of the bucket start.
+    """
+    if dialect.name == "postgresql":
+        if (dialect.server_version_info or (0,)) >= (14,):
+            return func.date_bin(
+                literal_column(f"INTERVAL '{bucket_seconds} seconds'"),
+                timestamp,
+                literal_column("TIMESTAMPTZ '1970-01-01 00:00:00+00'")
+            )
+        return func.to_timestamp(
+            func.floor(func.extract('epoch', timestamp) / bucket_seconds) * bucket_seconds
+        )
+    
+    if dialect.name == "sqlite":
+        epoch = cast(func.strftime('%s', timestamp), Integer)
+        return (epoch // bucket_seconds) * bucket_seconds
+    
+    return func.floor(func.extract('epoch', timestamp) / bucket_seconds) * bucket_seconds
+
+
+def bucket_datetime(bucket: Any) -> datetime:
+    """Normalise a bucket value from time_bucket() to a datetime."""
+    if isinstance(bucket, datetime):
+        return bucket
+    return datetime.fromtimestamp(int(bucket), timezone.utc)
+
+
 class TelemetryRepository(BaseRepository[TelemetryEvent]):
     """
     Telemetry repository with time-series data management capabilities.
     
     Provides specialized operations for telemetry data including
     time-based queries, aggregations, and performance optimizations.
+    
+    Events created through the repository also upsert the per-device,
+    per-metric latest-value table unless maintain_latest is off. With a
+    SummaryCache, device statistics are served from it for its TTL. Time
+    series are read from the telemetry rollups when one fits, unless
+    use_rollups is off.
     """
     
-    def __init__(self, session: AsyncSession):
+    def __init__(self, session: AsyncSession, maintain_latest: bool = True,
+                 summary_cache: Optional[SummaryCache] = None,
+                 use_rollups: bool = True):
         super().__init__(session, TelemetryEvent)
+        self.maintain_latest = maintain_latest
+        self.use_rollups = use_rollups
+        self.summary_cache = summary_cache
+        self.latest = LatestTelemetryRepository(session)
+    
+    async def create(self, obj_in: Union[Any, Dict[str, Any]], **kwargs) -> TelemetryEvent:
+        """Create a telemetry event and update the device's latest value."""
+        event = await super().create(obj_in, **kwargs)
+        if self.maintain_latest:
+            await self.latest.record([event])
+        return event
+    
+    async def bulk_create(self, objects: List[Union[Any, Dict[str, Any]]]) -> List[TelemetryEvent]:
+        """Create telemetry events and update the devices' latest values."""
+        events = await super().bulk_create(objects)
+        if self.maintain_latest:
+            await self.latest.record(events)
+        return events
+    
+    async def bulk_insert(self, objects: List[Union[Any, Dict[str, Any]]],
+                          chunk_size: Optional[int] = None,
+                          use_copy: bool = True) -> List[Any]:
+        """Insert telemetry events through Core and update the devices' latest values."""
+        if not self.maintain_latest or not objects:
+            return await super().bulk_insert(objects, chunk_size, use_copy)
+        
+        # Apply defaults once so the latest values see the same IDs and timestamps;
+        # telemetry attribute names match their column keys, so rows pass back through
+        rows = self._prepare_bulk_rows(objects)
+        ids = await super().bulk_insert(rows, chunk_size, use_copy)
+        await self.latest.record(rows)
+        return ids
     
     async def get_by_device(self, device_id: uuid.UUID, 
                            start_time: Optional[datetime] = None,
@@ -57,18 +152,49 @@ class TelemetryRepository(BaseRepository[TelemetryEvent]):
             self.logger.error(f"Error getting telemetry for device {device_id}: {e}")
             raise RepositoryError(f"Failed to get telemetry for device: {e}")
     
+    async def get_by_device_page(self, device_id: uuid.UUID,
+                                 start_time: Optional[datetime] = None,
+                                 end_time: Optional[datetime] = None,
+                                 event_types: Optional[List[TelemetryType]] = None,
+                                 cursor: Optional[str] = None,
+                                 limit: int = 100) -> Page[TelemetryEvent]:
+        """
+        Get telemetry events for a device, newest first, one keyset page at a time.
+        
+        Pages seek along idx_telemetry_device_timestamp, so deep pages cost
+        the same as the first.
+        
+        Args:
+            device_id: Device ID
+            start_time: Earliest event timestamp (inclusive)
+            end_time: Latest event timestamp (inclusive)
+            event_types: Restrict to these event types
+            cursor: next_cursor of the previous page, or None for the first page
+            limit: Maximum number of events to return
+            
+        Returns:
+            Page of events with the cursor of the next page
+        """
+        query = select(self.model).where(self.model.device_id == device_id)
+        if start_time:
+            query = query.where(self.model.timestamp >= start_time)
+        if end_time:
+            query = query.where(self.model.timestamp <= end_time)
+        if event_types:
+            query = query.where(self.model.event_type.in_(event_types))
+        
+        return await self.paginate(query, ['-timestamp'], cursor=cursor, limit=limit)
+    
     async def get_latest_by_device(self, device_id: uuid.UUID,
                                   event_name: Optional[str] = None) -> Optional[TelemetryEvent]:
         """Get the latest telemetry event for a device."""
         try:
-            query = select(self.model).where(self.model.device_id == device_id)
-            
             if event_name:
-                query = query.where(self.model.event_name == event_name)
-            
-            query = query.order_by(desc(self.model.timestamp)).limit(1)
-            
-            result = await self.session.execute(query)
+                result = await self.session.execute(
+                    _LATEST_BY_DEVICE_AND_NAME, {'device_id': device_id, 'event_name': event_name}
+                )
+            else:
+                result = await self.session.execute(_LATEST_BY_DEVICE, {'device_id': device_id})
             return result.scalar_one_or_none()
             
         except Exception as e:
@@ -112,91 +238,136 @@ class TelemetryRepository(BaseRepository[TelemetryEvent]):
             self.logger.error(f"Error getting aggregated telemetry data: {e}")
             raise RepositoryError(f"Failed to get aggregated data: {e}")
     
-    async def get_time_series_data(self, device_id: uuid.UUID,
+    async def get_time_series_data(self, device_id: Union[uuid.UUID, Sequence[uuid.UUID]],
                                   event_name: str,
                                   start_time: datetime,
                                   end_time: datetime,
-                                  interval_minutes: int = 60) -> List[Dict[str, Any]]:
-        """Get time-series data with specified interval."""
+                                  interval_minutes: int = 60,
+                                  interval: Optional[timedelta] = None) -> List[Dict[str, Any]]:
+        """
+        Get time-series data bucketed into fixed intervals.
+        
+        Bucketing and aggregation run in the database, so one row comes back
+        per device and bucket regardless of how many events fall in the range.
+        Buckets are aligned to the Unix epoch (UTC), which gives stable
+        boundaries for any interval size. When use_rollups is set and a rollup
+        fits the interval and range, the coarsest such rollup is read instead
+        of the raw events (see TelemetryRollupRepository.choose_resolution).
+        
+        Args:
+            device_id: Device ID, or several device IDs to query together
+            event_name: Event name to aggregate
+            start_time: Start of the range (inclusive)
+            end_time: End of the range (inclusive)
+            interval_minutes: Bucket size in minutes
+            interval: Bucket size as a timedelta; overrides interval_minutes
+            
+        Returns:
+            Buckets ordered by device and time, each with timestamp, device_id,
+            value (average), count, sum, min and max; rollup reads also carry
+            stddev and the resolution read
+        """
+        if interval is None:
+            interval = timedelta(minutes=interval_minutes)
+        
+        if self.use_rollups:
+            # Imported here: the rollup repository builds on this module
+            from .telemetry_rollup import TelemetryRollupRepository
+            
+            rollups = TelemetryRollupRepository(self.session)
+            # Rollup ranges are half-open; this one is inclusive at both ends
+            range_end = end_time + timedelta(microseconds=1)
+            dialect = (await self.session.connection()).dialect
+            if (dialect.name in rollups.SUPPORTED_DIALECTS
+                    and rollups.choose_resolution(interval, start_time, range_end) is not None):
+                return await rollups.get_time_series(
+                    device_id, event_name, start_time, range_end, interval=interval
+                )
+        
         try:
-            # This is a simplified implementation
-            # In production, you'd use database-specific time bucketing functions
-            query = select(self.model).where(
+            bucket_seconds = int(interval.total_seconds())
+            if bucket_seconds < 1:
+                raise ValueError("Time series interval must be at least one second")
+            
+            device_ids = [device_id] if isinstance(device_id, uuid.UUID) else list(device_id)
+            dialect = (await self.session.connection()).dialect
+            
+            # Bucket in a subquery so GROUP BY refers to a plain column rather
+            # than repeating an expression with its own bind parameters
+            events = select(
+                self.model.device_id,
+                self._time_bucket(dialect, bucket_seconds).label('bucket'),
+                self.model.numeric_value.label('value')
+            ).where(
                 and_(
-                    self.model.device_id == device_id,
+                    self.model.device_id.in_(device_ids),
                     self.model.event_name == event_name,
                     self.model.timestamp >= start_time,
                     self.model.timestamp <= end_time,
                     self.model.numeric_value.isnot(None)
                 )
-            ).order_by(self.model.timestamp)
+            ).subquery()
             
-            result = await self.session.execute(query)
-            events = result.scalars().all()
-            
-            # Group by time intervals
-            time_series = []
-            current_bucket = None
-            bucket_values = []
-            
-            for event in events:
-                # Calculate bucket timestamp
-                bucket_timestamp = event.timestamp.replace(
-                    minute=(event.timestamp.minute // interval_minutes) * interval_minutes,
-                    second=0,
-                    microsecond=0
+            query = (
+                select(
+                    events.c.device_id,
+                    events.c.bucket,
+                    func.avg(events.c.value),
+                    func.count(events.c.value),
+                    func.sum(events.c.value),
+                    func.min(events.c.value),
+                    func.max(events.c.value)
                 )
-                
-                if current_bucket != bucket_timestamp:
-                    # Save previous bucket
-                    if current_bucket and bucket_values:
-                        time_series.append({
-                            'timestamp': current_bucket,
-                            'value': sum(bucket_values) / len(bucket_values),
-                            'count': len(bucket_values),
-                            'min': min(bucket_values),
-                            'max': max(bucket_values)
-                        })
-                    
-                    # Start new bucket
-                    current_bucket = bucket_timestamp
-                    bucket_values = []
-                
-                bucket_values.append(event.numeric_value)
-            
-            # Save last bucket
-            if current_bucket and bucket_values:
-                time_series.append({
-                    'timestamp': current_bucket,
-                    'value': sum(bucket_values) / len(bucket_values),
-                    'count': len(bucket_values),
-                    'min': min(bucket_values),
-                    'max': max(bucket_values)
-                })
-            
-            return time_series
+                .group_by(events.c.device_id, events.c.bucket)
+                .order_by(events.c.device_id, events.c.bucket)
+            )
+            
+            result = await self.session.execute(query)
+            return [
+                {
+                    'timestamp': bucket_datetime(bucket),
+                    'device_id': row_device_id,
+                    'value': avg_value,
+                    'count': count,
+                    'sum': total,
+                    'min': min_value,
+                    'max': max_value
+                }
+                for row_device_id, bucket, avg_value, count, total, min_value, max_value in result.all()
+            ]
             
         except Exception as e:
             self.logger.error(f"Error getting time series data: {e}")
             raise RepositoryError(f"Failed to get time series data: {e}")
     
-    async def cleanup_old_data(self, retention_days: int = 30) -> int:
-        """Clean up old telemetry data."""
+    def _time_bucket(self, dialect, bucket_seconds: int):
+        """Expression flooring the event timestamp to an epoch-aligned bucket."""
+        return time_bucket(dialect, self.model.timestamp, bucket_seconds)
+    
+    async def cleanup_old_data(self, retention_days: int = 30,
+                               batch_size: int = 1000,
+                               pause_seconds: float = 0.1,
+                               progress_callback: Optional[Callable[[RetentionProgress], None]] = None) -> int:
+        """
+        Clean up old telemetry data.
+        
+        When telemetry_events is partitioned (PostgreSQL only), whole expired
+        partitions are dropped instead of deleting rows, and upcoming
+        partitions are created. Otherwise rows are deleted in committed
+        batches of ``batch_size`` with a pause between them, in a session of
+        their own; see RetentionExecutor.
+        """
         try:
             cutoff_date = datetime.now(timezone.utc) - timedelta(days=retention_days)
             
-            # Count records to be deleted
-            count_query = select(func.count(self.model.id)).where(
-                self.model.timestamp < cutoff_date
-            )
-            count_result = await self.session.execute(count_query)
-            count = count_result.scalar()
-            
-            # Delete old records
-            from sqlalchemy import delete
-            delete_query = delete(self.model).where(self.model.timestamp < cutoff_date)
-            await self.session.execute(delete_query)
-            await self.session.flush()
+            partitions = TelemetryPartitionManager(self.session)
+            if await partitions.is_partitioned():
+                count = await partitions.drop_partitions_before(cutoff_date)
+                await partitions.ensure_partitions()
+            else:
+                async with retention_session(self.session) as session:
+                    executor = RetentionExecutor(session, batch_size, pause_seconds, progress_callback)
+                    count = (await executor.purge(self.model, self.model.timestamp < cutoff_date)).deleted
             
             self.logger.info(f"Cleaned up {count} old telemetry records")
             return count
@@ -209,39 +380,37 @@ class TelemetryRepository(BaseRepository[TelemetryEvent]):
                                    start_time: Optional[datetime] = None,
                                    end_time: Optional[datetime] = None) -> Dict[str, Any]:
         """Get telemetry statistics for a device."""
+        if self.summary_cache is not None:
+            return await self.summary_cache.get(
+                ('telemetry_statistics', device_id, start_time, end_time),
+                lambda: self._compute_device_statistics(device_id, start_time, end_time)
+            )
+        return await self._compute_device_statistics(device_id, start_time, end_time)
+    
+    async def _compute_device_statistics(self, device_id: uuid.UUID,
+                                         start_time: Optional[datetime],
+                                         end_time: Optional[datetime]) -> Dict[str, Any]:
         try:
-            query = select(self.model).where(self.model.device_id == device_id)
-            
+            # One pass over the device's events, grouped by type
+            query = (
+                select(self.model.event_type, func.count(self.model.id), func.max(self.model.timestamp))
+                .where(self.model.device_id == device_id)
+                .group_by(self.model.event_type)
+            )
             if start_time:
                 query = query.where(self.model.timestamp >= start_time)
             if end_time:
                 query = query.where(self.model.timestamp <= end_time)
             
-            # Total events
-            total_query = select(func.count(self.model.id)).select_from(query.subquery())
-            total_result = await self.session.execute(total_query)
-            total_events = total_result.scalar()
-            
-            # Events by type
-            type_query = (
-                select(self.model.event_type, func.count(self.model.id))
-                .select_from(query.subquery())
-                .group_by(self.model.event_type)
-            )
-            type_result = await self.session.execute(type_query)
-            type_distribution = dict(type_result.all())
-            
-            # Latest event
-            latest_query = query.order_by(desc(self.model.timestamp)).limit(1)
-            latest_result = await self.session.execute(latest_query)
-            latest_event = latest_result.scalar_one_or_none()
+            result = await self.session.execute(query)
+            rows = result.all()
             
             return {
-                'total_events': total_events,
+                'total_events': sum(count for _, count, _ in rows),
                 'type_distribution': {
-                    event_type.value: count for event_type, count in type_distribution.items()
+                    event_type.value: count for event_type, count, _ in rows
                 },
-                'latest_event_time': latest_event.timestamp if latest_event else None,
+                'latest_event_time': max((latest for _, _, latest in rows), default=None),
                 'device_id': str(device_id)
             }
             
@@ -0,0 +1,312 @@
+"""
+Latest Telemetry Repository
+
+Maintains ``device_latest_telemetry``, the newest reading of every metric of
+every device, and answers "current values" queries from it. Ingestion
+upserts the table as events arrive; ``backfill`` builds it from the events
+already stored.
+"""
+
+import asyncio
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Sequence, Union
+from datetime import datetime, timezone
+
+from sqlalchemy import and_, func, literal, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ...core.logging import get_logger
+from .base import RepositoryError
+from ..models.telemetry import TelemetryEvent
+from ..models.telemetry_latest import DeviceLatestTelemetry
+
+# Event fields copied into the latest-value row
+VALUE_FIELDS = (
+    'event_type', 'timestamp', 'numeric_value', 'string_value',
+    'boolean_value', 'units', 'quality_score'
+)
+
+
+@dataclass
+class BackfillProgress:
+    """Progress of a backfill; ``last_device_id`` resumes an interrupted run."""
+    devices: int = 0
+    rows: int = 0
+    batches: int = 0
+    elapsed: float = 0.0
+    last_device_id: Optional[uuid.UUID] = None
+    completed: bool = False
+    started_at: float = field(default_factory=time.monotonic, repr=False)
+
+
+class LatestTelemetryRepository:
+    """
+    Upserts and reads of the per-device, per-metric latest-value table.
+
+    An upsert only replaces a row with a reading at least as new as the one
+    it holds, so out-of-order ingestion and a backfill running alongside
+    live ingestion never move a metric back in time.
+    """
+
+    SUPPORTED_DIALECTS = ("postgresql", "sqlite")
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+        self.logger = get_logger(f"{__name__}.LatestTelemetryRepository")
+
+    async def record(self, events: Sequence[Union[TelemetryEvent, Dict[str, Any]]]) -> int:
+        """
+        Upsert the newest of the given events for each device and metric.
+
+        Args:
+            events: Ingested events, as model instances or column-keyed dicts
+
+        Returns:
+            Number of latest-value rows written
+        """
+        if not events:
+            return 0
+
+        try:
+            newest: Dict[tuple, Dict[str, Any]] = {}
+            for event in events:
+                row = self._latest_row(event)
+                key = (row['device_id'], row['event_name'])
+                current = newest.get(key)
+                if current is None or row['timestamp'] >= current['timestamp']:
+                    newest[key] = row
+
+            # A consistent lock order keeps concurrent ingesters from deadlocking
+            rows = [newest[key] for key in sorted(newest, key=lambda k: (str(k[0]), k[1]))]
+            now = datetime.now(timezone.utc)
+            for row in rows:
+                row['updated_at'] = now
+
+            conn = await self.session.connection()
+            statement = self._upsert(self._insert(conn.dialect)(DeviceLatestTelemetry.__table__))
+            await conn.execute(statement, rows)
+            return len(rows)
+
+        except RepositoryError:
+            raise
+        except Exception as e:
+            self.logger.error(f"Error recording latest telemetry: {e}")
+            raise RepositoryError(f"Failed to record latest telemetry: {e}")
+
+    async def get_device_values(self, device_id: uuid.UUID,
+                                event_names: Optional[Sequence[str]] = None) -> Dict[str, DeviceLatestTelemetry]:
+        """
+        Get the latest reading of each metric of a device.
+
+        Args:
+            device_id: Device ID
+            event_names: Restrict to these metrics
+
+        Returns:
+            Latest readings keyed by metric name
+        """
+        try:
+            query = select(DeviceLatestTelemetry).where(DeviceLatestTelemetry.device_id == device_id)
+            if event_names:
+                query = query.where(DeviceLatestTelemetry.event_name.in_(event_names))
+
+            result = await self.session.execute(query)
+            return {row.event_name: row for row in result.scalars().all()}
+
+        except Exception as e:
+            self.logger.error(f"Error getting latest telemetry for device {device_id}: {e}")
+            raise RepositoryError(f"Failed to get latest telemetry: {e}")
+
+    async def get_fleet_values(self, event_names: Optional[Sequence[str]] = None,
+                               device_ids: Optional[Sequence[uuid.UUID]] = None,
+                               since: Optional[datetime] = None) -> List[DeviceLatestTelemetry]:
+        """
+        Get the current value of every metric across the fleet.
+
+        Args:
+            event_names: Restrict to these metrics
+            device_ids: Restrict to these devices
+            since: Skip readings older than this
+
+        Returns:
+            Latest readings ordered by device and metric name
+        """
+        try:
+            conditions = []
+            if event_names:
+                conditions.append(DeviceLatestTelemetry.event_name.in_(event_names))
+            if device_ids:
+                conditions.append(DeviceLatestTelemetry.device_id.in_(device_ids))
+            if since:
+                conditions.append(DeviceLatestTelemetry.timestamp >= since)
+
+            query = select(DeviceLatestTelemetry).order_by(
+                DeviceLatestTelemetry.device_id, DeviceLatestTelemetry.event_name
+            )
+            if conditions:
+                query = query.where(and_(*conditions))
+
+            result = await self.session.execute(query)
+            return result.scalars().all()
+
+        except Exception as e:
+            self.logger.error(f"Error getting fleet latest telemetry: {e}")
+            raise RepositoryError(f"Failed to get fleet latest telemetry: {e}")
+
+    async def backfill(self, batch_size: int = 500,
+                       pause_seconds: float = 0.0,
+                       resume_from: Optional[uuid.UUID] = None,
+                       progress_callback: Optional[Callable[[BackfillProgress], None]] = None) -> BackfillProgress:
+        """
+        Build the latest-value table from the stored telemetry events.
+
+        Devices are processed in ID order, ``batch_size`` at a time, with one
+        INSERT ... SELECT per batch that ranks each device's events per metric
+        and upserts the newest. Each batch is committed, so the backfill
+        commits the session it is given and can be resumed from the reported
+        ``last_device_id``. Rerunning it is harmless.
+
+        Args:
+            batch_size: Devices per batch
+            pause_seconds: Sleep between batches to yield to other writers
+            resume_from: Device ID after which to start
+            progress_callback: Called with the progress after every batch
+
+        Returns:
+            Final progress of the run
+        """
+        if batch_size <= 0:
+            raise ValueError("Batch size must be positive")
+
+        progress = BackfillProgress(last_device_id=resume_from)
+        try:
+            dialect = (await self.session.connection()).dialect
+            if dialect.name not in self.SUPPORTED_DIALECTS:
+                raise RepositoryError(f"Latest telemetry is not supported on {dialect.name}")
+
+            while True:
+                device_ids = await self._next_devices(progress.last_device_id, batch_size)
+                if not device_ids:
+                    break
+
+                result = await self.session.execute(self._backfill_statement(dialect, device_ids))
+                await self.session.commit()
+
+                progress.devices += len(device_ids)
+                progress.rows += max(result.rowcount, 0)
+                progress.batches += 1
+                progress.last_device_id = device_ids[-1]
+                progress.elapsed = time.monotonic() - progress.started_at
+
+                self.logger.debug(
+                    f"Latest telemetry backfill: batch {progress.batches}, "
+                    f"{progress.devices} devices, {progress.rows} rows"
+                )
+                if progress_callback:
+                    progress_callback(progress)
+
+                if len(device_ids) < batch_size:
+                    break
+                if pause_seconds:
+                    await asyncio.sleep(pause_seconds)
+
+            progress.completed = True
+            progress.elapsed = time.monotonic() - progress.started_at
+            self.logger.info(
+                f"Latest telemetry backfill wrote {progress.rows} rows for "
+                f"{progress.devices} devices in {progress.elapsed:.1f}s"
+            )
+            return progress
+
+        except RepositoryError:
+            raise
+        except Exception as e:
+            await self.session.rollback()
+            self.logger.error(
+                f"Latest telemetry backfill stopped after {progress.devices} devices "
+                f"(resume from {progress.last_device_id}): {e}"
+            )
+            raise RepositoryError(f"Failed to backfill latest telemetry: {e}")
+
+    async def _next_devices(self, after: Optional[uuid.UUID], limit: int) -> List[uuid.UUID]:
+        """
+        Next device IDs present in the events, in ID order.
+
+        Each ID is found with a MIN() above the previous one, a single probe
+        of the device index, rather than a DISTINCT over the whole table.
+        """
+        device_ids = []
+        while len(device_ids) < limit:
+            query = select(func.min(TelemetryEvent.device_id))
+            if after is not None:
+                query = query.where(TelemetryEvent.device_id > after)
+            after = (await self.session.execute(query)).scalar()
+            if after is None:
+                break
+            device_ids.append(after)
+        return device_ids
+
+    def _backfill_statement(self, dialect, device_ids: List[uuid.UUID]):
+        """INSERT ... SELECT of the newest event per device and metric."""
+        events = TelemetryEvent
+        ranked = select(
+            events.device_id,
+            events.event_name,
+            events.id.label('event_id'),
+            *(getattr(events, name) for name in VALUE_FIELDS),
+            func.row_number().over(
+                partition_by=(events.device_id, events.event_name),
+                order_by=(events.timestamp.desc(), events.received_at.desc())
+            ).label('row_rank')
+        ).where(
+            events.device_id.in_(device_ids),
+            events.is_deleted.is_(False)
+        ).subquery()
+
+        columns = ['device_id', 'event_name', 'event_id', *VALUE_FIELDS]
+        latest = select(
+            *(ranked.c[name] for name in columns),
+            literal(datetime.now(timezone.utc), DeviceLatestTelemetry.updated_at.type)
+        ).where(ranked.c.row_rank == 1)
+
+        statement = self._insert(dialect)(DeviceLatestTelemetry).from_select(
+            [*columns, 'updated_at'], latest
+        )
+        return self._upsert(statement)
+
+    def _insert(self, dialect):
+        if dialect.name == "postgresql":
+            return pg_insert
+        if dialect.name == "sqlite":
+            return sqlite_insert
+        raise RepositoryError(f"Latest telemetry is not supported on {dialect.name}")
+
+    @staticmethod
+    def _upsert(statement):
+        """Merge into existing rows, keeping whichever reading is newer."""
+        table = DeviceLatestTelemetry.__table__
+        excluded = statement.excluded
+        return statement.on_conflict_do_update(
+            index_elements=[table.c.device_id, table.c.event_name],
+            set_={
+                name: excluded[name]
+                for name in ('event_id', *VALUE_FIELDS, 'updated_at')
+            },
+            where=excluded.timestamp >= table.c.timestamp
+        )
+
+    @staticmethod
+    def _latest_row(event: Union[TelemetryEvent, Dict[str, Any]]) -> Dict[str, Any]:
+        """Latest-value row for one event."""
+        get = event.get if isinstance(event, dict) else lambda name: getattr(event, name, None)
+        row = {
+            'device_id': get('device_id'),
+            'event_name': get('event_name'),
+            'event_id': get('id'),
+        }
+        row.update((name, get(name)) for name in VALUE_FIELDS)
+        return row
@@ -0,0 +1,267 @@
+"""
+Telemetry Partition Management
+
+Time partitioning for ``telemetry_events`` so that retention drops whole
+periods instead of deleting rows.
+
+On PostgreSQL the table is natively range partitioned on ``timestamp`` with a
+DEFAULT partition catching rows outside every range, and the ORM model and
+repositories keep addressing ``telemetry_events``. SQLite keeps a single
+table: an emulated layout would route writes through INSTEAD OF triggers,
+which report no row counts, so ORM updates of loaded events would fail their
+row count check. Retention on SQLite runs through RetentionExecutor instead.
+"""
+
+import enum
+import re
+from dataclasses import dataclass
+from datetime import datetime, timezone, timedelta
+from typing import List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ...core.logging import get_logger
+from .base import RepositoryError
+from ..models.telemetry import TelemetryEvent
+
+
+class PartitionPeriod(enum.Enum):
+    """Width of a telemetry partition."""
+    DAY = "day"
+    WEEK = "week"
+
+    def floor(self, moment: datetime) -> datetime:
+        """Start of the period containing a moment (UTC; weeks start on Monday)."""
+        if moment.tzinfo is None:
+            moment = moment.replace(tzinfo=timezone.utc)
+        start = moment.astimezone(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+        if self is PartitionPeriod.WEEK:
+            start -= timedelta(days=start.weekday())
+        return start
+
+    @property
+    def length(self) -> timedelta:
+        """Duration of one period."""
+        return timedelta(days=7 if self is PartitionPeriod.WEEK else 1)
+
+
+@dataclass
+class TelemetryPartition:
+    """A telemetry partition and the half-open timestamp range it holds."""
+    name: str
+    start: Optional[datetime] = None
+    end: Optional[datetime] = None
+
+    @property
+    def is_default(self) -> bool:
+        """Whether this is the catch-all partition."""
+        return self.start is None
+
+
+_PG_BOUND = re.compile(r"FROM \('([^']+)'\) TO \('([^']+)'\)")
+
+
+class TelemetryPartitionManager:
+    """
+    Creates, lists and drops telemetry partitions.
+
+    Call ``ensure_partitions`` at startup and at least once per period so the
+    upcoming partitions exist before data arrives for them; rows that arrive
+    first land in the default partition and are moved when their partition
+    is created. On SQLite the table is left unpartitioned and this call does
+    nothing.
+    """
+
+    PARENT = TelemetryEvent.__tablename__
+    DEFAULT = f"{TelemetryEvent.__tablename__}_default"
+    SUPPORTED_DIALECTS = ("postgresql", "sqlite")
+
+    def __init__(self, session: AsyncSession,
+                 period: PartitionPeriod = PartitionPeriod.DAY,
+                 premake: int = 7):
+        """
+        Initialize the partition manager.
+
+        Args:
+            session: Async SQLAlchemy session
+            period: Width of newly created partitions
+            premake: Number of future periods to create ahead of time
+        """
+        self.session = session
+        self.period = period
+        self.premake = premake
+        self.logger = get_logger(f"{__name__}.TelemetryPartitionManager")
+
+    async def is_partitioned(self) -> bool:
+        """Whether telemetry_events uses the partitioned layout."""
+        dialect = (await self.session.connection()).dialect.name
+        if dialect == "postgresql":
+            result = await self.session.execute(
+                text("SELECT relkind FROM pg_class WHERE oid = to_regclass(:name)"),
+                {"name": self.PARENT}
+            )
+            return result.scalar() == "p"
+        return False
+
+    async def list_partitions(self) -> List[TelemetryPartition]:
+        """Partitions ordered by start, with the default partition last."""
+        if await self._dialect_name() != "postgresql":
+            return []
+
+        result = await self.session.execute(text(
+            "SELECT c.relname, pg_get_expr(c.relpartbound, c.oid) "
+            "FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+            "WHERE i.inhparent = to_regclass(:name)"
+        ), {"name": self.PARENT})
+        partitions = []
+        for name, bound in result.all():
+            match = _PG_BOUND.search(bound or "")
+            if match:
+                partitions.append(TelemetryPartition(
+                    name, _parse_bound(match.group(1)), _parse_bound(match.group(2))
+                ))
+            else:
+                partitions.append(TelemetryPartition(name))
+
+        epoch = datetime.min.replace(tzinfo=timezone.utc)
+        return sorted(partitions, key=lambda p: (p.is_default, p.start or epoch))
+
+    async def ensure_partitions(self, now: Optional[datetime] = None) -> List[str]:
+        """
+        Create partitions for the current period and ``premake`` periods ahead.
+
+        Returns:
+            Names of the partitions created; always empty on SQLite
+        """
+        try:
+            if await self._dialect_name() == "sqlite":
+                return []
+            if not await self.is_partitioned():
+                raise RepositoryError(
+                    f"{self.PARENT} is not a partitioned table; recreate it from the current model"
+                )
+            else:
+                await self.session.execute(text(
+                    f"CREATE TABLE IF NOT EXISTS {self.DEFAULT} PARTITION OF {self.PARENT} DEFAULT"
+                ))
+
+            existing = [p for p in await self.list_partitions() if not p.is_default]
+            start = self.period.floor(now or datetime.now(timezone.utc))
+            created = []
+
+            for _ in range(self.premake + 1):
+                end = start + self.period.length
+                if not any(p.start < end and start < p.end for p in existing):
+                    name = self.partition_name(start)
+                    await self._create_pg_partition(name, start, end)
+                    existing.append(TelemetryPartition(name, start, end))
+                    created.append(name)
+                start = end
+
+            await self.session.flush()
+
+            if created:
+                self.logger.info(f"Created telemetry partitions: {', '.join(created)}")
+            return created
+
+        except RepositoryError:
+            raise
+        except Exception as e:
+            self.logger.error(f"Error creating telemetry partitions: {e}")
+            raise RepositoryError(f"Failed to create telemetry partitions: {e}")
+
+    async def drop_partitions_before(self, cutoff: datetime) -> int:
+        """
+        Drop every partition that ends at or before ``cutoff``.
+
+        Partitions are detached before being dropped, so the parent table is
+        only locked briefly. Rows older than the cutoff that sit in the default
+        partition are deleted; the partition straddling the cutoff is kept
+        until it expires entirely.
+
+        Returns:
+            Number of rows removed
+        """
+        try:
+            if not await self.is_partitioned():
+                raise RepositoryError(
+                    f"{self.PARENT} is not partitioned; use TelemetryRepository.cleanup_old_data"
+                )
+            if cutoff.tzinfo is None:
+                cutoff = cutoff.replace(tzinfo=timezone.utc)
+
+            expired = [
+                p for p in await self.list_partitions()
+                if not p.is_default and p.end <= cutoff
+            ]
+            removed = 0
+
+            # Take the partitions out of the parent first, then drop them
+            for partition in expired:
+                await self.session.execute(text(
+                    f"ALTER TABLE {self.PARENT} DETACH PARTITION {partition.name}"
+                ))
+
+            for partition in expired:
+                removed += (await self.session.execute(
+                    text(f"SELECT count(*) FROM {partition.name}")
+                )).scalar()
+                await self.session.execute(text(f"DROP TABLE {partition.name}"))
+
+            result = await self.session.execute(
+                text(f'DELETE FROM {self.DEFAULT} WHERE "timestamp" < :cutoff'),
+                {"cutoff": cutoff}
+            )
+            removed += result.rowcount or 0
+            await self.session.flush()
+
+            if expired:
+                self.logger.info(
+                    f"Dropped telemetry partitions: {', '.join(p.name for p in expired)}"
+                )
+            return removed
+
+        except RepositoryError:
+            raise
+        except Exception as e:
+            self.logger.error(f"Error dropping telemetry partitions: {e}")
+            raise RepositoryError(f"Failed to drop telemetry partitions: {e}")
+
+    def partition_name(self, start: datetime) -> str:
+        """Table name of the partition starting at ``start``."""
+        return f"{self.PARENT}_p{start:%Y%m%d}"
+
+    async def _dialect_name(self) -> str:
+        dialect = (await self.session.connection()).dialect.name
+        if dialect not in self.SUPPORTED_DIALECTS:
+            raise RepositoryError(f"Telemetry partitioning is not supported on {dialect}")
+        return dialect
+
+    async def _create_pg_partition(self, name: str, start: datetime, end: datetime) -> None:
+        """Create a partition, moving any rows for its range out of the default partition."""
+        lower, upper = _format_bound(start), _format_bound(end)
+        await self.session.execute(text(
+            f"CREATE TABLE {name} (LIKE {self.PARENT} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"
+        ))
+        await self.session.execute(text(
+            f"WITH moved AS (DELETE FROM {self.DEFAULT} "
+            f"WHERE timestamp >= '{lower}' AND timestamp < '{upper}' RETURNING *) "
+            f"INSERT INTO {name} SELECT * FROM moved"
+        ))
+        await self.session.execute(text(
+            f"ALTER TABLE {self.PARENT} ATTACH PARTITION {name} "
+            f"FOR VALUES FROM ('{lower}') TO ('{upper}')"
+        ))
+
+
+def _format_bound(moment: datetime) -> str:
+    """Render a partition bound as a PostgreSQL timestamptz literal."""
+    return moment.astimezone(timezone.utc).strftime("%Y-%m-%d %H:%M:%S+00")
+
+
+def _parse_bound(value: str) -> datetime:
+    moment = datetime.fromisoformat(value)
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return moment.astimezone(timezone.utc)
@@ -0,0 +1,349 @@
+"""
+Telemetry Rollup Repository
+
+Incrementally maintains the per-minute, per-hour and per-day telemetry
+rollups and answers time-series queries from the coarsest rollup that fits.
+"""
+
+import uuid
+from typing import List, Optional, Dict, Any, Sequence, Union
+from datetime import datetime, timezone, timedelta
+
+from sqlalchemy import select, func, and_, or_, literal, union_all
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ...core.logging import get_logger
+from .base import RepositoryError
+from .telemetry import TelemetryRepository, bucket_datetime, time_bucket
+from ..models.telemetry import TelemetryEvent, TelemetryType
+from ..models.telemetry_rollup import (
+    ROLLUP_MODELS, RollupResolution, TelemetryRollupState, rollup_stddev
+)
+
+
+class TelemetryRollupRepository:
+    """
+    Rollup maintenance and rollup-backed time-series queries.
+
+    ``refresh`` folds raw events received since the stored high-water mark
+    into every rollup table, merging into existing buckets so late events are
+    counted in the bucket they belong to. Queries read the rollups and merge
+    in the raw events received after the high-water mark, so they include
+    events not yet refreshed.
+    """
+
+    SOURCE = "telemetry_events"
+    SUPPORTED_DIALECTS = ("postgresql", "sqlite")
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+        self.logger = get_logger(f"{__name__}.TelemetryRollupRepository")
+
+    async def refresh(self, until: Optional[datetime] = None,
+                      lag: timedelta = timedelta(seconds=30)) -> Dict[RollupResolution, int]:
+        """
+        Fold newly received raw events into the rollup tables.
+
+        Args:
+            until: Newest received_at to include; defaults to now minus lag
+            lag: Margin left for in-flight inserts that have not committed yet
+
+        Returns:
+            Number of rollup rows written per resolution
+        """
+        try:
+            dialect = await self._dialect()
+            high = until or datetime.now(timezone.utc) - lag
+
+            state = await self._lock_state(dialect)
+            low = state.high_water_mark if state else None
+            if low is not None and low.tzinfo is None:
+                low = low.replace(tzinfo=timezone.utc)
+            if low is not None and high <= low:
+                return {}
+
+            window = [TelemetryEvent.received_at <= high, TelemetryEvent.numeric_value.isnot(None)]
+            if low is not None:
+                window.append(TelemetryEvent.received_at > low)
+
+            written = {}
+            for resolution, model in ROLLUP_MODELS.items():
+                result = await self.session.execute(
+                    self._merge_statement(dialect, resolution, model, window)
+                )
+                written[resolution] = result.rowcount
+
+            now = datetime.now(timezone.utc)
+            if state is None:
+                self.session.add(TelemetryRollupState(
+                    name=self.SOURCE, high_water_mark=high, updated_at=now
+                ))
+            else:
+                state.high_water_mark = high
+                state.updated_at = now
+            await self.session.flush()
+
+            self.logger.info(
+                f"Refreshed telemetry rollups up to {high.isoformat()}: "
+                + ", ".join(f"{r.value}={n}" for r, n in written.items())
+            )
+            return written
+
+        except RepositoryError:
+            raise
+        except Exception as e:
+            self.logger.error(f"Error refreshing telemetry rollups: {e}")
+            raise RepositoryError(f"Failed to refresh telemetry rollups: {e}")
+
+    async def get_high_water_mark(self) -> Optional[datetime]:
+        """received_at of the newest raw event included in the rollups."""
+        state = await self.session.get(TelemetryRollupState, self.SOURCE)
+        return state.high_water_mark if state else None
+
+    @staticmethod
+    def choose_resolution(interval: timedelta, start_time: datetime,
+                          end_time: datetime) -> Optional[RollupResolution]:
+        """
+        Coarsest rollup whose buckets tile the interval and start at the range's start.
+
+        The range's end need not be aligned: the part after the last whole
+        rollup bucket is read from raw events. Returns None when no rollup
+        fits, e.g. for sub-minute intervals or ranges that do not start on a
+        minute boundary.
+        """
+        interval_seconds = interval.total_seconds()
+        for resolution in reversed(list(ROLLUP_MODELS)):
+            seconds = resolution.seconds
+            if (interval_seconds >= seconds and interval_seconds % seconds == 0
+                    and _aligned(start_time, seconds)):
+                return resolution
+        return None
+
+    async def get_time_series(self, device_id: Union[uuid.UUID, Sequence[uuid.UUID]],
+                              event_name: str,
+                              start_time: datetime,
+                              end_time: datetime,
+                              interval_minutes: int = 60,
+                              interval: Optional[timedelta] = None,
+                              event_type: Optional[TelemetryType] = None) -> List[Dict[str, Any]]:
+        """
+        Get time-series data from the coarsest rollup that fits the request.
+
+        The range is half-open, [start_time, end_time). Raw events received
+        after the rollups' high-water mark, and those after the last whole
+        rollup bucket before end_time, are aggregated and merged into the
+        rollup buckets. When no rollup fits the interval and range, the raw
+        events are aggregated instead.
+
+        Args:
+            device_id: Device ID, or several device IDs to query together
+            event_name: Event name to aggregate
+            start_time: Start of the range (inclusive)
+            end_time: End of the range (exclusive)
+            interval_minutes: Bucket size in minutes
+            interval: Bucket size as a timedelta; overrides interval_minutes
+            event_type: Restrict rollup reads to one event type
+
+        Returns:
+            Buckets ordered by device and time, each with timestamp, device_id,
+            value (average), count, sum, min, max, stddev and the resolution read
+        """
+        if interval is None:
+            interval = timedelta(minutes=interval_minutes)
+
+        resolution = self.choose_resolution(interval, start_time, end_time)
+        if resolution is None:
+            # Raw ranges are inclusive at both ends
+            series = await TelemetryRepository(self.session, use_rollups=False).get_time_series_data(
+                device_id, event_name, start_time, end_time - timedelta(microseconds=1),
+                interval=interval
+            )
+            for point in series:
+                point.update(stddev=None, resolution=None)
+            return series
+
+        try:
+            dialect = await self._dialect()
+            model = ROLLUP_MODELS[resolution]
+            device_ids = [device_id] if isinstance(device_id, uuid.UUID) else list(device_id)
+
+            bucket_seconds = int(interval.total_seconds())
+            # Rollup buckets must end by end_time; the rest of the range is read raw
+            rollup_end = _floor(end_time, resolution.seconds)
+
+            conditions = [
+                model.device_id.in_(device_ids),
+                model.event_name == event_name,
+                model.bucket_start >= start_time,
+                model.bucket_start < rollup_end,
+            ]
+            if event_type is not None:
+                conditions.append(model.event_type == event_type)
+
+            buckets = select(
+                model.device_id,
+                time_bucket(dialect, model.bucket_start, bucket_seconds).label('bucket'),
+                model.count.label('count'),
+                model.sum.label('sum'),
+                model.min.label('min'),
+                model.max.label('max'),
+                model.sum_squares.label('sum_squares')
+            ).where(and_(*conditions))
+
+            # Raw events the rollups do not include, or that fall after rollup_end
+            high_water_mark = await self.get_high_water_mark()
+            raw_conditions = [
+                TelemetryEvent.device_id.in_(device_ids),
+                TelemetryEvent.event_name == event_name,
+                TelemetryEvent.timestamp >= start_time,
+                TelemetryEvent.timestamp < end_time,
+                TelemetryEvent.numeric_value.isnot(None),
+            ]
+            if high_water_mark is not None:
+                raw_conditions.append(or_(
+                    TelemetryEvent.received_at > high_water_mark,
+                    TelemetryEvent.timestamp >= rollup_end
+                ))
+            if event_type is not None:
+                raw_conditions.append(TelemetryEvent.event_type == event_type)
+
+            value = TelemetryEvent.numeric_value
+            pending = select(
+                TelemetryEvent.device_id,
+                time_bucket(dialect, TelemetryEvent.timestamp, bucket_seconds).label('bucket'),
+                literal(1).label('count'),
+                value.label('sum'),
+                value.label('min'),
+                value.label('max'),
+                (value * value).label('sum_squares')
+            ).where(and_(*raw_conditions))
+
+            rows = union_all(buckets, pending).subquery()
+            query = (
+                select(
+                    rows.c.device_id,
+                    rows.c.bucket,
+                    func.sum(rows.c.count),
+                    func.sum(rows.c.sum),
+                    func.min(rows.c.min),
+                    func.max(rows.c.max),
+                    func.sum(rows.c.sum_squares)
+                )
+                .group_by(rows.c.device_id, rows.c.bucket)
+                .order_by(rows.c.device_id, rows.c.bucket)
+            )
+
+            result = await self.session.execute(query)
+            return [
+                {
+                    'timestamp': bucket_datetime(bucket),
+                    'device_id': row_device_id,
+                    'value': total / count,
+                    'count': count,
+                    'sum': total,
+                    'min': min_value,
+                    'max': max_value,
+                    'stddev': rollup_stddev(count, total, sum_squares),
+                    'resolution': resolution.value
+                }
+                for row_device_id, bucket, count, total, min_value, max_value, sum_squares
+                in result.all()
+            ]
+
+        except Exception as e:
+            self.logger.error(f"Error getting rollup time series data: {e}")
+            raise RepositoryError(f"Failed to get rollup time series data: {e}")
+
+    async def _dialect(self):
+        dialect = (await self.session.connection()).dialect
+        if dialect.name not in self.SUPPORTED_DIALECTS:
+            raise RepositoryError(f"Telemetry rollups are not supported on {dialect.name}")
+        return dialect
+
+    async def _lock_state(self, dialect) -> Optional[TelemetryRollupState]:
+        """Load the rollup state, holding a row lock on PostgreSQL so refreshes serialise."""
+        if dialect.name != "postgresql":
+            return await self.session.get(TelemetryRollupState, self.SOURCE)
+
+        epoch = datetime(1970, 1, 1, tzinfo=timezone.utc)
+        await self.session.execute(
+            pg_insert(TelemetryRollupState)
+            .values(name=self.SOURCE, high_water_mark=epoch, updated_at=epoch)
+            .on_conflict_do_nothing(index_elements=[TelemetryRollupState.name])
+        )
+        result = await self.session.execute(
+            select(TelemetryRollupState)
+            .where(TelemetryRollupState.name == self.SOURCE)
+            .with_for_update()
+            .execution_options(populate_existing=True)
+        )
+        return result.scalar_one()
+
+    @staticmethod
+    def _merge_statement(dialect, resolution: RollupResolution, model, window):
+        """INSERT ... SELECT aggregating the raw window, merging into existing buckets."""
+        bucket = time_bucket(dialect, TelemetryEvent.timestamp, resolution.seconds)
+        if dialect.name == "sqlite":
+            # Match the text format SQLAlchemy stores DateTime values in
+            bucket = func.strftime('%Y-%m-%d %H:%M:%S.000000', bucket, 'unixepoch')
+
+        events = select(
+            TelemetryEvent.device_id,
+            TelemetryEvent.event_type,
+            TelemetryEvent.event_name,
+            bucket.label('bucket_start'),
+            TelemetryEvent.numeric_value.label('value')
+        ).where(and_(*window)).subquery()
+
+        aggregated = (
+            select(
+                events.c.device_id,
+                events.c.event_type,
+                events.c.event_name,
+                events.c.bucket_start,
+                func.count(events.c.value),
+                func.sum(events.c.value),
+                func.min(events.c.value),
+                func.max(events.c.value),
+                func.sum(events.c.value * events.c.value)
+            )
+            .group_by(events.c.device_id, events.c.event_type,
+                      events.c.event_name, events.c.bucket_start)
+        )
+
+        insert = pg_insert if dialect.name == "postgresql" else sqlite_insert
+        least = func.least if dialect.name == "postgresql" else func.min
+        greatest = func.greatest if dialect.name == "postgresql" else func.max
+
+        statement = insert(model).from_select(
+            ['device_id', 'event_type', 'event_name', 'bucket_start',
+             'count', 'sum', 'min', 'max', 'sum_squares'],
+            aggregated
+        )
+        excluded = statement.excluded
+        return statement.on_conflict_do_update(
+            index_elements=[model.device_id, model.event_type, model.event_name, model.bucket_start],
+            set_={
+                'count': model.count + excluded['count'],
+                'sum': model.sum + excluded['sum'],
+                'min': least(model.min, excluded['min']),
+                'max': greatest(model.max, excluded['max']),
+                'sum_squares': model.sum_squares + excluded['sum_squares'],
+            }
+        )
+
+
+def _floor(moment: datetime, seconds: int) -> datetime:
+    """Start of the epoch-aligned ``seconds`` bucket holding a datetime."""
+    aware = moment if moment.tzinfo is not None else moment.replace(tzinfo=timezone.utc)
+    remainder = int(aware.timestamp()) % seconds
+    return moment.replace(microsecond=0) - timedelta(seconds=remainder)
+
+
+def _aligned(moment: datetime, seconds: int) -> bool:
+    """Whether a datetime falls on an epoch-aligned boundary of ``seconds``."""
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return moment.microsecond == 0 and int(moment.timestamp()) % seconds == 0
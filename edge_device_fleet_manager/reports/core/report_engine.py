@@ -185,7 +185,7 @@ class ReportEngine:
         if not self.database_manager:
             raise ValueError("Database manager not available for query execution")
         
-        async with self.database_manager.get_session() as session:
+        async with self.database_manager.get_read_session() as session:
             result = await session.execute(query)
             rows = result.fetchall()
             columns = result.keys()
@@ -233,7 +233,7 @@ class ReportEngine:
         from ...persistence.repositories.alert import AlertRepository
         from ...persistence.repositories.audit_log import AuditLogRepository
         
-        async with self.database_manager.get_session() as session:
+        async with self.database_manager.get_read_session() as session:
             if data_source == 'devices':
                 repo = DeviceRepository(session)
                 devices = await repo.get_all()
@@ -131,7 +131,7 @@ class DataAdapter:
         if not self.database_manager:
             raise ValueError("Database manager not available")
         
-        async with self.database_manager.get_session() as session:
+        async with self.database_manager.get_read_session() as session:
             device_repo = DeviceRepository(session)
             
             if filter_spec == 'all':
@@ -166,7 +166,7 @@ class DataAdapter:
         if not self.database_manager:
             raise ValueError("Database manager not available")
         
-        async with self.database_manager.get_session() as session:
+        async with self.database_manager.get_read_session() as session:
             device_repo = DeviceRepository(session)
             
             # Apply filters
@@ -196,7 +196,7 @@ class DataAdapter:
         if not self.database_manager:
             raise ValueError("Database manager not available")
         
-        async with self.database_manager.get_session() as session:
+        async with self.database_manager.get_read_session() as session:
             telemetry_repo = TelemetryRepository(session)
             
             # Parse filter specification
@@ -238,7 +238,7 @@ class DataAdapter:
         if not self.database_manager:
             raise ValueError("Database manager not available")
         
-        async with self.database_manager.get_session() as session:
+        async with self.database_manager.get_read_session() as session:
             telemetry_repo = TelemetryRepository(session)
             
             # Apply filters
@@ -284,7 +284,7 @@ class DataAdapter:
         if not self.database_manager:
             raise ValueError("Database manager not available")
         
-        async with self.database_manager.get_session() as session:
+        async with self.database_manager.get_read_session() as session:
             analytics_repo = AnalyticsRepository(session)
             
             if filter_spec == 'recent':
@@ -322,7 +322,7 @@ class DataAdapter:
         if not self.database_manager:
             raise ValueError("Database manager not available")
         
-        async with self.database_manager.get_session() as session:
+        async with self.database_manager.get_read_session() as session:
             analytics_repo = AnalyticsRepository(session)
             
             # Apply filters
@@ -393,7 +393,7 @@ class DataAdapter:
         if not self.database_manager:
             raise ValueError("Database manager not available")
         
-        async with self.database_manager.get_session() as session:
+        async with self.database_manager.get_read_session() as session:
             result = await session.execute(query)
             rows = result.fetchall()
             columns = result.keys()
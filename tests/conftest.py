@@ -6,17 +6,20 @@ import asyncio
 import os
 import tempfile
 from pathlib import Path
-from typing import AsyncGenerator, Generator
+from typing import AsyncGenerator, Generator, List, Optional
 from unittest.mock import AsyncMock, MagicMock
 
 import pytest
 import pytest_asyncio
 from click.testing import CliRunner
+from sqlalchemy import MetaData, Table, event
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
 
 from edge_device_fleet_manager.core.config import Config, ConfigLoader
 from edge_device_fleet_manager.core.context import AppContext, app_context
 from edge_device_fleet_manager.core.plugins import PluginLoader
 from edge_device_fleet_manager.cli.main import cli
+from edge_device_fleet_manager.persistence.models.base import Base
 
 
 @pytest.fixture(scope="session")
@@ -270,6 +273,38 @@ async def async_mock():
     return AsyncMock()
 
 
+# Database fixtures
+class SQLiteTestDatabase:
+    """A fresh SQLite database file for repository tests."""
+    
+    def __init__(self, engine: AsyncEngine):
+        self.engine = engine
+        self.sessions = async_sessionmaker(engine, expire_on_commit=False)
+    
+    async def create_tables(self, metadata: MetaData = Base.metadata,
+                            tables: Optional[List[Table]] = None) -> None:
+        """Create ``tables``, or every table in ``metadata``."""
+        async with self.engine.begin() as conn:
+            await conn.run_sync(metadata.create_all, tables=tables)
+    
+    def record_statements(self) -> List[str]:
+        """Collect the SQL executed from now on into the returned list."""
+        statements = []
+        event.listen(
+            self.engine.sync_engine, "before_cursor_execute",
+            lambda conn, cursor, statement, *args: statements.append(statement)
+        )
+        return statements
+
+
+@pytest_asyncio.fixture
+async def sqlite_db(tmp_path: Path) -> AsyncGenerator[SQLiteTestDatabase, None]:
+    """Create an empty SQLite database; tests create the tables they need."""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'test.db'}")
+    yield SQLiteTestDatabase(engine)
+    await engine.dispose()
+
+
 # Markers for test categorization
 pytest.mark.unit = pytest.mark.unit
 pytest.mark.integration = pytest.mark.integration
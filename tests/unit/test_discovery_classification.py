@@ -0,0 +1,153 @@
+"""
+Unit tests for port-signature device classification.
+"""
+
+import pytest
+
+from edge_device_fleet_manager.discovery.core import Device, DeviceType
+from edge_device_fleet_manager.discovery.classification import (
+    DeviceClassifier, PortSignature
+)
+from edge_device_fleet_manager.discovery.plugins.base import (
+    DiscoveryPlugin, PluginConfig, PluginStatus
+)
+from edge_device_fleet_manager.discovery.plugins.manager import PluginManager
+
+
+class TestPortSignature:
+    """Test signature validation."""
+
+    def test_normalizes_fields(self):
+        """Test ports become frozensets and hints are lowercased."""
+        signature = PortSignature(DeviceType.CAMERA, any_ports=[554], hints=["RTSP"])
+
+        assert signature.any_ports == frozenset({554})
+        assert signature.hints == frozenset({"rtsp"})
+        assert signature.name == "camera"
+
+    def test_requires_condition(self):
+        """Test a signature without conditions is rejected."""
+        with pytest.raises(ValueError):
+            PortSignature(DeviceType.CAMERA)
+
+    def test_rejects_invalid_confidence(self):
+        """Test confidence must be in (0, 1]."""
+        with pytest.raises(ValueError):
+            PortSignature(DeviceType.CAMERA, any_ports={554}, confidence=1.5)
+
+
+class TestDeviceClassifier:
+    """Test vectorised classification."""
+
+    @pytest.fixture
+    def classifier(self):
+        """Create classifier with default signatures."""
+        return DeviceClassifier()
+
+    def test_default_rules(self, classifier):
+        """Test the built-in rule chain and its precedence."""
+        test_cases = [
+            ([80, 443, 22], ["HTTP", "HTTPS", "SSH"], DeviceType.ROUTER),
+            ([80, 443, 23], [], DeviceType.ROUTER),
+            ([631], ["Printer"], DeviceType.PRINTER),
+            ([80], ["Network Printer"], DeviceType.PRINTER),
+            ([8080, 631], [], DeviceType.PRINTER),
+            ([32400], [], DeviceType.MEDIA_SERVER),
+            ([1883], ["MQTT"], DeviceType.IOT_GATEWAY),
+            ([554, 8000], ["HTTP"], DeviceType.CAMERA),
+            ([554], [], DeviceType.UNKNOWN),
+            ([161], [], DeviceType.SWITCH),
+            ([22, 80], [], DeviceType.SWITCH),
+            ([5683], [], DeviceType.IOT_SENSOR),
+            ([9999], ["Unknown"], DeviceType.UNKNOWN),
+            ([], [], DeviceType.UNKNOWN),
+        ]
+
+        device_types, confidences = classifier.classify(
+            [(ports, services) for ports, services, _ in test_cases]
+        )
+
+        assert device_types == [expected for _, _, expected in test_cases]
+        assert len(confidences) == len(test_cases)
+
+    def test_confidence(self, classifier):
+        """Test confidence reflects the winning signature and conflicting evidence."""
+        device_type, confidence = classifier.classify_one([631], [])
+        assert device_type == DeviceType.PRINTER
+        assert confidence == pytest.approx(0.9)
+
+        # Switch evidence is fully explained by the router signature
+        _, router_confidence = classifier.classify_one([80, 443, 22], [])
+        assert router_confidence == pytest.approx(0.85)
+
+        # SNMP is independent evidence for another type
+        _, conflicted = classifier.classify_one([1883, 161], [])
+        assert 0.0 < conflicted < 0.8
+
+        assert classifier.classify_one([9999], []) == (DeviceType.UNKNOWN, 0.0)
+
+    def test_batches(self):
+        """Test results are identical across batch boundaries."""
+        hosts = [([631], []), ([1883], []), ([9999], []), ([161], [])] * 5
+        batched = DeviceClassifier(batch_size=3).classify(hosts)
+
+        assert batched == DeviceClassifier().classify(hosts)
+
+    def test_registered_signatures_take_precedence(self, classifier):
+        """Test registered rules are evaluated before the built-in ones."""
+        assert classifier.classify_one([1883, 502], [])[0] == DeviceType.IOT_GATEWAY
+
+        classifier.register_signatures([
+            PortSignature(DeviceType.IOT_SENSOR, all_ports={502}, confidence=0.9, name="modbus")
+        ])
+        assert classifier.classify_one([1883, 502], [])[0] == DeviceType.IOT_SENSOR
+
+        classifier.clear_registered_signatures()
+        assert classifier.classify_one([1883, 502], [])[0] == DeviceType.IOT_GATEWAY
+
+    def test_classify_devices(self, classifier):
+        """Test devices are updated in place."""
+        devices = [
+            Device(ip_address="10.0.0.1", ports=[554, 8000], services=["HTTP"]),
+            Device(ip_address="10.0.0.2", ports=[9999]),
+        ]
+
+        classifier.classify_devices(devices)
+
+        assert devices[0].device_type == DeviceType.CAMERA
+        assert devices[0].metadata['classification_confidence'] == 0.75
+        assert devices[1].device_type == DeviceType.UNKNOWN
+        assert devices[1].metadata['classification_confidence'] == 0.0
+
+
+class ModbusPlugin(DiscoveryPlugin):
+    """Plugin contributing a classification rule."""
+
+    async def initialize(self) -> None:
+        pass
+
+    async def discover(self, **kwargs):
+        pass
+
+    async def cleanup(self) -> None:
+        pass
+
+    def get_classification_rules(self):
+        return [PortSignature(DeviceType.IOT_SENSOR, all_ports={502}, name="modbus")]
+
+
+class TestPluginClassificationRules:
+    """Test collecting rules from plugins."""
+
+    async def test_collects_rules_from_active_plugins(self):
+        """Test only active plugins contribute rules."""
+        manager = PluginManager([], enable_hot_reload=False)
+        active = ModbusPlugin(PluginConfig(plugin_name="modbus"))
+        active.status = PluginStatus.ACTIVE
+        inactive = ModbusPlugin(PluginConfig(plugin_name="inactive"))
+        await manager.registry.swap_plugin("modbus", active)
+        await manager.registry.swap_plugin("inactive", inactive)
+
+        rules = await manager.get_classification_rules()
+
+        assert [rule.name for rule in rules] == ["modbus"]
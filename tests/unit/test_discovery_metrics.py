@@ -0,0 +1,161 @@
+"""
+Unit tests for discovery Prometheus metrics.
+"""
+
+import socket
+import urllib.request
+from unittest.mock import Mock
+
+import pytest
+from prometheus_client import REGISTRY
+
+from edge_device_fleet_manager.discovery.cache import DiscoveryCache
+from edge_device_fleet_manager.discovery.core import (
+    Device, DeviceRegistry, DiscoveryEngine, DiscoveryProtocol, DiscoveryResult
+)
+from edge_device_fleet_manager.discovery.exceptions import RateLimitExceededError
+from edge_device_fleet_manager.discovery.metrics import start_metrics_server
+from edge_device_fleet_manager.discovery.protocols.mdns import MDNSDiscovery
+from edge_device_fleet_manager.discovery.protocols.multicast import (
+    MulticastResponse, NetworkInterface
+)
+from edge_device_fleet_manager.discovery.rate_limiter import RateLimitConfig, RateLimiter
+
+
+def sample(name, **labels):
+    """Current value of a sample on the default registry, 0 if absent."""
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+class StaticProtocol(DiscoveryProtocol):
+    """Protocol returning fixed devices, or failing."""
+
+    def __init__(self, name, devices=(), should_fail=False):
+        super().__init__(name)
+        self.devices = list(devices)
+        self.should_fail = should_fail
+
+    async def discover(self, **kwargs):
+        if self.should_fail:
+            raise RuntimeError("probe failure")
+        result = DiscoveryResult(protocol=self.name)
+        result.devices = list(self.devices)
+        result.duration = 0.2
+        return result
+
+    async def is_available(self):
+        return True
+
+
+class TestEngineMetrics:
+    """Test per-protocol run metrics recorded by the engine."""
+
+    async def test_discover_all_records_runs(self):
+        """Test durations, outcomes and device counts per protocol."""
+        engine = DiscoveryEngine(Mock())
+        engine.register_protocol(StaticProtocol("metrics_ok", [
+            Device(ip_address="10.9.0.1"), Device(ip_address="10.9.0.2")
+        ]))
+        engine.register_protocol(StaticProtocol("metrics_bad", should_fail=True))
+
+        before_all = sample("edge_discovery_duration_seconds_count", protocol="all")
+
+        await engine.discover_all()
+
+        assert sample("edge_discovery_duration_seconds_count", protocol="metrics_ok") == 1
+        assert sample("edge_discovery_duration_seconds_sum", protocol="metrics_ok") == pytest.approx(0.2)
+        assert sample("edge_discovery_runs_total", protocol="metrics_ok", outcome="success") == 1
+        assert sample("edge_discovery_runs_total", protocol="metrics_bad", outcome="failure") == 1
+        assert sample("edge_discovery_devices_discovered_total", protocol="metrics_ok") == 2
+        assert sample("edge_discovery_duration_seconds_count", protocol="all") == before_all + 1
+
+    async def test_registry_size(self):
+        """Test the registry gauge follows additions and removals."""
+        registry = DeviceRegistry()
+        device = Device(ip_address="10.9.1.1")
+
+        await registry.add_device(device)
+        await registry.add_device(Device(ip_address="10.9.1.2"))
+        assert sample("edge_discovery_registry_devices") == 2
+
+        await registry.remove_device(device.device_id)
+        assert sample("edge_discovery_registry_devices") == 1
+
+
+class TestProtocolMetrics:
+    """Test probe and response counters in protocols."""
+
+    async def test_mdns_responses(self):
+        """Test mDNS replies are counted as parsed or rejected."""
+        protocol = MDNSDiscovery()
+        interface = NetworkInterface(name="eth0", address="10.0.0.2")
+        before = sample("edge_discovery_responses_parsed_total", protocol="mdns", result="rejected")
+
+        await protocol._collect_responses([MulticastResponse(b"\x00", "10.0.0.9", interface)])
+
+        after = sample("edge_discovery_responses_parsed_total", protocol="mdns", result="rejected")
+        assert after == before + 1
+
+
+class TestRateLimiterMetrics:
+    """Test rate limiter wait and rejection metrics."""
+
+    async def test_wait_observed(self):
+        """Test every granted request records its wait."""
+        limiter = RateLimiter(RateLimitConfig(per_host_limit=100, global_limit=100))
+        before = sample("edge_discovery_rate_limiter_wait_seconds_count")
+
+        await limiter.acquire("10.9.2.1")
+        await limiter.acquire("10.9.2.1")
+
+        assert sample("edge_discovery_rate_limiter_wait_seconds_count") == before + 2
+
+    async def test_rejection_counted(self):
+        """Test timeouts count as rejections by scope."""
+        limiter = RateLimiter(RateLimitConfig(per_host_limit=0.001, global_limit=100))
+        before = sample("edge_discovery_rate_limiter_rejections_total", scope="host")
+
+        with pytest.raises(RateLimitExceededError):
+            await limiter.acquire("10.9.2.2", timeout=0.01)
+
+        assert sample("edge_discovery_rate_limiter_rejections_total", scope="host") == before + 1
+
+
+class TestCacheMetrics:
+    """Test cache lookup metrics."""
+
+    async def test_hits_and_misses(self):
+        """Test lookups are counted and the hit ratio updated."""
+        cache = DiscoveryCache()
+        device = Device(ip_address="10.9.3.1")
+        await cache.cache_device(device)
+        hits = sample("edge_discovery_cache_requests_total", backend="memory", result="hit")
+        misses = sample("edge_discovery_cache_requests_total", backend="memory", result="miss")
+
+        assert await cache.get_device(device.device_id) is not None
+        assert await cache.get_device("missing") is None
+
+        assert sample("edge_discovery_cache_requests_total", backend="memory", result="hit") == hits + 1
+        assert sample("edge_discovery_cache_requests_total", backend="memory", result="miss") == misses + 1
+        assert sample("edge_discovery_cache_hit_ratio", backend="memory") == pytest.approx(
+            (hits + 1) / (hits + misses + 2)
+        )
+
+
+class TestMetricsServer:
+    """Test the /metrics endpoint."""
+
+    def test_serves_metrics(self):
+        """Test the endpoint exposes discovery metrics and starts only once."""
+        with socket.socket() as sock:
+            sock.bind(("127.0.0.1", 0))
+            port = sock.getsockname()[1]
+
+        assert start_metrics_server(port, "127.0.0.1") is True
+        assert start_metrics_server(port, "127.0.0.1") is False
+
+        with urllib.request.urlopen(f"http://127.0.0.1:{port}/metrics", timeout=5) as response:
+            body = response.read().decode()
+
+        assert "edge_discovery_probes_sent_total" in body
+        assert "edge_discovery_registry_devices" in body
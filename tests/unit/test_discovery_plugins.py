@@ -20,7 +20,7 @@ from edge_device_fleet_manager.discovery.plugins.base import (
     DiscoveryPlugin, PluginConfig, PluginStatus, PluginMetadata, PluginError
 )
 from edge_device_fleet_manager.discovery.plugins.manager import (
-    PluginManager, PluginRegistry, PluginLoader
+    PluginManager, PluginRegistry, PluginLoader, PluginWatcher
 )
 from edge_device_fleet_manager.discovery.plugins.decorators import (
     discovery_plugin, plugin_config, plugin_dependency, plugin_hook
@@ -501,6 +501,120 @@ class TestPluginDecorators:
         assert HookedPlugin.on_device_discovered.__plugin_hook__ == "device_discovered"
 
 
+PLUGIN_SOURCE_TEMPLATE = """
+from edge_device_fleet_manager.discovery.core import DiscoveryResult
+from edge_device_fleet_manager.discovery.plugins.base import DiscoveryPlugin
+from edge_device_fleet_manager.discovery.plugins.decorators import discovery_plugin
+
+
+@discovery_plugin(
+    name="file_plugin",
+    version="{version}",
+    description="File based plugin",
+    author="Test Author"
+)
+class FilePlugin(DiscoveryPlugin):
+    async def initialize(self):
+        pass
+
+    async def discover(self, **kwargs):
+        return DiscoveryResult(protocol="file", metadata={{"version": "{version}"}})
+
+    async def cleanup(self):
+        pass
+"""
+
+
+class TestPluginHotReload:
+    """Test debounced, incremental plugin hot reload."""
+    
+    @pytest.fixture
+    def plugin_dir(self, tmp_path):
+        """Create plugin directory containing one plugin file."""
+        plugin_dir = tmp_path / "plugins"
+        plugin_dir.mkdir()
+        (plugin_dir / "file_plugin.py").write_text(PLUGIN_SOURCE_TEMPLATE.format(version="1.0.0"))
+        return plugin_dir
+    
+    @pytest.fixture
+    def plugin_manager(self, plugin_dir):
+        """Create plugin manager over the plugin directory."""
+        return PluginManager([str(plugin_dir)], enable_hot_reload=False)
+    
+    async def test_unchanged_file_is_not_reimported(self, plugin_manager, plugin_dir):
+        """Test reload is skipped when the file content hash is unchanged."""
+        await plugin_manager.initialize()
+        plugin = await plugin_manager.load_plugin("file_plugin")
+        
+        with patch.object(plugin_manager.loader, "_load_plugin_file") as load_file:
+            await plugin_manager.reload_plugin_file(plugin_dir / "file_plugin.py")
+            await plugin_manager.discover_plugins()
+        
+        load_file.assert_not_called()
+        assert await plugin_manager.get_plugin("file_plugin") is plugin
+    
+    async def test_changed_file_swaps_instance(self, plugin_manager, plugin_dir):
+        """Test a changed file installs a new instance and unloads the old one."""
+        await plugin_manager.initialize()
+        old_plugin = await plugin_manager.load_plugin("file_plugin")
+        await old_plugin.activate()
+        
+        (plugin_dir / "file_plugin.py").write_text(PLUGIN_SOURCE_TEMPLATE.format(version="2.0.0"))
+        await plugin_manager.reload_plugin_file(plugin_dir / "file_plugin.py")
+        
+        new_plugin = await plugin_manager.get_plugin("file_plugin")
+        assert new_plugin is not old_plugin
+        assert new_plugin.status == PluginStatus.ACTIVE
+        assert old_plugin.status == PluginStatus.UNLOADED
+        
+        result = await new_plugin.discover()
+        assert result.metadata["version"] == "2.0.0"
+    
+    async def test_broken_edit_keeps_previous_instance(self, plugin_manager, plugin_dir):
+        """Test a file that fails to import leaves the old instance in service."""
+        await plugin_manager.initialize()
+        old_plugin = await plugin_manager.load_plugin("file_plugin")
+        
+        (plugin_dir / "file_plugin.py").write_text("this is not python")
+        await plugin_manager.reload_plugin_file(plugin_dir / "file_plugin.py")
+        
+        assert await plugin_manager.get_plugin("file_plugin") is old_plugin
+        assert old_plugin.status == PluginStatus.LOADED
+    
+    async def test_watcher_debounces_event_bursts(self, plugin_dir):
+        """Test several events for one path trigger a single reload."""
+        manager = Mock()
+        manager.reload_plugin_file = AsyncMock()
+        manager.discover_new_plugins = AsyncMock()
+        watcher = PluginWatcher(manager, debounce_delay=0.05, loop=asyncio.get_running_loop())
+        
+        event = Mock(is_directory=False, src_path=str(plugin_dir / "file_plugin.py"))
+        for _ in range(5):
+            watcher.on_modified(event)
+        
+        await asyncio.sleep(0.02)
+        assert watcher.pending_count == 1
+        
+        await asyncio.sleep(0.1)
+        manager.reload_plugin_file.assert_awaited_once_with(Path(event.src_path))
+        manager.discover_new_plugins.assert_not_called()
+    
+    async def test_watcher_created_then_modified_is_discovery(self, plugin_dir):
+        """Test a create followed by writes is handled as a new plugin file."""
+        manager = Mock()
+        manager.reload_plugin_file = AsyncMock()
+        manager.discover_new_plugins = AsyncMock()
+        watcher = PluginWatcher(manager, debounce_delay=0.05, loop=asyncio.get_running_loop())
+        
+        event = Mock(is_directory=False, src_path=str(plugin_dir / "new_plugin.py"))
+        watcher.on_created(event)
+        watcher.on_modified(event)
+        
+        await asyncio.sleep(0.1)
+        manager.discover_new_plugins.assert_awaited_once()
+        manager.reload_plugin_file.assert_not_called()
+
+
 class TestPluginIntegration:
     """Test plugin system integration."""
     
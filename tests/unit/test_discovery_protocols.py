@@ -17,9 +17,14 @@ from edge_device_fleet_manager.discovery.protocols.ssdp import (
     SSDPDiscovery, SSDPMessage, UPnPDeviceParser
 )
 from edge_device_fleet_manager.discovery.protocols.network_scan import (
-    NetworkScanDiscovery, PortScanner, ServiceIdentifier, NetworkDiscovery
+    NetworkScanDiscovery, PortScanner, ServiceIdentifier, NetworkDiscovery,
+    NeighborEntry, NeighborTable
+)
+from edge_device_fleet_manager.discovery.protocols.multicast import (
+    MulticastResponse, MulticastSweep, NetworkInterface, enumerate_interfaces
 )
 from edge_device_fleet_manager.discovery.core import DeviceType, DeviceStatus
+from edge_device_fleet_manager.discovery.classification import PortSignature
 
 
 class TestMDNSQuery:
@@ -44,6 +49,14 @@ class TestMDNSQuery:
         assert authority == 0x0000
         assert additional == 0x0000
     
+    def test_build_query_unicast_response(self):
+        """Test the QU bit is set when a unicast response is requested."""
+        query = MDNSQuery.build_query("_http._tcp.local.", unicast_response=True)
+        
+        query_type, query_class = struct.unpack('!HH', query[-4:])
+        assert query_type == 12
+        assert query_class == 0x8001
+    
     def test_encode_domain_name(self):
         """Test domain name encoding."""
         encoded = MDNSQuery._encode_domain_name("_http._tcp.local.")
@@ -161,6 +174,99 @@ class TestMDNSDiscovery:
                 assert isinstance(result.devices, list)
 
 
+class TestMulticastSweep:
+    """Test per-interface concurrent multicast queries."""
+    
+    @pytest.fixture
+    async def responder(self):
+        """UDP responder on loopback standing in for a multicast group."""
+        loop = asyncio.get_running_loop()
+        
+        class Echo(asyncio.DatagramProtocol):
+            def connection_made(self, transport):
+                self.transport = transport
+            
+            def datagram_received(self, data, addr):
+                self.transport.sendto(b"reply:" + data, addr)
+        
+        transport, _ = await loop.create_datagram_endpoint(Echo, local_addr=("127.0.0.1", 0))
+        yield transport.get_extra_info("sockname")[1]
+        transport.close()
+    
+    def test_enumerate_interfaces_filters_by_name(self):
+        """Test interface selection by name."""
+        interfaces = enumerate_interfaces(names=["lo"], include_loopback=True)
+        
+        assert all(interface.name == "lo" for interface in interfaces)
+        assert all(interface.address for interface in interfaces)
+    
+    def test_enumerate_interfaces_warns_about_unknown_names(self):
+        """Test requested names that match no interface are reported."""
+        with patch("edge_device_fleet_manager.discovery.protocols.multicast.logger") as logger:
+            interfaces = enumerate_interfaces(names=["no-such-if0"])
+        
+        assert interfaces == []
+        logger.warning.assert_called_once()
+        assert logger.warning.call_args.kwargs["missing"] == ["no-such-if0"]
+    
+    async def test_query_tags_responses_with_interface(self, responder):
+        """Test each interface gets its own endpoint and tagged replies."""
+        sweep = MulticastSweep("127.0.0.1", responder)
+        interfaces = [
+            NetworkInterface("vlan10", "127.0.0.1"),
+            NetworkInterface("vlan20", "127.0.0.1"),
+        ]
+        
+        responses = await sweep.query([b"q1", b"q2"], timeout=0.2, interfaces=interfaces)
+        
+        assert len(responses) == 4
+        assert {r.interface.name for r in responses} == {"vlan10", "vlan20"}
+        assert all(r.source_ip == "127.0.0.1" for r in responses)
+        assert {r.data for r in responses} == {b"reply:q1", b"reply:q2"}
+    
+    async def test_interfaces_share_one_timeout_window(self, responder):
+        """Test interfaces are queried concurrently rather than one after another."""
+        sweep = MulticastSweep("127.0.0.1", responder)
+        interfaces = [NetworkInterface(f"vlan{i}", "127.0.0.1") for i in range(8)]
+        
+        start = asyncio.get_running_loop().time()
+        await sweep.query([b"q"], timeout=0.2, interfaces=interfaces)
+        elapsed = asyncio.get_running_loop().time() - start
+        
+        assert elapsed < 0.2 * 2
+    
+    async def test_unbindable_interface_is_skipped(self, responder):
+        """Test an interface that cannot be bound does not fail the sweep."""
+        sweep = MulticastSweep("127.0.0.1", responder)
+        interfaces = [
+            NetworkInterface("good", "127.0.0.1"),
+            NetworkInterface("gone", "203.0.113.77"),
+        ]
+        
+        responses = await sweep.query([b"q"], timeout=0.1, interfaces=interfaces)
+        
+        assert [r.interface.name for r in responses] == ["good"]
+
+
+class TestMDNSInterfaceTagging:
+    """Test mDNS devices are tagged with their interface."""
+    
+    async def test_collect_responses_tags_interface(self):
+        """Test devices carry the interface the response arrived on."""
+        header = struct.pack('!HHHHHH', 0, 0x8000, 0, 1, 0, 0)
+        name = b'\x04test\x05local\x00'
+        record = struct.pack('!HHIH', 1, 1, 300, 4) + b'\xc0\xa8\x0a\x05'
+        interface = NetworkInterface("vlan10", "192.168.10.1", 3)
+        
+        devices = await MDNSDiscovery()._collect_responses([
+            MulticastResponse(header + name + record, "192.168.10.5", interface)
+        ])
+        
+        assert len(devices) == 1
+        assert devices[0].metadata["interface"] == "vlan10"
+        assert devices[0].metadata["interface_address"] == "192.168.10.1"
+
+
 class TestSSDPMessage:
     """Test SSDP message handling."""
     
@@ -278,6 +384,27 @@ class TestSSDPDiscovery:
             assert result.success is False
             assert result.error == "SSDP not available"
     
+    async def test_discover_targets_tags_interface(self, ssdp_discovery):
+        """Test SSDP responses carry their interface."""
+        reply = MulticastResponse(
+            b"HTTP/1.1 200 OK\r\nLOCATION: http://192.168.20.9/desc.xml\r\nST: upnp:rootdevice\r\n\r\n",
+            "192.168.20.9",
+            NetworkInterface("vlan20", "192.168.20.1")
+        )
+        
+        with patch.object(ssdp_discovery.sweep, 'query', return_value=[reply]) as mock_query:
+            responses = await ssdp_discovery._discover_targets(["upnp:rootdevice", "ssdp:all"])
+        
+        # All targets go out in a single sweep
+        assert len(mock_query.call_args[0][0]) == 2
+        assert responses[0]['_interface'] == "vlan20"
+        
+        with patch.object(UPnPDeviceParser, 'fetch_device_description', return_value=None):
+            device = await ssdp_discovery._create_device_from_response(responses[0])
+        
+        assert device.metadata['interface'] == "vlan20"
+        assert device.metadata['interface_address'] == "192.168.20.1"
+    
     def test_determine_device_type(self, ssdp_discovery):
         """Test device type determination."""
         test_cases = [
@@ -401,6 +528,41 @@ class TestNetworkDiscovery:
                 assert any('192.168.1.0/24' in net for net in networks)
 
 
+class TestNeighborTable:
+    """Test kernel neighbour table parsing."""
+    
+    def test_parse_proc_arp(self):
+        """Test parsing /proc/net/arp content."""
+        content = (
+            "IP address       HW type     Flags       HW address            Mask     Device\n"
+            "192.168.1.1      0x1         0x2         AA:BB:CC:DD:EE:01     *        eth0\n"
+            "192.168.1.7      0x1         0x0         00:00:00:00:00:00     *        eth0\n"
+        )
+        
+        entries = NeighborTable.parse_proc_arp(content)
+        
+        assert entries["192.168.1.1"].mac_address == "aa:bb:cc:dd:ee:01"
+        assert entries["192.168.1.1"].interface == "eth0"
+        assert entries["192.168.1.1"].is_live is True
+        assert entries["192.168.1.7"].mac_address is None
+        assert entries["192.168.1.7"].is_live is False
+    
+    def test_parse_ip_neigh_json(self):
+        """Test parsing ip -json neigh output with NUD states."""
+        output = (
+            '[{"dst":"10.0.0.1","dev":"eth1","lladdr":"02:00:00:00:00:01","state":["REACHABLE"]},'
+            '{"dst":"10.0.0.2","dev":"eth1","lladdr":"02:00:00:00:00:02","state":["STALE"]},'
+            '{"dst":"10.0.0.3","dev":"eth1","state":["FAILED"]}]'
+        )
+        
+        entries = NeighborTable.parse_ip_neigh_json(output)
+        
+        assert entries["10.0.0.1"].is_live is True
+        assert entries["10.0.0.2"].is_live is False
+        assert entries["10.0.0.2"].mac_address == "02:00:00:00:00:02"
+        assert entries["10.0.0.3"].mac_address is None
+
+
 class TestNetworkScanDiscovery:
     """Test network scanning discovery protocol."""
     
@@ -425,20 +587,107 @@ class TestNetworkScanDiscovery:
                 
                 assert result is True
     
-    def test_determine_device_type(self, network_scan):
-        """Test device type determination from ports."""
-        test_cases = [
-            ([80, 443, 22], ["HTTP", "HTTPS", "SSH"], DeviceType.ROUTER),
-            ([631], ["Printer"], DeviceType.PRINTER),
-            ([1883], ["MQTT"], DeviceType.IOT_GATEWAY),
-            ([554, 8000], ["HTTP"], DeviceType.CAMERA),
-            ([9999], ["Unknown"], DeviceType.UNKNOWN),
-        ]
+    async def test_is_available_without_ping(self, network_scan):
+        """Test ping is only required when hosts are pinged first."""
+        with patch.object(NetworkDiscovery, 'ping_host', return_value=False) as mock_ping:
+            assert await network_scan.is_available() is False
+            assert await network_scan.is_available(ping_first=False) is True
+            
+            network_scan.ping_first = False
+            assert await network_scan.is_available() is True
         
-        for ports, services, expected in test_cases:
-            result = network_scan._determine_device_type(ports, services)
-            assert result == expected
+        mock_ping.assert_called_once()
     
+    async def test_scan_hosts_classifies_in_one_batch(self, network_scan):
+        """Test hosts are classified once, by the batch classifier."""
+        open_ports = {"192.168.1.1": [80, 443, 22], "192.168.1.2": [631]}
+        
+        async def scan_host(ip, ports, **kwargs):
+            return open_ports.get(ip, [])
+        
+        with patch.object(network_scan.port_scanner, 'scan_host', side_effect=scan_host):
+            with patch.object(ServiceIdentifier, 'identify_service', return_value=None):
+                with patch('socket.gethostbyaddr', side_effect=socket.herror):
+                    with patch.object(network_scan.classifier, 'classify_one') as mock_one:
+                        devices = await network_scan._scan_hosts(
+                            ["192.168.1.1", "192.168.1.2", "192.168.1.3"], [80], False
+                        )
+        
+        mock_one.assert_not_called()
+        types = {device.ip_address: device.device_type for device in devices}
+        assert types == {"192.168.1.1": DeviceType.ROUTER, "192.168.1.2": DeviceType.PRINTER}
+        assert all('classification_confidence' in device.metadata for device in devices)
+    
+    async def test_plugin_classification_rules(self, network_scan):
+        """Test rules from the plugin manager are registered with the classifier."""
+        rule = PortSignature(DeviceType.IOT_SENSOR, all_ports={1883, 502}, name="modbus")
+        network_scan.plugin_manager = Mock()
+        network_scan.plugin_manager.get_classification_rules = AsyncMock(return_value=[rule])
+        
+        assert await network_scan.load_classification_rules() == 1
+        assert network_scan.classifier.classify_one([1883, 502], [])[0] == DeviceType.IOT_SENSOR
+        
+        network_scan.plugin_manager.get_classification_rules.return_value = []
+        await network_scan.load_classification_rules()
+        assert network_scan.classifier.classify_one([1883, 502], [])[0] == DeviceType.IOT_GATEWAY
+    
+    async def test_live_neighbor_skips_ping_and_sets_mac(self, network_scan):
+        """Test reachable neighbours are not pinged and get their MAC."""
+        neighbor = NeighborEntry("192.168.1.10", "aa:bb:cc:dd:ee:ff", "eth0", "REACHABLE")
+        
+        with patch.object(NetworkDiscovery, 'ping_host', new_callable=AsyncMock) as mock_ping:
+            with patch.object(network_scan.port_scanner, 'scan_host', return_value=[9999]):
+                with patch.object(ServiceIdentifier, 'identify_service', return_value=None):
+                    with patch('socket.gethostbyaddr', side_effect=socket.herror):
+                        device = await network_scan._scan_single_host(
+                            "192.168.1.10", [9999], True, neighbor
+                        )
+        
+        mock_ping.assert_not_called()
+        assert device.mac_address == "aa:bb:cc:dd:ee:ff"
+        assert device.metadata["interface"] == "eth0"
+    
+    async def test_stale_neighbor_is_pinged(self, network_scan):
+        """Test stale neighbours still go through the liveness check."""
+        neighbor = NeighborEntry("192.168.1.10", "aa:bb:cc:dd:ee:ff", "eth0", "STALE")
+        
+        with patch.object(NetworkDiscovery, 'ping_host', return_value=False) as mock_ping:
+            device = await network_scan._scan_single_host("192.168.1.10", [80], True, neighbor)
+        
+        mock_ping.assert_called_once()
+        assert device is None
+    
+    async def test_discover_reports_prefiltered_hosts(self, network_scan):
+        """Test discovery seeds liveness from the neighbour table."""
+        neighbors = {
+            "192.168.1.1": NeighborEntry("192.168.1.1", "aa:bb:cc:dd:ee:01", "eth0", "REACHABLE"),
+            "192.168.1.2": NeighborEntry("192.168.1.2", "aa:bb:cc:dd:ee:02", "eth0", "STALE"),
+        }
+        
+        with patch.object(network_scan, 'is_available', return_value=True):
+            with patch.object(NeighborTable, 'read', return_value=neighbors):
+                with patch.object(network_scan, '_scan_hosts', return_value=[]) as mock_scan:
+                    result = await network_scan.discover(networks=["192.168.1.0/30"])
+        
+        assert result.metadata["pings_skipped"] == 1
+        assert mock_scan.call_args[0][3] is neighbors
+
+    async def test_discover_uses_instance_defaults(self, network_scan):
+        """Test networks, ports and ping behaviour default to instance settings."""
+        network_scan.networks = ["10.9.0.0/30"]
+        network_scan.ports = [1883]
+        network_scan.ping_first = False
+        network_scan.use_neighbor_table = False
+
+        with patch.object(network_scan, 'is_available', return_value=True):
+            with patch.object(network_scan, '_scan_hosts', return_value=[]) as mock_scan:
+                await network_scan.discover()
+
+        ips, ports, ping_first, _ = mock_scan.call_args[0]
+        assert ips == ["10.9.0.1", "10.9.0.2"]
+        assert ports == [1883]
+        assert ping_first is False
+
     async def test_discover_no_networks(self, network_scan):
         """Test discovery with no valid networks."""
         with patch.object(network_scan, 'is_available', return_value=True):
@@ -209,6 +209,15 @@ class MockDiscoveryEngine:
         self.result = DiscoveryResult(protocol="mock", success=True)
         self.delay = 0
         self.should_fail = False
+        self.started = False
+    
+    async def start(self):
+        """Mock start method."""
+        self.started = True
+    
+    async def stop(self):
+        """Mock stop method."""
+        self.started = False
     
     async def discover_all(self, protocols):
         """Mock discover all method."""
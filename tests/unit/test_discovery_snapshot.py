@@ -0,0 +1,220 @@
+"""
+Unit tests for registry warm-start snapshots.
+
+Tests RegistrySnapshotStore persistence, RegistrySnapshotter
+incremental snapshots, compaction and restore, and the discovery
+engine's warm start.
+"""
+
+import asyncio
+import sqlite3
+import pytest
+
+from edge_device_fleet_manager.core.config import Config, DiscoveryConfig
+from edge_device_fleet_manager.discovery.core import (
+    Device, DeviceRegistry, DeviceStatus, DeviceType, DiscoveryEngine
+)
+from edge_device_fleet_manager.discovery.scheduling import DiscoveryScheduler, ScheduleConfig
+from edge_device_fleet_manager.discovery.snapshot import (
+    RegistrySnapshotStore, RegistrySnapshotter
+)
+
+
+def make_device(index: int, **kwargs) -> Device:
+    """Create a test device with a unique IP address."""
+    return Device(
+        ip_address=f"10.0.{index // 256}.{index % 256}",
+        discovery_protocol="network_scan",
+        **kwargs
+    )
+
+
+class TestRegistrySnapshotStore:
+    """Test SQLite snapshot storage."""
+
+    @pytest.fixture
+    def store(self, tmp_path):
+        """Create snapshot store in a temporary directory."""
+        return RegistrySnapshotStore(tmp_path / "registry.db")
+
+    def test_round_trip(self, store):
+        """Test devices survive a write and read unchanged."""
+        device = make_device(
+            1,
+            name="Camera",
+            device_type=DeviceType.CAMERA,
+            mac_address="aa:bb:cc:dd:ee:ff",
+            ports=[80, 554],
+            services=["HTTP", "RTSP"],
+            capabilities={"ptz": True},
+            metadata={"vendor": "Acme"},
+            status=DeviceStatus.ONLINE
+        )
+
+        store.write([store.serialize(device)], full=True)
+        restored = store.read()
+
+        assert len(restored) == 1
+        assert restored[0].to_dict() == device.to_dict()
+
+    def test_empty_collections_stored_as_null(self, store):
+        """Test empty collections are not JSON encoded."""
+        store.write([store.serialize(make_device(1))], full=True)
+
+        conn = sqlite3.connect(str(store.path))
+        row = conn.execute("SELECT ports, services, capabilities, metadata FROM devices").fetchone()
+        conn.close()
+
+        assert row == (None, None, None, None)
+        restored = store.read()[0]
+        assert restored.ports == []
+        assert restored.capabilities == {}
+
+    def test_missing_file_reads_empty(self, store):
+        """Test reading a snapshot that was never written."""
+        assert store.read() == []
+
+    def test_delta_write_applies_removals(self, store):
+        """Test delta writes upsert and delete individual rows."""
+        first, second = make_device(1), make_device(2)
+        store.write([store.serialize(first), store.serialize(second)], full=True)
+
+        first.hostname = "renamed"
+        store.write([store.serialize(first)], removed_ids=[second.device_id])
+
+        restored = store.read()
+        assert [d.device_id for d in restored] == [first.device_id]
+        assert restored[0].hostname == "renamed"
+
+
+class TestRegistrySnapshotter:
+    """Test periodic snapshots and warm start."""
+
+    @pytest.fixture
+    def registry(self):
+        """Create a device registry."""
+        return DeviceRegistry()
+
+    @pytest.fixture
+    def snapshot_path(self, tmp_path):
+        """Snapshot file path."""
+        return tmp_path / "registry.db"
+
+    async def test_restore_marks_devices_unverified(self, registry, snapshot_path):
+        """Test restored devices are unverified until seen by a sweep."""
+        for i in range(3):
+            await registry.add_device(make_device(i, status=DeviceStatus.ONLINE))
+        await RegistrySnapshotter(registry, snapshot_path).snapshot()
+
+        warm_registry = DeviceRegistry()
+        restored = await RegistrySnapshotter(warm_registry, snapshot_path).restore()
+
+        assert restored == 3
+        unverified = await warm_registry.get_unverified_devices()
+        assert len(unverified) == 3
+        assert all(d.status == DeviceStatus.UNKNOWN for d in unverified)
+
+        # A sweep seeing the device confirms it
+        await warm_registry.add_device(make_device(0))
+        assert len(await warm_registry.get_unverified_devices()) == 2
+        confirmed = await warm_registry.get_device_by_ip(make_device(0).ip_address)
+        assert confirmed.verified is True
+        assert confirmed.status == DeviceStatus.ONLINE
+
+    async def test_incremental_snapshot_writes_only_changes(self, registry, snapshot_path):
+        """Test only changed devices are written after the first snapshot."""
+        snapshotter = RegistrySnapshotter(registry, snapshot_path)
+        for i in range(5):
+            await registry.add_device(make_device(i))
+        assert await snapshotter.snapshot() == 5
+
+        # Nothing changed
+        assert await snapshotter.snapshot() == 0
+
+        await registry.add_device(make_device(5))
+        device = await registry.get_device_by_ip(make_device(1).ip_address)
+        await registry.remove_device(device.device_id)
+
+        assert await snapshotter.snapshot() == 1
+        restored = snapshotter.store.read()
+        assert len(restored) == 5
+        assert device.device_id not in {d.device_id for d in restored}
+
+    async def test_compaction_rewrites_snapshot(self, registry, snapshot_path):
+        """Test every Nth snapshot is a full rewrite."""
+        snapshotter = RegistrySnapshotter(registry, snapshot_path, compact_every=2)
+        await registry.add_device(make_device(0))
+        await snapshotter.snapshot()
+
+        for i in range(1, 3):
+            await registry.add_device(make_device(i))
+            await snapshotter.snapshot()
+
+        await registry.add_device(make_device(3))
+        assert await snapshotter.snapshot() == 4
+
+    async def test_periodic_snapshots_and_final_flush(self, registry, snapshot_path):
+        """Test the background task snapshots and stop() flushes."""
+        snapshotter = RegistrySnapshotter(registry, snapshot_path, interval=0.01)
+        await snapshotter.start()
+        await registry.add_device(make_device(0))
+        await asyncio.sleep(0.05)
+
+        await registry.add_device(make_device(1))
+        await snapshotter.stop()
+
+        assert snapshotter.snapshot_count >= 1
+        assert len(snapshotter.store.read()) == 2
+
+    async def test_restore_skips_devices_already_present(self, registry, snapshot_path):
+        """Test live registry entries win over snapshot entries."""
+        await registry.add_device(make_device(0, hostname="old"))
+        await RegistrySnapshotter(registry, snapshot_path).snapshot()
+
+        warm_registry = DeviceRegistry()
+        await warm_registry.add_device(make_device(0, hostname="live"))
+        restored = await RegistrySnapshotter(warm_registry, snapshot_path).restore()
+
+        assert restored == 0
+        device = await warm_registry.get_device_by_ip(make_device(0).ip_address)
+        assert device.hostname == "live"
+        assert device.verified is True
+
+
+class TestEngineSnapshots:
+    """Test the engine's startup and shutdown path restores and flushes snapshots."""
+
+    @pytest.fixture
+    def config(self, tmp_path):
+        """Create a config with snapshots enabled."""
+        return Config(discovery=DiscoveryConfig(
+            snapshot_path=str(tmp_path / "registry.db"), snapshot_interval=60
+        ))
+
+    async def test_scheduler_restores_and_flushes(self, config):
+        """Test the snapshot is loaded before the first sweep and written on stop."""
+        engine = DiscoveryEngine(config)
+        scheduler = DiscoveryScheduler(engine, ScheduleConfig(enabled=False, max_concurrent_jobs=1))
+        await scheduler.start()
+        assert engine.snapshotter.get_statistics()["running"] is True
+
+        for i in range(3):
+            await engine.registry.add_device(make_device(i))
+        await scheduler.stop()
+        assert engine.snapshotter.get_statistics()["running"] is False
+        assert len(engine.snapshotter.store.read()) == 3
+
+        # A restarted engine serves the fleet before any sweep
+        restarted = DiscoveryEngine(config)
+        await restarted.start()
+        devices = await restarted.get_devices()
+        assert len(devices) == 3
+        assert all(not device.verified for device in devices)
+        await restarted.stop()
+
+    async def test_snapshots_disabled_without_path(self):
+        """Test the engine starts without a snapshotter when no path is configured."""
+        engine = DiscoveryEngine(Config())
+        await engine.start()
+        assert engine.snapshotter is None
+        await engine.stop()
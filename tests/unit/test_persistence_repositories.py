@@ -5,18 +5,44 @@ Tests the repository pattern implementation including CRUD operations,
 query optimization, transaction management, and business logic.
 """
 
+import asyncio
 import pytest
+import random
 import uuid
 from datetime import datetime, timezone, timedelta
 from unittest.mock import AsyncMock, MagicMock, patch
 
+from sqlalchemy import Column, DateTime, Float, Integer, String, func, select
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import declarative_base
+
 from edge_device_fleet_manager.persistence.repositories.base import (
     BaseRepository, RepositoryError
 )
 from edge_device_fleet_manager.persistence.repositories.device import DeviceRepository
+from edge_device_fleet_manager.persistence.repositories.device_cache import DeviceCache
+from edge_device_fleet_manager.persistence.repositories.device_spatial import (
+    DeviceSpatialIndex, SpatialBackend
+)
+from edge_device_fleet_manager.persistence.repositories.alert import AlertRepository
+from edge_device_fleet_manager.persistence.repositories.device_group import (
+    MAX_HIERARCHY_DEPTH, DeviceGroupRepository
+)
+from edge_device_fleet_manager.persistence.repositories.dynamic_groups import DynamicGroupEngine
+from edge_device_fleet_manager.persistence.repositories.search import (
+    SearchBackend, SearchIndexManager, create_statements
+)
+from edge_device_fleet_manager.persistence.migrations import search_indexes
+from edge_device_fleet_manager.persistence.repositories.summary_cache import SummaryCache
+from edge_device_fleet_manager.persistence.models.alert import Alert, AlertSeverity, AlertStatus
+from edge_device_fleet_manager.persistence.repositories.retention import RetentionExecutor
 from edge_device_fleet_manager.persistence.models.device import (
     Device, DeviceStatus, DeviceType
 )
+from edge_device_fleet_manager.persistence.models.device_group import DeviceGroup, DeviceGroupMembership
+from edge_device_fleet_manager.persistence.models.user import User
+from edge_device_fleet_manager.persistence.models.geo import cell_ranges, encode_geohash, haversine_km
 
 
 class TestBaseRepository:
@@ -334,27 +360,6 @@ class TestBaseRepository:
         assert len(mock_session.refresh.call_args_list) == 3
         assert result == mock_instances
     
-    @pytest.mark.asyncio
-    async def test_bulk_update(self, repository, mock_session):
-        """Test bulk record update."""
-        # Setup
-        updates = [
-            {"id": uuid.uuid4(), "name": "Updated 1"},
-            {"id": uuid.uuid4(), "name": "Updated 2"}
-        ]
-        
-        mock_result = MagicMock()
-        mock_result.rowcount = 1
-        mock_session.execute.return_value = mock_result
-        
-        # Execute
-        result = await repository.bulk_update(updates)
-        
-        # Verify
-        assert mock_session.execute.call_count == 2
-        mock_session.flush.assert_called_once()
-        assert result == 2
-    
     @pytest.mark.asyncio
     async def test_search(self, repository, mock_session, mock_model):
         """Test text search functionality."""
@@ -377,6 +382,233 @@ class TestBaseRepository:
         assert result == mock_instances
 
 
+
+BulkBase = declarative_base()
+
+
+class Reading(BulkBase):
+    """SQLite-compatible model for exercising Core bulk paths."""
+    __tablename__ = "bulk_readings"
+    
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    name = Column(String(50), nullable=False)
+    value = Column("reading_value", Float, nullable=True)
+    created_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc))
+    updated_at = Column(DateTime(timezone=True), nullable=True)
+
+
+class Counter(BulkBase):
+    """Model with a database-generated primary key."""
+    __tablename__ = "bulk_counters"
+    
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    name = Column(String(50))
+
+
+class TestCoreBulkOperations:
+    """Test the Core bulk insert and update paths against SQLite."""
+    
+    @pytest.fixture
+    async def session(self, sqlite_db):
+        """Create a session on a database with the bulk test tables."""
+        await sqlite_db.create_tables(BulkBase.metadata)
+        async with sqlite_db.sessions() as session:
+            yield session
+    
+    @pytest.mark.asyncio
+    async def test_returns_client_generated_ids(self, session):
+        """Test IDs are returned in order and defaults are applied."""
+        repository = BaseRepository(session, Reading)
+        
+        ids = await repository.bulk_insert(
+            [{"name": f"r{i}", "value": float(i)} for i in range(25)],
+            chunk_size=10
+        )
+        
+        assert len(ids) == 25
+        stored = (await session.execute(select(Reading).where(Reading.id == ids[7]))).scalar_one()
+        assert stored.name == "r7"
+        assert stored.value == 7.0
+        assert stored.created_at is not None
+    
+    @pytest.mark.asyncio
+    async def test_returns_database_generated_ids(self, session):
+        """Test RETURNING maps generated keys back to input order."""
+        repository = BaseRepository(session, Counter)
+        
+        ids = await repository.bulk_insert(
+            [{"name": "a"}, {"name": "b"}, {"id": 100, "name": "c"}, {"name": "d"}]
+        )
+        
+        rows = dict((await session.execute(select(Counter.id, Counter.name))).all())
+        assert [rows[pk] for pk in ids] == ["a", "b", "c", "d"]
+        assert ids[2] == 100
+    
+    @pytest.mark.asyncio
+    async def test_unknown_field(self, session):
+        """Test fields that do not map to columns are rejected."""
+        repository = BaseRepository(session, Reading)
+        
+        with pytest.raises(RepositoryError):
+            await repository.bulk_insert([{"name": "x", "bogus": 1}])
+    
+    @pytest.mark.asyncio
+    async def test_empty(self, session):
+        """Test an empty input does nothing."""
+        assert await BaseRepository(session, Reading).bulk_insert([]) == []
+    
+    @pytest.mark.asyncio
+    async def test_bulk_update_groups(self, session):
+        """Test updates are grouped by changed columns and counted per group."""
+        repository = BaseRepository(session, Reading)
+        ids = await repository.bulk_insert([{"name": f"r{i}", "value": 0.0} for i in range(30)])
+        
+        updates = (
+            [{"id": pk, "value": 1.0} for pk in ids[:20]]
+            + [{"id": pk, "name": "renamed", "value": 2.0} for pk in ids[20:]]
+            + [{"id": uuid.uuid4(), "value": 3.0}, {"name": "no id"}]
+        )
+        counts = await repository.bulk_update_grouped(updates, chunk_size=7)
+        
+        assert counts == {
+            ("reading_value", "updated_at"): 20,
+            ("name", "reading_value", "updated_at"): 10,
+        }
+        stored = (await session.execute(select(Reading).where(Reading.id == ids[25]))).scalar_one()
+        assert (stored.name, stored.value) == ("renamed", 2.0)
+        assert stored.updated_at is not None
+        assert await repository.bulk_update([{"id": ids[0], "value": 9.0}]) == 1
+    
+    @pytest.mark.asyncio
+    async def test_bulk_update_last_write_wins(self, session):
+        """Test a repeated ID keeps its last update."""
+        repository = BaseRepository(session, Reading)
+        ids = await repository.bulk_insert([{"name": "r", "value": 0.0}])
+        
+        count = await repository.bulk_update([
+            {"id": ids[0], "value": 1.0}, {"id": ids[0], "value": 2.0}
+        ])
+        
+        assert count == 1
+        assert (await session.execute(select(Reading.value))).scalar_one() == 2.0
+
+class TestRetentionExecutor:
+    """Test chunked retention deletes against SQLite."""
+    
+    @pytest.fixture
+    async def session(self, sqlite_db):
+        """Create a session on a database with the bulk test tables."""
+        await sqlite_db.create_tables(BulkBase.metadata)
+        async with sqlite_db.sessions() as session:
+            yield session
+    
+    @pytest.mark.asyncio
+    async def test_purge_in_batches(self, session):
+        """Test only matching rows are deleted, in committed batches."""
+        repository = BaseRepository(session, Reading)
+        await repository.bulk_insert([{"name": "old", "value": float(i)} for i in range(25)])
+        await repository.bulk_insert([{"name": "new", "value": float(i)} for i in range(5)])
+        await session.commit()
+        reports = []
+        
+        executor = RetentionExecutor(session, batch_size=10, pause_seconds=0,
+                                     progress_callback=lambda p: reports.append(p.deleted))
+        progress = await executor.purge(Reading, Reading.name == "old")
+        
+        assert (progress.deleted, progress.batches, progress.completed) == (25, 3, True)
+        assert reports == [10, 20, 25]
+        assert progress.rows_per_second > 0
+        names = (await session.execute(select(Reading.name))).scalars().all()
+        assert names == ["new"] * 5
+    
+    @pytest.mark.asyncio
+    async def test_resume_from(self, session):
+        """Test a resumed run skips keys at or below the last processed key."""
+        repository = BaseRepository(session, Reading)
+        ids = sorted(await repository.bulk_insert([{"name": "old"} for _ in range(6)]))
+        await session.commit()
+        
+        progress = await RetentionExecutor(session, batch_size=4, pause_seconds=0).purge(
+            Reading, Reading.name == "old", resume_from=ids[1]
+        )
+        
+        assert progress.deleted == 4
+        remaining = (await session.execute(select(Reading.id))).scalars().all()
+        assert sorted(remaining) == ids[:2]
+    
+    def test_invalid_settings(self):
+        """Test batch size and pause are validated."""
+        with pytest.raises(ValueError):
+            RetentionExecutor(MagicMock(), batch_size=0)
+        with pytest.raises(ValueError):
+            RetentionExecutor(MagicMock(), pause_seconds=-1)
+
+
+class TestKeysetPagination:
+    """Test cursor pagination against SQLite."""
+    
+    @pytest.fixture
+    async def session(self, sqlite_db):
+        """Create a session on a database with the bulk test tables."""
+        await sqlite_db.create_tables(BulkBase.metadata)
+        async with sqlite_db.sessions() as session:
+            yield session
+    
+    async def walk(self, repository, limit, **kwargs):
+        """Collect every page, returning the items and the page sizes."""
+        items, sizes, cursor = [], [], None
+        while True:
+            page = await repository.get_page(cursor=cursor, limit=limit, **kwargs)
+            items.extend(page.items)
+            sizes.append(len(page))
+            if not page.has_more:
+                return items, sizes
+            cursor = page.next_cursor
+    
+    @pytest.mark.asyncio
+    async def test_mixed_directions_with_nulls(self, session):
+        """Test a mixed-direction sort over a nullable column visits every row once."""
+        repository = BaseRepository(session, Reading)
+        values = [1.0, None, 2.0, 1.0, None, 3.0, 2.0]
+        await repository.bulk_insert(
+            [{"name": f"r{i % 3}", "value": value} for i, value in enumerate(values * 3)]
+        )
+        
+        items, sizes = await self.walk(repository, 4, order_by=["name", ("value", "desc")])
+        
+        assert sizes == [4, 4, 4, 4, 4, 1]
+        assert len({item.id for item in items}) == 21
+        # NULLs sort as the largest value, so first when descending
+        keys = [(item.name, item.value is not None, -(item.value or 0)) for item in items]
+        assert keys == sorted(keys)
+    
+    @pytest.mark.asyncio
+    async def test_row_value_seek_with_filters(self, session):
+        """Test uniform non-null sorts page through filtered rows."""
+        repository = BaseRepository(session, Reading)
+        await repository.bulk_insert([{"name": f"n{i % 5}", "value": float(i)} for i in range(20)])
+        
+        items, sizes = await self.walk(repository, 3, order_by=["-name"], value={"gte": 5.0})
+        
+        assert sizes == [3, 3, 3, 3, 3]
+        assert [item.name for item in items] == sorted((item.name for item in items), reverse=True)
+        assert sorted(item.value for item in items) == [float(i) for i in range(5, 20)]
+    
+    @pytest.mark.asyncio
+    async def test_invalid_cursor(self, session):
+        """Test malformed cursors and cursors from another ordering are rejected."""
+        repository = BaseRepository(session, Reading)
+        await repository.bulk_insert([{"name": "r"} for _ in range(3)])
+        page = await repository.get_page(limit=1, order_by=["name"])
+        
+        with pytest.raises(RepositoryError):
+            await repository.get_page(cursor="not a cursor", order_by=["name"])
+        with pytest.raises(RepositoryError):
+            await repository.get_page(cursor=page.next_cursor, order_by=["-name"])
+        with pytest.raises(RepositoryError):
+            await repository.get_page(order_by=["missing"])
+
+
 class TestDeviceRepository:
     """Test DeviceRepository specific functionality."""
     
@@ -480,31 +712,16 @@ class TestDeviceRepository:
     async def test_get_device_statistics(self, device_repository, mock_session):
         """Test getting device statistics."""
         # Setup
-        # Mock total count
-        total_result = MagicMock()
-        total_result.scalar.return_value = 100
-        
-        # Mock status distribution
-        status_result = MagicMock()
-        status_result.all.return_value = [
-            (DeviceStatus.ONLINE, 80),
-            (DeviceStatus.OFFLINE, 20)
-        ]
-        
-        # Mock type distribution
-        type_result = MagicMock()
-        type_result.all.return_value = [
-            (DeviceType.SENSOR, 60),
-            (DeviceType.GATEWAY, 40)
+        # Mock the single grouped query: status, type, count, scored, sum, min, max
+        grouped_result = MagicMock()
+        grouped_result.all.return_value = [
+            (DeviceStatus.ONLINE, DeviceType.SENSOR, 50, 50, 45.0, 0.2, 1.0),
+            (DeviceStatus.ONLINE, DeviceType.GATEWAY, 30, 30, 25.5, 0.5, 0.95),
+            (DeviceStatus.OFFLINE, DeviceType.SENSOR, 10, 10, 8.5, 0.6, 0.9),
+            (DeviceStatus.OFFLINE, DeviceType.GATEWAY, 10, 10, 6.0, 0.3, 0.8),
         ]
         
-        # Mock health statistics
-        health_result = MagicMock()
-        health_result.first.return_value = (0.85, 0.2, 1.0)
-        
-        mock_session.execute.side_effect = [
-            total_result, status_result, type_result, health_result
-        ]
+        mock_session.execute.return_value = grouped_result
         
         # Execute
         result = await device_repository.get_device_statistics()
@@ -515,9 +732,10 @@ class TestDeviceRepository:
         assert result['status_distribution']['offline'] == 20
         assert result['type_distribution']['sensor'] == 60
         assert result['type_distribution']['gateway'] == 40
-        assert result['health_statistics']['average_health'] == 0.85
+        assert result['health_statistics']['average_health'] == pytest.approx(0.85)
         assert result['health_statistics']['min_health'] == 0.2
         assert result['health_statistics']['max_health'] == 1.0
+        mock_session.execute.assert_called_once()
     
     @pytest.mark.asyncio
     async def test_update_last_seen(self, device_repository):
@@ -549,6 +767,27 @@ class TestDeviceRepository:
         # Verify
         assert result is False
     
+    @pytest.mark.asyncio
+    async def test_update_heartbeat(self, device_repository, mock_session):
+        """Test heartbeats are one UPDATE with the given timestamp."""
+        # Setup
+        device_id = uuid.uuid4()
+        timestamp = datetime.now(timezone.utc)
+        mock_session.execute.return_value = MagicMock(rowcount=1)
+        
+        # Execute
+        result = await device_repository.update_heartbeat(device_id, timestamp)
+        
+        # Verify
+        assert result is True
+        statement, params = mock_session.execute.call_args.args
+        assert params == {'device_id': device_id, 'heartbeat_at': timestamp}
+        
+        # The statement is reused across calls
+        mock_session.execute.return_value = MagicMock(rowcount=0)
+        assert await device_repository.update_heartbeat(uuid.uuid4()) is False
+        assert mock_session.execute.call_args.args[0] is statement
+    
     @pytest.mark.asyncio
     async def test_mark_devices_offline(self, device_repository):
         """Test marking multiple devices offline."""
@@ -587,6 +826,807 @@ class TestDeviceRepository:
         assert result == mock_devices
 
 
+class FakeRedis:
+    """Minimal in-memory stand-in for the redis.asyncio calls the device cache makes."""
+    
+    def __init__(self):
+        self.data = {}
+    
+    async def get(self, key):
+        return self.data.get(key)
+    
+    async def setex(self, key, ttl, value):
+        self.data[key] = value.encode() if isinstance(value, str) else value
+    
+    async def delete(self, *keys):
+        for key in keys:
+            self.data.pop(key, None)
+
+
+class TestDeviceCache:
+    """Test the read-through device cache against SQLite."""
+    
+    @pytest.fixture
+    async def sessions(self, sqlite_db):
+        """Create a factory for sessions on a database holding one device."""
+        await sqlite_db.create_tables(tables=[Device.__table__])
+        async with sqlite_db.sessions() as session:
+            session.add(Device(
+                id=self.device_id, name="sensor-1", device_type=DeviceType.SENSOR,
+                status=DeviceStatus.OFFLINE, ip_address="10.0.0.1", mac_address="aa:bb:cc:dd:ee:01"
+            ))
+            await session.commit()
+        return sqlite_db.sessions
+    
+    device_id = uuid.UUID("6f1c2a9e-3b7d-4e15-9a0c-5d2e8f4b7a61")
+    
+    async def lookup(self, sessions, cache, method="get", value=None):
+        """Look a device up in a fresh session."""
+        async with sessions() as session:
+            repository = DeviceRepository(session, cache)
+            return await getattr(repository, method)(value or self.device_id)
+    
+    @pytest.mark.asyncio
+    async def test_read_through(self, sessions):
+        """Test lookups by ID, IP and MAC are served from the cache after the first load."""
+        cache = DeviceCache()
+        first = await self.lookup(sessions, cache)
+        assert cache.stats.misses == 1
+        
+        by_id = await self.lookup(sessions, cache)
+        by_ip = await self.lookup(sessions, cache, "get_by_ip_address", "10.0.0.1")
+        by_mac = await self.lookup(sessions, cache, "get_by_mac_address", "aa:bb:cc:dd:ee:01")
+        
+        assert cache.stats.local_hits == 3
+        assert by_id is not first
+        assert by_id.name == by_ip.name == by_mac.name == "sensor-1"
+        assert cache.stats.hit_ratio == 0.75
+    
+    @pytest.mark.asyncio
+    async def test_cached_instance_is_attached(self, sessions):
+        """Test cached devices can be modified and flushed like loaded ones."""
+        cache = DeviceCache()
+        await self.lookup(sessions, cache)
+        
+        async with sessions() as session:
+            repository = DeviceRepository(session, cache)
+            device = await repository.get(self.device_id)
+            assert await repository.get(str(self.device_id)) is device
+            device.name = "renamed"
+            await session.commit()
+        
+        async with sessions() as session:
+            assert (await session.get(Device, self.device_id)).name == "renamed"
+    
+    @pytest.mark.asyncio
+    async def test_writes_invalidate(self, sessions):
+        """Test update and heartbeat paths drop the cached device."""
+        cache = DeviceCache()
+        await self.lookup(sessions, cache)
+        
+        async with sessions() as session:
+            await DeviceRepository(session, cache).update(self.device_id, {"name": "updated"})
+            await session.commit()
+        assert (await self.lookup(sessions, cache)).name == "updated"
+        
+        async with sessions() as session:
+            await DeviceRepository(session, cache).update_heartbeat(self.device_id)
+            await session.commit()
+        assert (await self.lookup(sessions, cache)).status == DeviceStatus.ONLINE
+        assert cache.stats.misses == 3
+    
+    @pytest.mark.asyncio
+    async def test_fill_during_write_is_dropped(self, sessions):
+        """Test a reader cannot cache the old row while a write is uncommitted."""
+        cache = DeviceCache()
+        async with sessions() as writer:
+            await DeviceRepository(writer, cache).update(self.device_id, {"name": "pending"})
+            # Another session still sees, and caches, the committed row
+            assert (await self.lookup(sessions, cache)).name == "sensor-1"
+            await writer.commit()
+        
+        assert (await self.lookup(sessions, cache)).name == "pending"
+    
+    @pytest.mark.asyncio
+    async def test_stale_reads_are_detected(self, sessions):
+        """Test verified hits that no longer match the database are counted and reloaded."""
+        cache = DeviceCache(verify_ratio=1.0)
+        await self.lookup(sessions, cache)
+        
+        async with sessions() as session:
+            # Written behind the repository's back, so the cache is not told
+            await session.execute(
+                Device.__table__.update().values(
+                    name="external", updated_at=datetime.now(timezone.utc) + timedelta(minutes=1)
+                )
+            )
+            await session.commit()
+        
+        assert (await self.lookup(sessions, cache)).name == "external"
+        assert (await self.lookup(sessions, cache)).name == "external"
+        assert (cache.stats.verifications, cache.stats.stale_reads) == (2, 1)
+        assert cache.stats.stale_read_ratio == 0.5
+    
+    @pytest.mark.asyncio
+    async def test_shared_redis_tier(self, sessions):
+        """Test caches sharing Redis serve each other's fills and invalidations."""
+        redis = FakeRedis()
+        reader, writer = DeviceCache(redis_client=redis), DeviceCache(redis_client=redis)
+        await self.lookup(sessions, writer)
+        
+        device = await self.lookup(sessions, reader, "get_by_mac_address", "aa:bb:cc:dd:ee:01")
+        assert reader.stats.redis_hits == 1
+        assert device.status == DeviceStatus.OFFLINE
+        assert device.id == self.device_id
+        
+        async with sessions() as session:
+            await DeviceRepository(session, writer).delete(self.device_id)
+            await session.commit()
+        reader.clear()
+        assert await self.lookup(sessions, reader) is None
+
+
+class TestSpatialSearch:
+    """Test location searches through the spatial indexes against SQLite."""
+    
+    # Clusters around Berlin, near the antimeridian and near the north pole
+    centers = [(52.52, 13.405, 50.0), (-16.5, 179.9, 120.0), (89.6, 40.0, 80.0)]
+    
+    @pytest.fixture
+    async def session(self, sqlite_db):
+        """Create a session on a database of scattered located devices."""
+        await sqlite_db.create_tables(tables=[Device.__table__])
+        async with sqlite_db.sessions() as session:
+            await self.seed(session)
+            yield session
+    
+    async def seed(self, session):
+        """Add scattered located devices."""
+        rng = random.Random(7)
+        devices = []
+        for latitude, longitude, _ in self.centers:
+            for i in range(60):
+                lat = latitude + rng.uniform(-2, 2)
+                lon = longitude + rng.uniform(-4, 4)
+                devices.append(Device(
+                    name=f"d{len(devices)}", device_type=DeviceType.SENSOR,
+                    # Reflect points past the pole back onto the globe
+                    latitude=180.0 - lat if lat > 90.0 else lat,
+                    longitude=(lon + 180.0) % 360.0 - 180.0
+                ))
+        devices.append(Device(name="nowhere", device_type=DeviceType.SENSOR))
+        session.add_all(devices)
+        await session.flush()
+    
+    async def expected(self, session, latitude, longitude, radius_km):
+        """Brute-force search, nearest first."""
+        devices = (await session.execute(select(Device).where(Device.latitude.isnot(None)))).scalars().all()
+        nearby = sorted(
+            (haversine_km(latitude, longitude, d.latitude, d.longitude), d.name) for d in devices
+        )
+        return [name for distance, name in nearby if distance <= radius_km]
+    
+    def test_geohash_helpers(self):
+        """Test geohash encoding and cell ranges."""
+        assert encode_geohash(42.605, -5.603, 5) == "ezs42"
+        assert encode_geohash(57.64911, 10.40744, 11) == "u4pruydqqvj"
+        assert cell_ranges(["u4", "u5", "u7"]) == [("u4", "u5zzzzzzz"), ("u7", "u7zzzzzzz")]
+    
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("backend", [SpatialBackend.GEOHASH, SpatialBackend.RTREE])
+    async def test_search_matches_brute_force(self, session, backend):
+        """Test indexed searches find exactly the devices within the radius, in order."""
+        repository = DeviceRepository(session)
+        assert await repository.spatial.backend() is SpatialBackend.GEOHASH
+        if backend is SpatialBackend.RTREE:
+            assert await repository.spatial.ensure() is SpatialBackend.RTREE
+            assert await repository.spatial.backend() is SpatialBackend.RTREE
+        
+        for latitude, longitude, radius_km in self.centers:
+            found = await repository.get_devices_by_location(latitude, longitude, radius_km, limit=1000)
+            expected = await self.expected(session, latitude, longitude, radius_km)
+            assert expected
+            assert [device.name for device in found] == expected
+        
+        page = await repository.get_devices_by_location(*self.centers[0], skip=2, limit=3)
+        assert [device.name for device in page] == (await self.expected(session, *self.centers[0]))[2:5]
+    
+    @pytest.mark.asyncio
+    async def test_rtree_follows_writes(self, session):
+        """Test the R-tree triggers track moved and deleted devices."""
+        repository = DeviceRepository(session)
+        await repository.spatial.ensure()
+        
+        mover = (await session.execute(select(Device).where(Device.name == "nowhere"))).scalar_one()
+        mover.latitude, mover.longitude = 52.5, 13.4
+        await session.flush()
+        assert "nowhere" in [d.name for d in await repository.get_devices_by_location(52.5, 13.4, 1)]
+        
+        await session.execute(Device.__table__.delete().where(Device.__table__.c.id == mover.id))
+        assert "nowhere" not in [d.name for d in await repository.get_devices_by_location(52.5, 13.4, 1)]
+    
+    @pytest.mark.asyncio
+    async def test_geohash_maintained(self, session):
+        """Test ORM writes, bulk inserts and bulk updates keep geohashes current."""
+        repository = DeviceRepository(session)
+        device = (await session.execute(select(Device).where(Device.name == "nowhere"))).scalar_one()
+        assert device.geohash is None
+        
+        device.latitude, device.longitude = 48.1, 11.6
+        await session.flush()
+        assert device.geohash == encode_geohash(48.1, 11.6)
+        
+        await repository.bulk_update_grouped([{'id': device.id, 'latitude': 40.4}])
+        stored = (await session.execute(select(Device.geohash).where(Device.id == device.id))).scalar()
+        assert stored == encode_geohash(40.4, 11.6)
+        
+        await repository.bulk_insert([
+            {'name': 'bulk', 'device_type': DeviceType.SENSOR, 'latitude': 1.5, 'longitude': 2.5}
+        ])
+        stored = (await session.execute(select(Device.geohash).where(Device.name == 'bulk'))).scalar()
+        assert stored == encode_geohash(1.5, 2.5)
+    
+    @pytest.mark.asyncio
+    async def test_fills_missing_geohashes(self, session):
+        """Test ensure() computes geohashes of rows stored without one."""
+        await session.execute(Device.__table__.update().values(geohash=None))
+        repository = DeviceRepository(session)
+        repository.spatial_backend = SpatialBackend.GEOHASH
+        assert await repository.get_devices_by_location(*self.centers[0]) == []
+        
+        await repository.spatial.ensure()
+        found = await repository.get_devices_by_location(*self.centers[0], limit=1000)
+        assert [d.name for d in found] == await self.expected(session, *self.centers[0])
+    
+    def test_postgis_condition(self):
+        """Test the PostGIS condition compiles to an indexable ST_DWithin."""
+        condition = DeviceSpatialIndex(MagicMock()).candidate_condition(
+            SpatialBackend.POSTGIS, 52.5, 13.4, 2.0
+        )
+        sql = str(condition.compile(dialect=postgresql.dialect()))
+        assert "ST_DWithin(CAST(ST_SetSRID(ST_MakePoint(devices.longitude, devices.latitude)" in sql
+        assert "AS geography)" in sql
+
+
+class TestGroupHierarchy:
+    """Test recursive hierarchy queries and hierarchy paths against SQLite."""
+    
+    @pytest.fixture
+    async def session(self, sqlite_db):
+        """Create a session on a site/building/floor/room tree, counting statements."""
+        await sqlite_db.create_tables(tables=[User.__table__, DeviceGroup.__table__, Device.__table__])
+        async with sqlite_db.sessions() as session:
+            await self.seed(session)
+            self.statements = sqlite_db.record_statements()
+            yield session
+    
+    async def seed(self, session):
+        """Build a site/building/floor/room tree with devices."""
+        self.groups = {}
+        site = self.groups['site'] = DeviceGroup(name="site")
+        for b in range(2):
+            building = self.groups[f"b{b}"] = DeviceGroup(name=f"b{b}", parent_group=site)
+            for f in range(2):
+                floor = self.groups[f"b{b}f{f}"] = DeviceGroup(name=f"b{b}f{f}", parent_group=building)
+                room = self.groups[f"b{b}f{f}r"] = DeviceGroup(name=f"b{b}f{f}r", parent_group=floor)
+                session.add(Device(name=f"d{b}{f}", device_type=DeviceType.SENSOR,
+                                   status=DeviceStatus.ONLINE if f else DeviceStatus.OFFLINE,
+                                   device_group=room))
+        session.add(Device(name="lobby", device_type=DeviceType.SENSOR, device_group=site))
+        session.add_all(self.groups.values())
+        await session.flush()
+    
+    @pytest.mark.asyncio
+    async def test_paths_set_on_insert(self, session):
+        """Test hierarchy paths list the IDs from the root down."""
+        room = self.groups['b1f0r']
+        expected = "/" + "/".join(
+            self.groups[name].id.hex for name in ('site', 'b1', 'b1f0', 'b1f0r')
+        ) + "/"
+        assert room.hierarchy_path == expected
+        assert self.groups['site'].is_ancestor_of(room)
+        assert not self.groups['b0'].is_ancestor_of(room)
+    
+    @pytest.mark.asyncio
+    async def test_hierarchy_in_one_query(self, session):
+        """Test ancestors and descendants are each read with one statement."""
+        repository = DeviceGroupRepository(session)
+        
+        hierarchy = await repository.get_group_hierarchy(self.groups['b1f1r'].id)
+        assert [group.name for group in hierarchy] == ['site', 'b1', 'b1f1', 'b1f1r']
+        assert len(self.statements) == 1
+        
+        descendants = await repository.get_descendants(self.groups['b0'].id)
+        assert [group.name for group in descendants] == ['b0f0', 'b0f1', 'b0f0r', 'b0f1r']
+        assert len(self.statements) == 2
+        
+        shallow = await repository.get_descendants(self.groups['site'].id, include_self=True, max_depth=1)
+        assert [group.name for group in shallow] == ['site', 'b0', 'b1']
+        assert [g.name for g in await repository.get_ancestors(self.groups['b0f1'].id)] == ['site', 'b0']
+    
+    @pytest.mark.asyncio
+    async def test_subtree_counts(self, session):
+        """Test subtree device counts are rolled up from one query."""
+        repository = DeviceGroupRepository(session)
+        subtree = await repository.get_subtree(self.groups['site'].id)
+        assert len(self.statements) == 1
+        
+        by_name = {entry['group'].name: entry for entry in subtree}
+        assert by_name['site']['depth'] == 0
+        assert by_name['site']['device_count'] == 1
+        assert by_name['site']['subtree_device_count'] == 5
+        assert by_name['site']['subtree_online_device_count'] == 2
+        assert by_name['b0']['subtree_device_count'] == 2
+        assert by_name['b0f1']['subtree_online_device_count'] == 1
+        assert by_name['b0f1r']['device_count'] == 1
+    
+    @pytest.mark.asyncio
+    async def test_subtree_membership(self, session):
+        """Test subtree checks and ranges use the hierarchy path."""
+        repository = DeviceGroupRepository(session)
+        assert await repository.is_in_subtree(self.groups['b1f0r'].id, self.groups['b1'].id)
+        assert await repository.is_in_subtree(self.groups['b1'].id, self.groups['b1'].id)
+        assert not await repository.is_in_subtree(self.groups['b1f0r'].id, self.groups['b0'].id)
+        assert len(self.statements) == 3
+        
+        ids = await repository.get_subtree_group_ids(self.groups['b1'].id)
+        assert set(ids) == {self.groups[name].id for name in ('b1', 'b1f0', 'b1f1', 'b1f0r', 'b1f1r')}
+    
+    @pytest.mark.asyncio
+    async def test_move_rewrites_subtree_paths(self, session):
+        """Test moving a group re-roots the paths of its descendants."""
+        repository = DeviceGroupRepository(session)
+        floor = self.groups['b0f0']
+        floor.parent_group = self.groups['b1']
+        await session.flush()
+        
+        assert await repository.is_in_subtree(self.groups['b0f0r'].id, self.groups['b1'].id)
+        assert not await repository.is_in_subtree(self.groups['b0f0r'].id, self.groups['b0'].id)
+        
+        self.groups['b1'].parent_group = self.groups['b0f0r']
+        with pytest.raises(ValueError, match="below itself"):
+            await session.flush()
+    
+    @pytest.mark.asyncio
+    async def test_rebuild_paths(self, session):
+        """Test paths are rebuilt for groups written without them."""
+        repository = DeviceGroupRepository(session)
+        expected = await repository.get_subtree_group_ids(self.groups['b0'].id)
+        await session.execute(DeviceGroup.__table__.update().values(hierarchy_path=None))
+        
+        assert await repository.rebuild_hierarchy_paths() == len(self.groups)
+        assert sorted(await repository.get_subtree_group_ids(self.groups['b0'].id)) == sorted(expected)
+        assert await repository.rebuild_hierarchy_paths() == 0
+    
+    def test_path_column_fits_max_depth(self):
+        """Test the path column holds the path of the deepest group the repository allows."""
+        path = "/" + "/".join(uuid.uuid4().hex for _ in range(MAX_HIERARCHY_DEPTH + 1)) + "/"
+        assert len(path) <= DeviceGroup.__table__.c.hierarchy_path.type.length
+
+
+class TestDynamicGroups:
+    """Test set-based dynamic group membership against SQLite."""
+    
+    criteria = {
+        'online_sensors': {'device_type': ['sensor'], 'status': ['online']},
+        'tagged': {'tags': ['outdoor', 'solar']},
+        'cameras_or_gateways': {'device_type': ['camera', 'gateway']},
+        'nothing': {'status': ['no-such-status']},
+    }
+    
+    @pytest.fixture
+    async def session(self, sqlite_db):
+        """Create a session on varied devices and dynamic groups, counting statements."""
+        await sqlite_db.create_tables(tables=[
+            User.__table__, DeviceGroup.__table__, Device.__table__, DeviceGroupMembership.__table__
+        ])
+        async with sqlite_db.sessions() as session:
+            await self.seed(session)
+            self.statements = sqlite_db.record_statements()
+            yield session
+    
+    async def seed(self, session):
+        """Add varied devices and the dynamic groups."""
+        rng = random.Random(3)
+        tag_choices = [None, {'outdoor': 1, 'solar': 1}, ['outdoor', 'solar', 'x'], ['outdoor'], {'solar': 'outdoor'}]
+        self.groups = {
+            name: DeviceGroup(name=name, is_dynamic=True, dynamic_criteria=criteria)
+            for name, criteria in self.criteria.items()
+        }
+        session.add_all(self.groups.values())
+        session.add_all([
+            Device(name=f"d{i}", device_type=rng.choice(list(DeviceType)),
+                   status=rng.choice([DeviceStatus.ONLINE, DeviceStatus.OFFLINE]),
+                   tags=rng.choice(tag_choices))
+            for i in range(120)
+        ])
+        await session.flush()
+    
+    async def members(self, session, name):
+        """Names of the devices holding a membership in a group."""
+        result = await session.execute(
+            select(Device.name).join(DeviceGroupMembership, DeviceGroupMembership.device_id == Device.id)
+            .where(DeviceGroupMembership.device_group_id == self.groups[name].id)
+        )
+        return set(result.scalars().all())
+    
+    async def expected(self, session, name):
+        """Names of the live devices the group's Python evaluator accepts."""
+        devices = (await session.execute(select(Device).where(Device.is_deleted == False))).scalars().all()
+        return {d.name for d in devices if self.groups[name].evaluate_dynamic_criteria(d)}
+    
+    async def counts(self, session, name):
+        """Stored device and active device counts of a group."""
+        result = await session.execute(
+            select(DeviceGroup.device_count, DeviceGroup.active_device_count)
+            .where(DeviceGroup.id == self.groups[name].id)
+        )
+        return tuple(result.first())
+    
+    @pytest.mark.asyncio
+    async def test_refresh_all_matches_evaluator(self, session):
+        """Test SQL-compiled criteria select exactly the devices the model accepts."""
+        refresh = await DynamicGroupEngine(session).refresh_all()
+        assert refresh.groups == len(self.criteria)
+        
+        for name in self.criteria:
+            expected = await self.expected(session, name)
+            assert await self.members(session, name) == expected
+        assert await self.members(session, 'tagged')
+        assert await self.members(session, 'nothing') == set()
+        
+        online = (await session.execute(
+            select(func.count()).select_from(Device)
+            .join(DeviceGroupMembership, DeviceGroupMembership.device_id == Device.id)
+            .where(DeviceGroupMembership.device_group_id == self.groups['tagged'].id,
+                   Device.status == DeviceStatus.ONLINE)
+        )).scalar()
+        assert await self.counts(session, 'tagged') == (len(await self.expected(session, 'tagged')), online)
+        
+        again = await DynamicGroupEngine(session).refresh_all()
+        assert again.added == again.removed == 0
+    
+    @pytest.mark.asyncio
+    async def test_device_writes_refresh_incrementally(self, session):
+        """Test relevant device writes move memberships and counts; others issue no refresh."""
+        engine = DynamicGroupEngine(session)
+        await engine.refresh_all()
+        repository = DeviceRepository(session, dynamic_groups=engine)
+        
+        device = (await session.execute(select(Device).where(Device.name == "d0"))).scalar_one()
+        await repository.update(device.id, {'device_type': DeviceType.SENSOR, 'status': DeviceStatus.ONLINE})
+        assert "d0" in await self.members(session, 'online_sensors')
+        before = await self.counts(session, 'online_sensors')
+        
+        self.statements.clear()
+        await repository.update(device.id, {'name': 'renamed'})
+        assert not any("device_group_memberships" in statement for statement in self.statements)
+        
+        await repository.mark_devices_offline([device.id])
+        assert "renamed" not in await self.members(session, 'online_sensors')
+        assert await self.counts(session, 'online_sensors') == (before[0] - 1, before[1] - 1)
+        
+        await repository.update_heartbeat(device.id)
+        assert "renamed" in await self.members(session, 'online_sensors')
+        
+        await repository.delete(device.id)
+        assert "renamed" not in await self.members(session, 'online_sensors')
+        
+        created = await repository.create({'name': 'new', 'device_type': DeviceType.CAMERA})
+        assert "new" in await self.members(session, 'cameras_or_gateways')
+        await repository.bulk_insert([{'name': 'bulk', 'device_type': DeviceType.GATEWAY}])
+        assert "bulk" in await self.members(session, 'cameras_or_gateways')
+        
+        for name in self.criteria:
+            assert await self.members(session, name) == await self.expected(session, name)
+    
+    @pytest.mark.asyncio
+    async def test_criteria_change_refreshes_group(self, session):
+        """Test editing a group's criteria recomputes its membership."""
+        engine = DynamicGroupEngine(session)
+        await engine.refresh_all()
+        repository = DeviceGroupRepository(session, dynamic_groups=engine)
+        
+        group = await repository.update(self.groups['nothing'].id, {'dynamic_criteria': {'tags': ['outdoor']}})
+        self.groups['nothing'] = group
+        expected = await self.expected(session, 'nothing')
+        assert expected and await self.members(session, 'nothing') == expected
+    
+    @pytest.mark.asyncio
+    async def test_making_group_static_clears_membership(self, session):
+        """Test turning a group static removes its computed members and resets its counts."""
+        engine = DynamicGroupEngine(session)
+        await engine.refresh_all()
+        repository = DeviceGroupRepository(session, dynamic_groups=engine)
+        assert await self.members(session, 'tagged')
+        
+        group = await repository.update(self.groups['tagged'].id, {'is_dynamic': False})
+        
+        assert await self.members(session, 'tagged') == set()
+        assert await self.counts(session, 'tagged') == (0, 0)
+        assert (group.device_count, group.active_device_count) == (0, 0)
+        
+        again = await engine.refresh_all()
+        assert await self.members(session, 'tagged') == set()
+        assert again.groups == len(self.criteria) - 1
+    
+    @pytest.mark.asyncio
+    async def test_deleting_group_clears_membership(self, session):
+        """Test deleting a dynamic group removes its memberships and resets its counts."""
+        engine = DynamicGroupEngine(session)
+        await engine.refresh_all()
+        repository = DeviceGroupRepository(session, dynamic_groups=engine)
+        assert await self.members(session, 'cameras_or_gateways')
+        
+        assert await repository.delete(self.groups['cameras_or_gateways'].id)
+        
+        assert await self.members(session, 'cameras_or_gateways') == set()
+        assert await self.counts(session, 'cameras_or_gateways') == (0, 0)
+        assert await self.members(session, 'tagged') == await self.expected(session, 'tagged')
+    
+    def test_evaluator_requires_tags(self):
+        """Test devices without tags do not satisfy tag criteria."""
+        group = DeviceGroup(name="g", is_dynamic=True, dynamic_criteria={'tags': ['outdoor']})
+        assert not group.evaluate_dynamic_criteria(Device(name="d", tags=None))
+        assert group.evaluate_dynamic_criteria(Device(name="d", tags=['outdoor']))
+
+
+class TestSearch:
+    """Test indexed text search against SQLite FTS5."""
+    
+    fields = ['name', 'hostname', 'location', 'manufacturer', 'model']
+    
+    @pytest.fixture
+    async def session(self, sqlite_db):
+        """Create a session on a database of searchable devices."""
+        await sqlite_db.create_tables(tables=[Device.__table__])
+        async with sqlite_db.sessions() as session:
+            await self.seed(session)
+            yield session
+    
+    async def seed(self, session):
+        """Add searchable devices."""
+        rng = random.Random(11)
+        words = ['Berlin', 'Boston', 'gateway', 'Acme', 'Globex', 'rack-7', 'rooftop', '50%_off']
+        session.add_all([
+            Device(name=f"{rng.choice(words)}-{i}", device_type=DeviceType.SENSOR,
+                   hostname=rng.choice([None, f"host-{rng.choice(words).lower()}"]),
+                   location=rng.choice(words), manufacturer=rng.choice(words),
+                   model=rng.choice([None, 'X100', 'gw-berlin']))
+            for i in range(150)
+        ])
+        await session.flush()
+    
+    async def scanned(self, session, term):
+        """Names of the live devices with a field containing the term, case-insensitively."""
+        devices = (await session.execute(select(Device))).scalars().all()
+        return sorted(
+            d.name for d in devices
+            if not d.is_deleted and any(term.lower() in (getattr(d, f) or '').lower() for f in self.fields)
+        )
+    
+    async def searched(self, repository, term):
+        return sorted(d.name for d in await repository.search(term, self.fields, limit=1000))
+    
+    @pytest.mark.asyncio
+    async def test_index_matches_scan(self, session):
+        """Test FTS5 searches find exactly what a scan finds."""
+        repository = DeviceRepository(session)
+        before = {term: await self.searched(repository, term) for term in ['berlin', 'ACME', 'off']}
+        
+        backends = await SearchIndexManager(session).ensure()
+        assert backends['devices'] is SearchBackend.FTS5
+        assert await SearchIndexManager(session).backend('devices') is SearchBackend.FTS5
+        
+        for term in ['berlin', 'ACME', 'off', 'host-glo', '50%_', 'ck-7 r', 'zzz']:
+            expected = await self.scanned(session, term)
+            assert await self.searched(repository, term) == expected
+            if term in before:
+                assert before[term] == expected
+    
+    @pytest.mark.asyncio
+    async def test_index_follows_writes(self, session):
+        """Test inserts, updates and deletes reach the FTS5 table through its triggers."""
+        await SearchIndexManager(session).ensure(tables=['devices'])
+        repository = DeviceRepository(session)
+        
+        device = await repository.create({'name': 'quasar-unit', 'device_type': DeviceType.SENSOR})
+        assert await self.searched(repository, 'quasar') == ['quasar-unit']
+        
+        await repository.update(device.id, {'name': 'pulsar-unit'})
+        assert await self.searched(repository, 'quasar') == []
+        assert await self.searched(repository, 'pulsar') == ['pulsar-unit']
+        
+        await repository.delete(device.id)
+        assert await self.searched(repository, 'pulsar') == []
+        
+        await session.execute(Device.__table__.delete().where(Device.name.like('Boston%')))
+        assert await self.searched(repository, 'boston-') == []
+    
+    @pytest.mark.asyncio
+    async def test_short_terms_and_other_fields_scan(self, session):
+        """Test terms shorter than a trigram and non-indexed field sets fall back to the scan."""
+        await SearchIndexManager(session).ensure(tables=['devices'])
+        repository = DeviceRepository(session)
+        
+        assert await self.searched(repository, 'X1') == await self.scanned(session, 'X1')
+        found = await repository.search('gw', ['model'], limit=1000)
+        assert found and all('gw' in d.model for d in found)
+    
+    @pytest.mark.asyncio
+    async def test_ranked_best_first(self, session):
+        """Test indexed results come ordered by relevance."""
+        await SearchIndexManager(session).ensure(tables=['devices'])
+        repository = DeviceRepository(session)
+        await repository.create({'name': 'rooftop rooftop', 'device_type': DeviceType.SENSOR,
+                                 'location': 'rooftop', 'manufacturer': 'rooftop'})
+        
+        results = await repository.search('rooftop', self.fields, limit=1)
+        assert [d.name for d in results] == ['rooftop rooftop']
+    
+    @pytest.mark.asyncio
+    async def test_migration_round_trip(self, session):
+        """Test the migration operations create and drop the indexes."""
+        from alembic.migration import MigrationContext
+        from alembic.operations import Operations
+        
+        def migrate(sync_conn, step):
+            step(Operations(MigrationContext.configure(sync_conn)), ['devices'])
+            return sync_conn.exec_driver_sql(
+                "SELECT count(*) FROM sqlite_master WHERE name IN ('devices_search', "
+                "'devices_search_insert', 'devices_search_update', 'devices_search_delete')"
+            ).scalar()
+        
+        conn = await session.connection()
+        # The FTS5 table and its three triggers
+        assert await conn.run_sync(migrate, search_indexes.upgrade) == 4
+        assert await SearchIndexManager(session).backend('devices') is SearchBackend.FTS5
+        assert await conn.run_sync(migrate, search_indexes.downgrade) == 0
+        assert not search_indexes.include_object(None, 'devices_search_idx', 'table', True, None)
+        assert search_indexes.include_object(None, 'devices', 'table', True, None)
+    
+    def test_postgresql_statements(self):
+        """Test the PostgreSQL index is a trigram GIN index on the search document."""
+        statements = create_statements('postgresql', 'devices')
+        assert statements[0] == "CREATE EXTENSION IF NOT EXISTS pg_trgm"
+        assert "USING gin" in statements[1] and "gin_trgm_ops" in statements[1]
+        assert "coalesce(name, '')" in statements[1]
+        
+        query = SearchIndexManager(None).query(SearchBackend.TRIGRAM, Device, '50%')
+        sql = str(query.compile(dialect=postgresql.dialect()))
+        assert "ILIKE" in sql and "word_similarity" in sql
+        # The query repeats the indexed expression, separators included
+        indexed = statements[1].split("USING gin ((")[1].split(") gin_trgm_ops")[0]
+        assert indexed.replace("coalesce(", "coalesce(devices.") in sql
+        assert SearchIndexManager(None).query(SearchBackend.SCAN, Device, 'abc') is None
+
+
+class TestStatistics:
+    """Test single-pass statistics queries against SQLite."""
+    
+    @pytest.fixture
+    async def session(self, sqlite_db):
+        """Create a session on a database with devices and alerts, counting statements."""
+        await sqlite_db.create_tables(tables=[Device.__table__, Alert.__table__])
+        async with sqlite_db.sessions() as session:
+            self.statements = sqlite_db.record_statements()
+            yield session
+    
+    @pytest.mark.asyncio
+    async def test_device_statistics(self, session):
+        """Test device statistics are computed in one query."""
+        session.add_all([
+            Device(name=f"d{i}", device_type=device_type, status=status, health_score=health)
+            for i, (device_type, status, health) in enumerate([
+                (DeviceType.SENSOR, DeviceStatus.ONLINE, 0.5),
+                (DeviceType.SENSOR, DeviceStatus.ONLINE, 1.0),
+                (DeviceType.SENSOR, DeviceStatus.OFFLINE, None),
+                (DeviceType.GATEWAY, DeviceStatus.ONLINE, 0.0),
+            ])
+        ])
+        session.add(Device(name="gone", device_type=DeviceType.GATEWAY, is_deleted=True))
+        await session.flush()
+        self.statements.clear()
+        
+        stats = await DeviceRepository(session).get_device_statistics()
+        
+        assert len(self.statements) == 1
+        assert stats == {
+            'total_devices': 4,
+            'status_distribution': {'online': 3, 'offline': 1},
+            'type_distribution': {'sensor': 3, 'gateway': 1},
+            'health_statistics': {'average_health': 0.5, 'min_health': 0.0, 'max_health': 1.0},
+        }
+    
+    @pytest.mark.asyncio
+    async def test_alert_statistics(self, session):
+        """Test alert statistics, including open and recent counts, come from one query."""
+        now = datetime.now(timezone.utc)
+        session.add_all([
+            Alert(title=f"a{i}", alert_type="threshold", severity=severity, status=status,
+                  first_occurred=now - timedelta(hours=hours))
+            for i, (severity, status, hours) in enumerate([
+                (AlertSeverity.CRITICAL, AlertStatus.OPEN, 1),
+                (AlertSeverity.CRITICAL, AlertStatus.ACKNOWLEDGED, 30),
+                (AlertSeverity.LOW, AlertStatus.RESOLVED, 2),
+                (AlertSeverity.LOW, AlertStatus.IN_PROGRESS, 48),
+            ])
+        ])
+        await session.flush()
+        self.statements.clear()
+        
+        stats = await AlertRepository(session).get_alert_statistics()
+        
+        assert len(self.statements) == 1
+        assert stats['total_alerts'] == 4
+        assert stats['open_alerts'] == 3
+        assert stats['recent_alerts_24h'] == 2
+        assert stats['severity_distribution'] == {'critical': 2, 'low': 2}
+        assert stats['status_distribution'] == {
+            'open': 1, 'acknowledged': 1, 'resolved': 1, 'in_progress': 1
+        }
+    
+    @pytest.mark.asyncio
+    async def test_summary_cache(self, session):
+        """Test repositories sharing a summary cache query once per TTL."""
+        summaries = SummaryCache(ttl_seconds=60)
+        session.add(Device(name="d", device_type=DeviceType.SENSOR))
+        await session.flush()
+        self.statements.clear()
+        
+        first = await DeviceRepository(session, summary_cache=summaries).get_device_statistics()
+        first['total_devices'] = 0
+        second = await DeviceRepository(session, summary_cache=summaries).get_device_statistics()
+        
+        assert len(self.statements) == 1
+        assert second['total_devices'] == 1
+        assert (summaries.stats.hits, summaries.stats.misses) == (1, 1)
+        
+        summaries.invalidate()
+        await DeviceRepository(session, summary_cache=summaries).get_device_statistics()
+        assert len(self.statements) == 2
+
+
+class TestSummaryCache:
+    """Test the summary cache."""
+    
+    @pytest.mark.asyncio
+    async def test_concurrent_refresh_runs_once(self):
+        """Test concurrent reads of an expired summary share one computation."""
+        cache = SummaryCache(ttl_seconds=60)
+        calls = []
+        
+        async def compute():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return {'value': len(calls)}
+        
+        results = await asyncio.gather(*(cache.get('summary', compute) for _ in range(5)))
+        
+        assert calls == [1]
+        assert results == [{'value': 1}] * 5
+        assert cache.stats.shared_refreshes == 4
+        assert cache.stats.hit_ratio == 0.8
+    
+    @pytest.mark.asyncio
+    async def test_expiry_and_errors(self):
+        """Test expired summaries are recomputed and failures are not cached."""
+        cache = SummaryCache(ttl_seconds=0.01)
+        values = iter([1, 2])
+        
+        async def compute():
+            return next(values)
+        
+        async def fail():
+            raise RuntimeError("database unavailable")
+        
+        with pytest.raises(RuntimeError):
+            await cache.get('summary', fail)
+        assert await cache.get('summary', compute) == 1
+        await asyncio.sleep(0.02)
+        assert await cache.get('summary', compute) == 2
+
+
 class TestDatabaseConnection:
     """Test database connection management."""
 
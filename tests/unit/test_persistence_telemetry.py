@@ -0,0 +1,537 @@
+"""
+Unit tests for the telemetry repository.
+"""
+
+import asyncio
+import pytest
+import uuid
+from datetime import datetime, timezone, timedelta
+
+from click.testing import CliRunner
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from edge_device_fleet_manager.cli.main import cli
+from edge_device_fleet_manager.persistence.models.base import Base
+from edge_device_fleet_manager.persistence.models.telemetry import TelemetryEvent, TelemetryType
+from edge_device_fleet_manager.persistence.models.telemetry_latest import DeviceLatestTelemetry
+from edge_device_fleet_manager.persistence.models.telemetry_rollup import (
+    ROLLUP_MODELS, RollupResolution, TelemetryRollupHour, TelemetryRollupState, rollup_stddev
+)
+from edge_device_fleet_manager.persistence.repositories.base import RepositoryError
+from edge_device_fleet_manager.persistence.repositories.telemetry import TelemetryRepository
+from edge_device_fleet_manager.persistence.repositories.telemetry_latest import LatestTelemetryRepository
+from edge_device_fleet_manager.persistence.repositories.telemetry_partitions import (
+    PartitionPeriod, TelemetryPartitionManager
+)
+from edge_device_fleet_manager.persistence.repositories.telemetry_rollup import TelemetryRollupRepository
+
+
+START = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+async def session():
+    """Create an in-memory database session with the telemetry table."""
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all, tables=[
+            TelemetryEvent.__table__, TelemetryRollupState.__table__, DeviceLatestTelemetry.__table__,
+            *(model.__table__ for model in ROLLUP_MODELS.values())
+        ])
+    async with async_sessionmaker(engine, expire_on_commit=False)() as session:
+        yield session
+    await engine.dispose()
+
+
+async def add_readings(repository, device_id, values, step=timedelta(minutes=10),
+                       event_name="temperature", received_at=None):
+    """Insert one reading per value, spaced by step from START."""
+    await repository.bulk_insert([
+        {
+            "device_id": device_id,
+            "event_type": TelemetryType.SENSOR_DATA,
+            "event_name": event_name,
+            "timestamp": START + step * i,
+            "received_at": received_at or START + step * i,
+            "numeric_value": value,
+        }
+        for i, value in enumerate(values)
+    ])
+
+
+class TestTimeSeries:
+    """Test database-side time bucketing."""
+
+    @pytest.mark.asyncio
+    async def test_hourly_buckets(self, session):
+        """Test intervals of an hour or more bucket correctly."""
+        repository = TelemetryRepository(session)
+        device_id = uuid.uuid4()
+        await add_readings(repository, device_id, [float(i) for i in range(18)])
+        await add_readings(repository, device_id, [100.0], event_name="humidity")
+
+        series = await repository.get_time_series_data(
+            device_id, "temperature", START, START + timedelta(days=1), interval_minutes=120
+        )
+
+        assert [(point["timestamp"], point["count"]) for point in series] == [
+            (START, 12), (START + timedelta(hours=2), 6)
+        ]
+        first = series[0]
+        assert (first["count"], first["min"], first["max"], first["sum"]) == (12, 0.0, 11.0, 66.0)
+        assert first["value"] == pytest.approx(5.5)
+        assert first["device_id"] == device_id
+
+    @pytest.mark.asyncio
+    async def test_multiple_devices(self, session):
+        """Test several devices are aggregated in one query."""
+        repository = TelemetryRepository(session)
+        first, second = sorted([uuid.uuid4(), uuid.uuid4()])
+        await add_readings(repository, first, [1.0, 2.0, 3.0])
+        await add_readings(repository, second, [10.0, 20.0, 30.0])
+
+        series = await repository.get_time_series_data(
+            [first, second], "temperature", START, START + timedelta(hours=1),
+            interval=timedelta(minutes=15)
+        )
+
+        assert [(p["device_id"], p["timestamp"], p["count"]) for p in series] == [
+            (first, START, 2), (first, START + timedelta(minutes=15), 1),
+            (second, START, 2), (second, START + timedelta(minutes=15), 1),
+        ]
+        assert series[2]["sum"] == 30.0
+
+    @pytest.mark.asyncio
+    async def test_invalid_interval(self, session):
+        """Test sub-second intervals are rejected."""
+        with pytest.raises(RepositoryError):
+            await TelemetryRepository(session).get_time_series_data(
+                uuid.uuid4(), "temperature", START, START, interval=timedelta(0)
+            )
+
+    def test_postgresql_bucket(self):
+        """Test PostgreSQL 14+ uses date_bin and older servers fall back to epoch arithmetic."""
+        repository = TelemetryRepository(None)
+        dialect = postgresql.dialect()
+
+        dialect.server_version_info = (15, 2)
+        sql = str(select(repository._time_bucket(dialect, 300)).compile(dialect=dialect))
+        assert "date_bin(INTERVAL '300 seconds'" in sql
+
+        dialect.server_version_info = (12, 0)
+        sql = str(select(repository._time_bucket(dialect, 300)).compile(dialect=dialect))
+        assert "to_timestamp(floor(EXTRACT(epoch FROM" in sql
+
+
+class TestLatest:
+    """Test the latest-event lookup."""
+
+    @pytest.mark.asyncio
+    async def test_get_latest_by_device(self, session):
+        """Test the newest event is returned, optionally for one event name."""
+        repository = TelemetryRepository(session)
+        device_id = uuid.uuid4()
+        await add_readings(repository, device_id, [1.0, 2.0, 3.0])
+        await add_readings(repository, device_id, [10.0, 20.0], event_name="humidity")
+
+        assert (await repository.get_latest_by_device(device_id)).numeric_value == 3.0
+        assert (await repository.get_latest_by_device(device_id, "humidity")).numeric_value == 20.0
+        assert await repository.get_latest_by_device(uuid.uuid4()) is None
+
+
+class TestLatestValues:
+    """Test the per-device, per-metric latest-value table."""
+
+    @pytest.mark.asyncio
+    async def test_ingestion_upserts(self, session):
+        """Test every ingestion path keeps the newest reading per metric."""
+        repository = TelemetryRepository(session)
+        latest = LatestTelemetryRepository(session)
+        device_id = uuid.uuid4()
+        await add_readings(repository, device_id, [1.0, 2.0, 3.0])
+        await add_readings(repository, device_id, [10.0], event_name="humidity")
+
+        values = await latest.get_device_values(device_id)
+        assert {name: row.value for name, row in values.items()} == {"temperature": 3.0, "humidity": 10.0}
+
+        # A late reading older than the stored one must not replace it
+        await add_readings(repository, device_id, [0.5])
+        await repository.create({
+            "device_id": device_id, "event_type": TelemetryType.SENSOR_DATA, "event_name": "humidity",
+            "timestamp": START + timedelta(hours=1), "numeric_value": 11.0,
+        })
+        await repository.bulk_create([{
+            "device_id": device_id, "event_type": TelemetryType.HEALTH_CHECK, "event_name": "online",
+            "timestamp": START, "boolean_value": True,
+        }])
+        session.expire_all()
+
+        values = await latest.get_device_values(device_id)
+        assert {name: row.value for name, row in values.items()} == {
+            "temperature": 3.0, "humidity": 11.0, "online": True
+        }
+        newest = (await repository.get_latest_by_device(device_id, "humidity"))
+        assert values["humidity"].event_id == newest.id
+
+    @pytest.mark.asyncio
+    async def test_fleet_values(self, session):
+        """Test the current value of a metric is read for the whole fleet."""
+        repository = TelemetryRepository(session)
+        device_ids = sorted(uuid.uuid4() for _ in range(3))
+        for i, device_id in enumerate(device_ids):
+            await add_readings(repository, device_id, [float(i), float(i) + 0.5])
+            await add_readings(repository, device_id, [50.0], event_name="humidity")
+
+        rows = await LatestTelemetryRepository(session).get_fleet_values(event_names=["temperature"])
+
+        assert [(row.device_id, row.value) for row in rows] == [
+            (device_id, i + 0.5) for i, device_id in enumerate(device_ids)
+        ]
+
+    @pytest.mark.asyncio
+    async def test_backfill(self, session):
+        """Test the backfill rebuilds the table in resumable batches."""
+        repository = TelemetryRepository(session, maintain_latest=False)
+        device_ids = sorted(uuid.uuid4() for _ in range(5))
+        for i, device_id in enumerate(device_ids):
+            await add_readings(repository, device_id, [float(i), float(i) * 10, 99.0][:i % 3 + 1])
+            await add_readings(repository, device_id, [1.0, 2.0], event_name="humidity")
+        latest = LatestTelemetryRepository(session)
+        assert await latest.get_fleet_values() == []
+
+        batches = []
+        first = await latest.backfill(batch_size=2, progress_callback=lambda p: batches.append(p.devices))
+        assert (first.devices, first.batches, first.rows, first.completed) == (5, 3, 10, True)
+        assert batches == [2, 4, 5]
+
+        rows = await latest.get_fleet_values(event_names=["temperature"])
+        assert [row.value for row in rows] == [0.0, 10.0, 99.0, 3.0, 40.0]
+        assert all(row.value == 2.0 for row in await latest.get_fleet_values(event_names=["humidity"]))
+
+        resumed = await latest.backfill(batch_size=2, resume_from=device_ids[2])
+        assert (resumed.devices, resumed.last_device_id) == (2, device_ids[-1])
+
+
+class TestStatistics:
+    """Test per-device telemetry statistics."""
+
+    @pytest.mark.asyncio
+    async def test_device_statistics(self, session):
+        """Test totals, type distribution and latest time are computed in one pass."""
+        repository = TelemetryRepository(session)
+        device_id = uuid.uuid4()
+        await add_readings(repository, device_id, [1.0, 2.0, 3.0])
+        await repository.bulk_insert([{
+            "device_id": device_id, "event_type": TelemetryType.HEALTH_CHECK, "event_name": "online",
+            "timestamp": START + timedelta(hours=2), "boolean_value": True,
+        }])
+        await add_readings(repository, uuid.uuid4(), [5.0])
+
+        stats = await repository.get_device_statistics(device_id)
+        assert stats["total_events"] == 4
+        assert stats["type_distribution"] == {"sensor_data": 3, "health_check": 1}
+        assert stats["latest_event_time"].replace(tzinfo=timezone.utc) == START + timedelta(hours=2)
+
+        windowed = await repository.get_device_statistics(device_id, end_time=START + timedelta(minutes=10))
+        assert windowed["total_events"] == 2
+        assert windowed["type_distribution"] == {"sensor_data": 2}
+
+        empty = await repository.get_device_statistics(uuid.uuid4())
+        assert (empty["total_events"], empty["latest_event_time"]) == (0, None)
+
+
+class TestPagination:
+    """Test keyset pagination of a device's events."""
+
+    @pytest.mark.asyncio
+    async def test_get_by_device_page(self, session):
+        """Test pages follow each other newest first, including equal timestamps."""
+        repository = TelemetryRepository(session)
+        device_id = uuid.uuid4()
+        await add_readings(repository, device_id, [float(i) for i in range(5)])
+        await add_readings(repository, device_id, [float(i) for i in range(5)], event_name="humidity")
+        await add_readings(repository, uuid.uuid4(), [1.0])
+
+        pages, cursor = [], None
+        while True:
+            page = await repository.get_by_device_page(device_id, cursor=cursor, limit=3)
+            pages.append(page.items)
+            if not page.has_more:
+                break
+            cursor = page.next_cursor
+
+        assert [len(items) for items in pages] == [3, 3, 3, 1]
+        events = [event for items in pages for event in items]
+        assert len({event.id for event in events}) == 10
+        assert [event.numeric_value for event in events] == [4.0, 4.0, 3.0, 3.0, 2.0, 2.0, 1.0, 1.0, 0.0, 0.0]
+
+
+class TestRetention:
+    """Test telemetry retention."""
+
+    @pytest.mark.asyncio
+    async def test_cleanup_unpartitioned(self, session):
+        """Test expired events are deleted in batches from a plain table."""
+        repository = TelemetryRepository(session)
+        device_id = uuid.uuid4()
+        now = datetime.now(timezone.utc)
+        await repository.bulk_insert([
+            {"device_id": device_id, "event_type": TelemetryType.SENSOR_DATA, "event_name": "temperature",
+             "timestamp": now - timedelta(days=days), "numeric_value": float(days)}
+            for days in range(0, 50, 2)
+        ])
+        await session.commit()
+
+        # Pending work in the caller's session is neither committed nor rolled back
+        pending = TelemetryEvent(device_id=device_id, event_type=TelemetryType.SENSOR_DATA,
+                                 event_name="temperature", timestamp=now - timedelta(days=40),
+                                 numeric_value=40.0)
+        session.add(pending)
+
+        count = await repository.cleanup_old_data(retention_days=30, batch_size=4, pause_seconds=0)
+
+        assert count == 10
+        assert pending in session.new
+        await session.rollback()
+        events = await repository.get_by_device(device_id)
+        assert len(events) == 15
+        assert max(event.numeric_value for event in events) == 28.0
+
+
+class TestRollups:
+    """Test incremental rollup maintenance and rollup-backed queries."""
+
+    @pytest.mark.asyncio
+    async def test_refresh_is_incremental(self, session):
+        """Test each refresh folds only new events and merges late arrivals."""
+        telemetry = TelemetryRepository(session)
+        rollups = TelemetryRollupRepository(session)
+        device_id = uuid.uuid4()
+        await add_readings(telemetry, device_id, [1.0, 2.0, 3.0, 4.0], step=timedelta(minutes=20))
+
+        written = await rollups.refresh(until=START + timedelta(hours=2))
+        assert written[RollupResolution.MINUTE] == 4
+        assert written[RollupResolution.DAY] == 1
+        assert await rollups.refresh(until=START + timedelta(hours=2)) == {}
+
+        # A late event for the first hour, received after the high-water mark
+        await add_readings(telemetry, device_id, [5.0], received_at=START + timedelta(hours=3))
+        await rollups.refresh(until=START + timedelta(hours=4))
+
+        hour = (await session.execute(
+            select(TelemetryRollupHour).where(TelemetryRollupHour.bucket_start == START)
+        )).scalar_one()
+        assert (hour.count, hour.sum, hour.min, hour.max) == (4, 11.0, 1.0, 5.0)
+        assert hour.sum_squares == 1.0 + 4.0 + 9.0 + 25.0
+        assert hour.stddev == pytest.approx(1.479019945774904)
+        assert (await rollups.get_high_water_mark()).replace(tzinfo=timezone.utc) == START + timedelta(hours=4)
+
+    @pytest.mark.asyncio
+    async def test_query_matches_raw(self, session):
+        """Test rollup-backed series agree with aggregating raw events."""
+        telemetry = TelemetryRepository(session)
+        rollups = TelemetryRollupRepository(session)
+        device_id = uuid.uuid4()
+        await add_readings(telemetry, device_id, [float(i % 7) for i in range(300)], step=timedelta(minutes=7))
+        await rollups.refresh(until=START + timedelta(days=3))
+        end = START + timedelta(days=2)
+
+        for interval, resolution in [
+            (timedelta(days=1), "1d"), (timedelta(hours=6), "1h"), (timedelta(minutes=30), "1m")
+        ]:
+            series = await rollups.get_time_series(device_id, "temperature", START, end, interval=interval)
+            raw = await TelemetryRepository(session, use_rollups=False).get_time_series_data(
+                device_id, "temperature", START, end - timedelta(microseconds=1), interval=interval
+            )
+            assert {point["resolution"] for point in series} == {resolution}
+            assert [(p["count"], p["sum"], p["min"], p["max"]) for p in series] == [
+                (p["count"], p["sum"], p["min"], p["max"]) for p in raw
+            ]
+
+    @pytest.mark.asyncio
+    async def test_query_includes_events_after_high_water_mark(self, session):
+        """Test events received since the last refresh are merged into rollup buckets."""
+        telemetry = TelemetryRepository(session)
+        rollups = TelemetryRollupRepository(session)
+        device_id = uuid.uuid4()
+        await add_readings(telemetry, device_id, [1.0, 2.0], step=timedelta(minutes=20))
+        await rollups.refresh(until=START + timedelta(hours=2))
+
+        # One late event for the first hour and one for the second, not yet refreshed
+        await add_readings(telemetry, device_id, [5.0, 7.0], step=timedelta(hours=1),
+                           received_at=START + timedelta(hours=3))
+
+        series = await rollups.get_time_series(
+            device_id, "temperature", START, START + timedelta(hours=2), interval=timedelta(hours=1)
+        )
+
+        assert [(p["count"], p["sum"], p["min"], p["max"]) for p in series] == [
+            (3, 8.0, 1.0, 5.0), (1, 7.0, 7.0, 7.0)
+        ]
+        assert series[0]["stddev"] == pytest.approx(rollup_stddev(3, 8.0, 30.0))
+
+    @pytest.mark.asyncio
+    async def test_time_series_data_reads_rollups(self, session):
+        """Test the telemetry repository's series come from rollups, raw past the last whole bucket."""
+        telemetry = TelemetryRepository(session)
+        device_id = uuid.uuid4()
+        await add_readings(telemetry, device_id, [1.0, 2.0, 3.0, 4.0, 5.0, 6.0], step=timedelta(minutes=20))
+        await TelemetryRollupRepository(session).refresh(until=START + timedelta(hours=2))
+
+        # The end is inclusive and not on an hour, so the second hour is read
+        # from raw events and stops at 01:20
+        series = await telemetry.get_time_series_data(
+            device_id, "temperature", START, START + timedelta(hours=1, minutes=20),
+            interval=timedelta(hours=1)
+        )
+
+        assert [(p["count"], p["sum"], p["resolution"]) for p in series] == [
+            (3, 6.0, "1h"), (2, 9.0, "1h")
+        ]
+
+    @pytest.mark.asyncio
+    async def test_unaligned_range_reads_raw(self, session):
+        """Test ranges that do not fit any rollup fall back to raw events."""
+        telemetry = TelemetryRepository(session)
+        device_id = uuid.uuid4()
+        await add_readings(telemetry, device_id, [1.0, 2.0])
+
+        series = await TelemetryRollupRepository(session).get_time_series(
+            device_id, "temperature", START + timedelta(seconds=30), START + timedelta(hours=1),
+            interval=timedelta(minutes=30)
+        )
+
+        assert [(p["count"], p["resolution"]) for p in series] == [(1, None)]
+
+    def test_choose_resolution(self):
+        """Test the coarsest rollup that tiles the interval and range is chosen."""
+        choose = TelemetryRollupRepository.choose_resolution
+        day = START + timedelta(days=1)
+
+        assert choose(timedelta(days=7), START, day) is RollupResolution.DAY
+        assert choose(timedelta(hours=2), START, day) is RollupResolution.HOUR
+        assert choose(timedelta(minutes=90), START, day) is RollupResolution.MINUTE
+        assert choose(timedelta(days=1), START + timedelta(hours=1), day) is RollupResolution.HOUR
+        assert choose(timedelta(hours=1), START, day + timedelta(minutes=5)) is RollupResolution.HOUR
+        assert choose(timedelta(seconds=30), START, day) is None
+
+
+class TestCommands:
+    """Test the CLI commands that maintain telemetry tables."""
+
+    def test_backfill_latest_telemetry_command(self, tmp_path, monkeypatch):
+        """Test the backfill command builds latest values in the configured database."""
+        url = f"sqlite+aiosqlite:///{tmp_path / 'fleet.db'}"
+        device_id = uuid.uuid4()
+
+        async def seed():
+            engine = create_async_engine(url)
+            async with engine.begin() as conn:
+                await conn.run_sync(Base.metadata.create_all, tables=[
+                    TelemetryEvent.__table__, DeviceLatestTelemetry.__table__
+                ])
+            async with async_sessionmaker(engine)() as session:
+                session.add_all([
+                    TelemetryEvent(device_id=device_id, event_type=TelemetryType.SENSOR_DATA,
+                                   event_name="temperature", numeric_value=value,
+                                   timestamp=datetime(2024, 1, 1, hour, tzinfo=timezone.utc))
+                    for hour, value in [(1, 20.0), (2, 21.5)]
+                ])
+                await session.commit()
+            await engine.dispose()
+
+        async def latest():
+            engine = create_async_engine(url)
+            async with async_sessionmaker(engine)() as session:
+                values = (await session.execute(select(DeviceLatestTelemetry.numeric_value))).scalars().all()
+            await engine.dispose()
+            return values
+
+        asyncio.run(seed())
+        monkeypatch.setenv("DATABASE_URL", url)
+        monkeypatch.setenv("DB_ENABLE_HEALTH_CHECKS", "false")
+
+        result = CliRunner().invoke(cli, ['backfill-latest-telemetry', '--batch-size', '10'])
+
+        assert result.exit_code == 0, result.output
+        assert "Backfilled 1 latest values for 1 devices" in result.output
+        assert asyncio.run(latest()) == [21.5]
+
+    def test_refresh_telemetry_rollups_command(self, tmp_path, monkeypatch):
+        """Test the refresh command folds stored telemetry into the rollups and commits."""
+        url = f"sqlite+aiosqlite:///{tmp_path / 'fleet.db'}"
+        device_id = uuid.uuid4()
+
+        async def seed():
+            engine = create_async_engine(url)
+            async with engine.begin() as conn:
+                await conn.run_sync(Base.metadata.create_all, tables=[
+                    TelemetryEvent.__table__, TelemetryRollupState.__table__,
+                    *(model.__table__ for model in ROLLUP_MODELS.values())
+                ])
+            async with async_sessionmaker(engine)() as session:
+                await add_readings(TelemetryRepository(session, maintain_latest=False),
+                                   device_id, [1.0, 2.0, 3.0], step=timedelta(minutes=20))
+                await session.commit()
+            await engine.dispose()
+
+        async def hours():
+            engine = create_async_engine(url)
+            async with async_sessionmaker(engine)() as session:
+                rows = (await session.execute(
+                    select(TelemetryRollupHour.count, TelemetryRollupHour.sum)
+                )).all()
+                high_water_mark = await TelemetryRollupRepository(session).get_high_water_mark()
+            await engine.dispose()
+            return [tuple(row) for row in rows], high_water_mark
+
+        asyncio.run(seed())
+        monkeypatch.setenv("DATABASE_URL", url)
+        monkeypatch.setenv("DB_ENABLE_HEALTH_CHECKS", "false")
+
+        result = CliRunner().invoke(cli, ['refresh-telemetry-rollups'])
+
+        assert result.exit_code == 0, result.output
+        assert "1h=1" in result.output
+        rows, high_water_mark = asyncio.run(hours())
+        assert rows == [(3, 6.0)]
+        assert high_water_mark is not None
+
+
+class TestPartitions:
+    """Test the partition manager on SQLite, which stays unpartitioned."""
+
+    @pytest.mark.asyncio
+    async def test_sqlite_stays_unpartitioned(self, session):
+        """Test ensuring partitions on SQLite leaves ORM updates and retention working."""
+        repository = TelemetryRepository(session)
+        manager = TelemetryPartitionManager(session, premake=2)
+        device_id = uuid.uuid4()
+        await add_readings(repository, device_id, [1.0, 2.0], step=timedelta(days=1))
+
+        assert await manager.ensure_partitions(now=START) == []
+        assert not await manager.is_partitioned()
+        assert await manager.list_partitions() == []
+
+        event = (await repository.get_by_device(device_id))[0]
+        event_id = event.id
+        event.mark_processed(duration_ms=5)
+        await session.commit()
+        session.expire_all()
+        assert (await repository.get(event_id)).processing_duration_ms == 5
+
+        # Both readings are from 2024, so row-by-row retention removes them
+        assert await repository.cleanup_old_data(retention_days=30, pause_seconds=0) == 2
+
+    @pytest.mark.asyncio
+    async def test_drop_partitions_before_requires_partitioned_table(self, session):
+        """Test dropping partitions on an unpartitioned table points at row retention."""
+        with pytest.raises(RepositoryError, match="cleanup_old_data"):
+            await TelemetryPartitionManager(session).drop_partitions_before(START)
+
+    def test_week_period(self):
+        """Test weekly partitions start on Monday."""
+        assert PartitionPeriod.WEEK.floor(datetime(2024, 1, 3, 15, tzinfo=timezone.utc)) == START
+        assert PartitionPeriod.WEEK.floor(datetime(2024, 1, 14, tzinfo=timezone.utc)) == datetime(2024, 1, 8, tzinfo=timezone.utc)